@@ -0,0 +1,96 @@
+"""add native pgvector columns to document_chunks
+
+Revision ID: 036_native_vector_columns
+Revises: 035_merchant_id_conversation_turns
+Create Date: 2026-04-08 10:00:00.000000
+
+Adds one native pgvector column per supported embedding dimension
+(768, 1536, 3072) with HNSW cosine indexes so retrieval can push the
+`<=>` distance, threshold and top-k into SQL.
+
+Backfill:
+- Unwraps double-encoded JSONB embeddings (JSON strings holding an array)
+  into plain JSONB arrays and fixes embedding_dimension.
+- Copies each embedding into the vector column matching its dimension.
+
+3072d embeddings use halfvec: HNSW on `vector` is limited to 2000 dims.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "036_native_vector_columns"
+down_revision: str | None = "035_merchant_id_conversation_turns"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# (dimension, column, pgvector type, operator class)
+VECTOR_COLUMNS = [
+    (768, "embedding_768", "vector", "vector_cosine_ops"),
+    (1536, "embedding_1536", "vector", "vector_cosine_ops"),
+    (3072, "embedding_3072", "halfvec", "halfvec_cosine_ops"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+
+    for dimension, column, vector_type, _ in VECTOR_COLUMNS:
+        op.execute(
+            f"ALTER TABLE document_chunks "
+            f"ADD COLUMN IF NOT EXISTS {column} {vector_type}({dimension})"
+        )
+
+    # Unwrap double-encoded rows: JSONB string "[0.1,...]" -> JSONB array [0.1, ...]
+    op.execute(
+        """
+        UPDATE document_chunks
+        SET embedding = (embedding #>> '{}')::jsonb
+        WHERE embedding IS NOT NULL
+          AND jsonb_typeof(embedding) = 'string'
+        """
+    )
+
+    op.execute(
+        """
+        UPDATE document_chunks
+        SET embedding_dimension = jsonb_array_length(embedding)
+        WHERE embedding IS NOT NULL
+          AND jsonb_typeof(embedding) = 'array'
+        """
+    )
+
+    for dimension, column, vector_type, _ in VECTOR_COLUMNS:
+        op.execute(
+            f"""
+            UPDATE document_chunks
+            SET {column} = (embedding::text)::{vector_type}({dimension})
+            WHERE embedding_dimension = {dimension}
+              AND jsonb_typeof(embedding) = 'array'
+            """
+        )
+
+    for _, column, _, opclass in VECTOR_COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_document_chunks_{column}_hnsw "
+            f"ON document_chunks USING hnsw ({column} {opclass}) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    for _, column, _, _ in VECTOR_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_document_chunks_{column}_hnsw")
+        op.execute(f"ALTER TABLE document_chunks DROP COLUMN IF EXISTS {column}")
+
+    # Restore the double-encoded format the previous retrieval code expects
+    op.execute(
+        """
+        UPDATE document_chunks
+        SET embedding = to_jsonb(embedding::text)
+        WHERE embedding IS NOT NULL
+          AND jsonb_typeof(embedding) = 'array'
+        """
+    )
@@ -0,0 +1,46 @@
+"""add content_hash to document_chunks
+
+Revision ID: 037_chunk_content_hash
+Revises: 036_native_vector_columns
+Create Date: 2026-04-10 10:00:00.000000
+
+Adds a sha256 content hash per chunk so re-processing a document only embeds
+chunks whose text changed and reuses stored vectors for the rest.
+Existing rows are backfilled with the same digest computed in SQL.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "037_chunk_content_hash"
+down_revision: str | None = "036_native_vector_columns"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "document_chunks",
+        sa.Column("content_hash", sa.String(64), nullable=True),
+    )
+
+    op.execute(
+        """
+        UPDATE document_chunks
+        SET content_hash = encode(sha256(convert_to(content, 'UTF8')), 'hex')
+        """
+    )
+
+    op.create_index(
+        "ix_document_chunks_document_id_content_hash",
+        "document_chunks",
+        ["document_id", "content_hash"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_chunks_document_id_content_hash", table_name="document_chunks")
+    op.drop_column("document_chunks", "content_hash")
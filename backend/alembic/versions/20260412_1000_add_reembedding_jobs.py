@@ -0,0 +1,73 @@
+"""add reembedding_jobs and staged_chunk_embeddings
+
+Revision ID: 038_reembedding_jobs
+Revises: 037_chunk_content_hash
+Create Date: 2026-04-12 10:00:00.000000
+
+Re-embedding becomes a resumable job:
+- reembedding_jobs tracks the target embedding version, progress and a
+  heartbeat (updated_at) so interrupted jobs can be resumed.
+- staged_chunk_embeddings holds new vectors until the job cuts over; the
+  current embeddings keep serving queries in the meantime.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "038_reembedding_jobs"
+down_revision: str | None = "037_chunk_content_hash"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reembedding_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("merchant_id", sa.Integer(), nullable=False),
+        sa.Column("target_provider", sa.String(length=20), nullable=False),
+        sa.Column("target_model", sa.String(length=100), nullable=False),
+        sa.Column("target_version", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("total_chunks", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("processed_chunks", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("chunks_per_second", sa.Float(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["merchant_id"], ["merchants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_reembedding_jobs_merchant_id", "reembedding_jobs", ["merchant_id"])
+    op.create_index("ix_reembedding_jobs_status", "reembedding_jobs", ["status"])
+
+    op.create_table(
+        "staged_chunk_embeddings",
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("chunk_id", sa.Integer(), nullable=False),
+        sa.Column("document_id", sa.Integer(), nullable=False),
+        sa.Column("embedding", postgresql.JSONB(), nullable=False),
+        sa.ForeignKeyConstraint(["job_id"], ["reembedding_jobs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["chunk_id"], ["document_chunks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("job_id", "chunk_id"),
+    )
+    op.create_index(
+        "ix_staged_chunk_embeddings_job_id_document_id",
+        "staged_chunk_embeddings",
+        ["job_id", "document_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_staged_chunk_embeddings_job_id_document_id", table_name="staged_chunk_embeddings"
+    )
+    op.drop_table("staged_chunk_embeddings")
+    op.drop_index("ix_reembedding_jobs_status", table_name="reembedding_jobs")
+    op.drop_index("ix_reembedding_jobs_merchant_id", table_name="reembedding_jobs")
+    op.drop_table("reembedding_jobs")
@@ -0,0 +1,42 @@
+"""add full-text search column to document_chunks
+
+Revision ID: 039_chunk_content_tsv
+Revises: 038_reembedding_jobs
+Create Date: 2026-04-14 10:00:00.000000
+
+Adds content_tsv, a stored generated tsvector over document_chunks.content,
+with a GIN index. Hybrid retrieval fuses its ts_rank_cd ranking with vector
+similarity so exact terms (product names, SKUs, policy terms, locations)
+are found even when their embeddings score low.
+
+The 'english' configuration stems words and drops stopwords, so natural
+language questions match on their content words.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "039_chunk_content_tsv"
+down_revision: str | None = "038_reembedding_jobs"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        ALTER TABLE document_chunks
+        ADD COLUMN IF NOT EXISTS content_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', content)) STORED
+        """
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_document_chunks_content_tsv "
+        "ON document_chunks USING gin (content_tsv)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_document_chunks_content_tsv")
+    op.execute("ALTER TABLE document_chunks DROP COLUMN IF EXISTS content_tsv")
@@ -0,0 +1,100 @@
+"""add local product catalog replica
+
+Revision ID: 040_catalog_products
+Revises: 039_chunk_content_tsv
+Create Date: 2026-04-16 10:00:00.000000
+
+catalog_products and catalog_variants hold each merchant's Shopify catalog,
+bootstrapped by a paginated Admin API sync and updated by product and
+inventory webhooks. shopify_integrations.catalog_synced_at records the last
+completed full sync.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "040_catalog_products"
+down_revision: str | None = "039_chunk_content_tsv"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_products",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("merchant_id", sa.Integer(), nullable=False),
+        sa.Column("product_id", sa.String(length=50), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("product_type", sa.String(length=255), nullable=True),
+        sa.Column("vendor", sa.String(length=255), nullable=True),
+        sa.Column("tags", postgresql.JSONB(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("image_url", sa.Text(), nullable=True),
+        sa.Column("price", sa.Numeric(12, 2), nullable=True),
+        sa.Column("deleted", sa.Boolean(), nullable=False, server_default="false"),
+        sa.Column("shopify_updated_at", sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column("synced_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["merchant_id"], ["merchants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "merchant_id", "product_id", name="uq_catalog_products_merchant_product"
+        ),
+    )
+    op.create_index(
+        "ix_catalog_products_merchant_id_synced_at",
+        "catalog_products",
+        ["merchant_id", "synced_at"],
+    )
+
+    op.create_table(
+        "catalog_variants",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("catalog_product_id", sa.Integer(), nullable=False),
+        sa.Column("merchant_id", sa.Integer(), nullable=False),
+        sa.Column("variant_id", sa.String(length=50), nullable=False),
+        sa.Column("inventory_item_id", sa.String(length=50), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("price", sa.Numeric(12, 2), nullable=True),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("selected_options", postgresql.JSONB(), nullable=False),
+        sa.Column("inventory_quantity", sa.Integer(), nullable=True),
+        sa.Column("inventory_levels", postgresql.JSONB(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["catalog_product_id"], ["catalog_products.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["merchant_id"], ["merchants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "merchant_id", "variant_id", name="uq_catalog_variants_merchant_variant"
+        ),
+    )
+    op.create_index(
+        "ix_catalog_variants_catalog_product_id", "catalog_variants", ["catalog_product_id"]
+    )
+    op.create_index(
+        "ix_catalog_variants_merchant_id_inventory_item_id",
+        "catalog_variants",
+        ["merchant_id", "inventory_item_id"],
+    )
+
+    op.add_column(
+        "shopify_integrations",
+        sa.Column("catalog_synced_at", sa.TIMESTAMP(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("shopify_integrations", "catalog_synced_at")
+    op.drop_index(
+        "ix_catalog_variants_merchant_id_inventory_item_id", table_name="catalog_variants"
+    )
+    op.drop_index("ix_catalog_variants_catalog_product_id", table_name="catalog_variants")
+    op.drop_table("catalog_variants")
+    op.drop_index("ix_catalog_products_merchant_id_synced_at", table_name="catalog_products")
+    op.drop_table("catalog_products")
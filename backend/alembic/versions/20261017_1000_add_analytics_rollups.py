@@ -0,0 +1,104 @@
+"""add analytics rollup tables
+
+Revision ID: 041_analytics_rollups
+Revises: 040_catalog_products
+Create Date: 2026-10-17 10:00:00.000000
+
+analytics_daily_rollups, analytics_hourly_rollups and faq_daily_rollups hold
+per-merchant aggregates maintained by the analytics rollup job, so dashboard
+widgets no longer scan raw conversations, messages and logs per request.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "041_analytics_rollups"
+down_revision: str | None = "040_catalog_products"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_DAILY_COUNTERS = (
+    "conversations_started",
+    "handoffs_triggered",
+    "customer_messages",
+    "bot_messages",
+    "sentiment_positive",
+    "sentiment_negative",
+    "sentiment_neutral",
+    "feedback_positive",
+    "feedback_negative",
+    "rag_queries",
+    "rag_matched",
+    "faq_clicks",
+    "faq_followups",
+    "llm_requests",
+    "llm_tokens",
+    "response_time_count",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_daily_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("merchant_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        *(
+            sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+            for name in _DAILY_COUNTERS
+        ),
+        sa.Column("llm_cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("response_time_sum_ms", sa.Float(), nullable=False, server_default="0"),
+        sa.Column(
+            "response_time_histogram",
+            postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+        sa.Column("computed_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["merchant_id"], ["merchants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("merchant_id", "day", name="uq_analytics_daily_rollups_merchant_day"),
+    )
+
+    op.create_table(
+        "analytics_hourly_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("merchant_id", sa.Integer(), nullable=False),
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("conversations_started", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("customer_messages", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["merchant_id"], ["merchants.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "merchant_id", "hour", name="uq_analytics_hourly_rollups_merchant_hour"
+        ),
+    )
+
+    op.create_table(
+        "faq_daily_rollups",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("merchant_id", sa.Integer(), nullable=False),
+        sa.Column("faq_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("clicks", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("followups", sa.Integer(), nullable=False, server_default="0"),
+        sa.ForeignKeyConstraint(["merchant_id"], ["merchants.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["faq_id"], ["faqs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("faq_id", "day", name="uq_faq_daily_rollups_faq_day"),
+    )
+    op.create_index(
+        "ix_faq_daily_rollups_merchant_day", "faq_daily_rollups", ["merchant_id", "day"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_faq_daily_rollups_merchant_day", table_name="faq_daily_rollups")
+    op.drop_table("faq_daily_rollups")
+    op.drop_table("analytics_hourly_rollups")
+    op.drop_table("analytics_daily_rollups")
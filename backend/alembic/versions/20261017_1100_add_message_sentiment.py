@@ -0,0 +1,39 @@
+"""add stored sentiment to messages
+
+Revision ID: 042_message_sentiment
+Revises: 041_analytics_rollups
+Create Date: 2026-10-17 11:00:00.000000
+
+messages.sentiment / sentiment_score are computed once when a customer
+message is written (existing rows are filled by the sentiment backfill job),
+so the sentiment trend is a GROUP BY instead of decrypting and analyzing
+every message per dashboard load. The partial index covers the trend query.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "042_message_sentiment"
+down_revision: str | None = "041_analytics_rollups"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("messages", sa.Column("sentiment", sa.String(length=10), nullable=True))
+    op.add_column("messages", sa.Column("sentiment_score", sa.Float(), nullable=True))
+    op.create_index(
+        "ix_messages_customer_sentiment",
+        "messages",
+        ["conversation_id", "created_at", "sentiment"],
+        postgresql_where=sa.text("sender = 'customer'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_customer_sentiment", table_name="messages")
+    op.drop_column("messages", "sentiment_score")
+    op.drop_column("messages", "sentiment")
@@ -0,0 +1,31 @@
+"""index document_chunks.content_hash
+
+Revision ID: 043_chunk_content_hash_index
+Revises: 042_message_sentiment
+Create Date: 2026-10-17 12:00:00.000000
+
+Document processing reuses stored embeddings of any of the merchant's chunks
+with the same content hash, not only the document's own previous chunks, so
+the lookup needs an index that doesn't lead with document_id.
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "043_chunk_content_hash_index"
+down_revision: str | None = "042_message_sentiment"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_document_chunks_content_hash",
+        "document_chunks",
+        ["content_hash"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_chunks_content_hash", table_name="document_chunks")
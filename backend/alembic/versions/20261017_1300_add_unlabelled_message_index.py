@@ -0,0 +1,35 @@
+"""index customer messages without stored sentiment
+
+Revision ID: 044_unlabelled_message_index
+Revises: 043_chunk_content_hash_index
+Create Date: 2026-10-17 13:00:00.000000
+
+The sentiment backfill pages through customer messages whose sentiment is
+still NULL in id order. A partial index on id over exactly those rows keeps
+each batch an index range scan, and shrinks to nothing once the backfill is
+done.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "044_unlabelled_message_index"
+down_revision: str | None = "043_chunk_content_hash_index"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_messages_customer_unlabelled",
+        "messages",
+        ["id"],
+        postgresql_where=sa.text("sender = 'customer' AND sentiment IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_messages_customer_unlabelled", table_name="messages")
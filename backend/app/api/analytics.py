@@ -12,16 +12,23 @@ from typing import Any
 
 import structlog
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from fastapi.responses import PlainTextResponse
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.tracing import get_latency_histograms
 from app.services.analytics.aggregated_analytics_service import AggregatedAnalyticsService
+from app.services.analytics.analytics_result_cache import cached_analytics_result
 from app.services.analytics.conversation_flow_analytics_service import (
     ConversationFlowAnalyticsService,
 )
+from app.services.analytics.dashboard_snapshot_service import (
+    SNAPSHOT_WIDGETS,
+    DashboardSnapshotService,
+)
 from app.services.analytics.widget_analytics_service import WidgetAnalyticsService
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
@@ -172,7 +179,12 @@ async def get_widget_analytics_metrics(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = WidgetAnalyticsService(db)
-    metrics = await service.get_metrics(merchant_id, days)
+    metrics = await cached_analytics_result(
+        merchant_id,
+        "widget",
+        {"days": days},
+        lambda: service.get_metrics(merchant_id, days),
+    )
     return metrics
 
 
@@ -212,7 +224,12 @@ async def get_analytics_summary(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    summary = await service.get_anonymized_summary(merchant_id)
+    summary = await cached_analytics_result(
+        merchant_id,
+        "summary",
+        {},
+        lambda: service.get_anonymized_summary(merchant_id),
+    )
     return summary
 
 
@@ -232,7 +249,12 @@ async def get_knowledge_gaps(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    gaps = await service.get_knowledge_gaps(merchant_id, days, limit)
+    gaps = await cached_analytics_result(
+        merchant_id,
+        "knowledge-gaps",
+        {"days": days, "limit": limit},
+        lambda: service.get_knowledge_gaps(merchant_id, days, limit),
+    )
     return gaps
 
 
@@ -250,7 +272,12 @@ async def get_peak_hours(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    peak_hours_data = await service.get_peak_hours(merchant_id, days)
+    peak_hours_data = await cached_analytics_result(
+        merchant_id,
+        "peak-hours",
+        {"days": days},
+        lambda: service.get_peak_hours(merchant_id, days),
+    )
     return peak_hours_data
 
 
@@ -268,7 +295,12 @@ async def get_bot_quality(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    metrics = await service.get_bot_quality_metrics(merchant_id, days)
+    metrics = await cached_analytics_result(
+        merchant_id,
+        "bot-quality",
+        {"days": days},
+        lambda: service.get_bot_quality_metrics(merchant_id, days),
+    )
     return metrics
 
 
@@ -286,7 +318,12 @@ async def get_conversion_funnel(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    funnel_data = await service.get_conversion_funnel(merchant_id, days)
+    funnel_data = await cached_analytics_result(
+        merchant_id,
+        "conversion-funnel",
+        {"days": days},
+        lambda: service.get_conversion_funnel(merchant_id, days),
+    )
     return funnel_data
 
 
@@ -304,7 +341,12 @@ async def get_benchmarks(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    benchmark_data = await service.get_benchmark_comparison(merchant_id, days)
+    benchmark_data = await cached_analytics_result(
+        merchant_id,
+        "benchmarks",
+        {"days": days},
+        lambda: service.get_benchmark_comparison(merchant_id, days),
+    )
     return benchmark_data
 
 
@@ -322,7 +364,12 @@ async def get_sentiment_trend(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    sentiment_data = await service.get_sentiment_trend(merchant_id, days)
+    sentiment_data = await cached_analytics_result(
+        merchant_id,
+        "sentiment-trend",
+        {"days": days},
+        lambda: service.get_sentiment_trend(merchant_id, days),
+    )
     return sentiment_data
 
 
@@ -346,7 +393,12 @@ async def get_knowledge_effectiveness(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    effectiveness_data = await service.get_knowledge_effectiveness(merchant_id, days)
+    effectiveness_data = await cached_analytics_result(
+        merchant_id,
+        "knowledge-effectiveness",
+        {"days": days},
+        lambda: service.get_knowledge_effectiveness(merchant_id, days),
+    )
     return {"data": effectiveness_data}
 
 
@@ -366,7 +418,12 @@ async def get_top_topics(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    topics_data = await service.get_top_topics(merchant_id, days)
+    topics_data = await cached_analytics_result(
+        merchant_id,
+        "top-topics",
+        {"days": days},
+        lambda: service.get_top_topics(merchant_id, days),
+    )
 
     import hashlib
 
@@ -400,7 +457,12 @@ async def get_top_products(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    products = await service.get_top_products(merchant_id, days, limit)
+    products = await cached_analytics_result(
+        merchant_id,
+        "top-products",
+        {"days": days, "limit": limit},
+        lambda: service.get_top_products(merchant_id, days, limit),
+    )
     return {"items": products, "merchantId": merchant_id, "days": days}
 
 
@@ -418,7 +480,12 @@ async def get_pending_orders(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    orders = await service.get_pending_orders(merchant_id, limit, offset)
+    orders = await cached_analytics_result(
+        merchant_id,
+        "pending-orders",
+        {"limit": limit, "offset": offset},
+        lambda: service.get_pending_orders(merchant_id, limit, offset),
+    )
     return {"items": orders, "merchantId": merchant_id}
 
 
@@ -438,10 +505,67 @@ async def get_response_time_distribution(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_response_time_distribution(merchant_id, days)
+    data = await cached_analytics_result(
+        merchant_id,
+        "response-time-distribution",
+        {"days": days},
+        lambda: service.get_response_time_distribution(merchant_id, days),
+    )
     return {"data": data}
 
 
+@router.get("/snapshot")
+async def get_dashboard_snapshot(
+    request: Request,
+    widgets: list[str] | None = Query(
+        None,
+        description="Widget ids (route paths, repeated or comma-separated); defaults to all",
+    ),
+    days: int = Query(30, ge=1, le=365, description="Number of days to analyze"),
+):
+    """Compute a set of dashboard widgets in one request.
+
+    Streams newline-delimited JSON, one {"widget", "status", "data"} event
+    per widget as it completes; "data" has the same shape as the widget's
+    own route. Widgets reading RAGQueryLog share one scan, and each widget's
+    period is clamped to its route's maximum. Uses its own sessions, since
+    widgets are computed concurrently.
+    """
+    _check_analytics_rate_limit(request)
+    merchant_id = _get_merchant_id_from_request(request)
+    widget_ids = [
+        widget_id.strip()
+        for value in widgets or SNAPSHOT_WIDGETS
+        for widget_id in value.split(",")
+        if widget_id.strip()
+    ]
+
+    service = DashboardSnapshotService()
+    try:
+        service.plan(widget_ids, days)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    async def events():
+        async for event in service.stream(merchant_id, widget_ids, days):
+            yield json.dumps(jsonable_encoder(event)) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.get("/latency-breakdown")
+async def get_latency_breakdown(request: Request):
+    """Get per-stage chat pipeline latency for the merchant.
+
+    Rolling window of recent turns handled by this worker: P50/P95/P99, max
+    and histogram bucket counts for each traced stage (merchant load, FAQ
+    match, RAG retrieval, embedding, handlers, persistence, total).
+    """
+    _check_analytics_rate_limit(request)
+    merchant_id = _get_merchant_id_from_request(request)
+    return {"data": get_latency_histograms().snapshot(merchant_id), "merchantId": merchant_id}
+
+
 @router.get("/faq-usage")
 async def get_faq_usage(
     request: Request,
@@ -461,7 +585,12 @@ async def get_faq_usage(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_faq_usage(merchant_id, days, include_unused)
+    data = await cached_analytics_result(
+        merchant_id,
+        "faq-usage",
+        {"days": days, "include_unused": include_unused},
+        lambda: service.get_faq_usage(merchant_id, days, include_unused),
+    )
 
     data_str = json.dumps(data, default=str)
     etag = hashlib.md5(data_str.encode()).hexdigest()
@@ -492,7 +621,12 @@ async def get_geographic_analytics(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_geographic_analytics(merchant_id)
+    data = await cached_analytics_result(
+        merchant_id,
+        "geographic",
+        {},
+        lambda: service.get_geographic_analytics(merchant_id),
+    )
     return data
 
 
@@ -565,7 +699,12 @@ async def get_answer_quality_score(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.calculate_answer_quality_score(merchant_id, days)
+    data = await cached_analytics_result(
+        merchant_id,
+        "answer-quality",
+        {"days": days},
+        lambda: service.calculate_answer_quality_score(merchant_id, days),
+    )
     return data
 
 
@@ -588,7 +727,12 @@ async def get_top_questions(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_top_questions_with_metrics(merchant_id, days, limit)
+    data = await cached_analytics_result(
+        merchant_id,
+        "top-questions",
+        {"days": days, "limit": limit},
+        lambda: service.get_top_questions_with_metrics(merchant_id, days, limit),
+    )
     return data
 
 
@@ -609,7 +753,12 @@ async def get_customer_feedback(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_customer_feedback_metrics(merchant_id, days)
+    data = await cached_analytics_result(
+        merchant_id,
+        "customer-feedback",
+        {"days": days},
+        lambda: service.get_customer_feedback_metrics(merchant_id, days),
+    )
     return data
 
 
@@ -636,7 +785,12 @@ async def get_document_performance(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_document_usage_stats(merchant_id, days, limit, offset)
+    data = await cached_analytics_result(
+        merchant_id,
+        "document-performance",
+        {"days": days, "limit": limit, "offset": offset},
+        lambda: service.get_document_usage_stats(merchant_id, days, limit, offset),
+    )
     return data
 
 
@@ -658,7 +812,12 @@ async def get_high_impact_improvements(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_high_impact_improvements(merchant_id, days, limit)
+    data = await cached_analytics_result(
+        merchant_id,
+        "high-impact-improvements",
+        {"days": days, "limit": limit},
+        lambda: service.get_high_impact_improvements(merchant_id, days, limit),
+    )
     return data
 
 
@@ -681,7 +840,12 @@ async def get_question_categories(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_question_categories(merchant_id, days)
+    data = await cached_analytics_result(
+        merchant_id,
+        "question-categories",
+        {"days": days},
+        lambda: service.get_question_categories(merchant_id, days),
+    )
     return data
 
 
@@ -705,7 +869,12 @@ async def get_failed_queries(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_failed_queries(merchant_id, days, limit)
+    data = await cached_analytics_result(
+        merchant_id,
+        "failed-queries",
+        {"days": days, "limit": limit},
+        lambda: service.get_failed_queries(merchant_id, days, limit),
+    )
     return data
 
 
@@ -728,7 +897,12 @@ async def get_performance_alerts(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_performance_alerts(merchant_id, days)
+    data = await cached_analytics_result(
+        merchant_id,
+        "performance-alerts",
+        {"days": days},
+        lambda: service.get_performance_alerts(merchant_id, days),
+    )
     return data
 
 
@@ -749,7 +923,12 @@ async def get_quick_actions(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = AggregatedAnalyticsService(db)
-    data = await service.get_quick_actions(merchant_id)
+    data = await cached_analytics_result(
+        merchant_id,
+        "quick-actions",
+        {},
+        lambda: service.get_quick_actions(merchant_id),
+    )
     return data
 
 
@@ -772,7 +951,12 @@ async def get_conversation_flow_overview(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = ConversationFlowAnalyticsService(db)
-    return await service.get_overview(merchant_id, days)
+    return await cached_analytics_result(
+        merchant_id,
+        "conversation-flow/overview",
+        {"days": days},
+        lambda: service.get_overview(merchant_id, days),
+    )
 
 
 @router.get("/conversation-flow/length-distribution")
@@ -790,7 +974,12 @@ async def get_conversation_flow_length_distribution(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = ConversationFlowAnalyticsService(db)
-    return await service.get_conversation_length_distribution(merchant_id, days)
+    return await cached_analytics_result(
+        merchant_id,
+        "conversation-flow/length-distribution",
+        {"days": days},
+        lambda: service.get_conversation_length_distribution(merchant_id, days),
+    )
 
 
 @router.get("/conversation-flow/clarification-patterns")
@@ -807,7 +996,12 @@ async def get_conversation_flow_clarification_patterns(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = ConversationFlowAnalyticsService(db)
-    return await service.get_clarification_patterns(merchant_id, days)
+    return await cached_analytics_result(
+        merchant_id,
+        "conversation-flow/clarification-patterns",
+        {"days": days},
+        lambda: service.get_clarification_patterns(merchant_id, days),
+    )
 
 
 @router.get("/conversation-flow/friction-points")
@@ -824,7 +1018,12 @@ async def get_conversation_flow_friction_points(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = ConversationFlowAnalyticsService(db)
-    return await service.get_friction_points(merchant_id, days)
+    return await cached_analytics_result(
+        merchant_id,
+        "conversation-flow/friction-points",
+        {"days": days},
+        lambda: service.get_friction_points(merchant_id, days),
+    )
 
 
 @router.get("/conversation-flow/sentiment-stages")
@@ -841,7 +1040,12 @@ async def get_conversation_flow_sentiment_stages(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = ConversationFlowAnalyticsService(db)
-    return await service.get_sentiment_distribution_by_stage(merchant_id, days)
+    return await cached_analytics_result(
+        merchant_id,
+        "conversation-flow/sentiment-stages",
+        {"days": days},
+        lambda: service.get_sentiment_distribution_by_stage(merchant_id, days),
+    )
 
 
 @router.get("/conversation-flow/handoff-correlation")
@@ -858,7 +1062,12 @@ async def get_conversation_flow_handoff_correlation(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = ConversationFlowAnalyticsService(db)
-    return await service.get_handoff_correlation(merchant_id, days)
+    return await cached_analytics_result(
+        merchant_id,
+        "conversation-flow/handoff-correlation",
+        {"days": days},
+        lambda: service.get_handoff_correlation(merchant_id, days),
+    )
 
 
 @router.get("/conversation-flow/context-utilization")
@@ -875,4 +1084,9 @@ async def get_conversation_flow_context_utilization(
     _check_analytics_rate_limit(request)
     merchant_id = _get_merchant_id_from_request(request)
     service = ConversationFlowAnalyticsService(db)
-    return await service.get_context_utilization(merchant_id, days)
+    return await cached_analytics_result(
+        merchant_id,
+        "conversation-flow/context-utilization",
+        {"days": days},
+        lambda: service.get_context_utilization(merchant_id, days),
+    )
@@ -17,11 +17,11 @@ import structlog
 from fastapi import APIRouter, Depends, Header, Request, status
 from fastapi.responses import StreamingResponse
 from redis.asyncio import Redis as AsyncRedis
-from redis.asyncio import from_url as async_from_url
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.core.errors import APIError, ErrorCode
+from app.core.redis_pool import get_redis
 from app.services.export.merchant_data_export_service import MerchantDataExportService
 
 router = APIRouter()
@@ -42,9 +42,7 @@ def get_async_redis_client() -> AsyncRedis | None:
         return None
 
     try:
-        redis_url = os.getenv("REDIS_URL")
-        if redis_url:
-            return async_from_url(redis_url, decode_responses=True)
+        return get_redis()
     except Exception as e:
         logger.warning("redis_connection_failed", error=str(e))
     return None
@@ -30,6 +30,12 @@ from app.schemas.faq import (
     FaqResponse,
     FaqUpdateRequest,
 )
+from app.services.faq import invalidate_faq_index
+from app.services.faq_rephrase_cache import (
+    invalidate_faq_rephrases,
+    schedule_faq_rephrase_prewarm,
+)
+from app.services.rag.semantic_answer_cache import invalidate_merchant_answers
 
 logger = structlog.get_logger(__name__)
 
@@ -177,7 +183,17 @@ async def create_faq(
 
         db.add(faq)
         await db.commit()
+        invalidate_faq_index(merchant_id)
+        try:
+            await invalidate_merchant_answers(merchant_id)
+        except Exception as e:
+            logger.warning(
+                "semantic_answers_invalidation_failed",
+                merchant_id=merchant_id,
+                error=str(e),
+            )
         await db.refresh(faq)
+        schedule_faq_rephrase_prewarm(merchant_id, faq.id)
 
         logger.info(
             "faq_created",
@@ -269,6 +285,15 @@ async def reorder_faqs(
             faq.order_index = new_index
 
         await db.commit()
+        invalidate_faq_index(merchant_id)
+        try:
+            await invalidate_merchant_answers(merchant_id)
+        except Exception as e:
+            logger.warning(
+                "semantic_answers_invalidation_failed",
+                merchant_id=merchant_id,
+                error=str(e),
+            )
 
         # Refresh all FAQs to get updated data
         for faq in faqs:
@@ -399,7 +424,18 @@ async def update_faq(
             faq.order_index = new_index
 
         await db.commit()
+        invalidate_faq_index(merchant_id)
+        try:
+            await invalidate_merchant_answers(merchant_id)
+        except Exception as e:
+            logger.warning(
+                "semantic_answers_invalidation_failed",
+                merchant_id=merchant_id,
+                error=str(e),
+            )
         await db.refresh(faq)
+        await invalidate_faq_rephrases(merchant_id, faq_id)
+        schedule_faq_rephrase_prewarm(merchant_id, faq_id)
 
         logger.info(
             "faq_updated",
@@ -490,6 +526,16 @@ async def delete_faq(
         )
 
         await db.commit()
+        invalidate_faq_index(merchant_id)
+        try:
+            await invalidate_merchant_answers(merchant_id)
+        except Exception as e:
+            logger.warning(
+                "semantic_answers_invalidation_failed",
+                merchant_id=merchant_id,
+                error=str(e),
+            )
+        await invalidate_faq_rephrases(merchant_id, faq_id)
 
         logger.info(
             "faq_deleted",
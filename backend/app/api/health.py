@@ -132,3 +132,69 @@ async def scheduler_health(
             "job_count": 0,
             "jobs": [],
         }
+
+
+@router.get("/rag-cache")
+async def rag_cache_health(
+    request: Request,
+    x_internal_request: str | None = Header(None, alias="X-Internal-Request"),
+) -> dict[str, Any]:
+    """Get RAG cache statistics for this worker.
+
+    Reports hit/miss counters for the query embedding cache, the
+    in-process embedding matrix cache, the FAQ rephrase cache and the semantic
+    answer cache, and query micro-batching counters.
+    Protected by internal-only access check.
+
+    Raises:
+        HTTPException: 403 if not internal request
+    """
+    if not _is_internal_request(request, x_internal_request):
+        raise HTTPException(
+            status_code=403,
+            detail={"error": "Forbidden", "message": "Internal endpoint only"},
+        )
+
+    from app.services.analytics.analytics_result_cache import get_analytics_result_cache
+    from app.services.faq_rephrase_cache import get_faq_rephrase_cache
+    from app.services.rag.embedding_matrix_cache import get_embedding_matrix_cache
+    from app.services.rag.query_embedding_batcher import get_query_embedding_batcher
+    from app.services.rag.query_embedding_cache import get_query_embedding_cache
+    from app.services.rag.semantic_answer_cache import get_semantic_answer_cache
+
+    batcher = get_query_embedding_batcher()
+    semantic_cache = get_semantic_answer_cache()
+    analytics_cache = get_analytics_result_cache()
+    return {
+        "query_embeddings": get_query_embedding_cache().stats(),
+        "embedding_matrices": get_embedding_matrix_cache().stats(),
+        "query_batching": batcher.stats() if batcher else None,
+        "faq_rephrases": get_faq_rephrase_cache().stats(),
+        "semantic_answers": semantic_cache.stats() if semantic_cache else None,
+        "analytics_results": analytics_cache.stats() if analytics_cache else None,
+    }
+
+
+@router.get("/redis")
+async def redis_pool_health(
+    request: Request,
+    x_internal_request: str | None = Header(None, alias="X-Internal-Request"),
+) -> dict[str, Any]:
+    """Get shared Redis pool health for this worker.
+
+    Pings Redis through the shared pool and reports ping latency and pool
+    connection counts (max, in use, idle).
+    Protected by internal-only access check.
+
+    Raises:
+        HTTPException: 403 if not internal request
+    """
+    if not _is_internal_request(request, x_internal_request):
+        raise HTTPException(
+            status_code=403,
+            detail={"error": "Forbidden", "message": "Internal endpoint only"},
+        )
+
+    from app.core.redis_pool import redis_health
+
+    return await redis_health()
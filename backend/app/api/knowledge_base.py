@@ -42,7 +42,13 @@ from app.schemas.knowledge_base import (
     DocumentUploadResponse,
     KnowledgeBaseStatsResponse,
 )
-from app.services.knowledge.chunker import ChunkingError, DocumentChunker
+from app.services.knowledge.chunker import ChunkingError, DocumentChunker, content_hash
+from app.services.knowledge.extraction_executor import (
+    get_extraction_executor,
+    iter_document_chunks_off_loop,
+)
+from app.services.rag.embedding_matrix_cache import invalidate_merchant_embeddings
+from app.services.rag.semantic_answer_cache import invalidate_merchant_answers
 
 logger = structlog.get_logger()
 
@@ -203,26 +209,36 @@ async def _process_document_chunks(
     """Process document and create chunks (without embeddings).
 
     Story 8-4: Chunking only - embeddings generated by background task.
-    Status remains 'pending' until embeddings are complete.
+    Status remains 'pending' until embeddings are complete. Text is extracted
+    in the extraction process pool (or a worker thread) and chunked page by
+    page, so large uploads neither block the event loop nor hold the whole
+    text in memory.
     """
     try:
         # Update status to processing (for chunking)
         document.status = DocumentStatus.PROCESSING.value
         await db.commit()
 
-        # Chunk document
-        chunker = DocumentChunker()
-        chunks = chunker.chunk_document(file_path, file_type)
+        # Chunk document page by page, parsing off the event loop
+        chunks = iter_document_chunks_off_loop(
+            DocumentChunker(),
+            file_path,
+            file_type,
+            executor=get_extraction_executor(),
+        )
 
         # Create chunk records (without embeddings)
-        for index, content in enumerate(chunks):
+        index = 0
+        async for content in chunks:
             chunk = DocumentChunk(
                 document_id=document.id,
                 chunk_index=index,
                 content=content,
+                content_hash=content_hash(content),
                 embedding=None,  # Embeddings generated by background task
             )
             db.add(chunk)
+            index += 1
 
         # Reset status to pending - waiting for embedding processing
         # Background task will update to 'ready' when embeddings complete
@@ -557,6 +573,15 @@ async def delete_document(
         # Delete database record (CASCADE deletes chunks)
         await db.delete(doc)
         await db.commit()
+        invalidate_merchant_embeddings(merchant_id)
+        try:
+            await invalidate_merchant_answers(merchant_id)
+        except Exception as e:
+            logger.warning(
+                "semantic_answers_invalidation_failed",
+                merchant_id=merchant_id,
+                error=str(e),
+            )
 
         logger.info(
             "document_deleted",
@@ -607,7 +632,7 @@ async def trigger_reembedding(
     merchant_id = get_request_merchant_id(request)
 
     from app.services.rag.dimension_handler import DimensionHandler
-    from app.services.rag.reembedding_worker import trigger_reembedding_for_merchant
+    from app.services.rag.reembedding_worker import reembed_all_documents
 
     # Mark all documents for re-embedding
     doc_count = await DimensionHandler.mark_documents_for_reembedding(
@@ -618,7 +643,7 @@ async def trigger_reembedding(
     if doc_count > 0:
         # Trigger background task
         background_tasks.add_task(
-            trigger_reembedding_for_merchant,
+            reembed_all_documents,
             merchant_id=merchant_id,
         )
 
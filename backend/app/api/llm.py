@@ -42,6 +42,7 @@ from app.schemas.llm import (
 from app.schemas.messaging import FacebookEntry, FacebookWebhookPayload
 from app.services.llm.base_llm_service import LLMMessage
 from app.services.llm.llm_factory import LLMProviderFactory
+from app.services.llm.provider_registry import get_provider_registry
 from app.services.messaging.message_processor import MessageProcessor
 
 logger = structlog.get_logger(__name__)
@@ -261,6 +262,7 @@ async def configure_llm(
 
     await db.commit()
     await db.refresh(llm_config)
+    get_provider_registry().invalidate(merchant_id)
 
     # Prepare response
     model = ollama_model or cloud_model or "default"
@@ -492,6 +494,7 @@ async def update_llm(
         )
 
     await db.commit()
+    get_provider_registry().invalidate(merchant_id)
 
     return {
         "data": {
@@ -526,6 +529,7 @@ async def clear_llm(
 
     await db.delete(config)
     await db.commit()
+    get_provider_registry().invalidate(merchant_id)
 
     return {
         "data": {
@@ -22,6 +22,7 @@ from app.core.database import get_db
 from app.core.errors import APIError, ErrorCode
 from app.models.merchant import Merchant, OnboardingMode, PersonalityType
 from app.schemas.base import MetaData, MinimalEnvelope
+from app.services.faq_rephrase_cache import invalidate_merchant_rephrases
 
 logger = structlog.get_logger(__name__)
 
@@ -230,6 +231,9 @@ async def update_personality_configuration(
                 ErrorCode.INTERNAL_ERROR, f"Failed to update personality configuration: {str(e)}"
             )
 
+        if update.personality:
+            await invalidate_merchant_rephrases(merchant_id)
+
         logger.info(
             "personality_configuration_updated",
             merchant_id=merchant_id,
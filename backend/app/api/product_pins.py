@@ -28,6 +28,7 @@ from app.schemas.product_pins import (
     ProductPinResponse,
     ReorderPinsRequest,
 )
+from app.services.shopify.product_catalog import get_product_catalog
 
 logger = structlog.get_logger(__name__)
 
@@ -180,6 +181,7 @@ async def pin_product(
 
     # Commit the transaction
     await db.commit()
+    get_product_catalog().invalidate_pins(merchant_id)
 
     return ProductPinDetailEnvelope(
         data=ProductPinResponse(
@@ -241,6 +243,7 @@ async def unpin_product_endpoint(
 
     # Commit the transaction
     await db.commit()
+    get_product_catalog().invalidate_pins(merchant_id)
 
     return ProductPinDetailEnvelope(
         data=ProductPinResponse(
@@ -330,6 +333,7 @@ async def reorder_pinned_products(
     # Save all changes
     db.add_all(list(pin_map.values()))
     await db.commit()
+    get_product_catalog().invalidate_pins(merchant_id)
 
     logger.info(
         "pinned_products_reordered",
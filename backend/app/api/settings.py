@@ -264,11 +264,6 @@ async def update_embedding_provider(
 
     needs_reembedding = old_dimension != new_dimension
 
-    merchant.embedding_provider = new_provider
-    merchant.embedding_model = new_model
-    merchant.embedding_dimension = new_dimension
-    await db.commit()
-
     doc_count = 0
     if needs_reembedding:
         doc_count = await DimensionHandler.mark_documents_for_reembedding(
@@ -276,12 +271,22 @@ async def update_embedding_provider(
             merchant_id=merchant_id,
         )
 
+    if doc_count > 0:
+        # Existing embeddings keep serving; the re-embedding job switches the
+        # merchant to the new provider once every document is re-embedded
         from app.services.rag.reembedding_worker import reembed_all_documents
 
         background_tasks.add_task(
             reembed_all_documents,
             merchant_id=merchant_id,
+            provider=new_provider,
+            model=new_model,
         )
+    else:
+        merchant.embedding_provider = new_provider
+        merchant.embedding_model = new_model
+        merchant.embedding_dimension = new_dimension
+        await db.commit()
 
     return EmbeddingProviderSettingsEnvelope(
         data=EmbeddingProviderSettingsData(
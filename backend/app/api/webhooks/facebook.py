@@ -16,7 +16,6 @@ import hmac
 import json
 
 import httpx
-import redis.asyncio as redis
 import structlog
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 from fastapi.responses import JSONResponse
@@ -24,6 +23,7 @@ from sqlalchemy import select
 
 from app.core.config import settings
 from app.core.database import async_session
+from app.core.redis_pool import get_redis
 from app.models.facebook_integration import FacebookIntegration
 from app.schemas.messaging import FacebookWebhookPayload, MessengerResponse
 from app.services.cart import CartService
@@ -294,9 +294,7 @@ async def handle_consent_postback(
     consent_granted = consent_choice == "YES"
 
     try:
-        config = settings()
-        redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-        redis_client = redis.from_url(redis_url, decode_responses=True)
+        redis_client = get_redis()
 
         consent_service = ConsentService(redis_client=redis_client)
         await consent_service.record_consent(psid, consent_granted=consent_granted)
@@ -336,19 +334,16 @@ async def handle_consent_postback(
                     item_count=cart.item_count,
                 )
 
-                await redis_client.close()
                 return MessengerResponse(
                     text=f"Great! I've added {pending['title']} (${pending['price']}) to your cart. Your cart will be saved for 24 hours.",
                     recipient_id=psid,
                 )
             else:
-                await redis_client.close()
                 return MessengerResponse(
                     text="Your cart session expired. Please search for the product again and add it.",
                     recipient_id=psid,
                 )
         else:
-            await redis_client.close()
             return MessengerResponse(
                 text="No problem! Let me know if you'd like to search for something else.",
                 recipient_id=psid,
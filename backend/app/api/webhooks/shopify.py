@@ -8,7 +8,6 @@ products/update, disputes/create.
 from __future__ import annotations
 
 import json
-import os
 from datetime import UTC
 from uuid import uuid4
 
@@ -695,14 +694,13 @@ async def enqueue_failed_shopify_webhook(
     try:
         from datetime import datetime
 
-        import redis
+        from app.core.redis_pool import get_redis
 
-        redis_url = os.getenv("REDIS_URL")
-        if not redis_url:
+        redis_client = get_redis()
+        if redis_client is None:
             log.warning("shopify_webhook_dlq_no_redis")
             return
 
-        redis_client = redis.from_url(redis_url, decode_responses=True)
         retry_data = {
             "webhook_data": webhook_data,
             "topic": topic,
@@ -711,7 +709,7 @@ async def enqueue_failed_shopify_webhook(
             "max_attempts": 3,
             "timestamp": datetime.utcnow().isoformat(),
         }
-        redis_client.rpush("webhook:dlq:shopify", json.dumps(retry_data))
+        await redis_client.rpush("webhook:dlq:shopify", json.dumps(retry_data))
         log.info("shopify_webhook_enqueued_dlq", topic=topic)
 
     except Exception as e:
@@ -883,11 +881,10 @@ async def _fetch_cogs_async(
         try:
             from datetime import datetime
 
-            import redis
+            from app.core.redis_pool import get_redis
 
-            redis_url = os.getenv("REDIS_URL")
-            if redis_url:
-                redis_client = redis.from_url(redis_url, decode_responses=True)
+            redis_client = get_redis()
+            if redis_client is not None:
                 retry_data = {
                     "order_id": order_id,
                     "variant_ids": variant_ids,
@@ -897,7 +894,7 @@ async def _fetch_cogs_async(
                     "max_attempts": 3,
                     "timestamp": datetime.utcnow().isoformat(),
                 }
-                redis_client.rpush("cogs:dlq", json.dumps(retry_data))
+                await redis_client.rpush("cogs:dlq", json.dumps(retry_data))
                 log.info("cogs_fetch_enqueued_dlq", order_id=order_id)
         except Exception as dlq_error:
             log.error("cogs_dlq_enqueue_failed", error=str(dlq_error))
@@ -1057,73 +1054,52 @@ async def _send_cancellation_notification(
 async def handle_product_created(payload: dict, shop_domain: str, log) -> None:
     """Handle products/create webhook.
 
-    Story 4-13: Invalidate product cache for new product.
+    Story 4-13: Add the new product to the merchant's local catalog.
 
     Args:
         payload: Product payload
         shop_domain: Shopify shop domain
         log: Structlog logger
     """
-    from app.models.shopify_integration import ShopifyIntegration
-    from app.services.shopify.product_service import invalidate_product_cache
-
-    product_id = payload.get("id")
-    product_title = payload.get("title")
-
     log.info(
         "shopify_product_created",
-        product_id=product_id,
-        product_title=product_title,
+        product_id=payload.get("id"),
+        product_title=payload.get("title"),
     )
-
-    try:
-        async with async_session()() as db:
-            result = await db.execute(
-                select(ShopifyIntegration.merchant_id).where(
-                    ShopifyIntegration.shop_domain == shop_domain
-                )
-            )
-            integration = result.scalar_one_or_none()
-
-            if integration:
-                merchant_id = integration
-                await invalidate_product_cache(merchant_id=str(merchant_id))
-
-                log.info(
-                    "shopify_product_created_cache_invalidated",
-                    product_id=product_id,
-                    merchant_id=merchant_id,
-                )
-
-    except Exception as e:
-        log.error(
-            "shopify_product_created_failed",
-            product_id=product_id,
-            error=str(e),
-        )
+    await _upsert_catalog_product(payload, shop_domain, log, "shopify_product_created")
 
 
 async def handle_product_updated(payload: dict, shop_domain: str, log) -> None:
     """Handle products/update webhook.
 
-    Story 4-13: Invalidate product cache for updated product.
+    Story 4-13: Update the product in the merchant's local catalog.
 
     Args:
         payload: Product payload
         shop_domain: Shopify shop domain
         log: Structlog logger
     """
-    from app.models.shopify_integration import ShopifyIntegration
-    from app.services.shopify.product_service import invalidate_product_cache
-
-    product_id = payload.get("id")
-    product_title = payload.get("title")
-
     log.info(
         "shopify_product_updated",
-        product_id=product_id,
-        product_title=product_title,
+        product_id=payload.get("id"),
+        product_title=payload.get("title"),
     )
+    await _upsert_catalog_product(payload, shop_domain, log, "shopify_product_updated")
+
+
+async def _upsert_catalog_product(payload: dict, shop_domain: str, log, event: str) -> None:
+    """Write a products/create or products/update payload to the local catalog.
+
+    Args:
+        payload: Product payload (Shopify REST product)
+        shop_domain: Shopify shop domain
+        log: Structlog logger
+        event: Log event prefix
+    """
+    from app.models.shopify_integration import ShopifyIntegration
+    from app.services.shopify.product_catalog import get_product_catalog
+
+    product_id = payload.get("id")
 
     try:
         async with async_session()() as db:
@@ -1132,21 +1108,21 @@ async def handle_product_updated(payload: dict, shop_domain: str, log) -> None:
                     ShopifyIntegration.shop_domain == shop_domain
                 )
             )
-            integration = result.scalar_one_or_none()
+            merchant_id = result.scalar_one_or_none()
 
-            if integration:
-                merchant_id = integration
-                await invalidate_product_cache(merchant_id=str(merchant_id))
+            if merchant_id:
+                written = await get_product_catalog().upsert_products(db, merchant_id, [payload])
 
                 log.info(
-                    "shopify_product_updated_cache_invalidated",
+                    f"{event}_catalog_updated",
                     product_id=product_id,
                     merchant_id=merchant_id,
+                    skipped_stale=written == 0,
                 )
 
     except Exception as e:
         log.error(
-            "shopify_product_updated_failed",
+            f"{event}_failed",
             product_id=product_id,
             error=str(e),
         )
@@ -1155,7 +1131,7 @@ async def handle_product_updated(payload: dict, shop_domain: str, log) -> None:
 async def handle_product_deleted(payload: dict, shop_domain: str, log) -> None:
     """Handle products/delete webhook.
 
-    Story 4-13: Invalidate product cache for deleted product.
+    Story 4-13: Remove the product from the merchant's local catalog.
 
     Args:
         payload: Product payload
@@ -1163,7 +1139,7 @@ async def handle_product_deleted(payload: dict, shop_domain: str, log) -> None:
         log: Structlog logger
     """
     from app.models.shopify_integration import ShopifyIntegration
-    from app.services.shopify.product_service import invalidate_product_cache
+    from app.services.shopify.product_catalog import get_product_catalog
 
     product_id = payload.get("id")
 
@@ -1179,16 +1155,18 @@ async def handle_product_deleted(payload: dict, shop_domain: str, log) -> None:
                     ShopifyIntegration.shop_domain == shop_domain
                 )
             )
-            integration = result.scalar_one_or_none()
+            merchant_id = result.scalar_one_or_none()
 
-            if integration:
-                merchant_id = integration
-                await invalidate_product_cache(merchant_id=str(merchant_id))
+            if merchant_id and product_id is not None:
+                removed = await get_product_catalog().delete_product(
+                    db, merchant_id, str(product_id)
+                )
 
                 log.info(
-                    "shopify_product_deleted_cache_invalidated",
+                    "shopify_product_deleted_catalog_updated",
                     product_id=product_id,
                     merchant_id=merchant_id,
+                    removed=removed,
                 )
 
     except Exception as e:
@@ -1202,7 +1180,7 @@ async def handle_product_deleted(payload: dict, shop_domain: str, log) -> None:
 async def handle_inventory_level_updated(payload: dict, shop_domain: str, log) -> None:
     """Handle inventory_levels/update webhook.
 
-    Story 4-13: Update stock levels, invalidate COGS cache, trigger low-stock alerts.
+    Story 4-13: Update catalog stock levels, invalidate COGS cache, trigger low-stock alerts.
 
     Args:
         payload: Inventory level payload
@@ -1240,6 +1218,27 @@ async def handle_inventory_level_updated(payload: dict, shop_domain: str, log) -
 
             merchant_id = integration
 
+            try:
+                from app.services.shopify.product_catalog import get_product_catalog
+
+                matched = await get_product_catalog().apply_inventory_level(
+                    db,
+                    merchant_id,
+                    inventory_item_id=str(inventory_item_id),
+                    location_id=str(location_id) if location_id is not None else None,
+                    available=payload.get("available"),
+                )
+                log.info(
+                    "shopify_inventory_catalog_updated",
+                    inventory_item_id=inventory_item_id,
+                    matched=matched,
+                )
+            except Exception as catalog_error:
+                log.warning(
+                    "shopify_inventory_catalog_update_failed",
+                    error=str(catalog_error),
+                )
+
             try:
                 from app.services.shopify.cogs_cache import COGSCache
 
@@ -74,7 +74,7 @@ class TestHandleConsentPostback:
                 "app.api.webhooks.facebook.settings",
                 return_value={"REDIS_URL": "redis://localhost"},
             ),
-            patch("app.api.webhooks.facebook.redis.from_url", return_value=mock_redis),
+            patch("app.api.webhooks.facebook.get_redis", return_value=mock_redis),
             patch("app.api.webhooks.facebook.ConsentService") as mock_consent_class,
         ):
             mock_consent = AsyncMock()
@@ -99,7 +99,7 @@ class TestHandleConsentPostback:
                 "app.api.webhooks.facebook.settings",
                 return_value={"REDIS_URL": "redis://localhost"},
             ),
-            patch("app.api.webhooks.facebook.redis.from_url", return_value=mock_redis),
+            patch("app.api.webhooks.facebook.get_redis", return_value=mock_redis),
             patch("app.api.webhooks.facebook.ConsentService") as mock_consent_class,
         ):
             mock_consent = AsyncMock()
@@ -140,7 +140,7 @@ class TestHandleConsentPostback:
                 "app.api.webhooks.facebook.settings",
                 return_value={"REDIS_URL": "redis://localhost"},
             ),
-            patch("app.api.webhooks.facebook.redis.from_url", return_value=mock_redis),
+            patch("app.api.webhooks.facebook.get_redis", return_value=mock_redis),
             patch("app.api.webhooks.facebook.ConsentService") as mock_consent_class,
             patch("app.api.webhooks.facebook.CartService") as mock_cart_class,
         ):
@@ -175,7 +175,7 @@ class TestHandleConsentPostback:
                 "app.api.webhooks.facebook.settings",
                 return_value={"REDIS_URL": "redis://localhost"},
             ),
-            patch("app.api.webhooks.facebook.redis.from_url", return_value=mock_redis),
+            patch("app.api.webhooks.facebook.get_redis", return_value=mock_redis),
             patch("app.api.webhooks.facebook.ConsentService") as mock_consent_class,
         ):
             mock_consent = AsyncMock()
@@ -201,7 +201,7 @@ class TestHandleConsentPostback:
                 "app.api.webhooks.facebook.settings",
                 return_value={"REDIS_URL": "redis://localhost"},
             ),
-            patch("app.api.webhooks.facebook.redis.from_url", return_value=mock_redis),
+            patch("app.api.webhooks.facebook.get_redis", return_value=mock_redis),
             patch("app.api.webhooks.facebook.ConsentService") as mock_consent_class,
         ):
             mock_consent = AsyncMock()
@@ -233,8 +233,8 @@ class TestHandleConsentPostback:
     @pytest.mark.asyncio
     @pytest.mark.p2
     @pytest.mark.test_id("5.11-CONSENT-009")
-    async def test_consent_closes_redis_connection(self, psid: str) -> None:
-        """Test that Redis connection is closed after handling."""
+    async def test_consent_leaves_shared_redis_open(self, psid: str) -> None:
+        """Test that the shared Redis client is not closed after handling."""
         from app.api.webhooks.facebook import handle_consent_postback
 
         mock_redis = AsyncMock()
@@ -246,7 +246,7 @@ class TestHandleConsentPostback:
                 "app.api.webhooks.facebook.settings",
                 return_value={"REDIS_URL": "redis://localhost"},
             ),
-            patch("app.api.webhooks.facebook.redis.from_url", return_value=mock_redis),
+            patch("app.api.webhooks.facebook.get_redis", return_value=mock_redis),
             patch("app.api.webhooks.facebook.ConsentService") as mock_consent_class,
         ):
             mock_consent = AsyncMock()
@@ -254,7 +254,7 @@ class TestHandleConsentPostback:
 
             await handle_consent_postback(psid, "CONSENT:NO:prod_123:var_456")
 
-            mock_redis.close.assert_called_once()
+            mock_redis.close.assert_not_called()
 
     @pytest.mark.asyncio
     @pytest.mark.p2
@@ -272,7 +272,7 @@ class TestHandleConsentPostback:
                 "app.api.webhooks.facebook.settings",
                 return_value={"REDIS_URL": "redis://localhost"},
             ),
-            patch("app.api.webhooks.facebook.redis.from_url", return_value=mock_redis),
+            patch("app.api.webhooks.facebook.get_redis", return_value=mock_redis),
             patch("app.api.webhooks.facebook.ConsentService") as mock_consent_class,
         ):
             mock_consent = AsyncMock()
@@ -19,12 +19,17 @@ from apscheduler.triggers.interval import IntervalTrigger
 
 from app.background_jobs.gdpr_compliance_check import add_gdpr_job_to_scheduler
 from app.background_jobs.gdpr_email_sender import add_email_job_to_scheduler
+from app.background_jobs.message_sentiment_backfill import run_scheduled_sentiment_backfill
+from app.core.config import settings
 from app.core.database import async_session
+from app.services.analytics.analytics_rollup_service import refresh_all_rollups
 from app.services.cart.cart_retention import run_cart_retention_cleanup
 from app.services.data_retention import (
     DataRetentionService,
 )  # DEPRECATED: Story 6-5 - Use RetentionPolicy instead
 from app.services.privacy.retention_service import RetentionPolicy
+from app.services.rag.reembedding_worker import resume_stalled_reembedding_jobs
+from app.services.shopify.product_catalog import sync_all_product_catalogs
 from app.tasks.handoff_followup_task import process_handoff_followups
 from app.tasks.handoff_resolution_task import process_handoff_resolutions
 from app.tasks.queued_notification_task import process_queued_notifications
@@ -34,6 +39,8 @@ logger = structlog.get_logger(__name__)
 # Global scheduler instance
 scheduler: AsyncIOScheduler | None = None
 
+SENTIMENT_BACKFILL_JOB_ID = "message_sentiment_backfill_task"
+
 # Retention service instance (DEPRECATED: Story 6-5 - Retained for session cleanup)
 retention_service = DataRetentionService()
 
@@ -143,6 +150,13 @@ async def run_retention_cleanup() -> dict:
     return results
 
 
+async def _run_sentiment_backfill() -> None:
+    """Run a sentiment backfill slice, unscheduling the job once it is done."""
+    if await run_scheduled_sentiment_backfill() and scheduler is not None:
+        scheduler.remove_job(SENTIMENT_BACKFILL_JOB_ID)
+        logger.info("message_sentiment_backfill_complete", job_id=SENTIMENT_BACKFILL_JOB_ID)
+
+
 async def _run_handoff_followup() -> dict:
     """Run handoff follow-up task wrapper.
 
@@ -231,6 +245,47 @@ def start_scheduler() -> None:
         replace_existing=True,
     )
 
+    # Resume re-embedding jobs left running by a worker that stopped
+    scheduler.add_job(
+        resume_stalled_reembedding_jobs,
+        trigger=IntervalTrigger(minutes=2),
+        id="reembedding_resume_task",
+        name="Resume Stalled Re-embedding Jobs",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+    # Reconcile local product catalogs with Shopify (catches missed webhooks)
+    scheduler.add_job(
+        sync_all_product_catalogs,
+        trigger=CronTrigger(hour=3, minute=0, timezone="UTC"),
+        id="product_catalog_sync_task",
+        name="Daily Product Catalog Sync",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+    # Compact raw analytics into per-merchant dashboard rollups
+    scheduler.add_job(
+        refresh_all_rollups,
+        trigger=IntervalTrigger(minutes=settings().get("ANALYTICS_ROLLUP_INTERVAL_MINUTES", 15)),
+        id="analytics_rollup_task",
+        name="Refresh Analytics Rollups",
+        replace_existing=True,
+        max_instances=1,
+    )
+
+    # Label customer messages written before sentiment was stored at write time
+    # (removed by the first run with nothing left to label)
+    scheduler.add_job(
+        _run_sentiment_backfill,
+        trigger=IntervalTrigger(minutes=10),
+        id=SENTIMENT_BACKFILL_JOB_ID,
+        name="Backfill Message Sentiment",
+        replace_existing=True,
+        max_instances=1,
+    )
+
     # Story 6-6: Schedule GDPR compliance check daily at 9 AM UTC
     add_gdpr_job_to_scheduler(scheduler)
 
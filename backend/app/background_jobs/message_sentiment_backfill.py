@@ -0,0 +1,92 @@
+"""Backfill stored sentiment on historical customer messages.
+
+New customer messages get their sentiment label and score at write time.
+Rows written before that (sentiment IS NULL) are labelled here in
+id-ordered batches, each committed on its own, so the job can stop and
+resume at any point. Batches read the ix_messages_customer_unlabelled
+partial index, which only holds the rows still to label. Scheduled from
+data_retention.start_scheduler and unscheduled by the first run that finds
+nothing left; a full run can also be started directly:
+
+    python -m app.background_jobs.message_sentiment_backfill
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import structlog
+from sqlalchemy import select, update
+
+from app.core.database import async_session
+from app.core.encryption import decrypt_conversation_content
+from app.models.message import Message
+from app.services.analytics.sentiment_analyzer import message_sentiment
+
+logger = structlog.get_logger(__name__)
+
+BATCH_SIZE = 500
+SCHEDULED_MAX_BATCHES = 20
+
+
+async def backfill_message_sentiment(
+    batch_size: int = BATCH_SIZE,
+    max_batches: int | None = None,
+) -> int:
+    """Label unlabelled customer messages with their sentiment.
+
+    Args:
+        batch_size: Messages decrypted, analyzed and updated per transaction
+        max_batches: Stop after this many batches (None runs to completion)
+
+    Returns:
+        Number of messages labelled
+    """
+    labelled = 0
+    batches = 0
+    last_id = 0
+    while max_batches is None or batches < max_batches:
+        async with async_session()() as db:
+            result = await db.execute(
+                select(Message.id, Message.content)
+                .where(Message.sender == "customer")
+                .where(Message.sentiment.is_(None))
+                .where(Message.id > last_id)
+                .order_by(Message.id)
+                .limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+
+            updates = []
+            for row in rows:
+                sentiment, score = message_sentiment(decrypt_conversation_content(row.content))
+                updates.append({"id": row.id, "sentiment": sentiment, "sentiment_score": score})
+            await db.execute(update(Message), updates)
+            await db.commit()
+
+        last_id = rows[-1].id
+        labelled += len(rows)
+        batches += 1
+
+    if labelled:
+        logger.info("message_sentiment_backfilled", labelled=labelled, batches=batches)
+    return labelled
+
+
+async def run_scheduled_sentiment_backfill() -> bool:
+    """Scheduled entry point: label up to SCHEDULED_MAX_BATCHES batches per run.
+
+    Returns:
+        True once there was nothing left to label (the job can be unscheduled)
+    """
+    try:
+        return await backfill_message_sentiment(max_batches=SCHEDULED_MAX_BATCHES) == 0
+    except Exception as e:
+        logger.error("message_sentiment_backfill_failed", error=str(e))
+        return False
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_message_sentiment())
@@ -65,6 +65,9 @@ def settings() -> dict[str, Any]:
         "DATABASE_ECHO": os.getenv("DATABASE_ECHO", "false").lower() == "true",
         # Redis
         "REDIS_URL": os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        # Shared async pool (app/core/redis_pool.py): per-process connection cap
+        "REDIS_MAX_CONNECTIONS": int(os.getenv("REDIS_MAX_CONNECTIONS", "100")),
+        "REDIS_SOCKET_TIMEOUT_SECONDS": float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "5")),
         # Security (validated above)
         "SECRET_KEY": secret_key,
         "WEBHOOK_SECRET": os.getenv("WEBHOOK_SECRET", "webhook-secret-change-in-production"),
@@ -83,6 +86,9 @@ def settings() -> dict[str, Any]:
             os.getenv("SHOPIFY_STOREFRONT_TOKEN", ""),
         ),
         "SHOPIFY_API_VERSION": "2024-01",
+        # Local product catalog: seconds between incremental refreshes of the
+        # in-memory index from Postgres (webhook writes in this process apply at once)
+        "PRODUCT_CACHE_TTL": int(os.getenv("PRODUCT_CACHE_TTL", "300")),
         # Facebook Messenger
         "FACEBOOK_PAGE_ID": os.getenv("FACEBOOK_PAGE_ID", ""),
         "FACEBOOK_PAGE_ACCESS_TOKEN": os.getenv("FACEBOOK_PAGE_ACCESS_TOKEN", ""),
@@ -136,6 +142,64 @@ def settings() -> dict[str, Any]:
         "EMBEDDING_RATE_LIMIT_RPM": int(os.getenv("EMBEDDING_RATE_LIMIT_RPM", "3000")),
         "EMBEDDING_RETRY_MAX_ATTEMPTS": int(os.getenv("EMBEDDING_RETRY_MAX_ATTEMPTS", "3")),
         "EMBEDDING_RETRY_BACKOFF_FACTOR": float(os.getenv("EMBEDDING_RETRY_BACKOFF_FACTOR", "2.0")),
+        "EMBEDDING_QUERY_CACHE_SIZE": int(os.getenv("EMBEDDING_QUERY_CACHE_SIZE", "2048")),
+        "EMBEDDING_QUERY_CACHE_REDIS": os.getenv("EMBEDDING_QUERY_CACHE_REDIS", "true").lower()
+        == "true",
+        # Coalesce concurrent query embeddings (0 disables)
+        "EMBEDDING_QUERY_BATCH_WINDOW_MS": float(os.getenv("EMBEDDING_QUERY_BATCH_WINDOW_MS", "5")),
+        "EMBEDDING_QUERY_BATCH_MAX": int(os.getenv("EMBEDDING_QUERY_BATCH_MAX", "32")),
+        # Cache of personality-rephrased FAQ answers (L1 size, Redis tier, edit-time pre-warm)
+        "FAQ_REPHRASE_CACHE_SIZE": int(os.getenv("FAQ_REPHRASE_CACHE_SIZE", "4096")),
+        "FAQ_REPHRASE_CACHE_REDIS": os.getenv("FAQ_REPHRASE_CACHE_REDIS", "true").lower()
+        == "true",
+        "FAQ_REPHRASE_PREWARM": os.getenv("FAQ_REPHRASE_PREWARM", "true").lower() == "true",
+        # RAG retrieval engine: "pgvector" (SQL + HNSW) or "memory" (in-process matrix)
+        "RAG_SEARCH_ENGINE": os.getenv("RAG_SEARCH_ENGINE", "pgvector"),
+        "RAG_MATRIX_CACHE_MAX_MB": int(os.getenv("RAG_MATRIX_CACHE_MAX_MB", "256")),
+        # HNSW scan depth; iterative scan ("off" before pgvector 0.8) keeps the
+        # scan going until enough rows pass the merchant filter
+        "RAG_HNSW_EF_SEARCH": int(os.getenv("RAG_HNSW_EF_SEARCH", "100")),
+        "RAG_HNSW_ITERATIVE_SCAN": os.getenv("RAG_HNSW_ITERATIVE_SCAN", "relaxed_order"),
+        # "hybrid" fuses full-text rank with vector similarity; "vector" is cosine only
+        "RAG_RETRIEVAL_MODE": os.getenv("RAG_RETRIEVAL_MODE", "hybrid"),
+        "RAG_HYBRID_RRF_K": int(os.getenv("RAG_HYBRID_RRF_K", "60")),
+        # Semantic answer cache for general-mode questions (nearest-neighbour on query embedding)
+        "SEMANTIC_CACHE_ENABLED": os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true",
+        "SEMANTIC_CACHE_SIMILARITY_THRESHOLD": float(
+            os.getenv("SEMANTIC_CACHE_SIMILARITY_THRESHOLD", "0.95")
+        ),
+        "SEMANTIC_CACHE_MAX_ENTRIES_PER_MERCHANT": int(
+            os.getenv("SEMANTIC_CACHE_MAX_ENTRIES_PER_MERCHANT", "500")
+        ),
+        "SEMANTIC_CACHE_TTL_SECONDS": int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "86400")),
+        # Dashboard analytics rollups (compacted by a scheduled job, read by widgets)
+        "ANALYTICS_ROLLUPS_ENABLED": os.getenv("ANALYTICS_ROLLUPS_ENABLED", "true").lower()
+        == "true",
+        "ANALYTICS_ROLLUP_INTERVAL_MINUTES": int(
+            os.getenv("ANALYTICS_ROLLUP_INTERVAL_MINUTES", "15")
+        ),
+        "ANALYTICS_ROLLUP_BACKFILL_DAYS": int(os.getenv("ANALYTICS_ROLLUP_BACKFILL_DAYS", "180")),
+        # Dashboard analytics route result cache (L1 size, Redis tier, TTL)
+        "ANALYTICS_CACHE_ENABLED": os.getenv("ANALYTICS_CACHE_ENABLED", "true").lower() == "true",
+        "ANALYTICS_CACHE_SIZE": int(os.getenv("ANALYTICS_CACHE_SIZE", "2048")),
+        "ANALYTICS_CACHE_REDIS": os.getenv("ANALYTICS_CACHE_REDIS", "true").lower() == "true",
+        "ANALYTICS_CACHE_TTL_SECONDS": int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "30")),
+        # Sessions a dashboard snapshot request uses at once
+        "ANALYTICS_SNAPSHOT_CONCURRENCY": int(os.getenv("ANALYTICS_SNAPSHOT_CONCURRENCY", "4")),
+        # Per-stage latency spans for chat turns (app/core/tracing.py)
+        "LATENCY_TRACING_ENABLED": os.getenv("LATENCY_TRACING_ENABLED", "true").lower()
+        == "true",
+        # Document text extraction process pool
+        "EXTRACTION_EXECUTOR_ENABLED": os.getenv("EXTRACTION_EXECUTOR_ENABLED", "true").lower()
+        == "true",
+        "EXTRACTION_MAX_WORKERS": int(os.getenv("EXTRACTION_MAX_WORKERS", "2")),
+        "EXTRACTION_TIMEOUT_SECONDS": float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "120")),
+        "EXTRACTION_MAX_MEMORY_MB": int(os.getenv("EXTRACTION_MAX_MEMORY_MB", "1024")),
+        "EXTRACTION_PAGES_PER_TASK": int(os.getenv("EXTRACTION_PAGES_PER_TASK", "25")),
+        # Re-embedding jobs (provider switch)
+        "REEMBEDDING_CONCURRENCY": int(os.getenv("REEMBEDDING_CONCURRENCY", "4")),
+        "REEMBEDDING_BATCH_SIZE": int(os.getenv("REEMBEDDING_BATCH_SIZE", "64")),
+        "REEMBEDDING_STALE_SECONDS": int(os.getenv("REEMBEDDING_STALE_SECONDS", "300")),
         # CORS
         "CORS_ORIGINS": os.getenv(
             "CORS_ORIGINS",
@@ -0,0 +1,181 @@
+"""Shared async Redis connection pool.
+
+Services used to call redis.from_url() on their own, some per message (and
+then close the client again), so every request paid a TCP connect and under
+load Redis saw a connection storm. One blocking pool per process is created
+in the application lifespan and handed out through get_redis(); callers
+borrow connections per command and must not close the shared client.
+
+Pub/Sub subscriptions hold their connection for as long as a WebSocket is
+open, so they get a separate uncapped pool (get_pubsub_redis()) and can't
+starve command traffic.
+
+Both pools are created lazily as well, so scripts, workers and tests that never
+run the lifespan still get the shared client on first use.
+
+An empty REDIS_URL means Redis is disabled (tests set it that way): the
+getters return None and callers fall back to their no-Redis behaviour.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Seconds a caller waits for a free connection before the pool raises
+POOL_WAIT_TIMEOUT_SECONDS = 5.0
+
+_pool: redis.BlockingConnectionPool | None = None
+_client: redis.Redis | None = None
+_pubsub_pool: redis.ConnectionPool | None = None
+_pubsub_client: redis.Redis | None = None
+
+
+def redis_enabled() -> bool:
+    """Whether a Redis URL is configured (an empty REDIS_URL disables Redis)."""
+    return bool(settings().get("REDIS_URL"))
+
+
+def _create_pool() -> redis.BlockingConnectionPool:
+    config = settings()
+    socket_timeout = config.get("REDIS_SOCKET_TIMEOUT_SECONDS", 5.0)
+    return redis.BlockingConnectionPool.from_url(
+        config["REDIS_URL"],
+        max_connections=config.get("REDIS_MAX_CONNECTIONS", 100),
+        timeout=POOL_WAIT_TIMEOUT_SECONDS,
+        decode_responses=True,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=socket_timeout,
+        socket_keepalive=True,
+        health_check_interval=30,
+    )
+
+
+def _create_pubsub_pool() -> redis.ConnectionPool:
+    config = settings()
+    # No socket_timeout: subscribers block on reads between messages
+    return redis.ConnectionPool.from_url(
+        config["REDIS_URL"],
+        decode_responses=True,
+        socket_connect_timeout=config.get("REDIS_SOCKET_TIMEOUT_SECONDS", 5.0),
+        socket_keepalive=True,
+        health_check_interval=30,
+    )
+
+
+def get_redis() -> redis.Redis | None:
+    """Get the process-wide async Redis client (decoded string responses).
+
+    Returns:
+        Redis client backed by the shared connection pool, or None when
+        Redis is disabled
+    """
+    global _pool, _client
+    if not redis_enabled():
+        return None
+    if _client is None:
+        _pool = _create_pool()
+        _client = redis.Redis(connection_pool=_pool)
+    return _client
+
+
+def get_pubsub_redis() -> redis.Redis | None:
+    """Get the process-wide async Redis client for Pub/Sub subscriptions.
+
+    Returns:
+        Redis client backed by the subscription pool, or None when Redis is
+        disabled
+    """
+    global _pubsub_pool, _pubsub_client
+    if not redis_enabled():
+        return None
+    if _pubsub_client is None:
+        _pubsub_pool = _create_pubsub_pool()
+        _pubsub_client = redis.Redis(connection_pool=_pubsub_pool)
+    return _pubsub_client
+
+
+async def init_redis() -> None:
+    """Create the shared pool and verify connectivity (application startup).
+
+    A failed ping is logged, not raised: Redis-backed features degrade on
+    their own and the pool reconnects once Redis is reachable.
+    """
+    client = get_redis()
+    if client is None:
+        logger.info("redis_disabled")
+        return
+    try:
+        await client.ping()
+        logger.info("redis_pool_ready", **redis_pool_stats())
+    except Exception as e:
+        logger.warning("redis_pool_ping_failed", error=str(e))
+
+
+async def close_redis() -> None:
+    """Close the shared clients and disconnect all pooled connections."""
+    global _pool, _client, _pubsub_pool, _pubsub_client
+    for client, pool in ((_client, _pool), (_pubsub_client, _pubsub_pool)):
+        if client is None or pool is None:
+            continue
+        try:
+            await client.aclose()
+            await pool.disconnect()
+        except Exception as e:
+            logger.warning("redis_pool_close_failed", error=str(e))
+    _pool = None
+    _client = None
+    _pubsub_pool = None
+    _pubsub_client = None
+
+
+def redis_pool_stats() -> dict[str, Any]:
+    """Connection counts of the shared pool.
+
+    Returns:
+        Dict with max, in-use and idle connection counts, plus the number of
+        connections held by Pub/Sub subscriptions
+    """
+    if _pool is None:
+        return {
+            "initialized": False,
+            "max_connections": 0,
+            "in_use": 0,
+            "idle": 0,
+            "pubsub_connections": 0,
+        }
+    return {
+        "initialized": True,
+        "max_connections": _pool.max_connections,
+        "in_use": len(getattr(_pool, "_in_use_connections", ())),
+        "idle": len(getattr(_pool, "_available_connections", ())),
+        "pubsub_connections": len(getattr(_pubsub_pool, "_in_use_connections", ())),
+    }
+
+
+async def redis_health() -> dict[str, Any]:
+    """Ping Redis through the shared pool.
+
+    Returns:
+        Dict with status, ping latency and pool stats
+    """
+    client = get_redis()
+    if client is None:
+        return {"status": "disabled", "pool": redis_pool_stats()}
+    started = time.perf_counter()
+    try:
+        await client.ping()
+    except Exception as e:
+        return {"status": "unavailable", "error": str(e), "pool": redis_pool_stats()}
+    return {
+        "status": "connected",
+        "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        "pool": redis_pool_stats(),
+    }
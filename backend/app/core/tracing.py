@@ -0,0 +1,226 @@
+"""Lightweight per-turn latency tracing.
+
+A chat turn opens a trace with start_trace(); code along the pipeline wraps
+its work in span("name") blocks. The active trace lives in a ContextVar, so
+spans need no plumbing through call signatures and are picked up by tasks
+spawned during the turn (asyncio copies the context into new tasks).
+
+Outside a trace, or with LATENCY_TRACING_ENABLED off, span() returns a shared
+no-op object: the cost is one ContextVar lookup.
+
+finish_trace() folds the turn's stage timings (plus a "total" stage) into
+per-merchant rolling histograms, served by GET /analytics/latency-breakdown.
+Histograms are in-process, so each worker reports the turns it handled.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict, deque
+from contextvars import ContextVar, Token
+from typing import Any
+
+from app.core.config import settings
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is unbounded
+HISTOGRAM_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+ROLLING_WINDOW_SECONDS = 900
+MAX_SAMPLES_PER_STAGE = 1000
+MAX_TRACKED_MERCHANTS = 1000
+
+TOTAL_STAGE = "total"
+
+
+class LatencyTrace:
+    """Stage timings (ms) collected during one conversation turn."""
+
+    __slots__ = ("merchant_id", "stages", "_started", "_token")
+
+    def __init__(self, merchant_id: int) -> None:
+        self.merchant_id = merchant_id
+        self.stages: dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._token: Token | None = None
+
+    def add(self, stage: str, elapsed_ms: float) -> None:
+        """Add time to a stage (repeated stages accumulate)."""
+        self.stages[stage] = round(self.stages.get(stage, 0.0) + elapsed_ms, 2)
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._started) * 1000, 2)
+
+
+_current_trace: ContextVar[LatencyTrace | None] = ContextVar("latency_trace", default=None)
+
+
+class _Span:
+    __slots__ = ("_trace", "_stage", "_started")
+
+    def __init__(self, trace: LatencyTrace, stage: str) -> None:
+        self._trace = trace
+        self._stage = stage
+        self._started = 0.0
+
+    def __enter__(self) -> _Span:
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        self._trace.add(self._stage, (time.perf_counter() - self._started) * 1000)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(stage: str) -> _Span | _NoopSpan:
+    """Time a block as a stage of the active trace.
+
+    Usage:
+        with span("retrieval.search"):
+            results = await search(...)
+
+    Args:
+        stage: Stage name ("<component>.<step>" for nested work)
+
+    Returns:
+        Context manager; a no-op when no trace is active
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return _Span(trace, stage)
+
+
+def current_trace() -> LatencyTrace | None:
+    """Get the trace of the turn being processed, if any."""
+    return _current_trace.get()
+
+
+def start_trace(merchant_id: int) -> LatencyTrace | None:
+    """Start tracing a conversation turn in the current context.
+
+    Args:
+        merchant_id: Merchant the turn belongs to
+
+    Returns:
+        The new trace, or None when tracing is disabled
+    """
+    if not settings().get("LATENCY_TRACING_ENABLED", True):
+        return None
+    trace = LatencyTrace(merchant_id)
+    trace._token = _current_trace.set(trace)
+    return trace
+
+
+def finish_trace(trace: LatencyTrace | None) -> None:
+    """End a trace started by start_trace() and record it in the histograms.
+
+    Must run in the context that started the trace. Safe to call with None.
+    """
+    if trace is None:
+        return
+    if trace._token is not None:
+        _current_trace.reset(trace._token)
+        trace._token = None
+    stages = {**trace.stages, TOTAL_STAGE: trace.elapsed_ms()}
+    get_latency_histograms().record(trace.merchant_id, stages)
+
+
+class LatencyHistograms:
+    """Rolling per-merchant, per-stage latency samples."""
+
+    def __init__(
+        self,
+        window_seconds: float = ROLLING_WINDOW_SECONDS,
+        max_samples: int = MAX_SAMPLES_PER_STAGE,
+        max_merchants: int = MAX_TRACKED_MERCHANTS,
+    ) -> None:
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self.max_merchants = max_merchants
+        self._merchants: OrderedDict[int, dict[str, deque[tuple[float, float]]]] = OrderedDict()
+
+    def record(self, merchant_id: int, stages: dict[str, float]) -> None:
+        """Record one turn's stage timings."""
+        now = time.monotonic()
+        merchant_stages = self._merchants.get(merchant_id)
+        if merchant_stages is None:
+            merchant_stages = {}
+            self._merchants[merchant_id] = merchant_stages
+            if len(self._merchants) > self.max_merchants:
+                self._merchants.popitem(last=False)
+        else:
+            self._merchants.move_to_end(merchant_id)
+
+        for stage, elapsed_ms in stages.items():
+            samples = merchant_stages.get(stage)
+            if samples is None:
+                samples = deque(maxlen=self.max_samples)
+                merchant_stages[stage] = samples
+            samples.append((now, elapsed_ms))
+
+    def snapshot(self, merchant_id: int) -> dict[str, Any]:
+        """Percentiles and bucket counts per stage over the rolling window.
+
+        Returns:
+            Dict with windowSeconds, bucketBoundsMs and a stages map of
+            stage name -> {count, p50, p95, p99, max, buckets}
+        """
+        cutoff = time.monotonic() - self.window_seconds
+        stages: dict[str, Any] = {}
+        for stage, samples in self._merchants.get(merchant_id, {}).items():
+            values = sorted(elapsed for recorded, elapsed in samples if recorded >= cutoff)
+            if values:
+                stages[stage] = _summarize(values)
+        return {
+            "windowSeconds": self.window_seconds,
+            "bucketBoundsMs": list(HISTOGRAM_BUCKETS_MS),
+            "stages": stages,
+        }
+
+    def reset(self) -> None:
+        self._merchants.clear()
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    index = max(0, min(len(values) - 1, round(percentile / 100 * len(values)) - 1))
+    return values[index]
+
+
+def _summarize(values: list[float]) -> dict[str, Any]:
+    buckets = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+    bucket = 0
+    for value in values:
+        while bucket < len(HISTOGRAM_BUCKETS_MS) and value > HISTOGRAM_BUCKETS_MS[bucket]:
+            bucket += 1
+        buckets[bucket] += 1
+    return {
+        "count": len(values),
+        "p50": _percentile(values, 50),
+        "p95": _percentile(values, 95),
+        "p99": _percentile(values, 99),
+        "max": values[-1],
+        "buckets": buckets,
+    }
+
+
+_latency_histograms: LatencyHistograms | None = None
+
+
+def get_latency_histograms() -> LatencyHistograms:
+    """Get the process-wide latency histograms."""
+    global _latency_histograms
+    if _latency_histograms is None:
+        _latency_histograms = LatencyHistograms()
+    return _latency_histograms
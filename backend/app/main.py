@@ -72,6 +72,7 @@ from app.background_jobs.widget_conversation_cleanup import (
 from app.core.config import settings
 from app.core.database import close_db, engine, init_db
 from app.core.errors import APIError, ErrorCode
+from app.core.redis_pool import close_redis, init_redis, redis_health
 from app.middleware.auth import AuthenticationMiddleware
 from app.middleware.csrf import setup_csrf_middleware
 from app.middleware.rate_limit import GlobalRateLimitMiddleware
@@ -100,6 +101,8 @@ from app.schemas.webhook_verification import (  # noqa: F401 (export for type ge
     WebhookStatusResponse,
     WebhookTestResponse,
 )
+from app.services.knowledge.extraction_executor import shutdown_extraction_executor
+from app.services.llm.provider_registry import close_provider_registry
 
 
 def get_error_status_code(error_code: ErrorCode) -> int:
@@ -192,6 +195,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
         structlog.get_logger().warning("db_init_failed_during_startup", error=str(e))
         # Database will be initialized lazily on first use
+    await init_redis()  # Shared async Redis pool for all services
     start_scheduler()  # Story 2-7: Start data retention cleanup scheduler
     await start_widget_cleanup_scheduler()  # Story 5-2: Start widget session cleanup scheduler
     await (
@@ -237,6 +241,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         shutdown_widget_conversation_cleanup_scheduler()
     )  # Story 5-2: Shutdown widget conversation cleanup scheduler
     shutdown_scheduler()  # Story 2-7: Shutdown scheduler gracefully
+    shutdown_extraction_executor()  # Stop document text extraction workers
+    await close_provider_registry()  # Close pooled LLM/embedding HTTP clients
+    await close_redis()
     await close_db()
 
 
@@ -352,7 +359,7 @@ async def root() -> dict[str, str]:
 @app.get("/health")
 async def health() -> dict[str, Any]:
     """Health check endpoint with database connectivity."""
-    health_status = {"status": "healthy", "database": "connected"}
+    health_status: dict[str, Any] = {"status": "healthy", "database": "connected"}
 
     # Check database connectivity
     try:
@@ -362,6 +369,9 @@ async def health() -> dict[str, Any]:
         health_status["status"] = "unhealthy"
         health_status["database"] = f"disconnected: {str(e)}"
 
+    # Redis is reported but not fatal: Redis-backed features degrade on their own
+    health_status["redis"] = (await redis_health())["status"]
+
     return health_status
 
 
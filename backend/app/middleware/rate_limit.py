@@ -27,22 +27,13 @@ AUTH_RATE_PERIOD = 60
 HEALTH_CHECK_PATHS = {"/health", "/api/health/", "/"}
 
 _in_memory_counters: dict[str, list[float]] = defaultdict(list)
-_redis_client = None
 
 
 def _get_redis():
-    global _redis_client
-    if _redis_client is not None:
-        return _redis_client
     try:
-        import redis.asyncio as aioredis
+        from app.core.redis_pool import get_redis
 
-        from app.core.config import settings
-
-        config = settings()
-        redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-        _redis_client = aioredis.from_url(redis_url, decode_responses=True)
-        return _redis_client
+        return get_redis()
     except Exception:
         return None
 
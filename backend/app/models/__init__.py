@@ -3,8 +3,14 @@
 This package contains SQLAlchemy ORM models for database entities.
 """
 
+from app.models.analytics_rollup import (
+    AnalyticsDailyRollup,
+    AnalyticsHourlyRollup,
+    FaqDailyRollup,
+)
 from app.models.budget_alert import BudgetAlert
 from app.models.carrier_config import CarrierConfig
+from app.models.catalog_product import CatalogProduct, CatalogVariant
 from app.models.consent import Consent, ConsentType
 from app.models.conversation import Conversation
 from app.models.conversation_context import (
@@ -21,7 +27,13 @@ from app.models.facebook_integration import FacebookIntegration
 from app.models.faq import Faq
 from app.models.faq_interaction_log import FaqInteractionLog
 from app.models.handoff_alert import HandoffAlert
-from app.models.knowledge_base import DocumentChunk, DocumentStatus, KnowledgeDocument
+from app.models.knowledge_base import (
+    DocumentChunk,
+    DocumentStatus,
+    KnowledgeDocument,
+    ReembeddingJob,
+    StagedChunkEmbedding,
+)
 from app.models.llm_configuration import LLMConfiguration
 from app.models.llm_conversation_cost import LLMConversationCost
 from app.models.merchant import Merchant
@@ -46,6 +58,8 @@ __all__ = [
     "PrerequisiteChecklist",
     "FacebookIntegration",
     "ShopifyIntegration",
+    "CatalogProduct",
+    "CatalogVariant",
     "Conversation",
     "ConversationContext",
     "ConversationTurn",
@@ -75,6 +89,8 @@ __all__ = [
     "KnowledgeDocument",
     "DocumentChunk",
     "DocumentStatus",
+    "ReembeddingJob",
+    "StagedChunkEmbedding",
     "WidgetAnalyticsEvent",
     "RAGQueryLog",
     "FaqInteractionLog",
@@ -83,4 +99,7 @@ __all__ = [
     "GapType",
     "SuggestedAction",
     "PasswordResetToken",
+    "AnalyticsDailyRollup",
+    "AnalyticsHourlyRollup",
+    "FaqDailyRollup",
 ]
@@ -0,0 +1,130 @@
+"""Analytics rollup ORM models.
+
+Per-merchant daily and hourly aggregates of conversations, messages,
+sentiment, feedback, RAG queries, FAQ clicks, LLM cost and response-time
+histograms. Written by the rollup compaction job
+(app/services/analytics/analytics_rollup_service.py) so dashboard widgets
+read a handful of rows per day instead of scanning raw history.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+from sqlalchemy import Date, DateTime, Float, ForeignKey, Index, Integer, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class AnalyticsDailyRollup(Base):
+    """One merchant-day of aggregated analytics (UTC days).
+
+    A row exists for every compacted day, including idle ones, so the
+    presence of rows marks which days are covered.
+
+    Attributes:
+        merchant_id: Owning merchant
+        day: UTC calendar day
+        conversations_started: Conversations created that day
+        handoffs_triggered: Handoffs triggered that day
+        customer_messages / bot_messages: Messages by sender
+        sentiment_*: Customer messages by analyzed sentiment
+        feedback_*: Thumbs up/down feedback
+        rag_queries / rag_matched: RAG query log counts
+        faq_clicks / faq_followups: FAQ widget clicks and follow-ups
+        llm_requests / llm_tokens / llm_cost_usd: LLM usage and cost
+        response_time_count / response_time_sum_ms: Timed LLM responses
+        response_time_histogram: {"rag"|"general"|"other": sparse LatencyHistogram}
+        computed_at: When the row was last recomputed
+    """
+
+    __tablename__ = "analytics_daily_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    merchant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("merchants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    conversations_started: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    handoffs_triggered: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    customer_messages: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    bot_messages: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sentiment_positive: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sentiment_negative: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sentiment_neutral: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    feedback_positive: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    feedback_negative: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rag_queries: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rag_matched: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    faq_clicks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    faq_followups: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    llm_requests: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    llm_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    llm_cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    response_time_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    response_time_sum_ms: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    response_time_histogram: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    computed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        UniqueConstraint("merchant_id", "day", name="uq_analytics_daily_rollups_merchant_day"),
+    )
+
+
+class AnalyticsHourlyRollup(Base):
+    """Conversation and customer-message counts for one merchant-hour (UTC).
+
+    Only non-empty hours are stored. Backs the peak-hours heatmap.
+    """
+
+    __tablename__ = "analytics_hourly_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    merchant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("merchants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    hour: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    conversations_started: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    customer_messages: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "merchant_id", "hour", name="uq_analytics_hourly_rollups_merchant_hour"
+        ),
+    )
+
+
+class FaqDailyRollup(Base):
+    """Clicks and follow-ups for one FAQ on one UTC day (non-empty days only)."""
+
+    __tablename__ = "faq_daily_rollups"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    merchant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("merchants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    faq_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("faqs.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    clicks: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    followups: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("faq_id", "day", name="uq_faq_daily_rollups_faq_day"),
+        Index("ix_faq_daily_rollups_merchant_day", "merchant_id", "day"),
+    )
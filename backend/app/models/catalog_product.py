@@ -0,0 +1,140 @@
+"""Product catalog replica ORM models.
+
+Local copy of each merchant's Shopify catalog. Bootstrapped by a paginated
+Admin API sync and kept current by products/* and inventory_levels/update
+webhooks, so chat-time product search never calls Shopify.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from decimal import Decimal
+
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base
+
+
+class CatalogProduct(Base):
+    """One Shopify product in a merchant's catalog replica.
+
+    Deleted products are kept as tombstones (deleted=True) so in-memory
+    catalog indexes can pick up removals from their incremental refresh,
+    which reads rows by synced_at.
+
+    Attributes:
+        merchant_id: Owning merchant
+        product_id: Shopify product ID (numeric, as string)
+        price: Price of the first variant (what the bot quotes)
+        tags: Shopify tags as a list
+        shopify_updated_at: Shopify's updated_at, used to drop out-of-order webhooks
+        synced_at: When this row last changed locally (refresh watermark)
+    """
+
+    __tablename__ = "catalog_products"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    merchant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("merchants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    product_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    title: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    product_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    vendor: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    tags: Mapped[list] = mapped_column(JSONB, nullable=False, default=list)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="active")
+    image_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    price: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), nullable=True)
+    deleted: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default="false"
+    )
+    shopify_updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    synced_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+    )
+
+    variants: Mapped[list[CatalogVariant]] = relationship(
+        "CatalogVariant",
+        back_populates="product",
+        cascade="all, delete-orphan",
+        order_by="CatalogVariant.position",
+    )
+
+    __table_args__ = (
+        UniqueConstraint("merchant_id", "product_id", name="uq_catalog_products_merchant_product"),
+        Index("ix_catalog_products_merchant_id_synced_at", "merchant_id", "synced_at"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<CatalogProduct(id={self.id}, merchant_id={self.merchant_id}, "
+            f"product_id={self.product_id}, title={self.title})>"
+        )
+
+
+class CatalogVariant(Base):
+    """One variant of a catalog product.
+
+    inventory_levels maps Shopify location_id to available quantity as
+    reported by inventory_levels/update; inventory_quantity is the total
+    across locations (None when Shopify doesn't track inventory).
+    """
+
+    __tablename__ = "catalog_variants"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    catalog_product_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("catalog_products.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    merchant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("merchants.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    variant_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    inventory_item_id: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    title: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    price: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), nullable=True)
+    position: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    selected_options: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+    inventory_quantity: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    inventory_levels: Mapped[dict] = mapped_column(JSONB, nullable=False, default=dict)
+
+    product: Mapped[CatalogProduct] = relationship("CatalogProduct", back_populates="variants")
+
+    __table_args__ = (
+        UniqueConstraint("merchant_id", "variant_id", name="uq_catalog_variants_merchant_variant"),
+        Index(
+            "ix_catalog_variants_merchant_id_inventory_item_id",
+            "merchant_id",
+            "inventory_item_id",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<CatalogVariant(id={self.id}, variant_id={self.variant_id}, "
+            f"inventory_quantity={self.inventory_quantity})>"
+        )
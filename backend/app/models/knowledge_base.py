@@ -4,14 +4,21 @@ Implements document storage and chunking for the knowledge base feature (Epic 8)
 
 Story 8-11: Changed embedding column from Vector(1536) to JSONB for flexible
 dimension support (768 for Gemini/Ollama, 1536 for OpenAI).
+
+Native pgvector columns (one per supported dimension) mirror the JSONB
+embedding so similarity search can run in SQL against an HNSW index.
+
+Re-embedding jobs stage new vectors in a separate table; chunks keep serving
+their current embedding until the job cuts over.
 """
 
 from datetime import UTC, datetime
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from pgvector.sqlalchemy import HALFVEC, Vector
+from sqlalchemy import Computed, DateTime, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -20,6 +27,16 @@ if TYPE_CHECKING:
     from app.models.merchant import Merchant
 
 
+# Native vector column per embedding dimension: {dimension: (column_name, pgvector_type)}
+# HNSW/IVFFlat indexes on `vector` are capped at 2000 dims, so 3072d (Gemini)
+# embeddings are stored as `halfvec`, which can be indexed up to 4000 dims.
+VECTOR_COLUMNS: dict[int, tuple[str, str]] = {
+    768: ("embedding_768", "vector"),
+    1536: ("embedding_1536", "vector"),
+    3072: ("embedding_3072", "halfvec"),
+}
+
+
 def _utcnow_aware() -> datetime:
     """Return current UTC time as an aware datetime."""
     return datetime.now(UTC)
@@ -133,6 +150,11 @@ class DocumentChunk(Base):
     """
 
     __tablename__ = "document_chunks"
+    __table_args__ = (
+        Index("ix_document_chunks_document_id_content_hash", "document_id", "content_hash"),
+        Index("ix_document_chunks_content_hash", "content_hash"),
+        Index("ix_document_chunks_content_tsv", "content_tsv", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     document_id: Mapped[int] = mapped_column(
@@ -149,6 +171,19 @@ class DocumentChunk(Base):
         Text,
         nullable=False,
     )
+    # Full-text index of content for hybrid (lexical + vector) retrieval.
+    # Generated by Postgres and GIN-indexed; deferred so ORM loads skip it.
+    content_tsv: Mapped[str | None] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('english', content)", persisted=True),
+        nullable=True,
+        deferred=True,
+    )
+    # sha256 of content; lets re-processing reuse embeddings of unchanged chunks
+    content_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+    )
     # Story 8-11: JSONB for flexible embedding dimensions (768 or 1536)
     # Cast to vector at query time: embedding::jsonb::float[]::vector(N)
     embedding: Mapped[list[float] | None] = mapped_column(
@@ -159,6 +194,20 @@ class DocumentChunk(Base):
         Integer,
         nullable=True,
     )
+    # Native pgvector copies of `embedding` (see VECTOR_COLUMNS); only the column
+    # matching embedding_dimension is populated. Indexed with HNSW (cosine).
+    embedding_768: Mapped[list[float] | None] = mapped_column(
+        Vector(768),
+        nullable=True,
+    )
+    embedding_1536: Mapped[list[float] | None] = mapped_column(
+        Vector(1536),
+        nullable=True,
+    )
+    embedding_3072: Mapped[list[float] | None] = mapped_column(
+        HALFVEC(3072),
+        nullable=True,
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         default=_utcnow_aware,
@@ -171,8 +220,153 @@ class DocumentChunk(Base):
         back_populates="chunks",
     )
 
+    @staticmethod
+    def embedding_values(embedding: list[float]) -> dict[str, Any]:
+        """Column values storing an embedding in JSONB and its native vector column.
+
+        Dimensions without a native column (see VECTOR_COLUMNS) are only kept
+        in JSONB and served by the in-process matrix search.
+        """
+        dimension = len(embedding)
+        values: dict[str, Any] = {"embedding": embedding, "embedding_dimension": dimension}
+        for column_dimension, (column_name, _) in VECTOR_COLUMNS.items():
+            values[column_name] = embedding if column_dimension == dimension else None
+        return values
+
+    def set_embedding(self, embedding: list[float]) -> None:
+        """Store an embedding in the JSONB column and its native vector column."""
+        for column_name, value in self.embedding_values(embedding).items():
+            setattr(self, column_name, value)
+
     def __repr__(self) -> str:
         return (
             f"<DocumentChunk(id={self.id}, doc_id={self.document_id}, "
             f"chunk_idx={self.chunk_index}, dim={self.embedding_dimension})>"
         )
+
+
+class ReembeddingJobStatus(str, Enum):
+    """Re-embedding job status."""
+
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    SUPERSEDED = "superseded"
+
+
+class ReembeddingJob(Base):
+    """Re-embedding job for a merchant's knowledge base.
+
+    New embeddings are written to StagedChunkEmbedding while the merchant keeps
+    serving its current embedding_version. Once every chunk is staged, the job
+    swaps the vectors, document versions and merchant embedding settings in a
+    single transaction.
+
+    updated_at doubles as a heartbeat: a running job that stops updating is
+    resumed by the next worker that starts.
+    """
+
+    __tablename__ = "reembedding_jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    merchant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("merchants.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    target_provider: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+    )
+    target_model: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+    )
+    target_version: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        default=ReembeddingJobStatus.RUNNING.value,
+        nullable=False,
+        index=True,
+    )
+    total_chunks: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        server_default="0",
+    )
+    processed_chunks: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        nullable=False,
+        server_default="0",
+    )
+    # Staging throughput of the current run, used for the ETA in the status endpoint
+    chunks_per_second: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True,
+    )
+    error_message: Mapped[str | None] = mapped_column(
+        Text,
+        nullable=True,
+    )
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=_utcnow_aware,
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=_utcnow_aware,
+        onupdate=_utcnow_aware,
+        nullable=False,
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ReembeddingJob(id={self.id}, merchant_id={self.merchant_id}, "
+            f"target={self.target_version}, status={self.status})>"
+        )
+
+
+class StagedChunkEmbedding(Base):
+    """Embedding computed by a re-embedding job, not yet serving queries.
+
+    Rows are written in chunk id order per document, so the highest staged
+    chunk id of a document is its resume cursor.
+    """
+
+    __tablename__ = "staged_chunk_embeddings"
+    __table_args__ = (
+        Index("ix_staged_chunk_embeddings_job_id_document_id", "job_id", "document_id"),
+    )
+
+    job_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("reembedding_jobs.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    chunk_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("document_chunks.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    document_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+    )
+    embedding: Mapped[list[float]] = mapped_column(
+        JSONB,
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return f"<StagedChunkEmbedding(job_id={self.job_id}, chunk_id={self.chunk_id})>"
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, Text
+from sqlalchemy import DateTime, Enum, Float, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -82,6 +82,15 @@ class Message(Base):
         nullable=False,
         index=True,
     )
+    # Customer messages only: analyzed once at write time (or by the backfill job)
+    sentiment: Mapped[str | None] = mapped_column(
+        String(10),
+        nullable=True,
+    )
+    sentiment_score: Mapped[float | None] = mapped_column(
+        Float,
+        nullable=True,
+    )
 
     # Relationship to conversation (string reference to avoid circular import)
     conversation: Mapped[object] = relationship(
@@ -153,7 +162,22 @@ class Message(Base):
         else:
             self.message_metadata = encrypt_metadata(metadata)
 
-    __table_args__ = (Index("ix_messages_tier_created", "data_tier", "created_at"),)
+    __table_args__ = (
+        Index("ix_messages_tier_created", "data_tier", "created_at"),
+        Index(
+            "ix_messages_customer_sentiment",
+            "conversation_id",
+            "created_at",
+            "sentiment",
+            postgresql_where=text("sender = 'customer'"),
+        ),
+        # Rows left for the sentiment backfill
+        Index(
+            "ix_messages_customer_unlabelled",
+            "id",
+            postgresql_where=text("sender = 'customer' AND sentiment IS NULL"),
+        ),
+    )
 
     def __repr__(self) -> str:
         return (
@@ -88,6 +88,11 @@ class ShopifyIntegration(Base):
         DateTime,
         nullable=True,
     )
+    # Last completed full sync of the local product catalog (None = not bootstrapped)
+    catalog_synced_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+    )
     connected_at: Mapped[datetime] = mapped_column(
         DateTime,
         default=datetime.utcnow,
@@ -9,7 +9,9 @@ All aggregated data is stored as tier=ANONYMIZED.
 
 from __future__ import annotations
 
-from datetime import UTC, datetime, timedelta
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
 from typing import Any
 
 import structlog
@@ -24,12 +26,40 @@ from app.models.order import Order
 from app.models.rag_query_log import RAGQueryLog
 from app.models.message_feedback import FeedbackRating, MessageFeedback
 from app.services.privacy.data_tier_service import DataTier
-from app.services.analytics.sentiment_analyzer import analyze_sentiment
+from app.services.analytics.analytics_rollup_service import (
+    AnalyticsRollupService,
+    customer_sentiment_by_day,
+    merged_histogram,
+    rollups_enabled,
+)
+from app.services.analytics.sql_distribution import (
+    bucket_count_columns,
+    bucket_counts_from_row,
+    percentile_columns,
+    percentiles_from_row,
+)
 from app.core.encryption import decrypt_conversation_content, is_encrypted
 
 logger = structlog.get_logger(__name__)
 
 
+@dataclass
+class ResponseTimeStats:
+    """Response-time distribution of a window, from rollups or raw cost rows.
+
+    Percentile dicts are {"p50": ms | None, "p95": ..., "p99": ...}.
+    """
+
+    count: int
+    percentiles: dict[str, int | None]
+    histogram: list[dict[str, Any]]
+    previous_percentiles: dict[str, int | None]
+    rag_count: int
+    rag_percentiles: dict[str, int | None]
+    general_count: int
+    general_percentiles: dict[str, int | None]
+
+
 class AggregatedAnalyticsService:
     """Service for aggregated, anonymized analytics.
 
@@ -39,10 +69,32 @@ class AggregatedAnalyticsService:
     - Strips PII (customer IDs, emails, names, addresses)
     - Stores as tier=ANONYMIZED
     - Used for dashboard widgets and reporting
+
+    Peak hours, sentiment trend, response time and FAQ usage are served from
+    the analytics rollup tables when they cover the requested window.
     """
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, use_rollups: bool | None = None):
+        """Initialize the service.
+
+        Args:
+            db: Database session
+            use_rollups: Read widgets from rollup tables (defaults to
+                ANALYTICS_ROLLUPS_ENABLED; off in IS_TESTING mode unless set)
+        """
         self.db = db
+        self.use_rollups = rollups_enabled() if use_rollups is None else use_rollups
+
+    async def _rollups_for(
+        self, merchant_id: int, start_day: date
+    ) -> AnalyticsRollupService | None:
+        """Rollup reader when rollups cover start_day through today, else None."""
+        if not self.use_rollups:
+            return None
+        rollups = AnalyticsRollupService(self.db)
+        if await rollups.covers(merchant_id, start_day, datetime.now(UTC).date()):
+            return rollups
+        return None
 
     async def get_tier_distribution(
         self,
@@ -825,27 +877,38 @@ class AggregatedAnalyticsService:
         try:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
 
-            result = await self.db.execute(
-                select(
-                    func.extract("dow", Conversation.created_at).label("day_of_week"),
-                    func.extract("hour", Conversation.created_at).label("hour"),
-                    func.count(Conversation.id).label("count"),
+            rollups = await self._rollups_for(merchant_id, cutoff_date.date())
+            if rollups is not None:
+                hourly_breakdown = [
+                    {
+                        "dayOfWeek": int(row.day_of_week),
+                        "hour": int(row.hour),
+                        "count": int(row.total),
+                    }
+                    for row in await rollups.hourly_heatmap(merchant_id, cutoff_date.date())
+                ]
+            else:
+                result = await self.db.execute(
+                    select(
+                        func.extract("dow", Conversation.created_at).label("day_of_week"),
+                        func.extract("hour", Conversation.created_at).label("hour"),
+                        func.count(Conversation.id).label("count"),
+                    )
+                    .where(Conversation.merchant_id == merchant_id)
+                    .where(Conversation.created_at >= cutoff_date)
+                    .group_by("day_of_week", "hour")
+                    .order_by(func.count(Conversation.id).desc())
                 )
-                .where(Conversation.merchant_id == merchant_id)
-                .where(Conversation.created_at >= cutoff_date)
-                .group_by("day_of_week", "hour")
-                .order_by(func.count(Conversation.id).desc())
-            )
-            rows = result.all()
+                rows = result.all()
 
-            hourly_breakdown = [
-                {
-                    "dayOfWeek": int(row.day_of_week) if row.day_of_week is not None else 0,
-                    "hour": int(row.hour) if row.hour is not None else 0,
-                    "count": row.count,
-                }
-                for row in rows
-            ]
+                hourly_breakdown = [
+                    {
+                        "dayOfWeek": int(row.day_of_week) if row.day_of_week is not None else 0,
+                        "hour": int(row.hour) if row.hour is not None else 0,
+                        "count": row.count,
+                    }
+                    for row in rows
+                ]
 
             total_conversations = sum(h["count"] for h in hourly_breakdown)
 
@@ -1259,78 +1322,115 @@ class AggregatedAnalyticsService:
             cutoff_date = datetime.utcnow() - timedelta(days=days)
             prev_cutoff = datetime.utcnow() - timedelta(days=days * 2)
 
-            # Query customer messages for text-based sentiment
-            result = await self.db.execute(
-                select(Message)
-                .join(Conversation, Message.conversation_id == Conversation.id)
-                .where(Conversation.merchant_id == merchant_id)
-                .where(Message.sender == "customer")
-                .where(Message.created_at >= cutoff_date)
-                .order_by(Message.created_at.desc())
-            )
-            messages = result.scalars().all()
-
-            # Query explicit feedback (thumbs up/down)
-            # Include both widget feedback (by merchant_id) and conversation feedback
-            feedback_result = await self.db.execute(
-                select(MessageFeedback)
-                .where(
-                    or_(
-                        MessageFeedback.merchant_id == merchant_id,
-                        MessageFeedback.conversation_id.in_(
-                            select(Conversation.id).where(Conversation.merchant_id == merchant_id)
-                        ),
+            daily_sentiment: dict[str, dict[str, int]] = {}
+            rollups = await self._rollups_for(merchant_id, prev_cutoff.date())
+            if rollups is not None:
+                current_rows = await rollups.daily_rows(
+                    merchant_id, cutoff_date.date(), datetime.now(UTC).date()
+                )
+                for row in current_rows:
+                    day_positive = row.sentiment_positive + row.feedback_positive * 2
+                    day_negative = row.sentiment_negative + row.feedback_negative * 2
+                    if day_positive or day_negative or row.sentiment_neutral:
+                        daily_sentiment[row.day.isoformat()] = {
+                            "positive": day_positive,
+                            "negative": day_negative,
+                            "neutral": row.sentiment_neutral,
+                        }
+                total_positive = sum(r.sentiment_positive for r in current_rows)
+                total_negative = sum(r.sentiment_negative for r in current_rows)
+                total_neutral = sum(r.sentiment_neutral for r in current_rows)
+                feedback_positive = sum(r.feedback_positive for r in current_rows)
+                feedback_negative = sum(r.feedback_negative for r in current_rows)
+
+                prev_rows = await rollups.daily_rows(
+                    merchant_id, prev_cutoff.date(), cutoff_date.date() - timedelta(days=1)
+                )
+                prev_positive = sum(r.sentiment_positive for r in prev_rows)
+                prev_negative = sum(r.sentiment_negative for r in prev_rows)
+                prev_neutral = sum(r.sentiment_neutral for r in prev_rows)
+                prev_feedback_positive = sum(r.feedback_positive for r in prev_rows)
+                prev_feedback_negative = sum(r.feedback_negative for r in prev_rows)
+            else:
+                # Text-based sentiment, stored on customer messages at write time
+                message_days = await customer_sentiment_by_day(self.db, merchant_id, cutoff_date)
+
+                # Query explicit feedback (thumbs up/down)
+                # Include both widget feedback (by merchant_id) and conversation feedback
+                feedback_result = await self.db.execute(
+                    select(MessageFeedback)
+                    .where(
+                        or_(
+                            MessageFeedback.merchant_id == merchant_id,
+                            MessageFeedback.conversation_id.in_(
+                                select(Conversation.id).where(
+                                    Conversation.merchant_id == merchant_id
+                                )
+                            ),
+                        )
                     )
+                    .where(MessageFeedback.created_at >= cutoff_date)
                 )
-                .where(MessageFeedback.created_at >= cutoff_date)
-            )
-            feedbacks = feedback_result.scalars().all()
+                feedbacks = feedback_result.scalars().all()
 
-            logger.info(
-                "sentiment_trend_feedback_queried",
-                merchant_id=merchant_id,
-                cutoff_date=cutoff_date.isoformat(),
-                feedback_count=len(feedbacks),
-                feedback_ids=[f.id for f in feedbacks],
-            )
+                logger.info(
+                    "sentiment_trend_feedback_queried",
+                    merchant_id=merchant_id,
+                    cutoff_date=cutoff_date.isoformat(),
+                    feedback_count=len(feedbacks),
+                    feedback_ids=[f.id for f in feedbacks],
+                )
 
-            daily_sentiment: dict[str, dict[str, int]] = {}
-            total_positive = 0
-            total_negative = 0
-            total_neutral = 0
-            feedback_positive = 0
-            feedback_negative = 0
-
-            # Process text-based sentiment
-            for msg in messages:
-                content = msg.decrypted_content if msg.sender == "customer" else msg.content
-                sentiment = analyze_sentiment(content)
-                date_key = msg.created_at.strftime("%Y-%m-%d")
-
-                if date_key not in daily_sentiment:
-                    daily_sentiment[date_key] = {"positive": 0, "negative": 0, "neutral": 0}
-
-                daily_sentiment[date_key][sentiment] += 1
-
-                if sentiment == "positive":
-                    total_positive += 1
-                elif sentiment == "negative":
-                    total_negative += 1
-                else:
-                    total_neutral += 1
+                total_positive = 0
+                total_negative = 0
+                total_neutral = 0
+                feedback_positive = 0
+                feedback_negative = 0
+
+                for day, counts in message_days.items():
+                    daily_sentiment[day.isoformat()] = dict(counts)
+                    total_positive += counts["positive"]
+                    total_negative += counts["negative"]
+                    total_neutral += counts["neutral"]
+
+                # Process explicit feedback (weighted 2x)
+                for fb in feedbacks:
+                    date_key = fb.created_at.strftime("%Y-%m-%d")
+                    if date_key not in daily_sentiment:
+                        daily_sentiment[date_key] = {"positive": 0, "negative": 0, "neutral": 0}
+
+                    if fb.rating == FeedbackRating.POSITIVE:
+                        feedback_positive += 1
+                        daily_sentiment[date_key]["positive"] += 2  # 2x weight
+                    elif fb.rating == FeedbackRating.NEGATIVE:
+                        feedback_negative += 1
+                        daily_sentiment[date_key]["negative"] += 2  # 2x weight
+
+                # Previous period for trend comparison
+                prev_message_days = await customer_sentiment_by_day(
+                    self.db, merchant_id, prev_cutoff, cutoff_date
+                )
+
+                prev_feedback_result = await self.db.execute(
+                    select(MessageFeedback)
+                    .join(Conversation, MessageFeedback.conversation_id == Conversation.id)
+                    .where(Conversation.merchant_id == merchant_id)
+                    .where(MessageFeedback.created_at >= prev_cutoff)
+                    .where(MessageFeedback.created_at < cutoff_date)
+                )
+                prev_feedbacks = prev_feedback_result.scalars().all()
 
-            # Process explicit feedback (weighted 2x)
-            for fb in feedbacks:
-                date_key = fb.created_at.strftime("%Y-%m-%d")
-                if date_key not in daily_sentiment:
-                    daily_sentiment[date_key] = {"positive": 0, "negative": 0, "neutral": 0}
+                prev_positive = sum(c["positive"] for c in prev_message_days.values())
+                prev_negative = sum(c["negative"] for c in prev_message_days.values())
+                prev_neutral = sum(c["neutral"] for c in prev_message_days.values())
+                prev_feedback_positive = 0
+                prev_feedback_negative = 0
 
-                if fb.rating == FeedbackRating.POSITIVE:
-                    feedback_positive += 1
-                    daily_sentiment[date_key]["positive"] += 2  # 2x weight
-                elif fb.rating == FeedbackRating.NEGATIVE:
-                    feedback_negative += 1
-                    daily_sentiment[date_key]["negative"] += 2  # 2x weight
+                for fb in prev_feedbacks:
+                    if fb.rating == FeedbackRating.POSITIVE:
+                        prev_feedback_positive += 1
+                    elif fb.rating == FeedbackRating.NEGATIVE:
+                        prev_feedback_negative += 1
 
             total_messages = total_positive + total_negative + total_neutral
             total_feedback = feedback_positive + feedback_negative
@@ -1344,48 +1444,6 @@ class AggregatedAnalyticsService:
                 combined_positive / combined_total if combined_total > 0 else 0.5
             )
 
-            # Previous period for trend comparison
-            prev_result = await self.db.execute(
-                select(Message)
-                .join(Conversation, Message.conversation_id == Conversation.id)
-                .where(Conversation.merchant_id == merchant_id)
-                .where(Message.sender == "customer")
-                .where(Message.created_at >= prev_cutoff)
-                .where(Message.created_at < cutoff_date)
-            )
-            prev_messages = prev_result.scalars().all()
-
-            prev_feedback_result = await self.db.execute(
-                select(MessageFeedback)
-                .join(Conversation, MessageFeedback.conversation_id == Conversation.id)
-                .where(Conversation.merchant_id == merchant_id)
-                .where(MessageFeedback.created_at >= prev_cutoff)
-                .where(MessageFeedback.created_at < cutoff_date)
-            )
-            prev_feedbacks = prev_feedback_result.scalars().all()
-
-            prev_positive = 0
-            prev_negative = 0
-            prev_neutral = 0
-            prev_feedback_positive = 0
-            prev_feedback_negative = 0
-
-            for msg in prev_messages:
-                content = msg.decrypted_content if msg.sender == "customer" else msg.content
-                sentiment = analyze_sentiment(content)
-                if sentiment == "positive":
-                    prev_positive += 1
-                elif sentiment == "negative":
-                    prev_negative += 1
-                else:
-                    prev_neutral += 1
-
-            for fb in prev_feedbacks:
-                if fb.rating == FeedbackRating.POSITIVE:
-                    prev_feedback_positive += 1
-                elif fb.rating == FeedbackRating.NEGATIVE:
-                    prev_feedback_negative += 1
-
             prev_combined_positive = prev_positive + (prev_feedback_positive * 2)
             prev_combined_negative = prev_negative + (prev_feedback_negative * 2)
             prev_combined_total = prev_combined_positive + prev_combined_negative + prev_neutral
@@ -1514,12 +1572,6 @@ class AggregatedAnalyticsService:
             )
             successful_matches = matched_result.scalar() or 0
 
-            no_match_rate = 0.0
-            if total_queries > 0:
-                no_match_rate = round(
-                    ((total_queries - successful_matches) / total_queries) * 100, 1
-                )
-
             confidence_result = await self.db.execute(
                 select(func.avg(RAGQueryLog.confidence))
                 .where(RAGQueryLog.merchant_id == merchant_id)
@@ -1527,7 +1579,6 @@ class AggregatedAnalyticsService:
                 .where(RAGQueryLog.confidence.isnot(None))
             )
             avg_confidence = confidence_result.scalar()
-            avg_confidence = round(float(avg_confidence), 2) if avg_confidence else None
 
             daily_trend_result = await self.db.execute(
                 select(
@@ -1541,31 +1592,17 @@ class AggregatedAnalyticsService:
                 .group_by(func.date(RAGQueryLog.created_at))
                 .order_by(func.date(RAGQueryLog.created_at))
             )
-            daily_rows = daily_trend_result.all()
+            daily_confidence = [row.avg_confidence for row in daily_trend_result.all()]
 
-            trend = [round(float(row.avg_confidence or 0), 2) for row in daily_rows]
-
-            last_updated = datetime.now(UTC).isoformat()
-
-            logger.info(
-                "knowledge_effectiveness_retrieved",
-                merchant_id=merchant_id,
-                days=days,
-                total_queries=total_queries,
-                successful_matches=successful_matches,
-                no_match_rate=no_match_rate,
-                avg_confidence=avg_confidence,
+            return self.knowledge_effectiveness_from_totals(
+                merchant_id,
+                days,
+                total_queries,
+                successful_matches,
+                avg_confidence,
+                daily_confidence,
             )
 
-            return {
-                "totalQueries": total_queries,
-                "successfulMatches": successful_matches,
-                "noMatchRate": no_match_rate,
-                "avgConfidence": avg_confidence,
-                "trend": trend,
-                "lastUpdated": last_updated,
-            }
-
         except Exception as e:
             logger.error(
                 "knowledge_effectiveness_failed",
@@ -1574,6 +1611,56 @@ class AggregatedAnalyticsService:
             )
             raise
 
+    def knowledge_effectiveness_from_totals(
+        self,
+        merchant_id: int,
+        days: int,
+        total_queries: int,
+        successful_matches: int,
+        avg_confidence: float | None,
+        daily_confidence: list[float | None],
+    ) -> dict[str, Any]:
+        """Build the knowledge effectiveness payload from aggregated RAG query totals.
+
+        Args:
+            merchant_id: Merchant ID (for logging)
+            days: Number of days analyzed
+            total_queries: RAG queries in the period
+            successful_matches: Matched RAG queries in the period
+            avg_confidence: Average confidence of queries with a confidence
+            daily_confidence: Average confidence of matched queries per day, oldest first
+
+        Returns:
+            Dict with knowledge effectiveness metrics
+        """
+        no_match_rate = 0.0
+        if total_queries > 0:
+            no_match_rate = round(
+                ((total_queries - successful_matches) / total_queries) * 100, 1
+            )
+
+        avg_confidence = round(float(avg_confidence), 2) if avg_confidence else None
+        trend = [round(float(value or 0), 2) for value in daily_confidence]
+
+        logger.info(
+            "knowledge_effectiveness_retrieved",
+            merchant_id=merchant_id,
+            days=days,
+            total_queries=total_queries,
+            successful_matches=successful_matches,
+            no_match_rate=no_match_rate,
+            avg_confidence=avg_confidence,
+        )
+
+        return {
+            "totalQueries": total_queries,
+            "successfulMatches": successful_matches,
+            "noMatchRate": no_match_rate,
+            "avgConfidence": avg_confidence,
+            "trend": trend,
+            "lastUpdated": datetime.now(UTC).isoformat(),
+        }
+
     async def get_top_topics(
         self,
         merchant_id: int,
@@ -1639,89 +1726,120 @@ class AggregatedAnalyticsService:
             previous_rows = previous_result.all()
             previous_counts = {row.query: row.query_count for row in previous_rows}
 
-            topics = []
-            for row in current_rows:
-                # Decrypt topic name if encrypted (Fernet-encrypted queries)
-                try:
-                    topic_name = decrypt_conversation_content(row.query)
-
-                    # Verify decryption worked - check if result is still encrypted
-                    if is_encrypted(topic_name):
-                        logger.warning(
-                            "topic_decryption_failed",
-                            merchant_id=merchant_id,
-                            query_prefix=row.query[:20] if row.query else None,
-                        )
-                        # Mark as encrypted for frontend to handle gracefully
-                        topic_name = f"[Encrypted] {topic_name[:16]}..."
-                except Exception as e:
-                    logger.error(
-                        "topic_decryption_error",
-                        merchant_id=merchant_id,
-                        error=str(e),
-                        query_prefix=row.query[:20] if row.query else None,
-                    )
-                    topic_name = row.query
+            return self.top_topics_from_rows(
+                merchant_id,
+                days,
+                current_rows,
+                previous_counts,
+                current_period_start,
+                current_period_end,
+            )
 
-                current_count = row.query_count
-                previous_count = previous_counts.get(topic_name, 0)
+        except Exception as e:
+            logger.error(
+                "top_topics_failed",
+                merchant_id=merchant_id,
+                error=str(e),
+            )
+            raise
 
-                if previous_count == 0:
-                    trend = "new"
-                else:
-                    change = ((current_count - previous_count) / previous_count) * 100
-                    if change > 10:
-                        trend = "up"
-                    elif change < -10:
-                        trend = "down"
-                    else:
-                        trend = "stable"
+    def top_topics_from_rows(
+        self,
+        merchant_id: int,
+        days: int,
+        current_rows: list[Any],
+        previous_counts: dict[str, int],
+        current_period_start: datetime,
+        current_period_end: datetime,
+    ) -> dict[str, Any]:
+        """Build the top topics payload from per-query counts.
 
-                topics.append(
-                    {
-                        "name": topic_name,
-                        "queryCount": current_count,
-                        "trend": trend,
-                    }
-                )
+        Args:
+            merchant_id: Merchant ID (for logging)
+            days: Number of days analyzed
+            current_rows: Top queries of the period (``query``, ``query_count``), most asked first
+            previous_counts: Query counts of the previous period
+            current_period_start: Start of the period
+            current_period_end: End of the period
 
-            # Monitor decryption success/failure
-            decryption_failures = sum(1 for t in topics if t["name"].startswith("[Encrypted]"))
-            if decryption_failures > 0:
-                logger.warning(
-                    "topic_decryption_summary",
+        Returns:
+            Dict with topics data
+        """
+        topics = []
+        for row in current_rows:
+            # Decrypt topic name if encrypted (Fernet-encrypted queries)
+            try:
+                topic_name = decrypt_conversation_content(row.query)
+
+                # Verify decryption worked - check if result is still encrypted
+                if is_encrypted(topic_name):
+                    logger.warning(
+                        "topic_decryption_failed",
+                        merchant_id=merchant_id,
+                        query_prefix=row.query[:20] if row.query else None,
+                    )
+                    # Mark as encrypted for frontend to handle gracefully
+                    topic_name = f"[Encrypted] {topic_name[:16]}..."
+            except Exception as e:
+                logger.error(
+                    "topic_decryption_error",
                     merchant_id=merchant_id,
-                    failures=decryption_failures,
-                    total=len(topics),
+                    error=str(e),
+                    query_prefix=row.query[:20] if row.query else None,
                 )
+                topic_name = row.query
 
-            period_data = {
-                "days": days,
-                "startDate": current_period_start.isoformat(),
-                "endDate": current_period_end.isoformat(),
-            }
+            current_count = row.query_count
+            previous_count = previous_counts.get(topic_name, 0)
 
-            logger.info(
-                "top_topics_retrieved",
-                merchant_id=merchant_id,
-                days=days,
-                topic_count=len(topics),
-                decryption_failures=decryption_failures,
-            )
+            if previous_count == 0:
+                trend = "new"
+            else:
+                change = ((current_count - previous_count) / previous_count) * 100
+                if change > 10:
+                    trend = "up"
+                elif change < -10:
+                    trend = "down"
+                else:
+                    trend = "stable"
 
-            return {
-                "topics": topics,
-                "lastUpdated": datetime.now(UTC).isoformat(),
-                "period": period_data,
-            }
+            topics.append(
+                {
+                    "name": topic_name,
+                    "queryCount": current_count,
+                    "trend": trend,
+                }
+            )
 
-        except Exception as e:
-            logger.error(
-                "top_topics_failed",
+        # Monitor decryption success/failure
+        decryption_failures = sum(1 for t in topics if t["name"].startswith("[Encrypted]"))
+        if decryption_failures > 0:
+            logger.warning(
+                "topic_decryption_summary",
                 merchant_id=merchant_id,
-                error=str(e),
+                failures=decryption_failures,
+                total=len(topics),
             )
-            raise
+
+        period_data = {
+            "days": days,
+            "startDate": current_period_start.isoformat(),
+            "endDate": current_period_end.isoformat(),
+        }
+
+        logger.info(
+            "top_topics_retrieved",
+            merchant_id=merchant_id,
+            days=days,
+            topic_count=len(topics),
+            decryption_failures=decryption_failures,
+        )
+
+        return {
+            "topics": topics,
+            "lastUpdated": datetime.now(UTC).isoformat(),
+            "period": period_data,
+        }
 
     async def get_response_time_distribution(
         self,
@@ -1751,17 +1869,49 @@ class AggregatedAnalyticsService:
             days = min(max(1, days), 30)
             cutoff_date = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=days)
 
-            result = await self.db.execute(
-                select(LLMConversationCost.processing_time_ms, LLMConversationCost.response_type)
-                .where(LLMConversationCost.merchant_id == merchant_id)
-                .where(LLMConversationCost.created_at >= cutoff_date)
-                .where(LLMConversationCost.processing_time_ms.isnot(None))
-                .order_by(LLMConversationCost.created_at)
-            )
-            rows = result.all()
-            times = [float(row.processing_time_ms) for row in rows]
+            BUCKETS = [
+                {"label": "0-1s", "min": 0, "max": 1000, "color": "green"},
+                {"label": "1-2s", "min": 1000, "max": 2000, "color": "green"},
+                {"label": "2-3s", "min": 2000, "max": 3000, "color": "green"},
+                {"label": "3-5s", "min": 3000, "max": 5000, "color": "yellow"},
+                {"label": "5s+", "min": 5000, "max": None, "color": "red"},
+            ]
+
+            prev_start_day = (cutoff_date - timedelta(days=days)).date()
+            rollups = await self._rollups_for(merchant_id, prev_start_day)
+            if rollups is not None:
+                current_rows = await rollups.daily_rows(
+                    merchant_id, cutoff_date.date(), datetime.now(UTC).date()
+                )
+                current = merged_histogram(current_rows)
+                rag = merged_histogram(current_rows, "rag")
+                general = merged_histogram(current_rows, "general")
+                previous = merged_histogram(
+                    await rollups.daily_rows(
+                        merchant_id, prev_start_day, cutoff_date.date() - timedelta(days=1)
+                    )
+                )
+                stats = ResponseTimeStats(
+                    count=current.count,
+                    percentiles=current.percentiles(),
+                    histogram=[
+                        {
+                            "label": b["label"],
+                            "count": current.count_between(b["min"], b["max"]),
+                            "color": b["color"],
+                        }
+                        for b in BUCKETS
+                    ],
+                    previous_percentiles=previous.percentiles(),
+                    rag_count=rag.count,
+                    rag_percentiles=rag.percentiles(),
+                    general_count=general.count,
+                    general_percentiles=general.percentiles(),
+                )
+            else:
+                stats = await self._raw_response_times(merchant_id, days, cutoff_date, BUCKETS)
 
-            if not times:
+            if not stats.count:
                 return {
                     "percentiles": {"p50": None, "p95": None, "p99": None},
                     "histogram": [],
@@ -1775,60 +1925,12 @@ class AggregatedAnalyticsService:
                     "count": 0,
                 }
 
-            times_sorted = sorted(times)
-            count = len(times_sorted)
-
-            def percentile(data: list[float], p: float) -> int | None:
-                if not data:
-                    return None
-                k = (len(data) - 1) * p / 100
-                f = int(k)
-                c = f + 1 if f + 1 < len(data) else f
-                if f == c:
-                    return int(data[f])
-                return int(data[f] * (c - k) + data[c] * (k - f))
-
-            p50 = percentile(times_sorted, 50)
-            p95 = percentile(times_sorted, 95)
-            p99 = percentile(times_sorted, 99)
-
-            BUCKETS = [
-                {"label": "0-1s", "min": 0, "max": 1000, "color": "green"},
-                {"label": "1-2s", "min": 1000, "max": 2000, "color": "green"},
-                {"label": "2-3s", "min": 2000, "max": 3000, "color": "green"},
-                {"label": "3-5s", "min": 3000, "max": 5000, "color": "yellow"},
-                {"label": "5s+", "min": 5000, "max": None, "color": "red"},
-            ]
-
-            histogram = [{"label": b["label"], "count": 0, "color": b["color"]} for b in BUCKETS]
-
-            for time_ms in times:
-                for i, bucket in enumerate(BUCKETS):
-                    if bucket["max"] is None:
-                        if time_ms >= bucket["min"]:
-                            histogram[i]["count"] += 1
-                            break
-                    else:
-                        if bucket["min"] <= time_ms < bucket["max"]:
-                            histogram[i]["count"] += 1
-                            break
-
-            prev_cutoff = cutoff_date - timedelta(days=days)
-            prev_end = cutoff_date
-
-            prev_result = await self.db.execute(
-                select(LLMConversationCost.processing_time_ms)
-                .where(LLMConversationCost.merchant_id == merchant_id)
-                .where(LLMConversationCost.created_at >= prev_cutoff)
-                .where(LLMConversationCost.created_at < prev_end)
-                .where(LLMConversationCost.processing_time_ms.isnot(None))
-                .order_by(LLMConversationCost.created_at)
-            )
-            prev_times = [float(row.processing_time_ms) for row in prev_result.all()]
-
-            prev_p50 = percentile(sorted(prev_times), 50) if prev_times else None
-            prev_p95 = percentile(sorted(prev_times), 95) if prev_times else None
-            prev_p99 = percentile(sorted(prev_times), 99) if prev_times else None
+            p50 = stats.percentiles["p50"]
+            p95 = stats.percentiles["p95"]
+            p99 = stats.percentiles["p99"]
+            prev_p50 = stats.previous_percentiles["p50"]
+            prev_p95 = stats.previous_percentiles["p95"]
+            prev_p99 = stats.previous_percentiles["p99"]
 
             comparison = None
             if p50 is not None and prev_p50 is not None:
@@ -1871,31 +1973,11 @@ class AggregatedAnalyticsService:
                         "severity": "warning",
                     }
 
-            rag_times = [
-                float(row.processing_time_ms) for row in rows if row.response_type == "rag"
-            ]
-            general_times = [
-                float(row.processing_time_ms)
-                for row in rows
-                if row.response_type in ("general", "unknown", None)
-            ]
-
-            rag_p50 = percentile(sorted(rag_times), 50) if rag_times else None
-            rag_p95 = percentile(sorted(rag_times), 95) if rag_times else None
-            rag_p99 = percentile(sorted(rag_times), 99) if rag_times else None
-
-            general_p50 = percentile(sorted(general_times), 50) if general_times else None
-            general_p95 = percentile(sorted(general_times), 95) if general_times else None
-            general_p99 = percentile(sorted(general_times), 99) if general_times else None
-
             response_type_breakdown = {
-                "rag": {
-                    "count": len(rag_times),
-                    "percentiles": {"p50": rag_p50, "p95": rag_p95, "p99": rag_p99},
-                },
+                "rag": {"count": stats.rag_count, "percentiles": stats.rag_percentiles},
                 "general": {
-                    "count": len(general_times),
-                    "percentiles": {"p50": general_p50, "p95": general_p95, "p99": general_p99},
+                    "count": stats.general_count,
+                    "percentiles": stats.general_percentiles,
                 },
             }
 
@@ -1903,17 +1985,17 @@ class AggregatedAnalyticsService:
                 "response_time_distribution_retrieved",
                 merchant_id=merchant_id,
                 days=days,
-                count=count,
+                count=stats.count,
                 p50=p50,
                 p95=p95,
                 p99=p99,
-                rag_count=len(rag_times),
-                general_count=len(general_times),
+                rag_count=stats.rag_count,
+                general_count=stats.general_count,
             )
 
             return {
                 "percentiles": {"p50": p50, "p95": p95, "p99": p99},
-                "histogram": histogram,
+                "histogram": stats.histogram,
                 "previousPeriod": {
                     "percentiles": {"p50": prev_p50, "p95": prev_p95, "p99": prev_p99},
                     "comparison": comparison,
@@ -1921,7 +2003,7 @@ class AggregatedAnalyticsService:
                 "warning": warning,
                 "lastUpdated": datetime.now(UTC).isoformat(),
                 "period": f"{days}d",
-                "count": count,
+                "count": stats.count,
                 "responseTypeBreakdown": response_type_breakdown,
             }
 
@@ -1933,6 +2015,76 @@ class AggregatedAnalyticsService:
             )
             raise
 
+    async def _raw_response_times(
+        self,
+        merchant_id: int,
+        days: int,
+        cutoff_date: datetime,
+        buckets: list[dict[str, Any]],
+    ) -> ResponseTimeStats:
+        """Response-time percentiles and histogram aggregated from raw LLM cost rows.
+
+        Fallback for get_response_time_distribution when rollups do not cover
+        the window. Both periods and the RAG/general breakdown come from a
+        single scan; percentiles and buckets are computed by the database.
+        """
+        samples = (
+            select(
+                case(
+                    (LLMConversationCost.created_at >= cutoff_date, "current"),
+                    else_="previous",
+                ).label("period"),
+                LLMConversationCost.processing_time_ms.label("time_ms"),
+                LLMConversationCost.response_type,
+            )
+            .where(LLMConversationCost.merchant_id == merchant_id)
+            .where(LLMConversationCost.created_at >= cutoff_date - timedelta(days=days))
+            .where(LLMConversationCost.processing_time_ms.isnot(None))
+            .subquery()
+        )
+        time_ms = samples.c.time_ms
+        rag_ms = case((samples.c.response_type == "rag", time_ms))
+        general_ms = case(
+            (
+                or_(
+                    samples.c.response_type.in_(("general", "unknown")),
+                    samples.c.response_type.is_(None),
+                ),
+                time_ms,
+            )
+        )
+
+        result = await self.db.execute(
+            select(
+                samples.c.period,
+                func.count().label("total"),
+                *percentile_columns(time_ms),
+                *bucket_count_columns(time_ms, buckets),
+                func.count(rag_ms).label("rag_total"),
+                *percentile_columns(rag_ms, prefix="rag_"),
+                func.count(general_ms).label("general_total"),
+                *percentile_columns(general_ms, prefix="general_"),
+            ).group_by(samples.c.period)
+        )
+        rows = {row.period: row for row in result.all()}
+        current_row = rows.get("current")
+        previous_row = rows.get("previous")
+
+        if current_row is None:
+            empty = percentiles_from_row(None)
+            return ResponseTimeStats(0, empty, [], empty, 0, empty, 0, empty)
+
+        return ResponseTimeStats(
+            count=current_row.total,
+            percentiles=percentiles_from_row(current_row),
+            histogram=bucket_counts_from_row(current_row, buckets),
+            previous_percentiles=percentiles_from_row(previous_row),
+            rag_count=current_row.rag_total,
+            rag_percentiles=percentiles_from_row(current_row, prefix="rag_"),
+            general_count=current_row.general_total,
+            general_percentiles=percentiles_from_row(current_row, prefix="general_"),
+        )
+
     async def get_faq_usage(
         self,
         merchant_id: int,
@@ -1967,46 +2119,75 @@ class AggregatedAnalyticsService:
             prev_cutoff = cutoff_date - timedelta(days=days)
             prev_end = cutoff_date
 
-            current_result = await self.db.execute(
-                select(
-                    Faq.id,
-                    Faq.question,
-                    func.count(FaqInteractionLog.id).label("click_count"),
-                    func.sum(FaqInteractionLog.had_followup).label("followup_count"),
+            rollups = await self._rollups_for(merchant_id, prev_cutoff.date())
+            if rollups is not None:
+                current_totals = await rollups.faq_totals(
+                    merchant_id, cutoff_date.date(), datetime.now(UTC).date()
                 )
-                .outerjoin(
-                    FaqInteractionLog,
-                    and_(
-                        FaqInteractionLog.faq_id == Faq.id,
-                        FaqInteractionLog.merchant_id == merchant_id,
-                        FaqInteractionLog.clicked_at >= cutoff_date,
-                    ),
+                prev_totals = await rollups.faq_totals(
+                    merchant_id, prev_cutoff.date(), cutoff_date.date() - timedelta(days=1)
                 )
-                .where(Faq.merchant_id == merchant_id)
-                .group_by(Faq.id, Faq.question)
-                .order_by(func.count(FaqInteractionLog.id).desc())
-            )
-            current_rows = current_result.all()
-
-            prev_result = await self.db.execute(
-                select(
-                    Faq.id,
-                    func.count(FaqInteractionLog.id).label("click_count"),
-                    func.sum(FaqInteractionLog.had_followup).label("followup_count"),
+                faq_result = await self.db.execute(
+                    select(Faq.id, Faq.question).where(Faq.merchant_id == merchant_id)
                 )
-                .outerjoin(
-                    FaqInteractionLog,
-                    and_(
-                        FaqInteractionLog.faq_id == Faq.id,
-                        FaqInteractionLog.merchant_id == merchant_id,
-                        FaqInteractionLog.clicked_at >= prev_cutoff,
-                        FaqInteractionLog.clicked_at < prev_end,
+                current_rows = sorted(
+                    (
+                        SimpleNamespace(
+                            id=faq.id,
+                            question=faq.question,
+                            click_count=current_totals.get(faq.id, (0, 0))[0],
+                            followup_count=current_totals.get(faq.id, (0, 0))[1],
+                        )
+                        for faq in faq_result.all()
                     ),
+                    key=lambda row: row.click_count,
+                    reverse=True,
                 )
-                .where(Faq.merchant_id == merchant_id)
-                .group_by(Faq.id)
-            )
-            prev_data = {row.id: row for row in prev_result.all()}
+                prev_data = {
+                    faq_id: SimpleNamespace(click_count=clicks, followup_count=followups)
+                    for faq_id, (clicks, followups) in prev_totals.items()
+                }
+            else:
+                current_result = await self.db.execute(
+                    select(
+                        Faq.id,
+                        Faq.question,
+                        func.count(FaqInteractionLog.id).label("click_count"),
+                        func.sum(FaqInteractionLog.had_followup).label("followup_count"),
+                    )
+                    .outerjoin(
+                        FaqInteractionLog,
+                        and_(
+                            FaqInteractionLog.faq_id == Faq.id,
+                            FaqInteractionLog.merchant_id == merchant_id,
+                            FaqInteractionLog.clicked_at >= cutoff_date,
+                        ),
+                    )
+                    .where(Faq.merchant_id == merchant_id)
+                    .group_by(Faq.id, Faq.question)
+                    .order_by(func.count(FaqInteractionLog.id).desc())
+                )
+                current_rows = current_result.all()
+
+                prev_result = await self.db.execute(
+                    select(
+                        Faq.id,
+                        func.count(FaqInteractionLog.id).label("click_count"),
+                        func.sum(FaqInteractionLog.had_followup).label("followup_count"),
+                    )
+                    .outerjoin(
+                        FaqInteractionLog,
+                        and_(
+                            FaqInteractionLog.faq_id == Faq.id,
+                            FaqInteractionLog.merchant_id == merchant_id,
+                            FaqInteractionLog.clicked_at >= prev_cutoff,
+                            FaqInteractionLog.clicked_at < prev_end,
+                        ),
+                    )
+                    .where(Faq.merchant_id == merchant_id)
+                    .group_by(Faq.id)
+                )
+                prev_data = {row.id: row for row in prev_result.all()}
 
             faq_items = []
             unused_faqs = []
@@ -2783,67 +2964,78 @@ class AggregatedAnalyticsService:
                 .order_by(desc(func.count(RAGQueryLog.id)))
             )
             rows = result.all()
+            return self.question_categories_from_rows(rows)
 
-            # Categorize queries
-            categories = {}
-            for row in rows:
-                query_lower = row.query.lower()
-                category = self._categorize_query(query_lower)
-
-                if category not in categories:
-                    categories[category] = {
-                        "category": category,
-                        "volume": 0,
-                        "matchedCount": 0,
-                        "totalConfidence": 0,
-                        "queries": [],
-                    }
-
-                categories[category]["volume"] += row.volume or 0
-                categories[category]["matchedCount"] += row.matched_count or 0
-                if row.avg_confidence:
-                    categories[category]["totalConfidence"] += float(row.avg_confidence) * (
-                        row.volume or 0
-                    )
-                categories[category]["queries"].append(row.query)
+        except Exception as e:
+            logger.error(
+                "question_categories_failed",
+                merchant_id=merchant_id,
+                error=str(e),
+            )
+            raise
 
-            # Calculate metrics per category
-            category_list = []
-            for cat_name, cat_data in categories.items():
-                volume = cat_data["volume"]
-                matched = cat_data["matchedCount"]
-                avg_conf = cat_data["totalConfidence"] / volume if volume > 0 else 0
-                match_rate = (matched / volume) if volume > 0 else 0
+    def question_categories_from_rows(self, rows: list[Any]) -> list[dict[str, Any]]:
+        """Build question categories from per-query totals.
 
-                # Determine trend (simplified - could implement proper trend analysis)
-                trend = "stable"
+        Args:
+            rows: Per-query rows (``query``, ``volume``, ``matched_count``,
+                ``avg_confidence``), highest volume first
 
-                # Get top 2 questions for this category
-                top_queries = cat_data["queries"][:2]
+        Returns:
+            Categories with volume, match rate and top questions, highest volume first
+        """
+        # Categorize queries
+        categories = {}
+        for row in rows:
+            query_lower = row.query.lower()
+            category = self._categorize_query(query_lower)
+
+            if category not in categories:
+                categories[category] = {
+                    "category": category,
+                    "volume": 0,
+                    "matchedCount": 0,
+                    "totalConfidence": 0,
+                    "queries": [],
+                }
 
-                category_list.append(
-                    {
-                        "category": cat_name,
-                        "volume": volume,
-                        "matchRate": match_rate,
-                        "avgConfidence": avg_conf,
-                        "trend": trend,
-                        "topQuestions": top_queries,
-                    }
+            categories[category]["volume"] += row.volume or 0
+            categories[category]["matchedCount"] += row.matched_count or 0
+            if row.avg_confidence:
+                categories[category]["totalConfidence"] += float(row.avg_confidence) * (
+                    row.volume or 0
                 )
+            categories[category]["queries"].append(row.query)
 
-            # Sort by volume
-            category_list.sort(key=lambda x: x["volume"], reverse=True)
+        # Calculate metrics per category
+        category_list = []
+        for cat_name, cat_data in categories.items():
+            volume = cat_data["volume"]
+            matched = cat_data["matchedCount"]
+            avg_conf = cat_data["totalConfidence"] / volume if volume > 0 else 0
+            match_rate = (matched / volume) if volume > 0 else 0
 
-            return category_list
+            # Determine trend (simplified - could implement proper trend analysis)
+            trend = "stable"
 
-        except Exception as e:
-            logger.error(
-                "question_categories_failed",
-                merchant_id=merchant_id,
-                error=str(e),
+            # Get top 2 questions for this category
+            top_queries = cat_data["queries"][:2]
+
+            category_list.append(
+                {
+                    "category": cat_name,
+                    "volume": volume,
+                    "matchRate": match_rate,
+                    "avgConfidence": avg_conf,
+                    "trend": trend,
+                    "topQuestions": top_queries,
+                }
             )
-            raise
+
+        # Sort by volume
+        category_list.sort(key=lambda x: x["volume"], reverse=True)
+
+        return category_list
 
     def _categorize_query(self, query: str) -> str:
         """Categorize a query based on keywords."""
@@ -2897,37 +3089,7 @@ class AggregatedAnalyticsService:
                 .limit(limit)
             )
             rows = result.all()
-
-            failed_queries = []
-            for row in rows:
-                query_lower = row.query.lower()
-                category = self._categorize_query(query_lower)
-
-                # Determine suggested action
-                if row.query.endswith("?"):
-                    suggested_action = "add_faq"
-                elif any(word in query_lower for word in ["product", "item", "specification"]):
-                    suggested_action = "upload_document"
-                else:
-                    suggested_action = "update_document"
-
-                # Calculate estimated impact (frequency * 0.1 = 10% handoff reduction per fix)
-                estimated_impact = (row.frequency or 0) * 0.1
-
-                failed_queries.append(
-                    {
-                        "query": row.query,
-                        "frequency": row.frequency or 0,
-                        "lastAsked": row.last_asked.isoformat()
-                        if row.last_asked
-                        else datetime.utcnow().isoformat(),
-                        "suggestedAction": suggested_action,
-                        "estimatedImpact": estimated_impact,
-                        "category": category,
-                    }
-                )
-
-            return failed_queries
+            return self.failed_queries_from_rows(rows)
 
         except Exception as e:
             logger.error(
@@ -2937,6 +3099,46 @@ class AggregatedAnalyticsService:
             )
             raise
 
+    def failed_queries_from_rows(self, rows: list[Any]) -> list[dict[str, Any]]:
+        """Build failed query entries from per-query unmatched totals.
+
+        Args:
+            rows: Per-query rows (``query``, ``frequency``, ``last_asked``), most frequent first
+
+        Returns:
+            Failed queries with suggested action, estimated impact and category
+        """
+        failed_queries = []
+        for row in rows:
+            query_lower = row.query.lower()
+            category = self._categorize_query(query_lower)
+
+            # Determine suggested action
+            if row.query.endswith("?"):
+                suggested_action = "add_faq"
+            elif any(word in query_lower for word in ["product", "item", "specification"]):
+                suggested_action = "upload_document"
+            else:
+                suggested_action = "update_document"
+
+            # Calculate estimated impact (frequency * 0.1 = 10% handoff reduction per fix)
+            estimated_impact = (row.frequency or 0) * 0.1
+
+            failed_queries.append(
+                {
+                    "query": row.query,
+                    "frequency": row.frequency or 0,
+                    "lastAsked": row.last_asked.isoformat()
+                    if row.last_asked
+                    else datetime.utcnow().isoformat(),
+                    "suggestedAction": suggested_action,
+                    "estimatedImpact": estimated_impact,
+                    "category": category,
+                }
+            )
+
+        return failed_queries
+
     async def get_performance_alerts(
         self,
         merchant_id: int,
@@ -0,0 +1,311 @@
+"""Per-merchant cache of dashboard analytics results.
+
+The dashboard polls every analytics route together, and a merchant with the
+dashboard open in several tabs used to run the whole query set once per tab.
+Route results are cached for a short TTL, keyed by merchant, endpoint and
+query parameters:
+
+- L1: in-process LRU with per-entry expiry
+- L2: Redis via the shared connection pool (shared by workers)
+- Single-flight: concurrent identical requests in a worker share one computation
+
+Invalidation uses a per-merchant generation counter that is part of every
+key. Dashboard broadcasts (DashboardConnectionManager.broadcast_to_merchant,
+which RAGQueryBroadcaster publishes through) bump it, so all workers stop
+serving the old results at once. When Redis is unreachable a local counter is
+used and entries only expire by TTL on other workers.
+
+Redis Keys:
+- analytics:result:gen:{merchant_id}
+- analytics:result:{merchant_id}:{generation}:{endpoint}:{sha256(params)}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis.asyncio as redis
+import structlog
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import is_testing, settings
+
+logger = structlog.get_logger(__name__)
+
+
+class AnalyticsResultCache:
+    """Short-TTL L1/Redis cache for analytics route results.
+
+    Features:
+    - Results are stored JSON-encoded, so L1 and Redis hits are identical
+    - Redis hits are promoted into the in-process LRU
+    - Graceful degradation: Redis errors are logged and treated as misses
+    - Per-merchant invalidation across workers
+    - Hit/miss counters via stats()
+    """
+
+    KEY_PREFIX = "analytics:result"
+    DEFAULT_TTL_SECONDS = 30
+    DEFAULT_MAX_ENTRIES = 2048
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        redis_client: redis.Redis | None = None,
+    ) -> None:
+        """Initialize analytics result cache.
+
+        Args:
+            ttl_seconds: Lifetime of a cached result in both tiers
+            max_entries: Maximum entries kept in the in-process LRU
+            redis_client: Optional Redis client for the shared tier
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._local_generations: dict[int, int] = {}
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.shared_computations = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    async def get_or_compute(
+        self,
+        merchant_id: int,
+        endpoint: str,
+        params: dict[str, Any],
+        compute: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Return the cached result for an endpoint call, computing it on a miss.
+
+        Args:
+            merchant_id: Merchant the result belongs to
+            endpoint: Route identifier (e.g. "peak-hours")
+            params: Query parameters that affect the result
+            compute: Async callable producing the result on a miss
+
+        Returns:
+            The JSON-encoded result
+        """
+        key = await self._make_key(merchant_id, endpoint, params)
+
+        value = self._get_local(key)
+        if value is not None:
+            self.local_hits += 1
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                value = await asyncio.shield(inflight)
+                self.shared_computations += 1
+                return value
+            except asyncio.CancelledError:
+                # Only recompute when the leading request was cancelled, not this one
+                if not inflight.cancelled():
+                    raise
+
+        value = await self._get_redis(key)
+        if value is not None:
+            self.redis_hits += 1
+            self._store_local(key, value)
+            return value
+
+        self.misses += 1
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = jsonable_encoder(await compute())
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Waiters re-raise it; don't warn about an unretrieved exception
+                future.exception()
+            raise
+        else:
+            future.set_result(value)
+            self._store_local(key, value)
+            await self._set_redis(key, value)
+            return value
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def invalidate_merchant(self, merchant_id: int) -> None:
+        """Bump the merchant's generation and drop its local results."""
+        self._local_generations[merchant_id] = self._local_generations.get(merchant_id, 0) + 1
+        prefix = f"{self.KEY_PREFIX}:{merchant_id}:"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+        if self.redis is not None:
+            try:
+                await self.redis.incr(self._generation_key(merchant_id))
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning("analytics_cache_generation_bump_failed", error=str(e))
+
+    def clear(self) -> None:
+        """Clear the in-process tier and reset counters."""
+        self._entries.clear()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.shared_computations = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and L1 size."""
+        hits = self.local_hits + self.redis_hits + self.shared_computations
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "shared_computations": self.shared_computations,
+            "misses": self.misses,
+            "inflight": len(self._inflight),
+            "redis_errors": self.redis_errors,
+            "redis_enabled": self.redis is not None,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _generation_key(self, merchant_id: int) -> str:
+        return f"{self.KEY_PREFIX}:gen:{merchant_id}"
+
+    async def _generation(self, merchant_id: int) -> str:
+        local = self._local_generations.get(merchant_id, 0)
+        if self.redis is None:
+            return str(local)
+        try:
+            value = await self.redis.get(self._generation_key(merchant_id))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("analytics_cache_generation_failed", error=str(e))
+            return f"l{local}"
+        return value if value is not None else "0"
+
+    async def _make_key(self, merchant_id: int, endpoint: str, params: dict[str, Any]) -> str:
+        generation = await self._generation(merchant_id)
+        digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        return f"{self.KEY_PREFIX}:{merchant_id}:{generation}:{endpoint}:{digest}"
+
+    def _get_local(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _store_local(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _get_redis(self, key: str) -> Any:
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(key)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("analytics_cache_redis_get_failed", error=str(e))
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def _set_redis(self, key: str, value: Any) -> None:
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(key, json.dumps(value), ex=max(1, int(self.ttl_seconds)))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("analytics_cache_redis_set_failed", error=str(e))
+
+
+_analytics_result_cache: AnalyticsResultCache | None = None
+
+
+def get_analytics_result_cache() -> AnalyticsResultCache | None:
+    """Get the process-wide analytics result cache.
+
+    Returns None when ANALYTICS_CACHE_ENABLED is off, and in IS_TESTING mode
+    (tests inject their own cache). The Redis tier uses the shared pool when
+    ANALYTICS_CACHE_REDIS is true.
+    """
+    global _analytics_result_cache
+    config = settings()
+    if is_testing() or not config.get("ANALYTICS_CACHE_ENABLED", True):
+        return None
+    if _analytics_result_cache is None:
+        redis_client = None
+        if config.get("ANALYTICS_CACHE_REDIS", True):
+            from app.core.redis_pool import get_redis
+
+            redis_client = get_redis()
+
+        _analytics_result_cache = AnalyticsResultCache(
+            ttl_seconds=config.get(
+                "ANALYTICS_CACHE_TTL_SECONDS", AnalyticsResultCache.DEFAULT_TTL_SECONDS
+            ),
+            max_entries=config.get(
+                "ANALYTICS_CACHE_SIZE", AnalyticsResultCache.DEFAULT_MAX_ENTRIES
+            ),
+            redis_client=redis_client,
+        )
+    return _analytics_result_cache
+
+
+async def cached_analytics_result(
+    merchant_id: int,
+    endpoint: str,
+    params: dict[str, Any],
+    compute: Callable[[], Awaitable[Any]],
+    cache: AnalyticsResultCache | None = None,
+) -> Any:
+    """Get an analytics route result through the result cache.
+
+    Args:
+        merchant_id: Merchant the result belongs to
+        endpoint: Route identifier
+        params: Query parameters that affect the result
+        compute: Async callable producing the result on a miss
+        cache: Result cache (optional, defaults to the process-wide cache;
+            bypassed when disabled or in IS_TESTING mode unless injected)
+
+    Returns:
+        The (possibly cached) result
+    """
+    cache = cache if cache is not None else get_analytics_result_cache()
+    if cache is None:
+        return await compute()
+    return await cache.get_or_compute(merchant_id, endpoint, params, compute)
+
+
+async def invalidate_analytics_results(merchant_id: int) -> None:
+    """Drop a merchant's cached analytics results (call when its dashboard data changed)."""
+    cache = get_analytics_result_cache()
+    if cache is not None:
+        await cache.invalidate_merchant(merchant_id)
+        logger.debug("analytics_results_invalidated", merchant_id=merchant_id)
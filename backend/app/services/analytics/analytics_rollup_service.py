@@ -0,0 +1,506 @@
+"""Incremental analytics rollups for the merchant dashboard.
+
+Dashboard widgets used to rescan raw conversations, messages, RAG logs and
+LLM cost rows (often for two 30-90 day periods) on every request. This
+service compacts raw rows into per-merchant daily and hourly rollup tables
+(app/models/analytics_rollup.py) and reads widgets back from them, so
+dashboard cost depends on the number of days shown rather than on history
+size.
+
+Compaction:
+- A scheduled job refreshes every merchant every ANALYTICS_ROLLUP_INTERVAL_MINUTES
+- Days before yesterday are closed and never recomputed; yesterday and
+  today are recomputed on each run to pick up late writes
+- The first run backfills ANALYTICS_ROLLUP_BACKFILL_DAYS in chunks
+- Each refresh replaces the window's rows in one transaction
+
+Readers only use rollups when every day of the requested window has a
+daily row; otherwise widgets fall back to the raw queries.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any
+
+import structlog
+from sqlalchemy import case, delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import is_testing, settings
+from app.core.database import async_session
+from app.core.encryption import decrypt_conversation_content
+from app.models.analytics_rollup import (
+    AnalyticsDailyRollup,
+    AnalyticsHourlyRollup,
+    FaqDailyRollup,
+)
+from app.models.conversation import Conversation
+from app.models.faq_interaction_log import FaqInteractionLog
+from app.models.llm_conversation_cost import LLMConversationCost
+from app.models.merchant import Merchant
+from app.models.message import Message
+from app.models.message_feedback import FeedbackRating, MessageFeedback
+from app.models.rag_query_log import RAGQueryLog
+from app.services.analytics.latency_histogram import LatencyHistogram
+from app.services.analytics.sentiment_analyzer import analyze_sentiment
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_BACKFILL_DAYS = 180
+REFRESH_CHUNK_DAYS = 31
+
+
+def rollups_enabled() -> bool:
+    """Whether widgets should read from rollups (off in IS_TESTING mode unless forced)."""
+    return not is_testing() and settings().get("ANALYTICS_ROLLUPS_ENABLED", True)
+
+
+def response_type_group(response_type: str | None) -> str:
+    """Map an LLM cost response_type to its histogram key (rag, general or other)."""
+    if response_type == "rag":
+        return "rag"
+    if response_type in ("general", "unknown", None):
+        return "general"
+    return "other"
+
+
+def _day_bounds(start_day: date, end_day: date) -> tuple[datetime, datetime]:
+    """Naive UTC [start, end) datetimes covering start_day..end_day inclusive."""
+    return (
+        datetime.combine(start_day, time.min),
+        datetime.combine(end_day + timedelta(days=1), time.min),
+    )
+
+
+def _utc_day(column: Any) -> Any:
+    """date_trunc('day') in UTC for timezone-aware columns."""
+    return func.date_trunc("day", func.timezone("UTC", column))
+
+
+def _as_date(value: datetime | date) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+class AnalyticsRollupService:
+    """Builds and reads per-merchant analytics rollups."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # ---------------------------------------------------------------- compaction
+
+    async def refresh_merchant(self, merchant_id: int, start_day: date, end_day: date) -> int:
+        """Recompute rollups for start_day..end_day (inclusive) and commit.
+
+        Args:
+            merchant_id: Merchant ID
+            start_day: First UTC day to recompute
+            end_day: Last UTC day to recompute
+
+        Returns:
+            Number of daily rows written
+        """
+        start, end = _day_bounds(start_day, end_day)
+        start_utc, end_utc = start.replace(tzinfo=UTC), end.replace(tzinfo=UTC)
+
+        days: dict[date, dict[str, Any]] = {}
+        current = start_day
+        while current <= end_day:
+            days[current] = defaultdict(int, histogram=defaultdict(LatencyHistogram))
+            current += timedelta(days=1)
+        hours: dict[datetime, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        faqs: dict[tuple[int, date], dict[str, int]] = defaultdict(lambda: defaultdict(int))
+
+        conversation_hour = func.date_trunc("hour", Conversation.created_at)
+        result = await self.db.execute(
+            select(conversation_hour.label("hour"), func.count(Conversation.id).label("total"))
+            .where(Conversation.merchant_id == merchant_id)
+            .where(Conversation.created_at >= start, Conversation.created_at < end)
+            .group_by(conversation_hour)
+        )
+        for row in result.all():
+            hours[row.hour]["conversations_started"] += row.total
+            days[row.hour.date()]["conversations_started"] += row.total
+
+        handoff_day = func.date_trunc("day", Conversation.handoff_triggered_at)
+        result = await self.db.execute(
+            select(handoff_day.label("day"), func.count(Conversation.id).label("total"))
+            .where(Conversation.merchant_id == merchant_id)
+            .where(
+                Conversation.handoff_triggered_at >= start,
+                Conversation.handoff_triggered_at < end,
+            )
+            .group_by(handoff_day)
+        )
+        for row in result.all():
+            days[_as_date(row.day)]["handoffs_triggered"] += row.total
+
+        message_hour = func.date_trunc("hour", Message.created_at)
+        result = await self.db.execute(
+            select(
+                message_hour.label("hour"),
+                Message.sender,
+                func.count(Message.id).label("total"),
+            )
+            .join(Conversation, Message.conversation_id == Conversation.id)
+            .where(Conversation.merchant_id == merchant_id)
+            .where(Message.created_at >= start, Message.created_at < end)
+            .group_by(message_hour, Message.sender)
+        )
+        for row in result.all():
+            if row.sender == "customer":
+                hours[row.hour]["customer_messages"] += row.total
+                days[row.hour.date()]["customer_messages"] += row.total
+            elif row.sender == "bot":
+                days[row.hour.date()]["bot_messages"] += row.total
+
+        sentiment_days = await customer_sentiment_by_day(self.db, merchant_id, start, end)
+        for day, counts in sentiment_days.items():
+            for sentiment, count in counts.items():
+                days[day][f"sentiment_{sentiment}"] += count
+
+        feedback_day = _utc_day(MessageFeedback.created_at)
+        result = await self.db.execute(
+            select(
+                feedback_day.label("day"),
+                MessageFeedback.rating,
+                func.count(MessageFeedback.id).label("total"),
+            )
+            .where(
+                or_(
+                    MessageFeedback.merchant_id == merchant_id,
+                    MessageFeedback.conversation_id.in_(
+                        select(Conversation.id).where(Conversation.merchant_id == merchant_id)
+                    ),
+                )
+            )
+            .where(MessageFeedback.created_at >= start_utc, MessageFeedback.created_at < end_utc)
+            .group_by(feedback_day, MessageFeedback.rating)
+        )
+        for row in result.all():
+            if row.rating == FeedbackRating.POSITIVE:
+                days[_as_date(row.day)]["feedback_positive"] += row.total
+            elif row.rating == FeedbackRating.NEGATIVE:
+                days[_as_date(row.day)]["feedback_negative"] += row.total
+
+        rag_day = _utc_day(RAGQueryLog.created_at)
+        result = await self.db.execute(
+            select(
+                rag_day.label("day"),
+                func.count(RAGQueryLog.id).label("total"),
+                func.sum(case((RAGQueryLog.matched.is_(True), 1), else_=0)).label("matched"),
+            )
+            .where(RAGQueryLog.merchant_id == merchant_id)
+            .where(RAGQueryLog.created_at >= start_utc, RAGQueryLog.created_at < end_utc)
+            .group_by(rag_day)
+        )
+        for row in result.all():
+            days[_as_date(row.day)]["rag_queries"] += row.total
+            days[_as_date(row.day)]["rag_matched"] += row.matched or 0
+
+        faq_day = _utc_day(FaqInteractionLog.clicked_at)
+        result = await self.db.execute(
+            select(
+                faq_day.label("day"),
+                FaqInteractionLog.faq_id,
+                func.count(FaqInteractionLog.id).label("clicks"),
+                func.sum(FaqInteractionLog.had_followup).label("followups"),
+            )
+            .where(FaqInteractionLog.merchant_id == merchant_id)
+            .where(
+                FaqInteractionLog.clicked_at >= start_utc,
+                FaqInteractionLog.clicked_at < end_utc,
+            )
+            .group_by(faq_day, FaqInteractionLog.faq_id)
+        )
+        for row in result.all():
+            day = _as_date(row.day)
+            faqs[(row.faq_id, day)]["clicks"] += row.clicks
+            faqs[(row.faq_id, day)]["followups"] += row.followups or 0
+            days[day]["faq_clicks"] += row.clicks
+            days[day]["faq_followups"] += row.followups or 0
+
+        cost_day = func.date_trunc("day", LLMConversationCost.created_at)
+        result = await self.db.execute(
+            select(
+                cost_day.label("day"),
+                func.count(LLMConversationCost.id).label("total"),
+                func.sum(LLMConversationCost.total_tokens).label("tokens"),
+                func.sum(LLMConversationCost.total_cost_usd).label("cost"),
+            )
+            .where(LLMConversationCost.merchant_id == merchant_id)
+            .where(LLMConversationCost.created_at >= start, LLMConversationCost.created_at < end)
+            .group_by(cost_day)
+        )
+        for row in result.all():
+            days[_as_date(row.day)]["llm_requests"] += row.total
+            days[_as_date(row.day)]["llm_tokens"] += row.tokens or 0
+            days[_as_date(row.day)]["llm_cost_usd"] += float(row.cost or 0.0)
+
+        result = await self.db.execute(
+            select(
+                LLMConversationCost.created_at,
+                LLMConversationCost.response_type,
+                LLMConversationCost.processing_time_ms,
+            )
+            .where(LLMConversationCost.merchant_id == merchant_id)
+            .where(LLMConversationCost.created_at >= start, LLMConversationCost.created_at < end)
+            .where(LLMConversationCost.processing_time_ms.isnot(None))
+        )
+        for row in result.all():
+            day = days[row.created_at.date()]
+            day["histogram"][response_type_group(row.response_type)].add(row.processing_time_ms)
+            day["response_time_count"] += 1
+            day["response_time_sum_ms"] += float(row.processing_time_ms)
+
+        await self._replace_window(merchant_id, start_day, end_day, start, end, days, hours, faqs)
+        return len(days)
+
+    async def _replace_window(
+        self,
+        merchant_id: int,
+        start_day: date,
+        end_day: date,
+        start: datetime,
+        end: datetime,
+        days: dict[date, dict[str, Any]],
+        hours: dict[datetime, dict[str, int]],
+        faqs: dict[tuple[int, date], dict[str, int]],
+    ) -> None:
+        await self.db.execute(
+            delete(AnalyticsDailyRollup).where(
+                AnalyticsDailyRollup.merchant_id == merchant_id,
+                AnalyticsDailyRollup.day >= start_day,
+                AnalyticsDailyRollup.day <= end_day,
+            )
+        )
+        await self.db.execute(
+            delete(AnalyticsHourlyRollup).where(
+                AnalyticsHourlyRollup.merchant_id == merchant_id,
+                AnalyticsHourlyRollup.hour >= start,
+                AnalyticsHourlyRollup.hour < end,
+            )
+        )
+        await self.db.execute(
+            delete(FaqDailyRollup).where(
+                FaqDailyRollup.merchant_id == merchant_id,
+                FaqDailyRollup.day >= start_day,
+                FaqDailyRollup.day <= end_day,
+            )
+        )
+
+        computed_at = datetime.now(UTC)
+        for day, counters in days.items():
+            histogram = counters.pop("histogram")
+            self.db.add(
+                AnalyticsDailyRollup(
+                    merchant_id=merchant_id,
+                    day=day,
+                    response_time_histogram={
+                        group: h.to_sparse() for group, h in histogram.items() if h.count
+                    },
+                    computed_at=computed_at,
+                    **counters,
+                )
+            )
+        for hour, counters in hours.items():
+            self.db.add(AnalyticsHourlyRollup(merchant_id=merchant_id, hour=hour, **counters))
+        for (faq_id, day), counters in faqs.items():
+            self.db.add(
+                FaqDailyRollup(merchant_id=merchant_id, faq_id=faq_id, day=day, **counters)
+            )
+        await self.db.commit()
+
+    async def latest_day(self, merchant_id: int) -> date | None:
+        """Most recent day with a daily rollup row."""
+        result = await self.db.execute(
+            select(func.max(AnalyticsDailyRollup.day)).where(
+                AnalyticsDailyRollup.merchant_id == merchant_id
+            )
+        )
+        return result.scalar()
+
+    async def refresh_incremental(
+        self,
+        merchant_id: int,
+        today: date | None = None,
+        backfill_days: int = DEFAULT_BACKFILL_DAYS,
+    ) -> int:
+        """Bring a merchant's rollups up to date.
+
+        Recomputes from yesterday (or the last compacted day, if older) through
+        today; merchants without rollups are backfilled ``backfill_days``.
+
+        Returns:
+            Number of daily rows written
+        """
+        today = today or datetime.now(UTC).date()
+        latest = await self.latest_day(merchant_id)
+        if latest is None:
+            start_day = today - timedelta(days=backfill_days)
+        else:
+            start_day = min(latest, today - timedelta(days=1))
+
+        written = 0
+        while start_day <= today:
+            chunk_end = min(start_day + timedelta(days=REFRESH_CHUNK_DAYS - 1), today)
+            written += await self.refresh_merchant(merchant_id, start_day, chunk_end)
+            start_day = chunk_end + timedelta(days=1)
+        return written
+
+    # ------------------------------------------------------------------- readers
+
+    async def covers(self, merchant_id: int, start_day: date, end_day: date) -> bool:
+        """Whether every day in start_day..end_day has been compacted."""
+        result = await self.db.execute(
+            select(func.count(AnalyticsDailyRollup.id)).where(
+                AnalyticsDailyRollup.merchant_id == merchant_id,
+                AnalyticsDailyRollup.day >= start_day,
+                AnalyticsDailyRollup.day <= end_day,
+            )
+        )
+        return (result.scalar() or 0) == (end_day - start_day).days + 1
+
+    async def daily_rows(
+        self, merchant_id: int, start_day: date, end_day: date
+    ) -> list[AnalyticsDailyRollup]:
+        """Daily rollup rows for start_day..end_day, oldest first."""
+        result = await self.db.execute(
+            select(AnalyticsDailyRollup)
+            .where(
+                AnalyticsDailyRollup.merchant_id == merchant_id,
+                AnalyticsDailyRollup.day >= start_day,
+                AnalyticsDailyRollup.day <= end_day,
+            )
+            .order_by(AnalyticsDailyRollup.day)
+        )
+        return list(result.scalars().all())
+
+    async def hourly_heatmap(self, merchant_id: int, start_day: date) -> list[Any]:
+        """Conversations by (day_of_week, hour) since start_day, busiest first."""
+        day_of_week = func.extract("dow", AnalyticsHourlyRollup.hour)
+        hour = func.extract("hour", AnalyticsHourlyRollup.hour)
+        count = func.sum(AnalyticsHourlyRollup.conversations_started)
+        result = await self.db.execute(
+            select(
+                day_of_week.label("day_of_week"),
+                hour.label("hour"),
+                count.label("total"),
+            )
+            .where(AnalyticsHourlyRollup.merchant_id == merchant_id)
+            .where(AnalyticsHourlyRollup.hour >= datetime.combine(start_day, time.min))
+            .where(AnalyticsHourlyRollup.conversations_started > 0)
+            .group_by(day_of_week, hour)
+            .order_by(count.desc())
+        )
+        return list(result.all())
+
+    async def faq_totals(
+        self, merchant_id: int, start_day: date, end_day: date
+    ) -> dict[int, tuple[int, int]]:
+        """Clicks and follow-ups per FAQ for start_day..end_day."""
+        result = await self.db.execute(
+            select(
+                FaqDailyRollup.faq_id,
+                func.sum(FaqDailyRollup.clicks).label("clicks"),
+                func.sum(FaqDailyRollup.followups).label("followups"),
+            )
+            .where(
+                FaqDailyRollup.merchant_id == merchant_id,
+                FaqDailyRollup.day >= start_day,
+                FaqDailyRollup.day <= end_day,
+            )
+            .group_by(FaqDailyRollup.faq_id)
+        )
+        return {row.faq_id: (int(row.clicks or 0), int(row.followups or 0)) for row in result}
+
+
+async def customer_sentiment_by_day(
+    db: AsyncSession,
+    merchant_id: int,
+    start: datetime,
+    end: datetime | None = None,
+) -> dict[date, dict[str, int]]:
+    """Customer-message sentiment counts per UTC day, from stored labels.
+
+    Messages the backfill job has not labelled yet are analyzed here, so
+    counts stay complete while the backfill runs.
+
+    Args:
+        db: Database session
+        merchant_id: Merchant ID
+        start: Naive UTC start (inclusive)
+        end: Naive UTC end (exclusive, optional)
+
+    Returns:
+        {day: {"positive": n, "negative": n, "neutral": n}}
+    """
+    filters = [
+        Conversation.merchant_id == merchant_id,
+        Message.sender == "customer",
+        Message.created_at >= start,
+    ]
+    if end is not None:
+        filters.append(Message.created_at < end)
+
+    counts: dict[date, dict[str, int]] = defaultdict(
+        lambda: {"positive": 0, "negative": 0, "neutral": 0}
+    )
+    message_day = func.date_trunc("day", Message.created_at)
+    result = await db.execute(
+        select(message_day.label("day"), Message.sentiment, func.count(Message.id).label("total"))
+        .join(Conversation, Message.conversation_id == Conversation.id)
+        .where(*filters, Message.sentiment.isnot(None))
+        .group_by(message_day, Message.sentiment)
+    )
+    for row in result.all():
+        counts[_as_date(row.day)][row.sentiment] += row.total
+
+    result = await db.execute(
+        select(Message.created_at, Message.content)
+        .join(Conversation, Message.conversation_id == Conversation.id)
+        .where(*filters, Message.sentiment.is_(None))
+    )
+    for row in result.all():
+        counts[row.created_at.date()][
+            analyze_sentiment(decrypt_conversation_content(row.content))
+        ] += 1
+    return dict(counts)
+
+
+def merged_histogram(rows: list[AnalyticsDailyRollup], *groups: str) -> LatencyHistogram:
+    """Sum the response-time histograms of daily rows (all groups when none given)."""
+    merged = LatencyHistogram()
+    for row in rows:
+        for group, sparse in (row.response_time_histogram or {}).items():
+            if not groups or group in groups:
+                merged.merge(LatencyHistogram.from_sparse(sparse))
+    return merged
+
+
+async def refresh_all_rollups() -> dict[str, int]:
+    """Bring every merchant's analytics rollups up to date (scheduled job).
+
+    Returns:
+        Counts of merchants refreshed and failed
+    """
+    async with async_session()() as db:
+        merchant_ids = (await db.execute(select(Merchant.id))).scalars().all()
+
+    backfill_days = settings().get("ANALYTICS_ROLLUP_BACKFILL_DAYS", DEFAULT_BACKFILL_DAYS)
+    results = {"refreshed": 0, "failed": 0}
+    for merchant_id in merchant_ids:
+        try:
+            async with async_session()() as db:
+                await AnalyticsRollupService(db).refresh_incremental(
+                    merchant_id, backfill_days=backfill_days
+                )
+            results["refreshed"] += 1
+        except Exception as e:
+            results["failed"] += 1
+            logger.warning("analytics_rollup_refresh_failed", merchant_id=merchant_id, error=str(e))
+
+    logger.info("analytics_rollups_refreshed", **results)
+    return results
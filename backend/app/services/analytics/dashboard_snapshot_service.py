@@ -0,0 +1,577 @@
+"""Batched dashboard snapshot.
+
+The dashboard used to fan out to one analytics route per widget, each
+opening its own session and re-scanning the same tables with slightly
+different filters. A snapshot takes a list of widget ids and a period,
+plans the work once and streams each widget's result as soon as it is ready:
+
+- Widgets that read RAGQueryLog (knowledge effectiveness, top topics, failed
+  queries, question categories) share one grouped scan per period
+- Other widgets run concurrently on their own sessions (bounded by
+  ANALYTICS_SNAPSHOT_CONCURRENCY); most of them are already served from
+  the daily/hourly rollups
+- Every widget goes through the analytics result cache with the same
+  endpoint and parameters as its route, so snapshots and individual route
+  calls share cached results
+
+Widget ids are the route paths under /analytics (e.g. "peak-hours",
+"conversation-flow/overview"), and each widget's data is shaped exactly like
+its route's response body.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.rag_query_log import RAGQueryLog
+from app.services.analytics.aggregated_analytics_service import AggregatedAnalyticsService
+from app.services.analytics.analytics_result_cache import (
+    AnalyticsResultCache,
+    cached_analytics_result,
+)
+from app.services.analytics.conversation_flow_analytics_service import (
+    ConversationFlowAnalyticsService,
+)
+from app.services.analytics.widget_analytics_service import WidgetAnalyticsService
+
+logger = structlog.get_logger(__name__)
+
+SessionFactory = Callable[[], Any]  # Returns an async context manager yielding AsyncSession
+
+RAG_QUERY_LOG_SCAN = "rag_query_log"
+
+
+@dataclass
+class RagQueryLogScan:
+    """Per-query RAGQueryLog totals for a period and the period before it.
+
+    One grouped query replaces the separate RAGQueryLog queries of the
+    knowledge effectiveness, top topics, failed queries and question
+    categories widgets.
+    """
+
+    days: int
+    period_start: datetime
+    period_end: datetime
+    rows: list[Any] = field(default_factory=list)
+
+    @classmethod
+    async def load(cls, db: AsyncSession, merchant_id: int, days: int) -> RagQueryLogScan:
+        """Scan RAGQueryLog for [now - 2 * days, now), grouped by query, day and period."""
+        period_end = datetime.now(UTC).replace(tzinfo=None)
+        period_start = period_end - timedelta(days=days)
+
+        logs = (
+            select(
+                RAGQueryLog.query.label("query"),
+                RAGQueryLog.matched.label("matched"),
+                RAGQueryLog.confidence.label("confidence"),
+                RAGQueryLog.created_at.label("created_at"),
+                func.date(RAGQueryLog.created_at).label("day"),
+                (RAGQueryLog.created_at >= period_start).label("current"),
+            )
+            .where(RAGQueryLog.merchant_id == merchant_id)
+            .where(RAGQueryLog.created_at >= period_start - timedelta(days=days))
+            .where(RAGQueryLog.created_at < period_end)
+            .subquery()
+        )
+        matched = logs.c.matched.is_(True)
+        result = await db.execute(
+            select(
+                logs.c.query,
+                logs.c.day,
+                logs.c.current,
+                func.count().label("total"),
+                func.count().filter(matched).label("matched"),
+                func.sum(logs.c.confidence).label("confidence_sum"),
+                func.count(logs.c.confidence).label("confidence_count"),
+                func.sum(logs.c.confidence).filter(matched).label("matched_confidence_sum"),
+                func.count(logs.c.confidence).filter(matched).label("matched_confidence_count"),
+                func.max(logs.c.created_at).filter(logs.c.matched.is_(False)).label(
+                    "last_unmatched_at"
+                ),
+            ).group_by(logs.c.query, logs.c.day, logs.c.current)
+        )
+        return cls(
+            days=days,
+            period_start=period_start,
+            period_end=period_end,
+            rows=list(result.all()),
+        )
+
+    def knowledge_effectiveness(
+        self, service: AggregatedAnalyticsService, merchant_id: int
+    ) -> dict[str, Any]:
+        """Knowledge effectiveness of the current period."""
+        rows = [row for row in self.rows if row.current]
+        confidence_sum = sum(float(row.confidence_sum or 0) for row in rows)
+        confidence_count = sum(row.confidence_count for row in rows)
+
+        daily: dict[Any, list[float]] = {}
+        for row in rows:
+            if row.matched_confidence_count:
+                totals = daily.setdefault(row.day, [0.0, 0])
+                totals[0] += float(row.matched_confidence_sum)
+                totals[1] += row.matched_confidence_count
+
+        return service.knowledge_effectiveness_from_totals(
+            merchant_id,
+            self.days,
+            sum(row.total for row in rows),
+            sum(row.matched for row in rows),
+            confidence_sum / confidence_count if confidence_count else None,
+            [daily[day][0] / daily[day][1] for day in sorted(daily)],
+        )
+
+    def top_topics(
+        self, service: AggregatedAnalyticsService, merchant_id: int, limit: int = 10
+    ) -> dict[str, Any]:
+        """Most asked queries of the current period with their trend."""
+        current = self._per_query(current=True)
+        previous = self._per_query(current=False)
+        ranked = sorted(current.values(), key=lambda q: q.total, reverse=True)[:limit]
+        return service.top_topics_from_rows(
+            merchant_id,
+            self.days,
+            [SimpleNamespace(query=q.query, query_count=q.total) for q in ranked],
+            {q.query: q.total for q in previous.values()},
+            self.period_start,
+            self.period_end,
+        )
+
+    def failed_queries(
+        self, service: AggregatedAnalyticsService, limit: int = 10
+    ) -> list[dict[str, Any]]:
+        """Most frequent unmatched queries of the current period."""
+        unmatched = [q for q in self._per_query(current=True).values() if q.unmatched]
+        ranked = sorted(unmatched, key=lambda q: q.unmatched, reverse=True)[:limit]
+        return service.failed_queries_from_rows(
+            [
+                SimpleNamespace(
+                    query=q.query, frequency=q.unmatched, last_asked=q.last_unmatched_at
+                )
+                for q in ranked
+            ]
+        )
+
+    def question_categories(self, service: AggregatedAnalyticsService) -> list[dict[str, Any]]:
+        """Question categories of the current period."""
+        ranked = sorted(
+            self._per_query(current=True).values(), key=lambda q: q.total, reverse=True
+        )
+        return service.question_categories_from_rows(
+            [
+                SimpleNamespace(
+                    query=q.query,
+                    volume=q.total,
+                    matched_count=q.matched,
+                    avg_confidence=(
+                        q.confidence_sum / q.confidence_count if q.confidence_count else None
+                    ),
+                )
+                for q in ranked
+            ]
+        )
+
+    def _per_query(self, current: bool) -> dict[str, SimpleNamespace]:
+        queries: dict[str, SimpleNamespace] = {}
+        for row in self.rows:
+            if bool(row.current) is not current:
+                continue
+            q = queries.get(row.query)
+            if q is None:
+                q = queries[row.query] = SimpleNamespace(
+                    query=row.query,
+                    total=0,
+                    matched=0,
+                    unmatched=0,
+                    confidence_sum=0.0,
+                    confidence_count=0,
+                    last_unmatched_at=None,
+                )
+            q.total += row.total
+            q.matched += row.matched
+            q.unmatched += row.total - row.matched
+            q.confidence_sum += float(row.confidence_sum or 0)
+            q.confidence_count += row.confidence_count
+            if row.last_unmatched_at is not None and (
+                q.last_unmatched_at is None or row.last_unmatched_at > q.last_unmatched_at
+            ):
+                q.last_unmatched_at = row.last_unmatched_at
+        return queries
+
+
+def _body(result: Any, merchant_id: int, params: dict[str, Any]) -> Any:
+    return result
+
+
+def _data_body(result: Any, merchant_id: int, params: dict[str, Any]) -> Any:
+    return {"data": result}
+
+
+@dataclass(frozen=True)
+class SnapshotWidget:
+    """A dashboard widget the snapshot can compute.
+
+    Attributes:
+        service: Analytics service class the widget's route uses
+        params: Route query parameters for a snapshot period (the cache key)
+        compute: Computes the route result from (service, merchant_id, params)
+        scan: Shared scan the widget reads from instead of calling compute
+        from_scan: Computes the route result from (scan, service, merchant_id, params)
+        body: Wraps the result the same way the route's response does
+    """
+
+    service: type
+    params: Callable[[int], dict[str, Any]]
+    compute: Callable[[Any, int, dict[str, Any]], Awaitable[Any]] | None = None
+    scan: str | None = None
+    from_scan: Callable[[Any, Any, int, dict[str, Any]], Any] | None = None
+    body: Callable[[Any, int, dict[str, Any]], Any] = _body
+
+
+def _days(max_days: int, **extra: Any) -> Callable[[int], dict[str, Any]]:
+    """Route params for a period, clamped to the route's maximum days."""
+    return lambda days: {"days": min(days, max_days), **extra}
+
+
+def _no_params(days: int) -> dict[str, Any]:
+    return {}
+
+
+def _flow_widget(method: str) -> SnapshotWidget:
+    return SnapshotWidget(
+        service=ConversationFlowAnalyticsService,
+        params=_days(365),
+        compute=lambda s, m, p: getattr(s, method)(m, p["days"]),
+    )
+
+
+SNAPSHOT_WIDGETS: dict[str, SnapshotWidget] = {
+    "widget": SnapshotWidget(
+        service=WidgetAnalyticsService,
+        params=_days(365),
+        compute=lambda s, m, p: s.get_metrics(m, p["days"]),
+    ),
+    "summary": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_no_params,
+        compute=lambda s, m, p: s.get_anonymized_summary(m),
+    ),
+    "knowledge-gaps": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(365, limit=10),
+        compute=lambda s, m, p: s.get_knowledge_gaps(m, p["days"], p["limit"]),
+    ),
+    "peak-hours": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(365),
+        compute=lambda s, m, p: s.get_peak_hours(m, p["days"]),
+    ),
+    "bot-quality": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(365),
+        compute=lambda s, m, p: s.get_bot_quality_metrics(m, p["days"]),
+    ),
+    "conversion-funnel": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(365),
+        compute=lambda s, m, p: s.get_conversion_funnel(m, p["days"]),
+    ),
+    "benchmarks": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(365),
+        compute=lambda s, m, p: s.get_benchmark_comparison(m, p["days"]),
+    ),
+    "sentiment-trend": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(365),
+        compute=lambda s, m, p: s.get_sentiment_trend(m, p["days"]),
+    ),
+    "knowledge-effectiveness": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(30),
+        scan=RAG_QUERY_LOG_SCAN,
+        from_scan=lambda scan, s, m, p: scan.knowledge_effectiveness(s, m),
+        body=_data_body,
+    ),
+    "top-topics": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(90),
+        scan=RAG_QUERY_LOG_SCAN,
+        from_scan=lambda scan, s, m, p: scan.top_topics(s, m),
+        body=_data_body,
+    ),
+    "top-products": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(365, limit=5),
+        compute=lambda s, m, p: s.get_top_products(m, p["days"], p["limit"]),
+        body=lambda result, m, p: {"items": result, "merchantId": m, "days": p["days"]},
+    ),
+    "pending-orders": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=lambda days: {"limit": 5, "offset": 0},
+        compute=lambda s, m, p: s.get_pending_orders(m, p["limit"], p["offset"]),
+        body=lambda result, m, p: {"items": result, "merchantId": m},
+    ),
+    "response-time-distribution": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(30),
+        compute=lambda s, m, p: s.get_response_time_distribution(m, p["days"]),
+        body=_data_body,
+    ),
+    "faq-usage": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(365, include_unused=True),
+        compute=lambda s, m, p: s.get_faq_usage(m, p["days"], p["include_unused"]),
+    ),
+    "geographic": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_no_params,
+        compute=lambda s, m, p: s.get_geographic_analytics(m),
+    ),
+    "answer-quality": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(90),
+        compute=lambda s, m, p: s.calculate_answer_quality_score(m, p["days"]),
+    ),
+    "top-questions": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(90, limit=10),
+        compute=lambda s, m, p: s.get_top_questions_with_metrics(m, p["days"], p["limit"]),
+    ),
+    "customer-feedback": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(90),
+        compute=lambda s, m, p: s.get_customer_feedback_metrics(m, p["days"]),
+    ),
+    "document-performance": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(90, limit=50, offset=0),
+        compute=lambda s, m, p: s.get_document_usage_stats(
+            m, p["days"], p["limit"], p["offset"]
+        ),
+    ),
+    "high-impact-improvements": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(90, limit=10),
+        compute=lambda s, m, p: s.get_high_impact_improvements(m, p["days"], p["limit"]),
+    ),
+    "question-categories": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(90),
+        scan=RAG_QUERY_LOG_SCAN,
+        from_scan=lambda scan, s, m, p: scan.question_categories(s),
+    ),
+    "failed-queries": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(90, limit=10),
+        scan=RAG_QUERY_LOG_SCAN,
+        from_scan=lambda scan, s, m, p: scan.failed_queries(s, p["limit"]),
+    ),
+    "performance-alerts": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_days(7),
+        compute=lambda s, m, p: s.get_performance_alerts(m, p["days"]),
+    ),
+    "quick-actions": SnapshotWidget(
+        service=AggregatedAnalyticsService,
+        params=_no_params,
+        compute=lambda s, m, p: s.get_quick_actions(m),
+    ),
+    "conversation-flow/overview": _flow_widget("get_overview"),
+    "conversation-flow/length-distribution": _flow_widget("get_conversation_length_distribution"),
+    "conversation-flow/clarification-patterns": _flow_widget("get_clarification_patterns"),
+    "conversation-flow/friction-points": _flow_widget("get_friction_points"),
+    "conversation-flow/sentiment-stages": _flow_widget("get_sentiment_distribution_by_stage"),
+    "conversation-flow/handoff-correlation": _flow_widget("get_handoff_correlation"),
+    "conversation-flow/context-utilization": _flow_widget("get_context_utilization"),
+}
+
+SCANS: dict[str, Callable[[AsyncSession, int, int], Awaitable[Any]]] = {
+    RAG_QUERY_LOG_SCAN: RagQueryLogScan.load,
+}
+
+
+@dataclass
+class SnapshotTask:
+    """Widgets computed together on one session (sharing a scan if any)."""
+
+    widgets: list[tuple[str, SnapshotWidget, dict[str, Any]]]
+    scan: str | None = None
+    scan_days: int | None = None
+
+
+class DashboardSnapshotService:
+    """Computes a set of dashboard widgets with shared scans and streams results."""
+
+    DEFAULT_CONCURRENCY = 4
+
+    def __init__(
+        self,
+        session_factory: SessionFactory | None = None,
+        concurrency: int | None = None,
+        cache: AnalyticsResultCache | None = None,
+    ) -> None:
+        """Initialize dashboard snapshot service.
+
+        Args:
+            session_factory: Factory for fresh database sessions (defaults to async_session())
+            concurrency: Maximum sessions in use at once
+                (defaults to ANALYTICS_SNAPSHOT_CONCURRENCY)
+            cache: Result cache (optional, defaults to the process-wide cache)
+        """
+        self.session_factory = session_factory or async_session()
+        self.concurrency = concurrency or settings().get(
+            "ANALYTICS_SNAPSHOT_CONCURRENCY", self.DEFAULT_CONCURRENCY
+        )
+        self.cache = cache
+
+    @staticmethod
+    def plan(widget_ids: Sequence[str], days: int) -> list[SnapshotTask]:
+        """Group the requested widgets into tasks.
+
+        Widgets reading the same scan with the same (clamped) period share a
+        task; every other widget gets a task of its own.
+
+        Raises:
+            ValueError: If a widget id is unknown
+        """
+        unknown = [widget_id for widget_id in widget_ids if widget_id not in SNAPSHOT_WIDGETS]
+        if unknown:
+            raise ValueError(f"Unknown dashboard widgets: {', '.join(unknown)}")
+
+        tasks: list[SnapshotTask] = []
+        scan_tasks: dict[tuple[str, int], SnapshotTask] = {}
+        for widget_id in dict.fromkeys(widget_ids):
+            widget = SNAPSHOT_WIDGETS[widget_id]
+            params = widget.params(days)
+            entry = (widget_id, widget, params)
+            if widget.scan is None:
+                tasks.append(SnapshotTask(widgets=[entry]))
+                continue
+            key = (widget.scan, params["days"])
+            if key not in scan_tasks:
+                scan_tasks[key] = SnapshotTask(widgets=[], scan=widget.scan, scan_days=key[1])
+                tasks.append(scan_tasks[key])
+            scan_tasks[key].widgets.append(entry)
+        return tasks
+
+    async def stream(
+        self,
+        merchant_id: int,
+        widget_ids: Sequence[str],
+        days: int,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Compute widgets and yield one event per widget as it completes.
+
+        Events are {"widget": id, "status": "ok", "data": <route body>} or
+        {"widget": id, "status": "error", "error": message}; a failing widget
+        doesn't affect the others. Pending work is cancelled when the consumer
+        stops iterating.
+
+        Raises:
+            ValueError: If a widget id is unknown (before anything is computed)
+        """
+        tasks = self.plan(widget_ids, days)
+        expected = sum(len(task.widgets) for task in tasks)
+        queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        running = [
+            asyncio.create_task(self._run(merchant_id, task, semaphore, queue)) for task in tasks
+        ]
+        try:
+            for _ in range(expected):
+                yield await queue.get()
+        finally:
+            for running_task in running:
+                running_task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        logger.info(
+            "dashboard_snapshot_completed",
+            merchant_id=merchant_id,
+            widgets=expected,
+            tasks=len(tasks),
+        )
+
+    async def _run(
+        self,
+        merchant_id: int,
+        task: SnapshotTask,
+        semaphore: asyncio.Semaphore,
+        queue: asyncio.Queue[dict[str, Any]],
+    ) -> None:
+        remaining = list(task.widgets)
+        try:
+            async with semaphore, self.session_factory() as db:
+                scan_result: Any = None
+
+                async def load_scan() -> Any:
+                    nonlocal scan_result
+                    if scan_result is None:
+                        scan_result = await SCANS[task.scan](db, merchant_id, task.scan_days)
+                    return scan_result
+
+                while remaining:
+                    widget_id, widget, params = remaining[0]
+                    await queue.put(
+                        await self._compute(db, merchant_id, widget_id, widget, params, load_scan)
+                    )
+                    remaining.pop(0)
+        except Exception as e:
+            logger.error(
+                "dashboard_snapshot_task_failed",
+                merchant_id=merchant_id,
+                widgets=[widget_id for widget_id, _, _ in remaining],
+                error=str(e),
+            )
+            for widget_id, _, _ in remaining:
+                await queue.put({"widget": widget_id, "status": "error", "error": str(e)})
+
+    async def _compute(
+        self,
+        db: AsyncSession,
+        merchant_id: int,
+        widget_id: str,
+        widget: SnapshotWidget,
+        params: dict[str, Any],
+        load_scan: Callable[[], Awaitable[Any]],
+    ) -> dict[str, Any]:
+        service = widget.service(db)
+
+        async def compute() -> Any:
+            if widget.from_scan is not None:
+                return widget.from_scan(await load_scan(), service, merchant_id, params)
+            return await widget.compute(service, merchant_id, params)
+
+        try:
+            result = await cached_analytics_result(
+                merchant_id, widget_id, params, compute, cache=self.cache
+            )
+        except Exception as e:
+            logger.warning(
+                "dashboard_snapshot_widget_failed",
+                merchant_id=merchant_id,
+                widget=widget_id,
+                error=str(e),
+            )
+            await db.rollback()
+            return {"widget": widget_id, "status": "error", "error": str(e)}
+
+        return {
+            "widget": widget_id,
+            "status": "ok",
+            "data": widget.body(result, merchant_id, params),
+        }
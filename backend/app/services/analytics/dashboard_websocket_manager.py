@@ -17,11 +17,12 @@ import redis.asyncio as redis
 import structlog
 from fastapi import WebSocket
 
-from app.core.config import settings
 from app.core.connection_limits import (
     MAX_CONNECTIONS_PER_DASHBOARD_MERCHANT,
     MAX_TOTAL_DASHBOARD_CONNECTIONS,
 )
+from app.core.redis_pool import get_pubsub_redis, get_redis
+from app.services.analytics.analytics_result_cache import invalidate_analytics_results
 
 logger = structlog.get_logger(__name__)
 
@@ -45,7 +46,7 @@ class DashboardConnectionManager:
         """Initialize the dashboard connection manager.
 
         Args:
-            redis_client: Optional Redis client (creates default if not provided)
+            redis_client: Optional Redis client (shared application pool if not provided)
         """
         self._connections: dict[int, set[WebSocket]] = {}
         self._redis: redis.Redis | None = redis_client
@@ -55,12 +56,16 @@ class DashboardConnectionManager:
         self._logger = structlog.get_logger(__name__)
         self._total_connections = 0
 
-    def _get_redis(self) -> redis.Redis:
-        """Get or create Redis client."""
+    def _get_redis(self) -> redis.Redis | None:
+        """Get the injected Redis client, or the shared one (None if Redis is disabled)."""
         if self._redis is None:
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self._redis = redis.from_url(redis_url, decode_responses=True)
+            return get_redis()
+        return self._redis
+
+    def _get_pubsub_redis(self) -> redis.Redis | None:
+        """Get the Redis client used for long-lived channel subscriptions."""
+        if self._redis is None:
+            return get_pubsub_redis()
         return self._redis
 
     async def connect(self, merchant_id: int, websocket: WebSocket) -> None:
@@ -166,6 +171,8 @@ class DashboardConnectionManager:
         """Broadcast analytics update to all dashboard connections for a merchant.
 
         Uses Redis Pub/Sub so messages work across multiple server instances.
+        Also invalidates the merchant's cached analytics route results, whether
+        or not a dashboard is connected.
 
         Args:
             merchant_id: Merchant identifier
@@ -174,6 +181,9 @@ class DashboardConnectionManager:
         Returns:
             Number of connections the message was sent to
         """
+        # Dashboard data changed: stop serving cached route results on every worker
+        await invalidate_analytics_results(merchant_id)
+
         # Check if there are any connections first
         conn_count = self.get_connection_count(merchant_id)
 
@@ -191,6 +201,8 @@ class DashboardConnectionManager:
         # Publish to Redis for delivery
         redis_client = self._get_redis()
         channel = f"dashboard:merchant:{merchant_id}"
+        if redis_client is None:
+            return await self._deliver_locally(merchant_id, message)
 
         try:
             await redis_client.publish(channel, json.dumps(message))
@@ -276,7 +288,10 @@ class DashboardConnectionManager:
         if merchant_id in self._listener_tasks:
             return
 
-        redis_client = self._get_redis()
+        redis_client = self._get_pubsub_redis()
+        if redis_client is None:
+            # Without Redis, broadcasts are delivered locally
+            return
         pubsub = redis_client.pubsub()
 
         try:
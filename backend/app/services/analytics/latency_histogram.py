@@ -0,0 +1,110 @@
+"""Mergeable fixed-bucket latency histogram.
+
+Response-time percentiles used to be computed by loading every
+processing_time_ms row and sorting it. A histogram over fixed bucket edges
+can be stored per day, summed across any range of days, and still answer
+percentile queries with bounded error (at most one bucket width, 50ms below
+one second).
+
+Stored form is sparse: {"<bucket index>": count}, so idle days cost nothing.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Iterable
+from typing import Any
+
+
+def _edges() -> tuple[int, ...]:
+    edges: list[int] = []
+    for start, stop, step in (
+        (0, 1000, 50),
+        (1000, 5000, 100),
+        (5000, 10000, 250),
+        (10000, 30000, 1000),
+        (30000, 60000, 5000),
+    ):
+        edges.extend(range(start, stop, step))
+    edges.append(60000)
+    return tuple(edges)
+
+
+# Lower edges (ms) of each bucket; the last bucket is open-ended
+LATENCY_BUCKET_EDGES_MS: tuple[int, ...] = _edges()
+
+
+class LatencyHistogram:
+    """Counts of latencies per fixed bucket.
+
+    Percentiles use the same rank convention as linear interpolation over
+    sorted samples (rank = (n - 1) * p / 100), placing samples evenly inside
+    their bucket.
+    """
+
+    def __init__(self, counts: list[int] | None = None) -> None:
+        self.counts = counts if counts is not None else [0] * len(LATENCY_BUCKET_EDGES_MS)
+
+    @classmethod
+    def from_values(cls, values_ms: Iterable[float]) -> LatencyHistogram:
+        """Build a histogram from raw latencies."""
+        histogram = cls()
+        for value in values_ms:
+            histogram.add(value)
+        return histogram
+
+    @classmethod
+    def from_sparse(cls, data: dict[str, int] | None) -> LatencyHistogram:
+        """Load the stored {"<bucket index>": count} form."""
+        histogram = cls()
+        for index, count in (data or {}).items():
+            histogram.counts[int(index)] += int(count)
+        return histogram
+
+    def to_sparse(self) -> dict[str, int]:
+        """Return the stored {"<bucket index>": count} form."""
+        return {str(i): count for i, count in enumerate(self.counts) if count}
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def add(self, value_ms: float, count: int = 1) -> None:
+        """Record a latency."""
+        index = max(bisect_right(LATENCY_BUCKET_EDGES_MS, max(value_ms, 0)) - 1, 0)
+        self.counts[index] += count
+
+    def merge(self, other: LatencyHistogram) -> LatencyHistogram:
+        """Add another histogram's counts into this one (returns self)."""
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        return self
+
+    def percentile(self, p: float) -> int | None:
+        """Approximate p-th percentile in ms, or None when empty."""
+        total = self.count
+        if total == 0:
+            return None
+        rank = (total - 1) * p / 100
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count > rank:
+                low = LATENCY_BUCKET_EDGES_MS[i]
+                if i + 1 == len(LATENCY_BUCKET_EDGES_MS):
+                    return low
+                high = LATENCY_BUCKET_EDGES_MS[i + 1]
+                return int(low + (high - low) * (rank - seen + 0.5) / count)
+            seen += count
+        return LATENCY_BUCKET_EDGES_MS[-1]
+
+    def count_between(self, low_ms: int, high_ms: int | None) -> int:
+        """Count latencies in [low_ms, high_ms); bounds must be bucket edges."""
+        return sum(
+            count
+            for edge, count in zip(LATENCY_BUCKET_EDGES_MS, self.counts)
+            if edge >= low_ms and (high_ms is None or edge < high_ms)
+        )
+
+    def percentiles(self) -> dict[str, Any]:
+        """Return {"p50", "p95", "p99"} as used by the dashboard widgets."""
+        return {"p50": self.percentile(50), "p95": self.percentile(95), "p99": self.percentile(99)}
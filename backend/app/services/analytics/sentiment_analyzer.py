@@ -560,3 +560,15 @@ def analyze_sentiment(content: str) -> str:
 def get_sentiment_score(content: str) -> SentimentScore:
     """Get full sentiment analysis with scores."""
     return _analyzer.analyze(content)
+
+
+def message_sentiment(content: str) -> tuple[str, float]:
+    """Sentiment label and signed polarity (-1..1) stored on customer messages.
+
+    The polarity is (positive - negative) / (positive + negative), 0 when no
+    sentiment terms matched.
+    """
+    score = _analyzer.analyze(content)
+    total = score.positive_score + score.negative_score
+    polarity = (score.positive_score - score.negative_score) / total if total else 0.0
+    return score.sentiment.value, round(polarity, 3)
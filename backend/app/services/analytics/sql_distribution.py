@@ -0,0 +1,89 @@
+"""Database-side distribution aggregates.
+
+Percentiles and histogram buckets used to be computed by loading every raw
+value into Python and sorting it. These helpers build the equivalent SQL
+aggregates (percentile_cont ... WITHIN GROUP, count(*) FILTER) so a whole
+distribution comes back as one row per group, whatever the event volume.
+
+percentile_cont interpolates linearly between the two nearest ranks
+(rank = (n - 1) * p), the same convention LatencyHistogram and the old
+Python implementations use. Like all aggregates it ignores NULLs, so
+conditional distributions are expressed as `case((condition, value))`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import and_, case, cast, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql.elements import ColumnElement, Label
+
+DEFAULT_PERCENTILES: tuple[int, ...] = (50, 95, 99)
+
+
+def percentile_columns(
+    value: ColumnElement[Any],
+    percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+    prefix: str = "",
+) -> list[Label[Any]]:
+    """percentile_cont aggregates labelled "<prefix>p<n>" for each percentile."""
+    return [
+        func.percentile_cont(p / 100).within_group(value).label(f"{prefix}p{p}")
+        for p in percentiles
+    ]
+
+
+def bucket_count_columns(
+    value: ColumnElement[Any],
+    buckets: Sequence[dict[str, Any]],
+    prefix: str = "bucket_",
+) -> list[Label[Any]]:
+    """count(*) FILTER per bucket, labelled "<prefix><index>".
+
+    Buckets are dicts with "min" (inclusive) and "max" (exclusive, None for
+    open-ended), matching the dashboard bucket definitions.
+    """
+    columns = []
+    for index, bucket in enumerate(buckets):
+        condition = value >= bucket["min"]
+        if bucket["max"] is not None:
+            condition = and_(condition, value < bucket["max"])
+        columns.append(func.count().filter(condition).label(f"{prefix}{index}"))
+    return columns
+
+
+def percentiles_from_row(
+    row: Any,
+    percentiles: Sequence[int] = DEFAULT_PERCENTILES,
+    prefix: str = "",
+) -> dict[str, int | None]:
+    """Read percentile_columns results as {"p50": int | None, ...}."""
+    result: dict[str, int | None] = {}
+    for p in percentiles:
+        value = getattr(row, f"{prefix}p{p}", None) if row is not None else None
+        result[f"p{p}"] = int(value) if value is not None else None
+    return result
+
+
+def bucket_counts_from_row(
+    row: Any,
+    buckets: Sequence[dict[str, Any]],
+    prefix: str = "bucket_",
+) -> list[dict[str, Any]]:
+    """Read bucket_count_columns results as dashboard histogram entries."""
+    return [
+        {
+            "label": bucket["label"],
+            "count": int(getattr(row, f"{prefix}{index}", 0) or 0),
+            "color": bucket["color"],
+        }
+        for index, bucket in enumerate(buckets)
+    ]
+
+
+def json_number(column: ColumnElement[Any], key: str) -> ColumnElement[Any]:
+    """column->key as a float, or NULL when the key is missing or not a JSON number."""
+    field = cast(column, JSONB)[key]
+    return case((func.jsonb_typeof(field) == "number", field.as_float()), else_=None)
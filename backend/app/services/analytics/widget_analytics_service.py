@@ -13,10 +13,11 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 
 import structlog
-from sqlalchemy import and_, delete, select
+from sqlalchemy import and_, case, delete, distinct, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.widget_analytics_event import WidgetAnalyticsEvent
+from app.services.analytics.sql_distribution import json_number, percentile_columns
 
 logger = structlog.get_logger(__name__)
 
@@ -111,18 +112,19 @@ class WidgetAnalyticsService:
         start_date = end_date - timedelta(days=days)
         prev_start = start_date - timedelta(days=days)
 
-        events = await self._get_events_in_range(merchant_id, start_date, end_date)
-        prev_events = await self._get_events_in_range(merchant_id, prev_start, start_date)
+        periods = await self._get_period_aggregates(merchant_id, prev_start, start_date, end_date)
+        current = periods.get("current")
+        previous = periods.get("previous")
 
-        metrics = self._calculate_metrics(events)
-        prev_metrics = self._calculate_metrics(prev_events)
+        metrics = self._calculate_metrics(*self._period_counts(current))
+        prev_metrics = self._calculate_metrics(*self._period_counts(previous))
 
         trends = self._calc_trends(metrics, prev_metrics)
 
         performance = {
-            "avg_load_time_ms": self._calc_avg_load_time(events),
-            "p95_load_time_ms": self._calc_p95_load_time(events),
-            "bundle_size_kb": self._calc_bundle_size(events),
+            "avg_load_time_ms": self._rounded(current, "avg_load_time_ms"),
+            "p95_load_time_ms": self._rounded(current, "load_time_p95"),
+            "bundle_size_kb": self._rounded(current, "avg_bundle_size_kb"),
         }
 
         return {
@@ -223,48 +225,76 @@ class WidgetAnalyticsService:
         )
         return deleted
 
-    async def _get_events_in_range(
+    async def _get_period_aggregates(
         self,
         merchant_id: int,
+        prev_start: datetime,
         start_date: datetime,
         end_date: datetime,
-    ) -> list[WidgetAnalyticsEvent]:
-        """Get events in a date range."""
-        result = await self.db.execute(
-            select(WidgetAnalyticsEvent).where(
+    ) -> dict[str, Any]:
+        """Aggregate the current and previous periods in one grouped query.
+
+        Returns rows keyed by "current" / "previous"; a period with no events
+        has no row.
+        """
+        ts = WidgetAnalyticsEvent.timestamp
+        events = (
+            select(
+                case((ts >= start_date, "current"), else_="previous").label("period"),
+                WidgetAnalyticsEvent.event_type,
+                WidgetAnalyticsEvent.session_id,
+                json_number(WidgetAnalyticsEvent.event_metadata, "load_time_ms").label(
+                    "load_time_ms"
+                ),
+                json_number(WidgetAnalyticsEvent.event_metadata, "bundle_size_kb").label(
+                    "bundle_size_kb"
+                ),
+            )
+            .where(
                 and_(
                     WidgetAnalyticsEvent.merchant_id == merchant_id,
-                    WidgetAnalyticsEvent.timestamp >= start_date,
-                    WidgetAnalyticsEvent.timestamp < end_date,
+                    ts >= prev_start,
+                    ts < end_date,
                 )
             )
+            .subquery()
         )
-        return list(result.scalars().all())
-
-    def _calculate_metrics(self, events: list[WidgetAnalyticsEvent]) -> dict[str, float]:
-        """Calculate metrics from events."""
-        if not events:
-            return {
-                "open_rate": 0.0,
-                "message_rate": 0.0,
-                "quick_reply_rate": 0.0,
-                "voice_input_rate": 0.0,
-                "proactive_conversion_rate": 0.0,
-                "carousel_engagement_rate": 0.0,
-            }
-
-        counts: dict[str, int] = {et: 0 for et in EVENT_TYPES}
-        for event in events:
-            if event.event_type in counts:
-                counts[event.event_type] += 1
 
+        result = await self.db.execute(
+            select(
+                events.c.period,
+                *(
+                    func.count().filter(events.c.event_type == event_type).label(event_type)
+                    for event_type in sorted(EVENT_TYPES)
+                ),
+                func.count(distinct(events.c.session_id)).label("sessions"),
+                func.avg(events.c.load_time_ms).label("avg_load_time_ms"),
+                *percentile_columns(events.c.load_time_ms, (95,), prefix="load_time_"),
+                func.avg(events.c.bundle_size_kb).label("avg_bundle_size_kb"),
+            ).group_by(events.c.period)
+        )
+        return {row.period: row for row in result.all()}
+
+    @staticmethod
+    def _period_counts(row: Any) -> tuple[dict[str, int], int]:
+        """Event counts per type and distinct sessions from a period row."""
+        if row is None:
+            return {}, 0
+        return {et: getattr(row, et) or 0 for et in EVENT_TYPES}, row.sessions or 0
+
+    @staticmethod
+    def _rounded(row: Any, attr: str) -> float:
+        """A performance aggregate rounded to 2 places, 0.0 when absent."""
+        value = getattr(row, attr, None) if row is not None else None
+        return round(float(value), 2) if value is not None else 0.0
+
+    def _calculate_metrics(self, counts: dict[str, int], total_sessions: int) -> dict[str, float]:
+        """Calculate rates from per-type event counts and distinct sessions."""
         total_opens = counts.get("widget_open", 0)
-        total_sessions = len(set(e.session_id for e in events)) or 1
+        total_sessions = total_sessions or 1
 
         return {
-            "open_rate": round(total_opens / total_sessions * 100, 2)
-            if total_sessions > 0
-            else 0.0,
+            "open_rate": round(total_opens / total_sessions * 100, 2),
             "message_rate": round(counts.get("message_send", 0) / max(total_opens, 1) * 100, 2),
             "quick_reply_rate": round(
                 counts.get("quick_reply_click", 0) / max(total_opens, 1) * 100, 2
@@ -296,50 +326,3 @@ class WidgetAnalyticsService:
                 current_metrics.get("message_rate", 0.0), prev_metrics.get("message_rate", 0.0)
             ),
         }
-
-    def _calc_avg_load_time(self, events: list[WidgetAnalyticsEvent]) -> float:
-        """Calculate average load time from event metadata."""
-        if not events:
-            return 0.0
-
-        load_times = []
-        for event in events:
-            if event.event_metadata and "load_time_ms" in event.event_metadata:
-                load_time = event.event_metadata["load_time_ms"]
-                if isinstance(load_time, (int, float)):
-                    load_times.append(load_time)
-
-        return round(sum(load_times) / len(load_times), 2) if load_times else 0.0
-
-    def _calc_p95_load_time(self, events: list[WidgetAnalyticsEvent]) -> float:
-        """Calculate p95 load time from event metadata."""
-        if not events:
-            return 0.0
-
-        load_times = []
-        for event in events:
-            if event.event_metadata and "load_time_ms" in event.event_metadata:
-                load_time = event.event_metadata["load_time_ms"]
-                if isinstance(load_time, (int, float)):
-                    load_times.append(load_time)
-
-        if not load_times:
-            return 0.0
-
-        load_times.sort()
-        p95_index = int(len(load_times) * 0.95)
-        return load_times[min(p95_index, len(load_times) - 1)]
-
-    def _calc_bundle_size(self, events: list[WidgetAnalyticsEvent]) -> float:
-        """Calculate average bundle size from event metadata."""
-        if not events:
-            return 0.0
-
-        bundle_sizes = []
-        for event in events:
-            if event.event_metadata and "bundle_size_kb" in event.event_metadata:
-                bundle_size = event.event_metadata["bundle_size_kb"]
-                if isinstance(bundle_size, (int, float)):
-                    bundle_sizes.append(bundle_size)
-
-        return round(sum(bundle_sizes) / len(bundle_sizes), 2) if bundle_sizes else 0.0
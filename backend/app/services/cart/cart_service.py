@@ -10,11 +10,10 @@ import json
 from datetime import UTC, datetime
 from typing import Any
 
-import redis.asyncio as redis
 import structlog
 
-from app.core.config import settings
 from app.core.errors import APIError, ErrorCode
+from app.core.redis_pool import get_redis
 from app.schemas.cart import Cart, CartItem, CurrencyCode
 
 
@@ -44,10 +43,7 @@ class CartService:
             redis_client: Redis client instance (creates default if not provided)
         """
         if redis_client is None:
-            # Create default Redis client (Async)
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self.redis = redis.from_url(redis_url, decode_responses=True)
+            self.redis = get_redis()
         else:
             self.redis = redis_client
 
@@ -23,7 +23,7 @@ from typing import Any
 import redis.asyncio as redis
 import structlog
 
-from app.core.config import settings
+from app.core.redis_pool import get_redis
 from app.schemas.cart import Cart, CartItem
 from app.services.cart.cart_service import CartService
 from app.services.shopify.shopify_cart_client import ShopifyCartClient
@@ -137,9 +137,7 @@ class ShopifyCartSync:
     def redis(self) -> redis.Redis:
         """Get Redis client."""
         if self._redis is None:
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self._redis = redis.from_url(redis_url, decode_responses=True)
+            self._redis = get_redis()
         return self._redis
 
     @property
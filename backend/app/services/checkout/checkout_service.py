@@ -12,10 +12,10 @@ from datetime import UTC, datetime
 from typing import Any
 from urllib.parse import urlparse
 
-import redis.asyncio as redis
 import structlog
 
 from app.core.errors import APIError, ErrorCode
+from app.core.redis_pool import get_redis
 from app.schemas.cart import Cart
 from app.services.cart import CartService
 from app.services.checkout.checkout_schema import CheckoutStatus
@@ -56,12 +56,7 @@ class CheckoutService:
             cart_service: Cart service instance
         """
         if redis_client is None:
-            # Create default Redis client (Async)
-            from app.core.config import settings
-
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self.redis = redis.from_url(redis_url, decode_responses=True)
+            self.redis = get_redis()
         else:
             self.redis = redis_client
 
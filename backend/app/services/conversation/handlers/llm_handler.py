@@ -6,6 +6,7 @@ Task 1: Create UnifiedConversationService
 Handles GENERAL and UNKNOWN intents with LLM-powered responses.
 Enhanced with automatic product mention detection for product cards.
 Story 9-4: Added quick reply generation for conversation continuation.
+Story 11-2: Optional token streaming straight from the provider.
 """
 
 from __future__ import annotations
@@ -22,6 +23,7 @@ from app.services.conversation.handlers.base_handler import BaseHandler
 from app.services.conversation.schemas import (
     ConversationContext,
     ConversationResponse,
+    TokenCallback,
 )
 from app.services.conversation_context import ConversationContextService
 from app.services.llm.base_llm_service import BaseLLMService, LLMMessage
@@ -38,6 +40,9 @@ register_conversation_templates()
 
 logger = structlog.get_logger(__name__)
 
+# Start of a classification payload leaking into a chat response
+CLASSIFICATION_LEAK_PREFIX = '{"intent"'
+
 
 class LLMHandler(BaseHandler):
     """Handler for GENERAL and UNKNOWN intents.
@@ -65,12 +70,17 @@ class LLMHandler(BaseHandler):
         message: str,
         context: ConversationContext,
         entities: dict[str, Any] | None = None,
+        on_token: TokenCallback | None = None,
     ) -> ConversationResponse:
         """Handle general/unknown intent with LLM.
 
         Story 11-1: Enhanced with conversation context memory integration.
         Injects mode-aware context into LLM prompts for better responses.
 
+        Story 11-2: When on_token is given, the completion is streamed and
+        each provider token is passed to it as it arrives; product mentions
+        and quick replies are still derived from the full text afterwards.
+
         Args:
             db: Database session
             merchant: Merchant configuration
@@ -78,6 +88,7 @@ class LLMHandler(BaseHandler):
             message: User's message
             context: Conversation context (with channel info)
             entities: Extracted entities (not used for general)
+            on_token: Optional callback receiving response tokens as generated
 
         Returns:
             ConversationResponse with LLM-generated message
@@ -165,10 +176,13 @@ class LLMHandler(BaseHandler):
             has_rag_context=rag_context is not None,
         )
         try:
-            response = await llm_service.chat(messages=messages, temperature=0.7)
-            response_text = response.content
+            if on_token is not None:
+                response_text = await self._stream_response(llm_service, messages, on_token)
+            else:
+                response = await llm_service.chat(messages=messages, temperature=0.7)
+                response_text = response.content
 
-            if response_text and response_text.strip().startswith('{"intent"'):
+            if response_text and response_text.strip().startswith(CLASSIFICATION_LEAK_PREFIX):
                 logger.warning(
                     "llm_handler_classification_leak",
                     merchant_id=merchant.id,
@@ -243,6 +257,50 @@ class LLMHandler(BaseHandler):
             },
         )
 
+    async def _stream_response(
+        self,
+        llm_service: BaseLLMService,
+        messages: list[LLMMessage],
+        on_token: TokenCallback,
+    ) -> str:
+        """Stream the completion to on_token and return the full text.
+
+        Tokens are held back while the text could still be a leaked
+        classification payload, so a leak is replaced before anything
+        reaches the user.
+
+        Args:
+            llm_service: LLM service for this merchant
+            messages: Prompt messages
+            on_token: Callback receiving tokens as they arrive
+
+        Returns:
+            Complete response text
+        """
+        parts: list[str] = []
+        held: list[str] | None = []
+
+        async for event in llm_service.stream_chat(messages=messages, temperature=0.7):
+            if event.type == "token" and event.content:
+                parts.append(event.content)
+                if held is None:
+                    await on_token(event.content)
+                    continue
+                held.append(event.content)
+                head = "".join(parts).lstrip()[: len(CLASSIFICATION_LEAK_PREFIX)]
+                if CLASSIFICATION_LEAK_PREFIX.startswith(head):
+                    continue
+                await on_token("".join(held))
+                held = None
+            elif event.type == "done" and event.content and not parts:
+                # Budget-paused wrappers answer with a single done event
+                parts.append(event.content)
+
+        response_text = "".join(parts)
+        if held and not response_text.strip().startswith(CLASSIFICATION_LEAK_PREFIX):
+            await on_token("".join(held))
+        return response_text
+
     def _should_detect_products(self, user_message: str, response_text: str) -> bool:
         """Determine if product cards should be shown based on message content.
 
@@ -115,10 +115,9 @@ class RecommendationHandler(BaseHandler):
         )
 
     async def _fetch_products(self, db: AsyncSession, merchant: Merchant) -> list:
-        from app.services.shopify_admin import ShopifyAdminClient
+        from app.services.shopify.product_service import fetch_products
 
-        admin_client = await ShopifyAdminClient.create(db, merchant.id)
-        return await admin_client.list_products(merchant.id)
+        return await fetch_products("", merchant.id, db)
 
     async def _load_context_data(
         self, db: AsyncSession, context: ConversationContext
@@ -22,7 +22,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.faq import Faq
 from app.services.conversation.schemas import ConversationContext, ConversationResponse
-from app.services.faq import FaqMatch, FaqMatcher, match_faq, rephrase_faq_with_personality
+from app.services.faq import FaqMatch, FaqMatcher, match_faq
+from app.services.faq_rephrase_cache import rephrase_faq_cached
 
 logger = structlog.get_logger(__name__)
 
@@ -168,9 +169,12 @@ class FAQPreprocessor:
                 business_name = merchant.business_name or "our store"
                 bot_name = merchant.bot_name if merchant.bot_name else "Mantisbot"
 
-                answer = await rephrase_faq_with_personality(
-                    llm_service=llm_service,
-                    faq_answer=faq_match.faq.answer,
+                async def get_llm_service():
+                    return llm_service
+
+                answer = await rephrase_faq_cached(
+                    get_llm_service,
+                    faq_match.faq,
                     personality_type=personality_type,
                     business_name=business_name,
                     bot_name=bot_name,
@@ -8,6 +8,7 @@ Defines the data structures for cross-channel message processing.
 
 from __future__ import annotations
 
+from collections.abc import Awaitable, Callable
 from enum import Enum
 from typing import Any, Literal
 
@@ -17,6 +18,9 @@ from app.services.proactive_gathering.schemas import GatheringState as Proactive
 
 SourceDocumentType = Literal["pdf", "url", "text"]
 
+# Receives response text as the LLM generates it (Story 11-2 streaming)
+TokenCallback = Callable[[str], Awaitable[None]]
+
 
 class SourceCitation(BaseModel):
     """Source citation for RAG-based responses.
@@ -729,10 +729,10 @@ class TestHandoffDetection:
         with (
             patch.object(service, "_get_conversation", return_value=None),
             patch("app.services.handoff.detector.HandoffDetector") as mock_detector_class,
-            patch("redis.asyncio") as mock_redis,
+            patch("app.core.redis_pool.get_redis") as mock_get_redis,
         ):
             mock_redis_client = AsyncMock()
-            mock_redis.from_url.return_value = mock_redis_client
+            mock_get_redis.return_value = mock_redis_client
             mock_detector = AsyncMock()
             mock_detector.detect.return_value = MagicMock(
                 should_handoff=False,
@@ -770,10 +770,10 @@ class TestHandoffDetection:
         with (
             patch.object(service, "_get_conversation", return_value=None),
             patch("app.services.handoff.detector.HandoffDetector") as mock_detector_class,
-            patch("redis.asyncio") as mock_redis,
+            patch("app.core.redis_pool.get_redis") as mock_get_redis,
         ):
             mock_redis_client = AsyncMock()
-            mock_redis.from_url.return_value = mock_redis_client
+            mock_get_redis.return_value = mock_redis_client
             mock_detector = AsyncMock()
             mock_detector.detect.return_value = MagicMock(
                 should_handoff=False,
@@ -814,10 +814,10 @@ class TestHandoffDetection:
                 service, "_get_handoff_message", return_value="Connecting you to support..."
             ),
             patch("app.services.handoff.detector.HandoffDetector") as mock_detector_class,
-            patch("redis.asyncio") as mock_redis,
+            patch("app.core.redis_pool.get_redis") as mock_get_redis,
         ):
             mock_redis_client = AsyncMock()
-            mock_redis.from_url.return_value = mock_redis_client
+            mock_get_redis.return_value = mock_redis_client
             mock_detector = AsyncMock()
             mock_detector.detect.return_value = MagicMock(
                 should_handoff=True,
@@ -852,9 +852,9 @@ class TestHandoffDetection:
         mock_db = AsyncMock(spec=AsyncSession)
 
         with (
-            patch("redis.asyncio") as mock_redis,
+            patch("app.core.redis_pool.get_redis") as mock_get_redis,
         ):
-            mock_redis.from_url.side_effect = Exception("Redis unavailable")
+            mock_get_redis.side_effect = Exception("Redis unavailable")
 
             response = await service._check_handoff(
                 db=mock_db,
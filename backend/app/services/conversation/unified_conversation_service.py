@@ -23,8 +23,9 @@ from __future__ import annotations
 import asyncio
 import re
 import time
+from contextlib import suppress
 from datetime import UTC, datetime
-from typing import Any, ClassVar
+from typing import TYPE_CHECKING, Any, ClassVar
 
 import structlog
 from sqlalchemy import select
@@ -34,12 +35,26 @@ from sqlalchemy.orm import selectinload
 
 from app.core.errors import APIError, ErrorCode
 from app.core.input_sanitizer import sanitize_user_message_for_llm
+from app.core.tracing import finish_trace, span, start_trace
+from app.models.conversation_context import ConversationTurn
 from app.models.knowledge_base import KnowledgeDocument
 from app.models.knowledge_gap import GapType, KnowledgeGap
 from app.models.merchant import Merchant, PersonalityType
-from app.models.conversation_context import ConversationTurn
 from app.schemas.consent import ConsentStatus
+from app.services.analytics.sentiment_analyzer import message_sentiment
 from app.services.consent.extended_consent_service import ConversationConsentService
+from app.services.context.edge_case_handler import EdgeCaseHandler
+from app.services.context.enhanced_context_service import EnhancedContextService
+from app.services.conversation.enhancers.ab_testing import ABTestFramework
+from app.services.conversation.enhancers.conversation_goals import ConversationGoalTracker
+from app.services.conversation.enhancers.conversation_summarizer import ConversationSummarizer
+from app.services.conversation.enhancers.performance_optimizer import ConversationOptimizer
+from app.services.conversation.enhancers.proactive_suggestions import ProactiveSuggestionEngine
+from app.services.conversation.enhancers.quality_metrics import ConversationQualityTracker
+from app.services.conversation.enhancers.quick_replies import QuickReplyGenerator
+from app.services.conversation.enhancers.response_consistency import ResponseConsistencyChecker
+from app.services.conversation.enhancers.response_variety import ResponseVarietyEnhancer
+from app.services.conversation.enhancers.typing_simulator import NaturalTypingSimulator
 from app.services.conversation.handlers import (
     CartHandler,
     CheckConsentHandler,
@@ -61,28 +76,17 @@ from app.services.conversation.schemas import (
     Channel,
     ConversationContext,
     ConversationResponse,
+    TokenCallback,
 )
 from app.services.conversation.sentiment_adapter import (
-    SentimentAdapterService,
     SentimentAdaptation,
+    SentimentAdapterService,
     SentimentStrategy,
 )
+from app.services.cost_tracking.budget_aware_llm_wrapper import BudgetAwareLLMWrapper
 from app.services.empathy.empathy_engine import (
     analyze_and_respond_with_empathy,
 )
-from app.services.context.edge_case_handler import EdgeCaseHandler
-from app.services.context.enhanced_context_service import EnhancedContextService
-from app.services.conversation.enhancers.ab_testing import ABTestFramework
-from app.services.conversation.enhancers.conversation_goals import ConversationGoalTracker
-from app.services.conversation.enhancers.conversation_summarizer import ConversationSummarizer
-from app.services.conversation.enhancers.performance_optimizer import ConversationOptimizer
-from app.services.conversation.enhancers.proactive_suggestions import ProactiveSuggestionEngine
-from app.services.conversation.enhancers.quality_metrics import ConversationQualityTracker
-from app.services.conversation.enhancers.quick_replies import QuickReplyGenerator
-from app.services.conversation.enhancers.response_consistency import ResponseConsistencyChecker
-from app.services.conversation.enhancers.response_variety import ResponseVarietyEnhancer
-from app.services.conversation.enhancers.typing_simulator import NaturalTypingSimulator
-from app.services.cost_tracking.budget_aware_llm_wrapper import BudgetAwareLLMWrapper
 from app.services.intent.classification_schema import (
     ClassificationResult,
 )
@@ -92,6 +96,7 @@ from app.services.intent.classification_schema import (
 from app.services.intent.intent_classifier import IntentClassifier
 from app.services.llm.base_llm_service import BaseLLMService
 from app.services.llm.llm_factory import LLMProviderFactory
+from app.services.llm.provider_registry import get_provider_registry
 from app.services.personality.clarification_question_templates import (
     register_natural_question_templates,
 )
@@ -102,6 +107,15 @@ from app.services.personality.conversation_templates import (
 )
 from app.services.personality.error_recovery_templates import register_error_recovery_templates
 from app.services.personality.response_formatter import PersonalityAwareResponseFormatter
+from app.services.rag.semantic_answer_cache import (
+    AnswerScope,
+    CachedAnswer,
+    SemanticAnswerCache,
+    get_semantic_answer_cache,
+)
+
+if TYPE_CHECKING:
+    from app.services.rag.retrieval_service import RetrievedChunk
 
 register_conversation_templates()
 register_error_recovery_templates()
@@ -119,6 +133,7 @@ def build_turn_context_snapshot(
     sentiment_adaptation: SentimentAdaptation | None = None,
     sentiment_confidence: float | None = None,
     mode: str | None = None,
+    stage_timings: dict[str, float] | None = None,
 ) -> dict[str, Any]:
     snapshot: dict[str, Any] = {
         "confidence": confidence,
@@ -127,6 +142,8 @@ def build_turn_context_snapshot(
     }
     if mode is not None:
         snapshot["mode"] = mode
+    if stage_timings:
+        snapshot["stage_timings_ms"] = dict(stage_timings)
     if sentiment_adaptation and sentiment_adaptation.original_score:
         snapshot["sentiment_score"] = sentiment_adaptation.original_score.confidence
     elif sentiment_confidence is not None:
@@ -193,6 +210,7 @@ class UnifiedConversationService:
         db: AsyncSession | None = None,
         track_costs: bool = True,
         rag_context_builder: RAGContextBuilder | None = None,
+        semantic_cache: SemanticAnswerCache | None = None,
     ) -> None:
         """Initialize unified conversation service.
 
@@ -200,10 +218,14 @@ class UnifiedConversationService:
             db: Database session for loading merchant config
             track_costs: Whether to track LLM costs (default True)
             rag_context_builder: RAG context builder for General mode (Story 8-5)
+            semantic_cache: Semantic answer cache for general-mode questions
+                (optional, defaults to the process-wide cache, resolved on the
+                first eligible lookup; bypassed in IS_TESTING mode unless injected)
         """
         self.db = db
         self.track_costs = track_costs
         self.rag_context_builder = rag_context_builder
+        self.semantic_cache = semantic_cache
         self.logger = structlog.get_logger(__name__)
 
         self.general_mode_fallback_handler = GeneralModeFallbackHandler()
@@ -230,11 +252,17 @@ class UnifiedConversationService:
         db: AsyncSession,
         context: ConversationContext,
         message: str,
+        on_token: TokenCallback | None = None,
     ) -> ConversationResponse:
         """Process a message and return a response.
 
         This is the main entry point for all channel message processing.
 
+        Story 11-2: Pass on_token to stream LLM-generated replies as the
+        provider produces them. Only LLMHandler replies are streamed; all
+        post-processing still runs on the full text, so the returned
+        message is authoritative.
+
         Story 5-11: Added pre-processing checks:
         - GAP-6: Budget pause check
         - GAP-5: Hybrid mode detection
@@ -245,6 +273,7 @@ class UnifiedConversationService:
             db: Database session
             context: Conversation context with channel info
             message: User's message text
+            on_token: Optional callback receiving LLM response tokens as generated
 
         Returns:
             ConversationResponse with message and metadata
@@ -257,6 +286,9 @@ class UnifiedConversationService:
         intent_name = None
         confidence = None
         entities = None
+        stage_timings: dict[str, float] = {}
+        trace = None
+        rag_task: asyncio.Task | None = None
 
         message = sanitize_user_message_for_llm(message)
         if not message:
@@ -266,7 +298,11 @@ class UnifiedConversationService:
             )
 
         try:
-            merchant = await self._load_merchant(db, context.merchant_id)
+            trace = start_trace(context.merchant_id)
+            if trace is not None:
+                stage_timings = trace.stages
+            with span("load_merchant"):
+                merchant = await self._load_merchant(db, context.merchant_id)
             if not merchant:
                 raise APIError(
                     ErrorCode.MERCHANT_NOT_FOUND,
@@ -281,48 +317,47 @@ class UnifiedConversationService:
             rag_sources: list[str] = []
             rag_chunks: list[RetrievedChunk] = []
             rag_used_in_response = False
-            if self.rag_context_builder and not self._is_simple_greeting(message):
-                # Story 8-11 AC6: Construct embedding version for dimension consistency
-                embedding_version = None
-                if merchant.embedding_provider and merchant.embedding_model:
-                    embedding_version = f"{merchant.embedding_provider}-{merchant.embedding_model}"
-
-                (
-                    rag_context,
-                    rag_chunks,
-                ) = await self.rag_context_builder.build_rag_context_with_chunks(
-                    merchant_id=merchant.id,
-                    user_query=message,
-                    embedding_version=embedding_version,
-                    conversation_history=context.conversation_history,
-                )
-                # Store in context for handlers to access
-                if context.metadata is None:
-                    context.metadata = {}
-                context.metadata["rag_context"] = rag_context
+            rag_checked = True
 
-                # Extract source document names from RAG context for tracking
-                if rag_context:
-                    # Extract document names from "From \"Document Name\":" pattern
-                    import re
+            # Story 8-11 AC6: Construct embedding version for dimension consistency
+            embedding_version = None
+            if merchant.embedding_provider and merchant.embedding_model:
+                embedding_version = f"{merchant.embedding_provider}-{merchant.embedding_model}"
 
-                    doc_names = re.findall(r'From "([^"]+)":', rag_context)
-                    rag_sources = doc_names
+            # I/O-free checks first: a silent hybrid-mode turn or a summarize
+            # request never needs retrieval
+            hybrid_mode_response = await self._check_hybrid_mode(db, context, message)
+            summarize_intent = self._check_summarize_pattern(message)
+
+            # Retrieval (query embedding + search) uses its own sessions, so it starts
+            # speculatively and overlaps the session-bound checks below. It is
+            # cancelled if budget pause or an FAQ hit answers the turn first.
+            if (
+                self.rag_context_builder
+                and hybrid_mode_response is None
+                and summarize_intent is None
+                and not self._is_simple_greeting(message)
+            ):
+                rag_task = asyncio.create_task(
+                    self._build_rag_context(merchant.id, embedding_version, message, context)
+                )
 
             # GAP-6: Check if bot is paused due to budget limit
-            budget_paused_response = await self._check_budget_pause(db, context, merchant)
+            with span("budget_pause"):
+                budget_paused_response = await self._check_budget_pause(db, context, merchant)
             if budget_paused_response:
                 response = budget_paused_response
                 intent_name = response.intent or "bot_paused"
                 confidence = response.confidence or 1.0
+                await self._cancel_rag_retrieval(rag_task, reason="budget_paused")
+                rag_task = None
+                rag_checked = False
 
             # GAP-5: Check hybrid mode - if active, only respond to @bot mentions
-            if response is None:
-                hybrid_mode_response = await self._check_hybrid_mode(db, context, message)
-                if hybrid_mode_response:
-                    response = hybrid_mode_response
-                    intent_name = response.intent or "hybrid_mode_silent"
-                    confidence = response.confidence or 1.0
+            if response is None and hybrid_mode_response:
+                response = hybrid_mode_response
+                intent_name = response.intent or "hybrid_mode_silent"
+                confidence = response.confidence or 1.0
 
             # GAP-7: Check for returning shopper and send welcome
             if response is None:
@@ -330,7 +365,8 @@ class UnifiedConversationService:
 
             # Story 6-1: Check consent status and prompt if needed
             if response is None:
-                await self._check_and_prompt_consent(db, context, merchant)
+                with span("consent"):
+                    await self._check_and_prompt_consent(db, context, merchant)
 
             # Story 4-13: Check for pending cross-device order lookup
             # If user is providing email/order number after being prompted, route to OrderHandler
@@ -358,26 +394,26 @@ class UnifiedConversationService:
                         )
                         handler = self._handlers["order"]
                         llm_service = await self._get_merchant_llm(merchant, db, context)
-                        response = await handler.handle(
-                            db=db,
-                            merchant=merchant,
-                            llm_service=llm_service,
-                            message=message,
-                            context=context,
-                            entities=None,
-                        )
+                        with span(f"handler.{type(handler).__name__}"):
+                            response = await handler.handle(
+                                db=db,
+                                merchant=merchant,
+                                llm_service=llm_service,
+                                message=message,
+                                context=context,
+                                entities=None,
+                            )
                         intent_name = "order_tracking"
                         confidence = 1.0
 
             # Story 11-9: Early SUMMARIZE pattern pre-check
             # Must run BEFORE multi-turn check, FAQ check, proactive gathering, and general-mode bypass
-            if response is None:
-                summarize_intent = self._check_summarize_pattern(message)
-                if summarize_intent:
-                    intent_name = summarize_intent.value
-                    confidence = 0.98
-                    handler = self._handlers["summarize"]
-                    llm_service = await self._get_merchant_llm(merchant, db, context)
+            if response is None and summarize_intent:
+                intent_name = summarize_intent.value
+                confidence = 0.98
+                handler = self._handlers["summarize"]
+                llm_service = await self._get_merchant_llm(merchant, db, context)
+                with span(f"handler.{type(handler).__name__}"):
                     response = await handler.handle(
                         db=db,
                         merchant=merchant,
@@ -390,12 +426,13 @@ class UnifiedConversationService:
             # Story 11-2: Check multi-turn state before FAQ/intent classification
             # If in active multi-turn flow, route directly to multi-turn handler
             if response is None:
-                mt_response = await self._check_multi_turn_state(
-                    db=db,
-                    context=context,
-                    merchant=merchant,
-                    message=message,
-                )
+                with span("multi_turn"):
+                    mt_response = await self._check_multi_turn_state(
+                        db=db,
+                        context=context,
+                        merchant=merchant,
+                        message=message,
+                    )
                 if mt_response:
                     response = mt_response
                     intent_name = response.intent or "clarification"
@@ -404,27 +441,47 @@ class UnifiedConversationService:
             # Check for FAQ match before intent classification
             faq_matched = False
             if response is None:
-                faq_response = await self._check_faq_match(db, context, merchant, message)
+                with span("faq_match"):
+                    faq_response = await self._check_faq_match(db, context, merchant, message)
                 if faq_response:
                     response = faq_response
                     intent_name = response.intent or "faq"
                     confidence = response.confidence or 1.0
                     faq_matched = True
+                    await self._cancel_rag_retrieval(rag_task, reason="faq_matched")
+                    rag_task = None
+                    rag_checked = False
 
             # Story 11-8: Proactive information gathering
             # After FAQ check, before intent classification
             # Check if active gathering state and handle response
             if response is None:
-                response = await self._check_proactive_gathering(
-                    db=db,
-                    context=context,
-                    merchant=merchant,
-                    message=message,
-                )
+                with span("proactive_gathering"):
+                    response = await self._check_proactive_gathering(
+                        db=db,
+                        context=context,
+                        merchant=merchant,
+                        message=message,
+                    )
                 if response:
                     intent_name = response.intent or "proactive_gathering"
                     confidence = response.confidence or 0.8
 
+            # Join speculative retrieval before routing (LLMHandler reads rag_context)
+            if rag_task is not None:
+                with span("rag_wait"):
+                    rag_context, rag_chunks = await rag_task
+                rag_task = None
+                # Store in context for handlers to access
+                if context.metadata is None:
+                    context.metadata = {}
+                context.metadata["rag_context"] = rag_context
+
+                # Extract source document names from RAG context for tracking
+                if rag_context:
+                    # Extract document names from "From \"Document Name\":" pattern
+                    rag_sources = re.findall(r'From "([^"]+)":', rag_context)
+
             # Normal flow: intent classification and handler routing
             if response is None:
                 llm_service = await self._get_merchant_llm(merchant, db, context)
@@ -465,14 +522,15 @@ class UnifiedConversationService:
                         )
 
                     # Check for handoff triggers (keyword detection works without confidence)
-                    handoff_response = await self._check_handoff(
-                        db=db,
-                        context=context,
-                        merchant=merchant,
-                        message=message,
-                        confidence=confidence,
-                        intent_name=intent_name,
-                    )
+                    with span("handoff"):
+                        handoff_response = await self._check_handoff(
+                            db=db,
+                            context=context,
+                            merchant=merchant,
+                            message=message,
+                            confidence=confidence,
+                            intent_name=intent_name,
+                        )
                     if handoff_response:
                         response = handoff_response
                         intent_name = response.intent or "human_handoff"
@@ -480,30 +538,64 @@ class UnifiedConversationService:
                     elif intent_name == "human_handoff":
                         handler_name = self.INTENT_TO_HANDLER_MAP.get(intent_name, "llm")
                         handler = self._handlers.get(handler_name, self._handlers["llm"])
-                        response = await handler.handle(
-                            db=db,
-                            merchant=merchant,
-                            llm_service=llm_service,
-                            message=message,
-                            context=context,
-                            entities=None,
-                        )
+                        with span(f"handler.{type(handler).__name__}"):
+                            response = await handler.handle(
+                                db=db,
+                                merchant=merchant,
+                                llm_service=llm_service,
+                                message=message,
+                                context=context,
+                                entities=None,
+                                **self._stream_kwargs(handler, on_token),
+                            )
                     else:
-                        handler = self._handlers["llm"]
-                        response = await handler.handle(
-                            db=db,
-                            merchant=merchant,
+                        with span("semantic_cache"):
+                            semantic_key = await self._semantic_cache_key(
+                                merchant, message, context, embedding_version
+                            )
+                            cached_answer = (
+                                self.semantic_cache.lookup(*semantic_key) if semantic_key else None
+                            )
+                        if cached_answer:
+                            response, rag_context, rag_chunks = self._semantic_cache_response(
+                                *cached_answer
+                            )
+                            if context.metadata is None:
+                                context.metadata = {}
+                            context.metadata["rag_context"] = rag_context
+                            rag_sources = (
+                                re.findall(r'From "([^"]+)":', rag_context) if rag_context else []
+                            )
+                        else:
+                            handler = self._handlers["llm"]
+                            with span(f"handler.{type(handler).__name__}"):
+                                response = await handler.handle(
+                                    db=db,
+                                    merchant=merchant,
+                                    llm_service=llm_service,
+                                    message=message,
+                                    context=context,
+                                    entities=None,
+                                    **self._stream_kwargs(handler, on_token),
+                                )
+                            if semantic_key and self._is_cacheable_answer(
+                                response, context, rag_chunks
+                            ):
+                                self.semantic_cache.store(
+                                    *semantic_key,
+                                    CachedAnswer(
+                                        answer=response.message,
+                                        rag_context=rag_context,
+                                        chunks=list(rag_chunks),
+                                    ),
+                                )
+                else:
+                    with span("classification"):
+                        classification = await self._classify_intent(
                             llm_service=llm_service,
                             message=message,
                             context=context,
-                            entities=None,
                         )
-                else:
-                    classification = await self._classify_intent(
-                        llm_service=llm_service,
-                        message=message,
-                        context=context,
-                    )
 
                     intent_name = (
                         classification.intent.value if classification.intent else "unknown"
@@ -749,14 +841,15 @@ class UnifiedConversationService:
                     )
 
                     # GAP-1: Check for handoff triggers (low confidence + clarification loop)
-                    handoff_response = await self._check_handoff(
-                        db=db,
-                        context=context,
-                        merchant=merchant,
-                        message=message,
-                        confidence=confidence,
-                        intent_name=intent_name,
-                    )
+                    with span("handoff"):
+                        handoff_response = await self._check_handoff(
+                            db=db,
+                            context=context,
+                            merchant=merchant,
+                            message=message,
+                            confidence=confidence,
+                            intent_name=intent_name,
+                        )
                     if handoff_response:
                         response = handoff_response
                         intent_name = response.intent or "human_handoff"
@@ -772,14 +865,16 @@ class UnifiedConversationService:
                             )
                             handler = self._handlers["llm"]
                             entities = None
-                            response = await handler.handle(
-                                db=db,
-                                merchant=merchant,
-                                llm_service=llm_service,
-                                message=message,
-                                context=context,
-                                entities=entities,
-                            )
+                            with span(f"handler.{type(handler).__name__}"):
+                                response = await handler.handle(
+                                    db=db,
+                                    merchant=merchant,
+                                    llm_service=llm_service,
+                                    message=message,
+                                    context=context,
+                                    entities=entities,
+                                    **self._stream_kwargs(handler, on_token),
+                                )
                         else:
                             # Story 8-5: Check for e-commerce intent in General mode
                             if (
@@ -797,14 +892,15 @@ class UnifiedConversationService:
                                 if classification.entities:
                                     entities = classification.entities.model_dump(exclude_none=True)
                                     entities["original_intent"] = intent_name
-                                response = await handler.handle(
-                                    db=db,
-                                    merchant=merchant,
-                                    llm_service=llm_service,
-                                    message=message,
-                                    context=context,
-                                    entities=entities,
-                                )
+                                with span(f"handler.{type(handler).__name__}"):
+                                    response = await handler.handle(
+                                        db=db,
+                                        merchant=merchant,
+                                        llm_service=llm_service,
+                                        message=message,
+                                        context=context,
+                                        entities=entities,
+                                    )
                                 intent_name = "general_mode_fallback"
                             else:
                                 handler_name = self.INTENT_TO_HANDLER_MAP.get(intent_name, "llm")
@@ -819,20 +915,23 @@ class UnifiedConversationService:
                                     cart_action = self._determine_cart_action(intent_name)
                                     entities["cart_action"] = cart_action
 
-                                response = await handler.handle(
-                                    db=db,
-                                    merchant=merchant,
-                                    llm_service=llm_service,
-                                    message=message,
-                                    context=context,
-                                    entities=entities,
-                                )
+                                with span(f"handler.{type(handler).__name__}"):
+                                    response = await handler.handle(
+                                        db=db,
+                                        merchant=merchant,
+                                        llm_service=llm_service,
+                                        message=message,
+                                        context=context,
+                                        entities=entities,
+                                        **self._stream_kwargs(handler, on_token),
+                                    )
 
             # Single exit point: ALWAYS persist and return
             processing_time_ms = (time.time() - start_time) * 1000
             if response.metadata is None:
                 response.metadata = {}
             response.metadata["processing_time_ms"] = round(processing_time_ms, 2)
+            response.metadata["stage_timings_ms"] = stage_timings
             response.intent = intent_name
             response.confidence = confidence
 
@@ -1092,7 +1191,9 @@ class UnifiedConversationService:
                         if cross_ref:
                             # Apply transition suppression
                             msg = response.message
-                            from app.services.personality.transition_phrases import TRANSITION_PHRASES
+                            from app.services.personality.transition_phrases import (
+                                TRANSITION_PHRASES,
+                            )
 
                             transition_suppressed = False
                             all_phrases: list[str] = []
@@ -1130,17 +1231,18 @@ class UnifiedConversationService:
             merchant_onboarding_mode = merchant.onboarding_mode
             merchant_personality = merchant.personality
 
-            res = await self._persist_conversation_message(
-                db=db,
-                context=context,
-                merchant_id=context.merchant_id,
-                user_message=message,
-                bot_response=response.message,
-                intent=intent_name,
-                confidence=confidence,
-                cart=response.cart,
-                response_metadata=response.metadata,
-            )
+            with span("persist"):
+                res = await self._persist_conversation_message(
+                    db=db,
+                    context=context,
+                    merchant_id=context.merchant_id,
+                    user_message=message,
+                    bot_response=response.message,
+                    intent=intent_name,
+                    confidence=confidence,
+                    cart=response.cart,
+                    response_metadata=response.metadata,
+                )
 
             conversation_id = None
             if res:
@@ -1156,6 +1258,7 @@ class UnifiedConversationService:
                 processing_time_ms=processing_time_ms,
                 intent_name=intent_name,
                 mode=merchant_onboarding_mode,
+                stage_timings=stage_timings,
             )
 
             # Detect and record knowledge gaps
@@ -1168,6 +1271,7 @@ class UnifiedConversationService:
                 confidence=confidence if confidence else 0.0,
                 rag_chunks=rag_chunks,
                 faq_matched=faq_matched,
+                rag_checked=rag_checked,
             )
 
             self.logger.info(
@@ -1177,6 +1281,7 @@ class UnifiedConversationService:
                 intent=intent_name,
                 confidence=confidence,
                 processing_time_ms=processing_time_ms,
+                stage_timings_ms=stage_timings,
             )
 
             # Week 3 Integration: Post-Response Enhancements (All 10 Systems)
@@ -1323,6 +1428,146 @@ class UnifiedConversationService:
                     ErrorCode.LLM_PROVIDER_ERROR,
                     f"Failed to process message: {str(e)}",
                 )
+        finally:
+            if rag_task is not None and not rag_task.done():
+                rag_task.cancel()
+            finish_trace(trace)
+
+    async def _build_rag_context(
+        self,
+        merchant_id: int,
+        embedding_version: str | None,
+        message: str,
+        context: ConversationContext,
+    ) -> tuple[str | None, list[RetrievedChunk]]:
+        """Retrieve RAG context for a turn (runs as a speculative task).
+
+        Takes plain values rather than the Merchant so the task never touches
+        the request's session, which the other stages keep using meanwhile.
+
+        Args:
+            merchant_id: Merchant ID
+            embedding_version: Embedding version filter (Story 8-11 AC6)
+            message: User's message
+            context: Conversation context
+
+        Returns:
+            Tuple of (formatted context string or None, retrieved chunks)
+        """
+        with span("rag_retrieval"):
+            return await self.rag_context_builder.build_rag_context_with_chunks(
+                merchant_id=merchant_id,
+                user_query=message,
+                embedding_version=embedding_version,
+                conversation_history=context.conversation_history,
+            )
+
+    async def _semantic_cache_key(
+        self,
+        merchant: Merchant,
+        message: str,
+        context: ConversationContext,
+        embedding_version: str | None,
+    ) -> tuple[AnswerScope, list[float]] | None:
+        """Scope and query embedding for a semantic answer cache lookup.
+
+        Only standalone questions are eligible: follow-ups depend on the
+        conversation, and sentiment-adapted replies depend on the customer's
+        mood. The embedding comes from the query embedding cache, which the
+        turn's retrieval has already filled.
+
+        Returns:
+            (scope, query embedding), or None when the turn is not cacheable
+        """
+        if self.rag_context_builder is None:
+            return None
+        if not self._is_question(message):
+            return None
+        if (context.metadata or {}).get("current_sentiment_adaptation"):
+            return None
+        query_rewriter = self.rag_context_builder.query_rewriter
+        if (
+            context.conversation_history
+            and query_rewriter is not None
+            and query_rewriter.is_follow_up(message)
+        ):
+            return None
+
+        if self.semantic_cache is None:
+            self.semantic_cache = get_semantic_answer_cache()
+            if self.semantic_cache is None:
+                return None
+        kb_version = await self.semantic_cache.kb_version(merchant.id)
+        if kb_version is None:
+            return None
+        try:
+            embedding = await asyncio.wait_for(
+                self.rag_context_builder.retrieval_service.embedding_service.embed_query(message),
+                timeout=1.0,
+            )
+        except Exception as e:
+            self.logger.debug("semantic_cache_embedding_failed", error=str(e))
+            return None
+
+        personality = merchant.personality or PersonalityType.FRIENDLY
+        persona = "|".join(
+            (
+                personality.value if hasattr(personality, "value") else str(personality),
+                merchant.bot_name or "Mantisbot",
+                merchant.business_name or "our store",
+            )
+        )
+        return AnswerScope(merchant.id, kb_version, embedding_version, persona), embedding
+
+    def _semantic_cache_response(
+        self, cached: CachedAnswer, similarity: float
+    ) -> tuple[ConversationResponse, str | None, list[RetrievedChunk]]:
+        """Build the turn's response and RAG state from a cached answer."""
+        self.logger.info("semantic_cache_hit", similarity=round(similarity, 4))
+        response = ConversationResponse(
+            message=cached.answer,
+            intent="general",
+            confidence=1.0,
+            metadata={"semantic_cache_hit": True, "semantic_similarity": round(similarity, 4)},
+        )
+        return response, cached.rag_context, list(cached.chunks)
+
+    def _is_cacheable_answer(
+        self,
+        response: ConversationResponse,
+        context: ConversationContext,
+        rag_chunks: list[RetrievedChunk],
+    ) -> bool:
+        """Whether a general-mode answer may be served to other customers.
+
+        Only first-turn answers grounded in retrieved knowledge are stored, so
+        a cached answer never leans on another customer's conversation.
+        """
+        return bool(
+            response.message
+            and not response.fallback
+            and rag_chunks
+            and not context.conversation_history
+            and not self._indicates_no_information_found(response.message)
+        )
+
+    async def _cancel_rag_retrieval(self, rag_task: asyncio.Task | None, reason: str) -> None:
+        """Discard speculative retrieval once an earlier stage has answered the turn."""
+        if rag_task is None:
+            return
+        if not rag_task.done():
+            rag_task.cancel()
+        with suppress(asyncio.CancelledError, Exception):
+            await rag_task
+        self.logger.debug("rag_retrieval_discarded", reason=reason)
+
+    def _stream_kwargs(
+        self, handler: Any, on_token: TokenCallback | None
+    ) -> dict[str, TokenCallback]:
+        """Handler kwargs that enable token streaming (only LLMHandler streams)."""
+        if on_token is not None and isinstance(handler, LLMHandler):
+            return {"on_token": on_token}
+        return {}
 
     async def generate_handoff_resolution_message(
         self,
@@ -1524,6 +1769,9 @@ class UnifiedConversationService:
         Story 5-10 Code Review Fix (C7):
         - Wraps LLM with BudgetAwareLLMWrapper for cost tracking
 
+        The provider itself comes from the process-wide registry, so its
+        pooled HTTP client is reused across turns.
+
         Args:
             merchant: Merchant model
             db: Database session
@@ -1535,24 +1783,12 @@ class UnifiedConversationService:
         base_llm = None
 
         llm_config = merchant.llm_configuration
+        registry = get_provider_registry()
 
         if llm_config:
-            provider_name = llm_config.provider or "ollama"
-            model = llm_config.ollama_model or llm_config.cloud_model
-
-            config = {"model": model}
-            if provider_name == "ollama":
-                config["ollama_url"] = llm_config.ollama_url
-            else:
-                if llm_config.api_key_encrypted:
-                    from app.core.security import decrypt_access_token
-
-                    config["api_key"] = decrypt_access_token(llm_config.api_key_encrypted)
-
             try:
-                llm_service = LLMProviderFactory.create_provider(
-                    provider_name=provider_name,
-                    config=config,
+                llm_service = registry.get_llm_provider(
+                    merchant.id, llm_config, provider_factory=LLMProviderFactory
                 )
                 return BudgetAwareLLMWrapper(
                     llm_service=llm_service,
@@ -1570,9 +1806,8 @@ class UnifiedConversationService:
                 )
 
         if base_llm is None:
-            base_llm = LLMProviderFactory.create_provider(
-                provider_name="ollama",
-                config={"model": "llama3.2"},
+            base_llm = registry.get_llm_provider(
+                merchant.id, None, provider_factory=LLMProviderFactory
             )
 
         if self.track_costs and context:
@@ -2302,6 +2537,7 @@ class UnifiedConversationService:
                 data_tier=DataTier.VOLUNTARY,
             )
             user_msg.set_encrypted_content(user_message, "customer")
+            user_msg.sentiment, user_msg.sentiment_score = message_sentiment(user_message)
             db.add(user_msg)
 
             bot_msg = Message(
@@ -2672,20 +2908,17 @@ class UnifiedConversationService:
             ConversationResponse with FAQ answer if matched, None otherwise
         """
         try:
-            from app.models.faq import Faq
-            from app.services.faq import match_faq, rephrase_faq_with_personality
+            from app.services.faq import get_faq_index
+            from app.services.faq_rephrase_cache import rephrase_faq_cached
 
-            # Get merchant's FAQs
-            result = await db.execute(
-                select(Faq).where(Faq.merchant_id == merchant.id).order_by(Faq.order_index)
-            )
-            faqs = list(result.scalars().all())
+            # Compiled per-merchant FAQ index (no DB hit when cached)
+            faq_index = await get_faq_index(db, merchant.id)
 
-            if not faqs:
+            if not faq_index:
                 return None
 
             # Try to match FAQ
-            faq_match = await match_faq(message, faqs)
+            faq_match = faq_index.match(message)
 
             if not faq_match:
                 return None
@@ -2706,15 +2939,15 @@ class UnifiedConversationService:
             business_name = merchant.business_name or "our store"
             bot_name = merchant.bot_name if merchant.bot_name else "Mantisbot"
 
-            # Get LLM service for rephrasing
-            llm_service = await self._get_merchant_llm(merchant, db, context)
+            async def get_llm_service() -> BaseLLMService:
+                return await self._get_merchant_llm(merchant, db, context)
 
-            # Rephrase with personality
+            # Rephrase with personality (cached; LLM only resolved on a miss)
             faq_answer = faq_match.faq.answer
             try:
-                faq_answer = await rephrase_faq_with_personality(
-                    llm_service=llm_service,
-                    faq_answer=faq_match.faq.answer,
+                faq_answer = await rephrase_faq_cached(
+                    get_llm_service,
+                    faq_match.faq,
                     personality_type=personality_type,
                     business_name=business_name,
                     bot_name=bot_name,
@@ -2782,17 +3015,11 @@ class UnifiedConversationService:
         Returns:
             ConversationResponse with handoff message if triggered, None otherwise
         """
-        redis_client = None
         try:
-            from app.core.config import settings
+            from app.core.redis_pool import get_redis
             from app.services.handoff.detector import HandoffDetector
 
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            import redis.asyncio as redis
-
-            redis_client = redis.from_url(redis_url, decode_responses=True)
-            detector = HandoffDetector(redis_client=redis_client)
+            detector = HandoffDetector(redis_client=get_redis())
 
             conversation = await self._get_conversation(db, context.session_id, merchant.id)
             conversation_id = conversation.id if conversation else merchant.id
@@ -2855,9 +3082,6 @@ class UnifiedConversationService:
                 merchant_id=merchant.id,
                 error=str(e),
             )
-        finally:
-            if redis_client:
-                await redis_client.close()
         return None
 
     async def _get_conversation(
@@ -2966,6 +3190,7 @@ class UnifiedConversationService:
                     data_tier=DataTier.VOLUNTARY,
                 )
                 user_msg.set_encrypted_content(user_message, "customer")
+                user_msg.sentiment, user_msg.sentiment_score = message_sentiment(user_message)
                 db.add(user_msg)
 
             if bot_response:
@@ -3232,6 +3457,7 @@ class UnifiedConversationService:
         sentiment_adaptation: SentimentAdaptation | None = None,
         sentiment_confidence: float | None = None,
         mode: str | None = None,
+        stage_timings: dict[str, float] | None = None,
     ) -> dict[str, Any]:
         return build_turn_context_snapshot(
             confidence=confidence,
@@ -3240,6 +3466,7 @@ class UnifiedConversationService:
             sentiment_adaptation=sentiment_adaptation,
             sentiment_confidence=sentiment_confidence,
             mode=mode,
+            stage_timings=stage_timings,
         )
 
     async def _write_conversation_turn(
@@ -3273,6 +3500,7 @@ class UnifiedConversationService:
         processing_time_ms: float,
         intent_name: str | None,
         mode: str | None,
+        stage_timings: dict[str, float] | None = None,
     ) -> None:
         if not conversation_id:
             return
@@ -3298,6 +3526,7 @@ class UnifiedConversationService:
                 sentiment_adaptation=sentiment_adaptation_obj,
                 sentiment_confidence=sentiment_confidence,
                 mode=mode,
+                stage_timings=stage_timings,
             )
             await self._write_conversation_turn(
                 db=db,
@@ -3336,6 +3565,7 @@ class UnifiedConversationService:
         confidence: float,
         rag_chunks: list[RetrievedChunk],
         faq_matched: bool,
+        rag_checked: bool = True,
     ) -> None:
         """Detect and record knowledge gaps.
 
@@ -3354,6 +3584,7 @@ class UnifiedConversationService:
             confidence: Classification confidence
             rag_chunks: RAG chunks retrieved (empty if no match)
             faq_matched: Whether an FAQ matched
+            rag_checked: False when retrieval was skipped because an earlier stage answered
         """
         try:
             if not self._is_question(user_message):
@@ -3364,7 +3595,7 @@ class UnifiedConversationService:
             has_rag_match = len(rag_chunks) > 0
             if not faq_matched:
                 gap_types.append(GapType.NO_FAQ_MATCH.value)
-            if not has_rag_match:
+            if rag_checked and not has_rag_match:
                 gap_types.append(GapType.NO_RAG_MATCH.value)
             if confidence < 0.5:
                 gap_types.append(GapType.LOW_CONFIDENCE.value)
@@ -21,7 +21,7 @@ import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
+from app.core.redis_pool import get_redis
 from app.models.budget_alert import BudgetAlert
 from app.models.merchant import Merchant
 from app.services.notification.in_app_provider import InAppNotificationProvider
@@ -67,9 +67,7 @@ class BudgetAlertService:
         self.notification_provider = InAppNotificationProvider(db) if db else None
 
         if redis_client is None:
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self.redis = redis.from_url(redis_url, decode_responses=True)
+            self.redis = get_redis()
         else:
             self.redis = redis_client
 
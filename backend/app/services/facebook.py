@@ -24,6 +24,7 @@ from app.models.conversation import Conversation
 from app.models.facebook_integration import FacebookIntegration
 from app.models.merchant import Merchant
 from app.models.message import Message
+from app.services.analytics.sentiment_analyzer import message_sentiment
 
 # Facebook API endpoints
 FACEBOOK_OAUTH_DIALOG_URL = "https://www.facebook.com/v18.0/dialog/oauth"
@@ -540,6 +541,8 @@ class FacebookService:
 
         # Use encrypted content setter for automatic encryption
         message.set_encrypted_content(content, sender)
+        if sender == "customer":
+            message.sentiment, message.sentiment_score = message_sentiment(content)
 
         # Encrypt metadata if provided
         if message_metadata:
@@ -1,20 +1,30 @@
 """FAQ matching service for Story 1.11.
 
 Provides keyword matching and relevance ranking for FAQ items.
+
+FAQ matching runs before intent classification on every message, so chat
+paths use a per-merchant FaqIndex (normalized lookups plus an Aho-Corasick
+automaton) cached in process and invalidated by the FAQ CRUD endpoints.
 """
 
 from __future__ import annotations
 
 import re
 import time
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass
 
 import structlog
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.faq import Faq
 
 logger = structlog.get_logger(__name__)
 
+FAQ_INDEX_TTL_SECONDS = 300
+
 
 @dataclass
 class FaqMatch:
@@ -256,6 +266,294 @@ class FaqMatcher:
         return None
 
 
+class _AhoCorasick:
+    """Aho-Corasick automaton reporting which patterns occur in a text."""
+
+    def __init__(self, patterns: list[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                node = next_node
+            self._outputs[node].append(pattern_id)
+
+        # Breadth-first failure links; outputs inherit those of their fail node
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def find(self, text: str) -> set[int]:
+        """Return the ids of all patterns occurring in text."""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found: set[int] = set()
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found.update(outputs[node])
+        return found
+
+
+class FaqIndex:
+    """Precompiled matcher over one merchant's FAQ list.
+
+    Produces the same result as FaqMatcher.match_faq() over the same list,
+    but normalizes questions and keywords once at build time:
+    - exact question and exact keyword hits are dict lookups,
+    - "question in message" and "keyword in message" come from a single
+      Aho-Corasick scan of the message,
+    - "message in question" is one word-bounded regex search over all
+      questions joined together.
+    """
+
+    _QUESTION = 0
+    _KEYWORD = 1
+
+    def __init__(self, faqs: list[Faq], matcher: FaqMatcher | None = None) -> None:
+        self.matcher = matcher or get_faq_matcher()
+        self.faqs = list(faqs)
+
+        self._exact_questions: dict[str, int] = {}
+        self._exact_keywords: dict[str, set[int]] = {}
+        self._always_contained: list[int] = []
+        pattern_ids: dict[str, int] = {}
+        # Per pattern: (faq position, kind) for every FAQ question/keyword entry
+        self._pattern_owners: list[list[tuple[int, int]]] = []
+        questions: list[str] = []
+
+        def add_pattern(pattern: str, position: int, kind: int) -> None:
+            pattern_id = pattern_ids.get(pattern)
+            if pattern_id is None:
+                pattern_id = len(self._pattern_owners)
+                pattern_ids[pattern] = pattern_id
+                self._pattern_owners.append([])
+            self._pattern_owners[pattern_id].append((position, kind))
+
+        for position, faq in enumerate(self.faqs):
+            question = self.matcher.normalize_text(faq.question)
+            questions.append(question)
+            self._exact_questions.setdefault(question, position)
+            if question:
+                add_pattern(question, position, self._QUESTION)
+            else:
+                self._always_contained.append(position)
+
+            for raw_keyword in (faq.keywords or "").split(","):
+                if not raw_keyword.strip():
+                    continue
+                keyword = self.matcher.normalize_text(raw_keyword)
+                self._exact_keywords.setdefault(keyword, set()).add(position)
+                add_pattern(keyword, position, self._KEYWORD)
+
+        self._automaton = _AhoCorasick(list(pattern_ids))
+        # Normalized text has no newlines, so they separate questions safely
+        self._joined_questions = "\n".join(questions)
+        self._question_offsets: list[int] = []
+        offset = 0
+        for question in questions:
+            self._question_offsets.append(offset)
+            offset += len(question) + 1
+
+    def __len__(self) -> int:
+        return len(self.faqs)
+
+    def match(self, customer_message: str) -> FaqMatch | None:
+        """Match a customer message against the indexed FAQs.
+
+        Args:
+            customer_message: Customer's question/message
+
+        Returns:
+            FaqMatch if confidence > 0.7, None otherwise
+
+        Raises:
+            ValueError: If customer_message is empty
+        """
+        if not customer_message or not customer_message.strip():
+            raise ValueError("customer_message cannot be empty")
+
+        if not self.faqs:
+            return None
+
+        start_time = time.perf_counter()
+        matcher = self.matcher
+        normalized_message = matcher.normalize_text(customer_message)
+
+        exact_position = self._exact_questions.get(normalized_message)
+        if exact_position is not None:
+            return FaqMatch(
+                faq=self.faqs[exact_position],
+                confidence=matcher.EXACT_QUESTION_MATCH_CONFIDENCE,
+                match_type="exact_question",
+            )
+
+        contains: dict[int, float] = dict.fromkeys(
+            self._always_contained, matcher.CONTAINS_QUESTION_MATCH_CONFIDENCE
+        )
+        partial_keywords: dict[int, int] = {}
+        for pattern_id in self._automaton.find(normalized_message):
+            for position, kind in self._pattern_owners[pattern_id]:
+                if kind == self._QUESTION:
+                    contains[position] = matcher.CONTAINS_QUESTION_MATCH_CONFIDENCE
+                else:
+                    partial_keywords[position] = partial_keywords.get(position, 0) + 1
+
+        # Short queries contained in a question, on word boundaries
+        if len(normalized_message) >= 4:
+            pattern = re.compile(r"\b" + re.escape(normalized_message) + r"\b")
+            for found in pattern.finditer(self._joined_questions):
+                position = bisect_right(self._question_offsets, found.start()) - 1
+                contains.setdefault(position, matcher.CONTAINS_QUESTION_MATCH_CONFIDENCE * 0.9)
+
+        exact_keywords = self._exact_keywords.get(normalized_message, set())
+        candidates = set(contains) | set(partial_keywords) | exact_keywords
+
+        best_match: FaqMatch | None = None
+        for position in sorted(candidates):
+            faq_match: FaqMatch | None = None
+            if position in contains:
+                faq_match = FaqMatch(
+                    faq=self.faqs[position],
+                    confidence=contains[position],
+                    match_type="contains_question",
+                )
+
+            keyword_match: FaqMatch | None = None
+            if position in exact_keywords:
+                keyword_match = FaqMatch(
+                    faq=self.faqs[position],
+                    confidence=matcher.EXACT_KEYWORD_MATCH_CONFIDENCE,
+                    match_type="keyword_exact",
+                )
+            elif position in partial_keywords:
+                keyword_match = FaqMatch(
+                    faq=self.faqs[position],
+                    confidence=matcher.PARTIAL_KEYWORD_MATCH_CONFIDENCE
+                    + min(partial_keywords[position] * 0.05, 0.1),
+                    match_type="keyword_partial",
+                )
+            if keyword_match and (
+                faq_match is None or keyword_match.confidence > faq_match.confidence
+            ):
+                faq_match = keyword_match
+
+            if faq_match and (best_match is None or faq_match.confidence > best_match.confidence):
+                best_match = faq_match
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        if best_match and best_match.confidence >= matcher.PARTIAL_KEYWORD_MATCH_CONFIDENCE:
+            logger.info(
+                "faq_matched",
+                faq_id=best_match.faq.id,
+                confidence=best_match.confidence,
+                match_type=best_match.match_type,
+                elapsed_ms=elapsed_ms,
+            )
+            return best_match
+
+        logger.debug(
+            "faq_no_match",
+            customer_message=customer_message[:100],
+            elapsed_ms=elapsed_ms,
+        )
+        return None
+
+
+def _detached_faq(faq: Faq) -> Faq:
+    """Session-independent copy of a FAQ row for the shared index."""
+    return Faq(
+        id=faq.id,
+        merchant_id=faq.merchant_id,
+        question=faq.question,
+        answer=faq.answer,
+        keywords=faq.keywords,
+        icon=faq.icon,
+        order_index=faq.order_index,
+        created_at=faq.created_at,
+        updated_at=faq.updated_at,
+    )
+
+
+class FaqIndexCache:
+    """Per-merchant FaqIndex cache with version-stamped invalidation.
+
+    Each merchant has a version counter that invalidate() bumps (FAQ create,
+    update, reorder and delete). An index built from rows read before an
+    invalidation is returned to its caller but never stored, so a build
+    racing with an edit cannot cache stale FAQs.
+
+    Architecture Note (Multi-Worker Limitation):
+        Invalidation is in-process only. Entries also expire after a TTL so
+        other workers pick up changes within ``ttl_seconds``.
+    """
+
+    def __init__(self, ttl_seconds: float = FAQ_INDEX_TTL_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[int, tuple[int, float, FaqIndex]] = {}
+        self._versions: dict[int, int] = {}
+
+    def version(self, merchant_id: int) -> int:
+        return self._versions.get(merchant_id, 0)
+
+    async def get(self, db: AsyncSession, merchant_id: int) -> FaqIndex:
+        """Get the merchant's FAQ index, loading FAQs only on a miss.
+
+        Args:
+            db: Database session (used on a miss)
+            merchant_id: Merchant ID
+
+        Returns:
+            FaqIndex over the merchant's FAQs in display order
+        """
+        version = self.version(merchant_id)
+        entry = self._entries.get(merchant_id)
+        if (
+            entry is not None
+            and entry[0] == version
+            and time.monotonic() - entry[1] < self.ttl_seconds
+        ):
+            return entry[2]
+
+        result = await db.execute(
+            select(Faq).where(Faq.merchant_id == merchant_id).order_by(Faq.order_index)
+        )
+        index = FaqIndex([_detached_faq(faq) for faq in result.scalars().all()])
+
+        if self.version(merchant_id) == version:
+            self._entries[merchant_id] = (version, time.monotonic(), index)
+        logger.debug("faq_index_built", merchant_id=merchant_id, faq_count=len(index))
+        return index
+
+    def invalidate(self, merchant_id: int) -> None:
+        """Drop the merchant's index after its FAQs changed."""
+        self._versions[merchant_id] = self.version(merchant_id) + 1
+        self._entries.pop(merchant_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._versions.clear()
+
+
 # Singleton instance for convenience
 _default_matcher: FaqMatcher | None = None
 
@@ -272,6 +570,35 @@ def get_faq_matcher() -> FaqMatcher:
     return _default_matcher
 
 
+_faq_index_cache: FaqIndexCache | None = None
+
+
+def get_faq_index_cache() -> FaqIndexCache:
+    """Get the process-wide per-merchant FAQ index cache."""
+    global _faq_index_cache
+    if _faq_index_cache is None:
+        _faq_index_cache = FaqIndexCache()
+    return _faq_index_cache
+
+
+async def get_faq_index(db: AsyncSession, merchant_id: int) -> FaqIndex:
+    """Get the merchant's compiled FAQ index (cached).
+
+    Args:
+        db: Database session (used only when the index must be rebuilt)
+        merchant_id: Merchant ID
+
+    Returns:
+        FaqIndex over the merchant's FAQs
+    """
+    return await get_faq_index_cache().get(db, merchant_id)
+
+
+def invalidate_faq_index(merchant_id: int) -> None:
+    """Drop a merchant's cached FAQ index (call after FAQ changes)."""
+    get_faq_index_cache().invalidate(merchant_id)
+
+
 async def match_faq(
     customer_message: str,
     merchant_faqs: list[Faq],
@@ -291,18 +618,15 @@ async def match_faq(
     return matcher.match_faq(customer_message, merchant_faqs)
 
 
-async def rephrase_faq_with_personality(
+async def generate_faq_rephrase(
     llm_service,
     faq_answer: str,
     personality_type,
     business_name: str,
     bot_name: str = "Mantisbot",
     timeout_seconds: float = 3.0,
-) -> str:
-    """Rephrase FAQ answer with personality tone.
-
-    Passes the FAQ answer through LLM to rephrase it in the bot's personality.
-    Falls back to original answer on timeout or error.
+) -> str | None:
+    """Rephrase FAQ answer with personality tone via the LLM.
 
     Args:
         llm_service: LLM service instance (BaseLLMService)
@@ -313,7 +637,8 @@ async def rephrase_faq_with_personality(
         timeout_seconds: Timeout for LLM call (default: 3.0)
 
     Returns:
-        Rephrased answer in personality tone, or original answer on failure
+        Rephrased answer in personality tone, or None on timeout, error or
+        when the budget wrapper blocked the call
     """
     import asyncio
 
@@ -347,6 +672,9 @@ Rephrased answer:"""
             llm_service.chat(messages, temperature=0.3, max_tokens=300),
             timeout=timeout_seconds,
         )
+        if response.provider == "budget_paused":
+            # The budget wrapper answered instead of the LLM; keep the original
+            return None
         rephrased = response.content.strip()
         logger.info(
             "faq_rephrase_success",
@@ -363,11 +691,46 @@ Rephrased answer:"""
             timeout_seconds=timeout_seconds,
             fallback=True,
         )
-        return faq_answer
+        return None
     except Exception as e:
         logger.warning(
             "faq_rephrase_failed",
             error=str(e),
             fallback=True,
         )
-        return faq_answer
+        return None
+
+
+async def rephrase_faq_with_personality(
+    llm_service,
+    faq_answer: str,
+    personality_type,
+    business_name: str,
+    bot_name: str = "Mantisbot",
+    timeout_seconds: float = 3.0,
+) -> str:
+    """Rephrase FAQ answer with personality tone.
+
+    Passes the FAQ answer through LLM to rephrase it in the bot's personality.
+    Falls back to original answer on timeout or error.
+
+    Args:
+        llm_service: LLM service instance (BaseLLMService)
+        faq_answer: Original FAQ answer to rephrase
+        personality_type: PersonalityType enum value
+        business_name: Name of the business
+        bot_name: Name of the bot (default: "Mantisbot")
+        timeout_seconds: Timeout for LLM call (default: 3.0)
+
+    Returns:
+        Rephrased answer in personality tone, or original answer on failure
+    """
+    rephrased = await generate_faq_rephrase(
+        llm_service=llm_service,
+        faq_answer=faq_answer,
+        personality_type=personality_type,
+        business_name=business_name,
+        bot_name=bot_name,
+        timeout_seconds=timeout_seconds,
+    )
+    return faq_answer if rephrased is None else rephrased
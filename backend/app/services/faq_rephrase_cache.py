@@ -0,0 +1,367 @@
+"""Cache for personality-rephrased FAQ answers.
+
+Every FAQ hit used to restyle the same static answer through the LLM, which
+turned the "fast, free" FAQ path into a full LLM round trip. The rephrasing
+only depends on the answer text and the merchant's personality, bot name and
+business name, so it is cached:
+
+- L1: in-process LRU (bounded by entry count)
+- L2: Redis via the shared connection pool (TTL-bounded, shared by workers)
+
+Keys hash the answer together with the personality settings, so an edited
+answer or a personality change never serves a stale rephrasing. Explicit
+invalidation (FAQ update/delete, personality update) only frees the entries
+early.
+
+Redis Keys:
+- faq:rephrase:{merchant_id}:{faq_id}:{sha256(answer, personality, bot, business)}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import is_testing, settings
+from app.models.faq import Faq
+
+logger = structlog.get_logger(__name__)
+
+# Pre-warm tasks are referenced here until done so they are not garbage collected
+_prewarm_tasks: set[asyncio.Task[None]] = set()
+
+
+def _personality_value(personality_type: Any) -> str:
+    return personality_type.value if hasattr(personality_type, "value") else str(personality_type)
+
+
+class FaqRephraseCache:
+    """In-process LRU with a Redis tier for rephrased FAQ answers.
+
+    Features:
+    - Redis hits are promoted into the in-process LRU
+    - Graceful degradation: Redis errors are logged and treated as misses
+    - Per-FAQ and per-merchant invalidation
+    - Hit/miss counters via stats()
+    """
+
+    KEY_PREFIX = "faq:rephrase"
+    DEFAULT_MAX_ENTRIES = 4096
+    DEFAULT_TTL_SECONDS = 30 * 24 * 3600  # Keys change whenever their inputs do
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        redis_client: redis.Redis | None = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        """Initialize FAQ rephrase cache.
+
+        Args:
+            max_entries: Maximum entries kept in the in-process LRU
+            redis_client: Optional Redis client for the shared tier
+            ttl_seconds: TTL for Redis entries
+        """
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    def make_key(
+        self,
+        faq: Faq,
+        personality_type: Any,
+        business_name: str,
+        bot_name: str,
+    ) -> str:
+        """Build the cache key for a FAQ answer under personality settings."""
+        digest = hashlib.sha256(
+            "\x1f".join(
+                (faq.answer, _personality_value(personality_type), bot_name, business_name)
+            ).encode("utf-8")
+        ).hexdigest()
+        return f"{self._faq_prefix(faq.merchant_id, faq.id)}{digest}"
+
+    async def get(self, key: str) -> str | None:
+        """Return the cached rephrasing for key, checking L1 then Redis."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+            self.local_hits += 1
+            return value
+
+        if self.redis is not None:
+            try:
+                value = await self.redis.get(key)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning("faq_rephrase_cache_redis_get_failed", error=str(e))
+                value = None
+            if value is not None:
+                self._store_local(key, value)
+                self.redis_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, rephrased: str) -> None:
+        """Store a rephrasing in both tiers."""
+        if not rephrased:
+            return
+
+        self._store_local(key, rephrased)
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, rephrased, ex=self.ttl_seconds)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning("faq_rephrase_cache_redis_set_failed", error=str(e))
+
+    async def invalidate_faq(self, merchant_id: int, faq_id: int) -> None:
+        """Drop all rephrasings of one FAQ (after its answer changed or it was deleted)."""
+        await self._invalidate_prefix(self._faq_prefix(merchant_id, faq_id))
+
+    async def invalidate_merchant(self, merchant_id: int) -> None:
+        """Drop all rephrasings for a merchant (after its personality changed)."""
+        await self._invalidate_prefix(f"{self.KEY_PREFIX}:{merchant_id}:")
+
+    def clear(self) -> None:
+        """Clear the in-process tier and reset counters."""
+        self._entries.clear()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and L1 size."""
+        lookups = self.local_hits + self.redis_hits + self.misses
+        hits = self.local_hits + self.redis_hits
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "redis_errors": self.redis_errors,
+            "redis_enabled": self.redis is not None,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _faq_prefix(self, merchant_id: int, faq_id: int) -> str:
+        return f"{self.KEY_PREFIX}:{merchant_id}:{faq_id}:"
+
+    async def _invalidate_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+        if self.redis is not None:
+            try:
+                keys = [key async for key in self.redis.scan_iter(match=f"{prefix}*")]
+                if keys:
+                    await self.redis.delete(*keys)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning("faq_rephrase_cache_redis_invalidate_failed", error=str(e))
+
+    def _store_local(self, key: str, value: str) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_faq_rephrase_cache: FaqRephraseCache | None = None
+
+
+def get_faq_rephrase_cache() -> FaqRephraseCache:
+    """Get the process-wide FAQ rephrase cache.
+
+    The Redis tier uses the shared pool when FAQ_REPHRASE_CACHE_REDIS is true.
+    """
+    global _faq_rephrase_cache
+    if _faq_rephrase_cache is None:
+        config = settings()
+        redis_client = None
+        if config.get("FAQ_REPHRASE_CACHE_REDIS", True):
+            from app.core.redis_pool import get_redis
+
+            redis_client = get_redis()
+
+        _faq_rephrase_cache = FaqRephraseCache(
+            max_entries=config.get(
+                "FAQ_REPHRASE_CACHE_SIZE", FaqRephraseCache.DEFAULT_MAX_ENTRIES
+            ),
+            redis_client=redis_client,
+        )
+    return _faq_rephrase_cache
+
+
+def _default_cache() -> FaqRephraseCache | None:
+    # Tests keep calling the (mocked) LLM unless a cache is injected
+    return None if is_testing() else get_faq_rephrase_cache()
+
+
+async def rephrase_faq_cached(
+    get_llm_service: Callable[[], Awaitable[Any]],
+    faq: Faq,
+    personality_type: Any,
+    business_name: str,
+    bot_name: str = "Mantisbot",
+    cache: FaqRephraseCache | None = None,
+) -> str:
+    """Get a FAQ answer rephrased in the merchant's personality, from cache if possible.
+
+    The LLM service is only resolved on a miss. Failed rephrasings fall back
+    to the original answer and are not cached.
+
+    Args:
+        get_llm_service: Async callable returning the LLM service (or None)
+        faq: Matched FAQ item
+        personality_type: PersonalityType enum value
+        business_name: Name of the business
+        bot_name: Name of the bot (default: "Mantisbot")
+        cache: Rephrase cache (optional, defaults to the process-wide cache;
+            bypassed in IS_TESTING mode unless injected)
+
+    Returns:
+        Rephrased answer, or the original answer when rephrasing fails
+    """
+    from app.services.faq import generate_faq_rephrase
+
+    cache = cache if cache is not None else _default_cache()
+    key = None
+    if cache is not None:
+        key = cache.make_key(faq, personality_type, business_name, bot_name)
+        cached = await cache.get(key)
+        if cached is not None:
+            logger.debug("faq_rephrase_cache_hit", faq_id=faq.id)
+            return cached
+
+    llm_service = await get_llm_service()
+    if llm_service is None:
+        return faq.answer
+
+    rephrased = await generate_faq_rephrase(
+        llm_service=llm_service,
+        faq_answer=faq.answer,
+        personality_type=personality_type,
+        business_name=business_name,
+        bot_name=bot_name,
+    )
+    if rephrased is None:
+        return faq.answer
+
+    if cache is not None and key is not None:
+        await cache.set(key, rephrased)
+    return rephrased
+
+
+async def invalidate_faq_rephrases(merchant_id: int, faq_id: int) -> None:
+    """Drop cached rephrasings of a FAQ (call after its answer changed or it was deleted)."""
+    cache = _default_cache()
+    if cache is not None:
+        await cache.invalidate_faq(merchant_id, faq_id)
+
+
+async def invalidate_merchant_rephrases(merchant_id: int) -> None:
+    """Drop a merchant's cached rephrasings (call after its personality changed)."""
+    cache = _default_cache()
+    if cache is not None:
+        await cache.invalidate_merchant(merchant_id)
+
+
+async def prewarm_faq_rephrase(merchant_id: int, faq_id: int) -> None:
+    """Rephrase a FAQ in the background so its first hit is served from cache.
+
+    Opens its own database session; failures are logged and swallowed. The
+    LLM call goes through BudgetAwareLLMWrapper like conversation turns, and
+    nothing is pre-warmed while the merchant's bot is paused for budget.
+
+    Args:
+        merchant_id: Merchant ID
+        faq_id: FAQ ID
+    """
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+
+    from app.core.database import async_session
+    from app.models.merchant import Merchant, PersonalityType
+    from app.services.cost_tracking.budget_aware_llm_wrapper import BudgetAwareLLMWrapper
+    from app.services.llm.llm_factory import LLMProviderFactory
+    from app.services.llm.provider_registry import get_provider_registry
+
+    try:
+        async with async_session()() as db:
+            merchant_result = await db.execute(
+                select(Merchant)
+                .where(Merchant.id == merchant_id)
+                .options(selectinload(Merchant.llm_configuration))
+            )
+            merchant = merchant_result.scalars().first()
+            faq_result = await db.execute(
+                select(Faq).where(Faq.id == faq_id, Faq.merchant_id == merchant_id)
+            )
+            faq = faq_result.scalars().first()
+            if merchant is None or faq is None:
+                return
+
+            async def get_llm_service() -> Any:
+                llm_service = BudgetAwareLLMWrapper(
+                    llm_service=get_provider_registry().get_llm_provider(
+                        merchant.id,
+                        merchant.llm_configuration,
+                        provider_factory=LLMProviderFactory,
+                    ),
+                    db=db,
+                    merchant_id=merchant.id,
+                    conversation_id=f"faq-prewarm-{faq.id}",
+                )
+                is_paused, _ = await llm_service.budget_service.get_bot_paused_state(
+                    merchant.id
+                )
+                if is_paused:
+                    logger.info(
+                        "faq_rephrase_prewarm_skipped_budget_paused",
+                        merchant_id=merchant.id,
+                        faq_id=faq.id,
+                    )
+                    return None
+                return llm_service
+
+            await rephrase_faq_cached(
+                get_llm_service,
+                faq,
+                personality_type=merchant.personality or PersonalityType.FRIENDLY,
+                business_name=merchant.business_name or "our store",
+                bot_name=merchant.bot_name or "Mantisbot",
+            )
+        logger.info("faq_rephrase_prewarmed", merchant_id=merchant_id, faq_id=faq_id)
+    except Exception as e:
+        logger.warning(
+            "faq_rephrase_prewarm_failed",
+            merchant_id=merchant_id,
+            faq_id=faq_id,
+            error=str(e),
+        )
+
+
+def schedule_faq_rephrase_prewarm(merchant_id: int, faq_id: int) -> None:
+    """Start background pre-warming for a FAQ when FAQ_REPHRASE_PREWARM is enabled."""
+    if is_testing() or not settings().get("FAQ_REPHRASE_PREWARM", True):
+        return
+    task = asyncio.create_task(prewarm_faq_rephrase(merchant_id, faq_id))
+    _prewarm_tasks.add(task)
+    task.add_done_callback(_prewarm_tasks.discard)
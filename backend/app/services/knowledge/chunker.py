@@ -1,16 +1,52 @@
 """Document chunking service for knowledge base.
 
 Handles extraction and chunking of text from various document types.
+
+Two entry points:
+- chunk_document(): extracts the whole document and returns all chunks
+- iter_document_chunks(): extracts page by page and yields chunks lazily,
+  so large documents never have to be held in memory as one string
+
+Two splitting strategies:
+- "structured" (default): packs headings, paragraphs and sentences into
+  chunks without overlap, so no text is embedded twice
+- "fixed": 1500-char windows with 300 chars of overlap (legacy)
+
+Every chunk can be identified by content_hash(), which lets re-processing
+reuse the stored embedding of unchanged chunks.
 """
 
 from __future__ import annotations
 
+import hashlib
+import re
+from collections.abc import Callable, Iterable, Iterator
+
 import structlog
 from docx import Document
 from PyPDF2 import PdfReader
 
 logger = structlog.get_logger()
 
+# Called after each extracted page with (pages_done, total_pages or None)
+PageCallback = Callable[[int, int | None], None]
+
+DOCX_PARAGRAPHS_PER_PAGE = 50
+
+CHUNK_STRATEGIES = ("structured", "fixed")
+
+# Blank line(s) between paragraphs, including trailing whitespace
+_PARAGRAPH_BREAK_RE = re.compile(r"\n[ \t]*\n\s*")
+_SENTENCE_BREAK_RE = re.compile(r"(?<=[.!?])\s+")
+_MARKDOWN_HEADING_RE = re.compile(r"^\s{0,3}#{1,6}\s+\S")
+_HEADING_MAX_CHARS = 80
+_HEADING_TRAILING_PUNCTUATION = ".!?,;:"
+
+
+def content_hash(content: str) -> str:
+    """Stable identity of a chunk's text (sha256 hex digest)."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
 
 class ChunkingError(Exception):
     """Raised when document chunking fails."""
@@ -18,20 +54,217 @@ class ChunkingError(Exception):
     pass
 
 
+class ChunkStream:
+    """Incremental fixed-window splitter (the "fixed" strategy).
+
+    Keeps at most one chunk window of text buffered between feed() calls.
+    """
+
+    def __init__(self, chunker: DocumentChunker) -> None:
+        self._chunker = chunker
+        self._step = chunker.CHUNK_SIZE_MAX - chunker.OVERLAP_SIZE
+        self._buffer = ""
+        self._first_page = True
+
+    def feed(self, page: str) -> list[str]:
+        """Append a page and return every chunk that is now complete."""
+        self._buffer = page if self._first_page else f"{self._buffer}\n{page}"
+        self._first_page = False
+
+        chunks = []
+        size = self._chunker.CHUNK_SIZE_MAX
+        while len(self._buffer) >= size:
+            chunk = self._buffer[:size].strip()
+            if self._chunker._validate_chunk_quality(chunk):
+                chunks.append(chunk)
+            self._buffer = self._buffer[self._step :]
+        return chunks
+
+    def finish(self) -> list[str]:
+        """Flush the remaining buffer as trailing chunks."""
+        chunks = []
+        size = self._chunker.CHUNK_SIZE_MAX
+        while self._buffer:
+            chunk = self._buffer[:size].strip()
+            if self._chunker._validate_chunk_quality(chunk):
+                chunks.append(chunk)
+            if len(self._buffer) <= self._step:
+                break
+            self._buffer = self._buffer[self._step :]
+        self._buffer = ""
+        return chunks
+
+
+class StructuredChunkStream:
+    """Incremental structure-aware splitter.
+
+    Splits text into headings, paragraphs and sentences and packs them into
+    chunks of up to CHUNK_SIZE_MAX characters:
+    - A heading starts a new chunk once the current one has CHUNK_SIZE_MIN chars
+    - A paragraph or sentence that does not fit starts a new chunk
+    - Only a single sentence longer than CHUNK_SIZE_MAX is cut mid-text
+    - A short trailing chunk is merged into the previous one when it fits
+
+    Text is buffered until a paragraph break, so pages can be fed one at a
+    time; a paragraph longer than PENDING_LIMIT_CHUNKS chunks is cut at its
+    last sentence break instead.
+    """
+
+    PENDING_LIMIT_CHUNKS = 4
+
+    def __init__(self, chunker: DocumentChunker) -> None:
+        self._chunker = chunker
+        self._pending = ""
+        self._first_page = True
+        self._continues_paragraph = False
+        self._parts: list[str] = []
+        self._length = 0
+        self._held: str | None = None
+
+    def feed(self, page: str) -> list[str]:
+        """Append a page and return every chunk that is now complete."""
+        self._pending = page if self._first_page else f"{self._pending}\n{page}"
+        self._first_page = False
+
+        chunks: list[str] = []
+        cut = self._last_break(_PARAGRAPH_BREAK_RE)
+        continues_paragraph = False
+        if cut is None and len(self._pending) > (
+            self.PENDING_LIMIT_CHUNKS * self._chunker.CHUNK_SIZE_MAX
+        ):
+            cut = self._last_break(_SENTENCE_BREAK_RE)
+            continues_paragraph = True
+
+        if cut is not None:
+            start, end = cut
+            text, self._pending = self._pending[:start], self._pending[end:]
+            self._add_text(text, chunks)
+            self._continues_paragraph = continues_paragraph
+        return chunks
+
+    def finish(self) -> list[str]:
+        """Flush buffered text as the final chunks."""
+        chunks: list[str] = []
+        self._add_text(self._pending, chunks)
+        self._pending = ""
+
+        tail = "".join(self._parts).strip()
+        self._parts, self._length = [], 0
+        if tail:
+            held = self._held
+            if (
+                held is not None
+                and len(held) + 2 + len(tail) <= self._chunker.CHUNK_SIZE_MAX
+                and (len(tail) < self._chunker.CHUNK_SIZE_MIN)
+            ):
+                self._held = f"{held}\n\n{tail}"
+            else:
+                self._emit_held(chunks)
+                self._held = tail
+        self._emit_held(chunks)
+        return chunks
+
+    def _last_break(self, pattern: re.Pattern[str]) -> tuple[int, int] | None:
+        """Span of the last break whose whitespace run is complete."""
+        last = None
+        for match in pattern.finditer(self._pending):
+            if match.end() < len(self._pending):
+                last = match.span()
+        return last
+
+    def _add_text(self, text: str, chunks: list[str]) -> None:
+        for block_index, block in enumerate(_PARAGRAPH_BREAK_RE.split(text)):
+            continues = block_index == 0 and self._continues_paragraph
+            lines = [line.strip() for line in block.split("\n") if line.strip()]
+            if not lines:
+                continue
+
+            if not continues and len(lines) == 1 and self._looks_like_heading(lines[0]):
+                self._add_unit(lines[0], "heading", chunks)
+                continue
+
+            body: list[str] = []
+            for line in lines:
+                if _MARKDOWN_HEADING_RE.match(line):
+                    self._add_body(body, continues, chunks)
+                    body, continues = [], False
+                    self._add_unit(line, "heading", chunks)
+                else:
+                    body.append(line)
+            self._add_body(body, continues, chunks)
+
+    def _add_body(self, lines: list[str], continues: bool, chunks: list[str]) -> None:
+        if not lines:
+            return
+        sentences = _SENTENCE_BREAK_RE.split(" ".join(lines))
+        for index, sentence in enumerate(sentences):
+            kind = "sentence" if index > 0 or continues else "paragraph"
+            self._add_unit(sentence, kind, chunks)
+
+    def _add_unit(self, unit: str, kind: str, chunks: list[str]) -> None:
+        max_size = self._chunker.CHUNK_SIZE_MAX
+        if kind == "heading" and self._length >= self._chunker.CHUNK_SIZE_MIN:
+            self._flush(chunks)
+
+        separator = "" if not self._parts else (" " if kind == "sentence" else "\n\n")
+        if self._length + len(separator) + len(unit) > max_size:
+            self._flush(chunks)
+            separator = ""
+
+        while len(unit) > max_size:
+            cut = unit.rfind(" ", max_size // 2, max_size)
+            cut = cut if cut > 0 else max_size
+            self._parts = [unit[:cut]]
+            self._flush(chunks)
+            unit = unit[cut:].lstrip()
+
+        self._parts.append(separator + unit)
+        self._length += len(separator) + len(unit)
+
+    def _flush(self, chunks: list[str]) -> None:
+        chunk = "".join(self._parts).strip()
+        self._parts, self._length = [], 0
+        if chunk:
+            self._emit_held(chunks)
+            self._held = chunk
+
+    def _emit_held(self, chunks: list[str]) -> None:
+        if self._held is not None and self._chunker._validate_chunk_quality(self._held):
+            chunks.append(self._held)
+        self._held = None
+
+    @staticmethod
+    def _looks_like_heading(line: str) -> bool:
+        if _MARKDOWN_HEADING_RE.match(line):
+            return True
+        return len(line) <= _HEADING_MAX_CHARS and line[-1] not in _HEADING_TRAILING_PUNCTUATION
+
+
 class DocumentChunker:
     """Service for chunking documents into text segments.
 
     Enhanced for better RAG performance:
     - Larger chunks (1500 chars) for more complete information
-    - More overlap (300 chars) for better continuity
-    - This improves context quality and reduces information loss at boundaries
+    - Structure-aware splitting keeps headings with their paragraphs and never
+      cuts a sentence unless it is longer than a chunk
+    - The legacy "fixed" strategy uses 300 chars of overlap between windows
     """
 
     CHUNK_SIZE_MIN = 500
     CHUNK_SIZE_MAX = 1500  # Increased from 1000 for more context per chunk
-    OVERLAP_SIZE = 300  # Increased from 100 for better continuity between chunks
+    OVERLAP_SIZE = 300  # "fixed" strategy only
     MIN_CHUNK_CHARS = 50
 
+    def __init__(self, strategy: str = "structured") -> None:
+        """Initialize chunker.
+
+        Args:
+            strategy: "structured" (default) or "fixed"
+        """
+        if strategy not in CHUNK_STRATEGIES:
+            raise ValueError(f"Unknown chunk strategy: {strategy}")
+        self.strategy = strategy
+
     def chunk_document(self, file_path: str, file_type: str) -> list[str]:
         """Extract text from document and split into chunks.
 
@@ -40,7 +273,8 @@ class DocumentChunker:
             file_type: File type (pdf, txt, md, docx)
 
         Returns:
-            List of text chunks (500-1000 chars each)
+            List of text chunks of up to CHUNK_SIZE_MAX chars, split by the
+            configured strategy
 
         Raises:
             ChunkingError: If text extraction or chunking fails
@@ -50,8 +284,7 @@ class DocumentChunker:
             if not text or not text.strip():
                 raise ChunkingError("Document contains no extractable text")
 
-            chunks = self._split_into_chunks(text)
-            chunks = [c for c in chunks if self._validate_chunk_quality(c)]
+            chunks = list(self.iter_chunks([text]))
 
             if not chunks:
                 raise ChunkingError("No valid chunks extracted from document")
@@ -70,6 +303,155 @@ class DocumentChunker:
             logger.error("chunking_failed", file_path=file_path, error=str(e))
             raise ChunkingError(f"Failed to chunk document: {str(e)}") from e
 
+    def iter_document_chunks(
+        self,
+        file_path: str,
+        file_type: str,
+        on_page: PageCallback | None = None,
+    ) -> Iterator[str]:
+        """Extract a document page by page and yield chunks as they fill.
+
+        Produces the same chunks as chunk_document() while only holding the
+        current page plus one chunk window in memory.
+
+        Args:
+            file_path: Path to the document file
+            file_type: File type (pdf, txt, md, docx)
+            on_page: Optional progress callback (pages_done, total_pages)
+
+        Yields:
+            Text chunks that pass quality validation
+
+        Raises:
+            ChunkingError: If extraction fails or no valid chunks are produced
+        """
+        chunk_count = 0
+        try:
+            for chunk in self.iter_chunks(self.iter_pages(file_path, file_type, on_page)):
+                chunk_count += 1
+                yield chunk
+        except ChunkingError:
+            raise
+        except Exception as e:
+            logger.error("chunking_failed", file_path=file_path, error=str(e))
+            raise ChunkingError(f"Failed to chunk document: {str(e)}") from e
+
+        if chunk_count == 0:
+            raise ChunkingError("No valid chunks extracted from document")
+
+        logger.info(
+            "document_chunked",
+            file_path=file_path,
+            file_type=file_type,
+            chunk_count=chunk_count,
+        )
+
+    def iter_pages(
+        self,
+        file_path: str,
+        file_type: str,
+        on_page: PageCallback | None = None,
+    ) -> Iterator[str]:
+        """Yield document text one page at a time.
+
+        PDFs yield one entry per page, DOCX files yield groups of paragraphs
+        and text files yield their whole content as one page.
+        """
+        file_type = file_type.lower()
+
+        if file_type == "pdf":
+            pages = self._iter_pdf_pages(file_path)
+        elif file_type in ("txt", "md"):
+            pages = self._iter_text_file(file_path)
+        elif file_type == "docx":
+            pages = self._iter_docx_pages(file_path)
+        else:
+            raise ChunkingError(f"Unsupported file type: {file_type}")
+
+        for pages_done, (page_text, total_pages) in enumerate(pages, start=1):
+            if on_page is not None:
+                on_page(pages_done, total_pages)
+            if page_text:
+                yield page_text
+
+    def iter_chunks(self, pages: Iterable[str]) -> Iterator[str]:
+        """Split a stream of page texts into chunks using the configured strategy.
+
+        For "fixed", equivalent to _split_into_chunks("\n".join(pages)) followed
+        by quality validation, but consumes pages incrementally.
+        """
+        stream = self.chunk_stream()
+        for page in pages:
+            yield from stream.feed(page)
+        yield from stream.finish()
+
+    def chunk_stream(self) -> ChunkStream | StructuredChunkStream:
+        """Create an incremental splitter for pages that arrive asynchronously."""
+        if self.strategy == "fixed":
+            return ChunkStream(self)
+        return StructuredChunkStream(self)
+
+    def extract_page_window(
+        self,
+        file_path: str,
+        file_type: str,
+        start: int,
+        count: int,
+    ) -> tuple[list[str], int]:
+        """Extract up to `count` pages starting at page `start`.
+
+        Used by the extraction executor so worker processes parse a bounded
+        window per task. Only PDFs are windowed; other types are returned in
+        full for start == 0.
+
+        Returns:
+            (non-empty page texts in the window, total page count)
+        """
+        file_type = file_type.lower()
+
+        if file_type == "pdf":
+            try:
+                reader = PdfReader(file_path)
+                total_pages = len(reader.pages)
+                texts = [
+                    reader.pages[index].extract_text() or ""
+                    for index in range(start, min(start + count, total_pages))
+                ]
+            except Exception as e:
+                raise ChunkingError(f"Failed to extract text from PDF: {str(e)}") from e
+            return [text for text in texts if text], total_pages
+
+        if start > 0:
+            return [], 1
+        return list(self.iter_pages(file_path, file_type)), 1
+
+    def _iter_pdf_pages(self, file_path: str) -> Iterator[tuple[str, int | None]]:
+        """Yield (page_text, total_pages) for each PDF page."""
+        try:
+            reader = PdfReader(file_path)
+            total_pages = len(reader.pages)
+            for page in reader.pages:
+                yield page.extract_text() or "", total_pages
+        except Exception as e:
+            raise ChunkingError(f"Failed to extract text from PDF: {str(e)}") from e
+
+    def _iter_docx_pages(self, file_path: str) -> Iterator[tuple[str, int | None]]:
+        """Yield (paragraph_group, total_groups) for a DOCX file."""
+        try:
+            doc = Document(file_path)
+            paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+        except Exception as e:
+            raise ChunkingError(f"Failed to extract text from DOCX: {str(e)}") from e
+
+        step = DOCX_PARAGRAPHS_PER_PAGE
+        total_pages = max(1, -(-len(paragraphs) // step))
+        for start in range(0, len(paragraphs), step):
+            yield "\n\n".join(paragraphs[start : start + step]), total_pages
+
+    def _iter_text_file(self, file_path: str) -> Iterator[tuple[str, int | None]]:
+        """Yield a plain text file as a single page (uploads are capped at 10MB)."""
+        yield self._extract_from_text(file_path), 1
+
     def _extract_text(self, file_path: str, file_type: str) -> str:
         """Extract text content from document based on file type."""
         file_type = file_type.lower()
@@ -99,7 +481,7 @@ class DocumentChunker:
         try:
             doc = Document(file_path)
             paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-            return "\n".join(paragraphs)
+            return "\n\n".join(paragraphs)
         except Exception as e:
             raise ChunkingError(f"Failed to extract text from DOCX: {str(e)}") from e
 
@@ -0,0 +1,289 @@
+"""Process-pool text extraction for knowledge base documents.
+
+PyPDF2 and python-docx parsing is CPU-bound and holds the GIL, so running it
+inside the async document pipeline stalls every WebSocket and chat request on
+the worker. This executor moves extraction into a ProcessPoolExecutor:
+
+- Workers parse a bounded window of pages per task (EXTRACTION_PAGES_PER_TASK)
+- Each document has an overall deadline (EXTRACTION_TIMEOUT_SECONDS)
+- Each worker process has an address-space limit (EXTRACTION_MAX_MEMORY_MB)
+- A hung or crashed worker is terminated and the pool is recreated
+
+Chunking of the extracted pages stays in the caller (ChunkStream is cheap
+string slicing), so chunks are identical to DocumentChunker.iter_document_chunks.
+iter_document_chunks_off_loop() falls back to a worker thread when the
+executor is disabled, so callers never parse on the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import structlog
+
+from app.core.config import settings
+from app.services.knowledge.chunker import ChunkingError, DocumentChunker, PageCallback
+
+logger = structlog.get_logger(__name__)
+
+
+class ExtractionTimeoutError(ChunkingError):
+    """Raised when a document exceeds its extraction deadline."""
+
+    pass
+
+
+def _limit_worker_memory(max_memory_bytes: int) -> None:
+    """Pool initializer: cap the worker's address space (POSIX only)."""
+    if max_memory_bytes <= 0:
+        return
+    try:
+        import resource
+
+        resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes))
+    except (ImportError, ValueError, OSError):
+        # Not supported on this platform; the timeout still applies
+        pass
+
+
+def _extract_page_window(
+    file_path: str, file_type: str, start: int, count: int
+) -> tuple[list[str], int]:
+    """Worker entry point: extract one window of pages."""
+    return DocumentChunker().extract_page_window(file_path, file_type, start, count)
+
+
+class ExtractionExecutor:
+    """Runs document text extraction in a pool of worker processes."""
+
+    DEFAULT_MAX_WORKERS = 2
+    DEFAULT_TIMEOUT_SECONDS = 120.0
+    DEFAULT_MAX_MEMORY_MB = 1024
+    DEFAULT_PAGES_PER_TASK = 25
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+        max_memory_mb: int = DEFAULT_MAX_MEMORY_MB,
+        pages_per_task: int = DEFAULT_PAGES_PER_TASK,
+        start_method: str = "spawn",
+    ) -> None:
+        """Initialize extraction executor.
+
+        Args:
+            max_workers: Number of worker processes
+            timeout_seconds: Overall extraction deadline per document
+            max_memory_mb: Address-space limit per worker (0 disables)
+            pages_per_task: PDF pages parsed per worker task
+            start_method: multiprocessing start method ("spawn" avoids forking
+                the event loop's threads and sockets)
+        """
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self.max_memory_mb = max_memory_mb
+        self.pages_per_task = pages_per_task
+        self.start_method = start_method
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_limit_worker_memory,
+                initargs=(self.max_memory_mb * 1024 * 1024,),
+            )
+        return self._pool
+
+    def _reset_pool(self) -> None:
+        """Terminate workers (e.g. one stuck past its deadline) and drop the pool."""
+        pool = self._pool
+        self._pool = None
+        if pool is None:
+            return
+        # ProcessPoolExecutor has no public API to kill a running task
+        for process in list(getattr(pool, "_processes", {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def iter_pages(
+        self,
+        file_path: str,
+        file_type: str,
+        on_page: PageCallback | None = None,
+    ) -> AsyncIterator[str]:
+        """Yield non-empty page texts extracted in worker processes.
+
+        Raises:
+            ExtractionTimeoutError: If the document exceeds timeout_seconds
+            ChunkingError: If extraction fails or a worker runs out of memory
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_seconds
+        start = 0
+
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise ExtractionTimeoutError(f"Text extraction exceeded {self.timeout_seconds:g}s")
+
+            try:
+                texts, total_pages = await asyncio.wait_for(
+                    loop.run_in_executor(
+                        self._get_pool(),
+                        _extract_page_window,
+                        file_path,
+                        file_type,
+                        start,
+                        self.pages_per_task,
+                    ),
+                    timeout=remaining,
+                )
+            except TimeoutError as e:
+                self._reset_pool()
+                logger.warning(
+                    "extraction_timeout",
+                    file_path=file_path,
+                    timeout_seconds=self.timeout_seconds,
+                )
+                raise ExtractionTimeoutError(
+                    f"Text extraction exceeded {self.timeout_seconds:g}s"
+                ) from e
+            except MemoryError as e:
+                raise ChunkingError(
+                    f"Text extraction exceeded {self.max_memory_mb}MB memory limit"
+                ) from e
+            except BrokenProcessPool as e:
+                self._reset_pool()
+                raise ChunkingError("Text extraction worker crashed") from e
+
+            pages_done = min(start + self.pages_per_task, total_pages)
+            if on_page is not None:
+                on_page(pages_done, total_pages)
+            for text in texts:
+                yield text
+
+            start += self.pages_per_task
+            if start >= total_pages:
+                break
+
+    async def iter_document_chunks(
+        self,
+        chunker: DocumentChunker,
+        file_path: str,
+        file_type: str,
+        on_page: PageCallback | None = None,
+    ) -> AsyncIterator[str]:
+        """Async counterpart of DocumentChunker.iter_document_chunks.
+
+        Raises:
+            ChunkingError: If extraction fails or no valid chunks are produced
+        """
+        stream = chunker.chunk_stream()
+        chunk_count = 0
+
+        async for page in self.iter_pages(file_path, file_type, on_page):
+            for chunk in stream.feed(page):
+                chunk_count += 1
+                yield chunk
+        for chunk in stream.finish():
+            chunk_count += 1
+            yield chunk
+
+        if chunk_count == 0:
+            raise ChunkingError("No valid chunks extracted from document")
+
+        logger.info(
+            "document_chunked",
+            file_path=file_path,
+            file_type=file_type,
+            chunk_count=chunk_count,
+            executor="process_pool",
+        )
+
+    def shutdown(self) -> None:
+        """Stop worker processes (called from application lifespan)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+async def iter_document_chunks_off_loop(
+    chunker: DocumentChunker,
+    file_path: str,
+    file_type: str,
+    executor: ExtractionExecutor | None = None,
+    on_page: PageCallback | None = None,
+) -> AsyncIterator[str]:
+    """Yield a document's chunks without parsing it on the event loop.
+
+    Uses the process pool when an executor is given. Otherwise pages are
+    parsed in a worker thread, one chunk at a time, so memory stays bounded
+    to the current page plus one chunk window either way.
+
+    Raises:
+        ChunkingError: If extraction fails or no valid chunks are produced
+    """
+    if executor is not None:
+        async for chunk in executor.iter_document_chunks(
+            chunker, file_path, file_type, on_page=on_page
+        ):
+            yield chunk
+        return
+
+    chunks = iter(chunker.iter_document_chunks(file_path, file_type, on_page=on_page))
+    try:
+        while True:
+            chunk = await asyncio.to_thread(next, chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        # Release the open file if the consumer stopped early
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+_extraction_executor: ExtractionExecutor | None = None
+
+
+def get_extraction_executor() -> ExtractionExecutor | None:
+    """Get the process-wide extraction executor.
+
+    Returns None when EXTRACTION_EXECUTOR_ENABLED is false, in which case
+    callers extract in-process.
+    """
+    global _extraction_executor
+    config = settings()
+    if not config.get("EXTRACTION_EXECUTOR_ENABLED", True):
+        return None
+    if _extraction_executor is None:
+        _extraction_executor = ExtractionExecutor(
+            max_workers=config.get(
+                "EXTRACTION_MAX_WORKERS", ExtractionExecutor.DEFAULT_MAX_WORKERS
+            ),
+            timeout_seconds=config.get(
+                "EXTRACTION_TIMEOUT_SECONDS", ExtractionExecutor.DEFAULT_TIMEOUT_SECONDS
+            ),
+            max_memory_mb=config.get(
+                "EXTRACTION_MAX_MEMORY_MB", ExtractionExecutor.DEFAULT_MAX_MEMORY_MB
+            ),
+            pages_per_task=config.get(
+                "EXTRACTION_PAGES_PER_TASK", ExtractionExecutor.DEFAULT_PAGES_PER_TASK
+            ),
+        )
+    return _extraction_executor
+
+
+def shutdown_extraction_executor() -> None:
+    """Shut down the process-wide extraction executor if it was started."""
+    global _extraction_executor
+    if _extraction_executor is not None:
+        _extraction_executor.shutdown()
+        _extraction_executor = None
@@ -14,6 +14,8 @@ import structlog
 
 from app.core.errors import APIError, ErrorCode
 from app.services.llm.base_llm_service import (
+    HTTP2_AVAILABLE,
+    HTTP_POOL_LIMITS,
     BaseLLMService,
     LLMMessage,
     LLMResponse,
@@ -53,6 +55,8 @@ class AnthropicService(BaseLLMService):
                 self._async_client = httpx.AsyncClient(
                     base_url=self.ANTHROPIC_API_URL,
                     timeout=60.0,
+                    http2=HTTP2_AVAILABLE,
+                    limits=HTTP_POOL_LIMITS,
                 )
         return self._async_client
 
@@ -9,10 +9,21 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections.abc import AsyncGenerator
+from importlib.util import find_spec
 from typing import Any
 
+import httpx
 from pydantic import BaseModel
 
+# Provider clients are long-lived (see provider_registry), so keep
+# connections warm and multiplex over HTTP/2 when the h2 extra is installed.
+HTTP2_AVAILABLE = find_spec("h2") is not None
+HTTP_POOL_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+
 
 class LLMMessage(BaseModel):
     """Standardized message format for all LLM providers."""
@@ -188,3 +199,9 @@ class BaseLLMService(ABC):
             "latency_ms": round(latency * 1000, 2),
             "model": self.config.get("model", "default"),
         }
+
+    async def close(self) -> None:
+        """Close the provider's HTTP client (if one was created)."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
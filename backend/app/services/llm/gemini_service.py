@@ -11,6 +11,8 @@ import structlog
 
 from app.core.errors import APIError, ErrorCode
 from app.services.llm.base_llm_service import (
+    HTTP2_AVAILABLE,
+    HTTP_POOL_LIMITS,
     BaseLLMService,
     LLMMessage,
     LLMResponse,
@@ -49,6 +51,8 @@ class GeminiService(BaseLLMService):
                 self._async_client = httpx.AsyncClient(
                     base_url=self.GEMINI_API_URL,
                     timeout=60.0,
+                    http2=HTTP2_AVAILABLE,
+                    limits=HTTP_POOL_LIMITS,
                 )
         return self._async_client
 
@@ -71,13 +75,12 @@ class GeminiService(BaseLLMService):
             # Build full URL (httpx has issues with colon in path when using base_url)
             full_url = f"{self.GEMINI_API_URL}/{model_name}:generateContent?key={api_key}"
 
-            # Use a fresh client without base_url for this request
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    full_url,
-                    headers={"Content-Type": "application/json"},
-                    json={"contents": [{"parts": [{"text": "Hello"}]}]},
-                )
+            # Absolute URL, so the pooled client's base_url isn't applied
+            response = await self.async_client.post(
+                full_url,
+                headers={"Content-Type": "application/json"},
+                json={"contents": [{"parts": [{"text": "Hello"}]}]},
+            )
             response.raise_for_status()
             return True
 
@@ -155,13 +158,12 @@ class GeminiService(BaseLLMService):
             # Build full URL (httpx has issues with colon in path when using base_url)
             full_url = f"{self.GEMINI_API_URL}/{model_name}:generateContent?key={api_key}"
 
-            # Use a fresh client without base_url
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                response = await client.post(
-                    full_url,
-                    headers={"Content-Type": "application/json"},
-                    json=payload,
-                )
+            # Absolute URL, so the pooled client's base_url isn't applied
+            response = await self.async_client.post(
+                full_url,
+                headers={"Content-Type": "application/json"},
+                json=payload,
+            )
             response.raise_for_status()
             data = response.json()
 
@@ -16,6 +16,7 @@ import structlog
 
 from app.core.errors import APIError, ErrorCode
 from app.services.llm.base_llm_service import (
+    HTTP_POOL_LIMITS,
     BaseLLMService,
     LLMMessage,
     LLMResponse,
@@ -59,6 +60,7 @@ class OllamaService(BaseLLMService):
                 self._async_client = httpx.AsyncClient(
                     base_url=ollama_url,
                     timeout=60.0,  # Ollama can be slow on first request
+                    limits=HTTP_POOL_LIMITS,
                 )
         return self._async_client
 
@@ -196,38 +198,33 @@ class OllamaService(BaseLLMService):
         }
 
         try:
-            ollama_url = self.config.get("ollama_url", "http://localhost:11434")
-
-            async with httpx.AsyncClient(
-                base_url=ollama_url,
+            async with self.async_client.stream(
+                "POST",
+                "/api/generate",
+                json=payload,
                 timeout=120.0,
-            ) as client:
-                async with client.stream(
-                    "POST",
-                    "/api/generate",
-                    json=payload,
-                ) as response:
-                    response.raise_for_status()
-
-                    prompt_eval_count = 0
-                    eval_count = 0
-
-                    async for line in response.aiter_lines():
-                        if not line.strip():
-                            continue
-
-                        try:
-                            chunk = json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
-
-                        text = chunk.get("response", "")
-                        if text:
-                            yield StreamEvent(type="token", content=text)
-
-                        if chunk.get("done", False):
-                            prompt_eval_count = chunk.get("prompt_eval_count", 0)
-                            eval_count = chunk.get("eval_count", 0)
+            ) as response:
+                response.raise_for_status()
+
+                prompt_eval_count = 0
+                eval_count = 0
+
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+
+                    try:
+                        chunk = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+                    text = chunk.get("response", "")
+                    if text:
+                        yield StreamEvent(type="token", content=text)
+
+                    if chunk.get("done", False):
+                        prompt_eval_count = chunk.get("prompt_eval_count", 0)
+                        eval_count = chunk.get("eval_count", 0)
 
             yield StreamEvent(
                 type="done",
@@ -0,0 +1,206 @@
+"""Process-wide registry of per-merchant LLM and embedding clients.
+
+Chat turns used to build a new provider (and EmbeddingService) per message,
+decrypting the merchant's API key and opening a fresh HTTP connection pool
+each time. The registry keeps one instance per (merchant, kind), keyed by a
+fingerprint of the configuration it was built from:
+
+- A lookup whose fingerprint matches returns the cached instance, so its
+  pooled keep-alive connections are reused and the key isn't decrypted again.
+- A changed fingerprint (new provider, model, URL or encrypted key) builds a
+  replacement; the old instance is closed after a grace period so in-flight
+  requests can finish.
+- invalidate() drops a merchant's clients when its LLM configuration changes
+  (also retired after the grace period); close() shuts everything down from
+  the application lifespan.
+
+Bypassed in IS_TESTING mode so tests keep getting fresh (mock) providers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import structlog
+
+from app.core.config import is_testing
+from app.services.llm.base_llm_service import BaseLLMService
+from app.services.llm.llm_factory import LLMProviderFactory
+
+logger = structlog.get_logger(__name__)
+
+T = TypeVar("T")
+
+LLM_CLIENT = "llm"
+EMBEDDING_CLIENT = "embedding"
+
+# Longer than any provider request timeout, so replaced clients drain first
+RETIRE_GRACE_SECONDS = 180.0
+
+# Ollama model for merchants without an LLMConfiguration. Decided here rather
+# than by callers so every path builds (and caches) the same fallback client.
+FALLBACK_LLM_MODEL = "llama3.2"
+
+
+def config_fingerprint(*parts: Any) -> str:
+    """Stable hash of the configuration a client is built from."""
+    payload = json.dumps(parts, default=str, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ProviderRegistry:
+    """Cache of long-lived LLM and embedding clients per merchant."""
+
+    def __init__(self, retire_grace_seconds: float = RETIRE_GRACE_SECONDS) -> None:
+        self.retire_grace_seconds = retire_grace_seconds
+        self._entries: dict[tuple[int, str], tuple[str, Any]] = {}
+        self._retiring: dict[asyncio.Task, Any] = {}
+
+    def get_or_create(
+        self,
+        merchant_id: int,
+        kind: str,
+        fingerprint: str,
+        factory: Callable[[], T],
+    ) -> T:
+        """Return the cached client for merchant/kind, rebuilding it if the config changed.
+
+        Args:
+            merchant_id: Merchant ID
+            kind: Client kind (LLM_CLIENT, EMBEDDING_CLIENT)
+            fingerprint: config_fingerprint() of the client's configuration
+            factory: Builds the client (decrypting credentials) on a miss
+
+        Returns:
+            Client instance
+        """
+        if is_testing():
+            return factory()
+
+        key = (merchant_id, kind)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+
+        client = factory()
+        self._entries[key] = (fingerprint, client)
+        if entry is not None:
+            logger.info("provider_registry_client_replaced", merchant_id=merchant_id, kind=kind)
+            self._retire(entry[1])
+        return client
+
+    def get_llm_provider(
+        self,
+        merchant_id: int,
+        llm_config: Any | None,
+        provider_factory: type[LLMProviderFactory] = LLMProviderFactory,
+    ) -> BaseLLMService:
+        """Get the merchant's LLM provider built from its LLMConfiguration.
+
+        Args:
+            merchant_id: Merchant ID
+            llm_config: Merchant's LLMConfiguration (None falls back to Ollama
+                with FALLBACK_LLM_MODEL)
+            provider_factory: Factory used on a miss (callers pass their own reference)
+
+        Returns:
+            Cached or newly created LLM service
+        """
+        if llm_config is None:
+            provider_name = "ollama"
+            config: dict[str, Any] = {"model": FALLBACK_LLM_MODEL}
+            api_key_encrypted = None
+        else:
+            provider_name = llm_config.provider or "ollama"
+            config = {"model": llm_config.ollama_model or llm_config.cloud_model}
+            api_key_encrypted = None
+            if provider_name == "ollama":
+                config["ollama_url"] = llm_config.ollama_url
+            else:
+                api_key_encrypted = llm_config.api_key_encrypted
+
+        def create() -> BaseLLMService:
+            provider_config = dict(config)
+            if api_key_encrypted:
+                from app.core.security import decrypt_access_token
+
+                provider_config["api_key"] = decrypt_access_token(api_key_encrypted)
+            return provider_factory.create_provider(
+                provider_name=provider_name,
+                config=provider_config,
+            )
+
+        return self.get_or_create(
+            merchant_id,
+            LLM_CLIENT,
+            config_fingerprint(provider_name, config, api_key_encrypted),
+            create,
+        )
+
+    def invalidate(self, merchant_id: int) -> None:
+        """Drop every client of a merchant (after LLM config changes).
+
+        Dropped clients are closed once in-flight requests have had time to finish.
+        """
+        for key in [key for key in self._entries if key[0] == merchant_id]:
+            _, client = self._entries.pop(key)
+            self._retire(client)
+
+    async def close(self) -> None:
+        """Close all clients, including ones waiting out their grace period."""
+        retiring = list(self._retiring.items())
+        self._retiring.clear()
+        for task, _ in retiring:
+            task.cancel()
+        clients = [client for _, client in retiring]
+        clients.extend(client for _, client in self._entries.values())
+        self._entries.clear()
+        for client in clients:
+            await _close_client(client)
+
+    def _retire(self, client: Any) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        async def close_later() -> None:
+            await asyncio.sleep(self.retire_grace_seconds)
+            await _close_client(client)
+
+        task = loop.create_task(close_later())
+        self._retiring[task] = client
+        task.add_done_callback(lambda done: self._retiring.pop(done, None))
+
+
+async def _close_client(client: Any) -> None:
+    close = getattr(client, "close", None)
+    if close is None:
+        return
+    try:
+        await close()
+    except Exception as e:
+        logger.warning("provider_registry_close_failed", error=str(e))
+
+
+_provider_registry: ProviderRegistry | None = None
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """Get the process-wide provider registry."""
+    global _provider_registry
+    if _provider_registry is None:
+        _provider_registry = ProviderRegistry()
+    return _provider_registry
+
+
+async def close_provider_registry() -> None:
+    """Close all registry clients (application shutdown)."""
+    global _provider_registry
+    if _provider_registry is not None:
+        await _provider_registry.close()
+        _provider_registry = None
@@ -18,6 +18,7 @@ from app.core.errors import APIError, ErrorCode
 from app.models.llm_configuration import LLMConfiguration
 from app.models.merchant import Merchant
 from app.services.llm.llm_factory import LLMProviderFactory
+from app.services.llm.provider_registry import get_provider_registry
 
 
 class ProviderValidationError(Exception):
@@ -225,6 +226,7 @@ class ProviderSwitchService:
 
             await self.db.commit()
             await self.db.refresh(current_config)
+            get_provider_registry().invalidate(merchant_id)
 
             return {
                 "success": True,
@@ -13,7 +13,7 @@ from typing import Any
 import redis.asyncio as redis
 import structlog
 
-from app.core.config import settings
+from app.core.redis_pool import get_redis
 
 logger = structlog.get_logger(__name__)
 
@@ -31,12 +31,11 @@ class ConversationContextManager:
         """Initialize context manager.
 
         Args:
-            redis_client: Redis client (uses default from settings if not provided)
+            redis_client: Redis client (uses the shared application client if not provided)
         """
         self.redis = redis_client
         if not self.redis:
-            redis_url = settings()["REDIS_URL"]
-            self.redis = redis.from_url(redis_url, decode_responses=True)
+            self.redis = get_redis()
         self.logger = structlog.get_logger(__name__)
 
     def _get_session_key(self, psid: str) -> str:
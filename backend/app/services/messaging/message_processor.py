@@ -34,7 +34,8 @@ from app.services.clarification import ClarificationService
 from app.services.clarification.question_generator import QuestionGenerator
 from app.services.consent import ConsentService, ConsentStatus
 from app.services.cost_tracking.budget_alert_service import BudgetAlertService
-from app.services.faq import match_faq, rephrase_faq_with_personality
+from app.services.faq import get_faq_index
+from app.services.faq_rephrase_cache import rephrase_faq_cached
 from app.services.handoff import HandoffDetector
 from app.services.handoff.business_hours_handoff_service import BusinessHoursHandoffService
 from app.services.intent import IntentClassifier, IntentType
@@ -464,27 +465,22 @@ class MessageProcessor:
             from app.models.merchant import Merchant, PersonalityType
 
             async with async_session()() as db:
-                # Get merchant with personality and LLM config
-                merchant_result = await db.execute(
-                    select(Merchant).where(Merchant.id == self.merchant_id)
-                )
-                merchant = merchant_result.scalars().first()
-
-                # Get merchant's FAQs
-                result = await db.execute(
-                    select(self._get_faq_model())
-                    .where(self._get_faq_model().merchant_id == self.merchant_id)
-                    .order_by(self._get_faq_model().order_index)
-                )
-                faqs = result.scalars().all()
+                # Compiled per-merchant FAQ index (no DB hit when cached)
+                faq_index = await get_faq_index(db, self.merchant_id)
 
-                if not faqs:
+                if not faq_index:
                     return None
 
                 # Try to match FAQ
-                faq_match = await match_faq(message, list(faqs))
+                faq_match = faq_index.match(message)
 
                 if faq_match:
+                    # Get merchant with personality and LLM config
+                    merchant_result = await db.execute(
+                        select(Merchant).where(Merchant.id == self.merchant_id)
+                    )
+                    merchant = merchant_result.scalars().first()
+
                     self.logger.info(
                         "faq_matched",
                         merchant_id=self.merchant_id,
@@ -504,20 +500,22 @@ class MessageProcessor:
                     # Get LLM service for rephrasing
                     faq_answer = faq_match.faq.answer
                     try:
-                        llm_service = await self._get_llm_service_for_faq(merchant, db)
-                        if llm_service:
-                            faq_answer = await rephrase_faq_with_personality(
-                                llm_service=llm_service,
-                                faq_answer=faq_match.faq.answer,
-                                personality_type=personality_type,
-                                business_name=business_name or "our store",
-                                bot_name=bot_name,
-                            )
-                            self.logger.info(
-                                "faq_rephrased",
-                                merchant_id=self.merchant_id,
-                                faq_id=faq_match.faq.id,
-                            )
+
+                        async def get_llm_service():
+                            return await self._get_llm_service_for_faq(merchant, db)
+
+                        faq_answer = await rephrase_faq_cached(
+                            get_llm_service,
+                            faq_match.faq,
+                            personality_type=personality_type,
+                            business_name=business_name or "our store",
+                            bot_name=bot_name,
+                        )
+                        self.logger.info(
+                            "faq_rephrased",
+                            merchant_id=self.merchant_id,
+                            faq_id=faq_match.faq.id,
+                        )
                     except Exception as e:
                         self.logger.warning(
                             "faq_rephrase_failed_using_original",
@@ -588,12 +586,6 @@ class MessageProcessor:
         except Exception:
             return None
 
-    def _get_faq_model(self):
-        """Get FAQ model (lazy import to avoid circular dependency)."""
-        from app.models.faq import Faq
-
-        return Faq
-
     async def _get_business_name(self, db) -> str | None:
         """Get business name for merchant (Story 1.11).
 
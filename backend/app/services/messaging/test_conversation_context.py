@@ -16,10 +16,10 @@ from app.services.messaging.conversation_context import ConversationContextManag
 @pytest.mark.asyncio
 async def test_get_context_new_session():
     """Test getting context for new session (no existing data)."""
-    with patch("app.services.messaging.conversation_context.redis") as mock_redis:
+    with patch("app.services.messaging.conversation_context.get_redis") as mock_get_redis:
         mock_redis_client = MagicMock()
         mock_redis_client.get.return_value = None
-        mock_redis.from_url.return_value = mock_redis_client
+        mock_get_redis.return_value = mock_redis_client
 
         manager = ConversationContextManager()
         context = await manager.get_context("123456")
@@ -36,7 +36,7 @@ async def test_get_context_new_session():
 @pytest.mark.asyncio
 async def test_get_context_existing_session():
     """Test getting context for existing session."""
-    with patch("app.services.messaging.conversation_context.redis") as mock_redis:
+    with patch("app.services.messaging.conversation_context.get_redis") as mock_get_redis:
         mock_redis_client = MagicMock()
         existing_context = {
             "psid": "123456",
@@ -48,7 +48,7 @@ async def test_get_context_existing_session():
             "conversation_state": "active",
         }
         mock_redis_client.get.return_value = json.dumps(existing_context)
-        mock_redis.from_url.return_value = mock_redis_client
+        mock_get_redis.return_value = mock_redis_client
 
         manager = ConversationContextManager()
         context = await manager.get_context("123456")
@@ -63,11 +63,11 @@ async def test_get_context_existing_session():
 @pytest.mark.asyncio
 async def test_update_classification():
     """Test updating context with new classification."""
-    with patch("app.services.messaging.conversation_context.redis") as mock_redis:
+    with patch("app.services.messaging.conversation_context.get_redis") as mock_get_redis:
         mock_redis_client = MagicMock()
         # No existing context
         mock_redis_client.get.return_value = None
-        mock_redis.from_url.return_value = mock_redis_client
+        mock_get_redis.return_value = mock_redis_client
 
         manager = ConversationContextManager()
 
@@ -96,7 +96,7 @@ async def test_update_classification():
 @pytest.mark.asyncio
 async def test_update_classification_merge_entities():
     """Test that entities are merged on update."""
-    with patch("app.services.messaging.conversation_context.redis") as mock_redis:
+    with patch("app.services.messaging.conversation_context.get_redis") as mock_get_redis:
         mock_redis_client = MagicMock()
         existing_context = {
             "psid": "123456",
@@ -108,7 +108,7 @@ async def test_update_classification_merge_entities():
             "conversation_state": "active",
         }
         mock_redis_client.get.return_value = json.dumps(existing_context)
-        mock_redis.from_url.return_value = mock_redis_client
+        mock_get_redis.return_value = mock_redis_client
 
         manager = ConversationContextManager()
 
@@ -133,9 +133,9 @@ async def test_update_classification_merge_entities():
 @pytest.mark.asyncio
 async def test_delete_context():
     """Test deleting conversation context."""
-    with patch("app.services.messaging.conversation_context.redis") as mock_redis:
+    with patch("app.services.messaging.conversation_context.get_redis") as mock_get_redis:
         mock_redis_client = MagicMock()
-        mock_redis.from_url.return_value = mock_redis_client
+        mock_get_redis.return_value = mock_redis_client
 
         manager = ConversationContextManager()
         await manager.delete_context("123456")
@@ -146,10 +146,10 @@ async def test_delete_context():
 @pytest.mark.asyncio
 async def test_get_context_error_handling():
     """Test error handling when Redis fails."""
-    with patch("app.services.messaging.conversation_context.redis") as mock_redis:
+    with patch("app.services.messaging.conversation_context.get_redis") as mock_get_redis:
         mock_redis_client = MagicMock()
         mock_redis_client.get.side_effect = Exception("Redis connection failed")
-        mock_redis.from_url.return_value = mock_redis_client
+        mock_get_redis.return_value = mock_redis_client
 
         manager = ConversationContextManager()
         context = await manager.get_context("123456")
@@ -175,11 +175,11 @@ async def test_session_key_generation():
 @pytest.mark.asyncio
 async def test_update_classification_error_handling():
     """Test error handling when update fails."""
-    with patch("app.services.messaging.conversation_context.redis") as mock_redis:
+    with patch("app.services.messaging.conversation_context.get_redis") as mock_get_redis:
         mock_redis_client = MagicMock()
         mock_redis_client.get.return_value = None
         mock_redis_client.setex.side_effect = Exception("Redis write failed")
-        mock_redis.from_url.return_value = mock_redis_client
+        mock_get_redis.return_value = mock_redis_client
 
         manager = ConversationContextManager()
 
@@ -13,12 +13,12 @@ import json
 from datetime import UTC, datetime
 from typing import Any
 
-import redis.asyncio as redis
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import APIError, ErrorCode
+from app.core.redis_pool import get_redis
 from app.models.merchant import Merchant, PersonalityType
 from app.schemas.order_confirmation import (
     ConfirmationStatus,
@@ -64,11 +64,7 @@ class OrderConfirmationService:
             db: Database session for fetching merchant personality
         """
         if redis_client is None:
-            from app.core.config import settings
-
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self.redis = redis.from_url(redis_url, decode_responses=True)
+            self.redis = get_redis()
         else:
             self.redis = redis_client
 
@@ -414,3 +414,26 @@ async def get_pinned_product_ids(
         )
     )
     return [str(pid) for pid in result.scalars().all()]
+
+
+async def get_pinned_product_orders(
+    db: AsyncSession,
+    merchant_id: int | str,
+) -> dict[str, int]:
+    """Get pinned order by product ID for a merchant.
+
+    Used by product search to precompute pinned boosts.
+
+    Args:
+        db: Database session
+        merchant_id: Merchant ID (int or str)
+
+    Returns:
+        Dict mapping product_id to pinned_order (1-10)
+    """
+    result = await db.execute(
+        select(ProductPin.product_id, ProductPin.pinned_order).where(
+            ProductPin.merchant_id == int(merchant_id)
+        )
+    )
+    return {str(pin.product_id): pin.pinned_order for pin in result.all()}
@@ -15,6 +15,7 @@ from typing import TYPE_CHECKING, Any
 
 import structlog
 
+from app.core.tracing import span
 from app.services.rag.query_rewriter import QueryRewriter
 from app.services.rag.retrieval_service import RetrievalService, RetrievedChunk, SessionFactory
 
@@ -36,6 +37,7 @@ class RAGContextBuilder:
     - Grouping by document name
     - Sentence-boundary truncation
     - Citation formatting
+    - Fewer, higher-similarity chunks in hybrid retrieval mode
     """
 
     RETRIEVAL_TIMEOUT_MS = 10000  # 10s timeout for retrieval (cloud embeddings can be slow)
@@ -63,12 +65,32 @@ class RAGContextBuilder:
         )
         self.query_rewriter = QueryRewriter(llm_service) if llm_service else None
 
+    def _resolve_limits(
+        self, top_k: int | None, similarity_threshold: float | None
+    ) -> tuple[int, float]:
+        """Fill in retrieval limits for the retrieval mode.
+
+        Vector-only search needs a low threshold and more chunks to catch
+        exact-term queries; hybrid search finds those through full-text
+        matching, so it uses a higher threshold and fewer chunks.
+        """
+        if self.retrieval_service.is_hybrid:
+            default_top_k = RetrievalService.HYBRID_TOP_K
+            default_threshold = RetrievalService.HYBRID_SIMILARITY_THRESHOLD
+        else:
+            default_top_k = self.TOP_K_DEFAULT
+            default_threshold = self.SIMILARITY_THRESHOLD_DEFAULT
+        return (
+            default_top_k if top_k is None else top_k,
+            default_threshold if similarity_threshold is None else similarity_threshold,
+        )
+
     async def build_rag_context(
         self,
         merchant_id: int,
         user_query: str,
-        top_k: int = 7,  # Increased from 5 for better context coverage
-        similarity_threshold: float = 0.2,  # Lowered for better recall
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
         embedding_version: str | None = None,
     ) -> str | None:
         """Retrieve relevant chunks and format as LLM context.
@@ -76,8 +98,8 @@ class RAGContextBuilder:
         Args:
             merchant_id: Merchant ID for multi-tenant isolation
             user_query: User's question or search query
-            top_k: Number of chunks to retrieve (default 5)
-            similarity_threshold: Minimum similarity score (default 0.7)
+            top_k: Number of chunks to retrieve (default depends on retrieval mode)
+            similarity_threshold: Minimum similarity score (default depends on retrieval mode)
             embedding_version: Filter by embedding version (e.g., "openai-text-embedding-3-small")
                               Prevents dimension mixing when provider changes (Story 8-11 AC6)
 
@@ -91,6 +113,7 @@ class RAGContextBuilder:
             Target: <500ms end-to-end
             Uses asyncio.wait_for() for timeout handling
         """
+        top_k, similarity_threshold = self._resolve_limits(top_k, similarity_threshold)
         try:
             # Retrieve chunks with timeout
             chunks = await asyncio.wait_for(
@@ -155,8 +178,8 @@ class RAGContextBuilder:
         self,
         merchant_id: int,
         user_query: str,
-        top_k: int = 7,  # Increased from 5 for better context coverage
-        similarity_threshold: float = 0.2,  # Lowered for better recall
+        top_k: int | None = None,
+        similarity_threshold: float | None = None,
         embedding_version: str | None = None,
         conversation_history: list[dict] | None = None,
     ) -> tuple[str | None, list[RetrievedChunk]]:
@@ -168,14 +191,15 @@ class RAGContextBuilder:
         Args:
             merchant_id: Merchant ID for multi-tenant isolation
             user_query: User's question or search query
-            top_k: Number of chunks to retrieve (default 5)
-            similarity_threshold: Minimum similarity score (default 0.7)
+            top_k: Number of chunks to retrieve (default depends on retrieval mode)
+            similarity_threshold: Minimum similarity score (default depends on retrieval mode)
             embedding_version: Filter by embedding version
             conversation_history: Optional conversation history for query rewriting
 
         Returns:
             Tuple of (formatted context string or None, list of RetrievedChunk)
         """
+        top_k, similarity_threshold = self._resolve_limits(top_k, similarity_threshold)
         search_query = user_query
 
         if (
@@ -184,10 +208,11 @@ class RAGContextBuilder:
             and self.query_rewriter.is_follow_up(user_query)
         ):
             try:
-                search_query = await asyncio.wait_for(
-                    self.query_rewriter.rewrite_query(user_query, conversation_history),
-                    timeout=self.REWRITE_TIMEOUT_MS / 1000.0,
-                )
+                with span("rag.query_rewrite"):
+                    search_query = await asyncio.wait_for(
+                        self.query_rewriter.rewrite_query(user_query, conversation_history),
+                        timeout=self.REWRITE_TIMEOUT_MS / 1000.0,
+                    )
                 logger.info(
                     "rag_query_rewritten",
                     merchant_id=merchant_id,
@@ -218,16 +243,17 @@ class RAGContextBuilder:
                 threshold=similarity_threshold,
                 embedding_version=embedding_version,
             )
-            chunks = await asyncio.wait_for(
-                self.retrieval_service.retrieve_relevant_chunks(
-                    merchant_id=merchant_id,
-                    query=search_query,
-                    top_k=top_k,
-                    threshold=similarity_threshold,
-                    embedding_version=embedding_version,
-                ),
-                timeout=self.RETRIEVAL_TIMEOUT_MS / 1000.0,
-            )
+            with span("rag.retrieve"):
+                chunks = await asyncio.wait_for(
+                    self.retrieval_service.retrieve_relevant_chunks(
+                        merchant_id=merchant_id,
+                        query=search_query,
+                        top_k=top_k,
+                        threshold=similarity_threshold,
+                        embedding_version=embedding_version,
+                    ),
+                    timeout=self.RETRIEVAL_TIMEOUT_MS / 1000.0,
+                )
 
             logger.info(
                 "rag_retrieval_completed",
@@ -12,7 +12,7 @@ import structlog
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.knowledge_base import KnowledgeDocument
+from app.models.knowledge_base import KnowledgeDocument, ReembeddingJob, ReembeddingJobStatus
 from app.models.merchant import Merchant
 from app.services.rag.embedding_service import EMBEDDING_DIMENSIONS
 
@@ -27,6 +27,9 @@ class DimensionHandler:
     2. Marks all documents for re-embedding
     3. Provides status tracking for re-embedding progress
 
+    Documents keep serving their current embeddings while queued; the
+    re-embedding worker switches them over once the whole job is staged.
+
     Dimension Reference:
     - OpenAI text-embedding-3-small: 1536
     - Gemini text-embedding-004: 768
@@ -74,8 +77,8 @@ class DimensionHandler:
     ) -> int:
         """Mark all documents for re-embedding.
 
-        Sets status to 'pending' and re_embedding_status to 'queued'.
-        The background worker will process these documents.
+        Sets re_embedding_status to 'queued'. Document status is unchanged so
+        retrieval keeps using the current embeddings until the worker cuts over.
 
         Args:
             db: Database session
@@ -88,7 +91,6 @@ class DimensionHandler:
             update(KnowledgeDocument)
             .where(KnowledgeDocument.merchant_id == merchant_id)
             .values(
-                status="pending",
                 re_embedding_status="queued",
                 re_embedding_progress=0,
             )
@@ -117,7 +119,9 @@ class DimensionHandler:
             merchant_id: Merchant ID
 
         Returns:
-            Dict with status counts and progress information
+            Dict with status counts and progress information. While a job is
+            running, progress_percent is chunk-level and "job" carries its
+            throughput and ETA.
         """
         result = await db.execute(
             select(
@@ -142,11 +146,55 @@ class DimensionHandler:
         completed = status_counts.get("completed", 0)
         progress = (completed / total_docs * 100) if total_docs > 0 else 0
 
+        job_result = await db.execute(
+            select(ReembeddingJob)
+            .where(ReembeddingJob.merchant_id == merchant_id)
+            .order_by(ReembeddingJob.id.desc())
+            .limit(1)
+        )
+        job = job_result.scalars().first()
+        job_status = DimensionHandler.get_job_status(job) if job else None
+        if job_status and job_status["status"] == ReembeddingJobStatus.RUNNING.value:
+            progress = job_status["progress_percent"]
+
         return {
             "status_counts": status_counts,
             "total_documents": total_docs,
             "completed_documents": completed,
             "progress_percent": round(progress, 1),
+            "job": job_status,
+        }
+
+    @staticmethod
+    def get_job_status(job: ReembeddingJob) -> dict:
+        """Summarize a re-embedding job with its progress and ETA.
+
+        Args:
+            job: Re-embedding job
+
+        Returns:
+            Dict with target, chunk progress, throughput and eta_seconds
+            (None unless the job is running and has a measured throughput)
+        """
+        total = job.total_chunks or 0
+        processed = min(job.processed_chunks or 0, total)
+        rate = job.chunks_per_second or 0.0
+        eta_seconds = None
+        if job.status == ReembeddingJobStatus.RUNNING.value and rate > 0:
+            eta_seconds = round((total - processed) / rate)
+
+        return {
+            "id": job.id,
+            "status": job.status,
+            "target_version": job.target_version,
+            "total_chunks": total,
+            "processed_chunks": processed,
+            "progress_percent": round(processed / total * 100, 1) if total else 0.0,
+            "chunks_per_second": rate,
+            "eta_seconds": eta_seconds,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+            "error_message": job.error_message,
         }
 
     @staticmethod
@@ -1,29 +1,43 @@
 """Document processor for RAG pipeline.
 
-Orchestrates the document processing pipeline:
+Orchestrates the document processing pipeline as bounded, streaming stages:
 1. Load document from database
 2. Update status to 'processing'
-3. Extract text and chunk (use existing DocumentChunker)
-4. Generate embeddings for chunks
-5. Store chunks with embeddings in database
-6. Update document status to 'ready'
+3. Extract text page by page and chunk lazily (DocumentChunker.iter_document_chunks)
+4. Embed chunks in batches with bounded concurrency, reusing the stored
+   embedding of any chunk of the merchant's documents with the same content
+   hash and embedding model
+5. Bulk-insert each embedded batch in its own short transaction
+6. Drop the previous chunks and update document status to 'ready'
+
+Memory stays bounded by EMBED_CONCURRENCY batches regardless of document
+size, and per-stage progress is written to re_embedding_progress.
 
 Story 8-4: Backend - RAG Service (Document Processing)
 """
 
 from __future__ import annotations
 
+import asyncio
 import time
+from collections import deque
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 
 import structlog
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import APIError
 from app.models.knowledge_base import DocumentChunk, DocumentStatus, KnowledgeDocument
-from app.services.knowledge.chunker import DocumentChunker
-from app.services.rag.embedding_service import EmbeddingService
+from app.services.knowledge.chunker import DocumentChunker, PageCallback, content_hash
+from app.services.knowledge.extraction_executor import (
+    ExtractionExecutor,
+    iter_document_chunks_off_loop,
+)
+from app.services.rag.embedding_matrix_cache import invalidate_merchant_embeddings
+from app.services.rag.embedding_service import EmbeddingResult, EmbeddingService
+from app.services.rag.semantic_answer_cache import invalidate_merchant_answers
 
 logger = structlog.get_logger(__name__)
 
@@ -39,21 +53,53 @@ class ProcessingResult:
     processing_time_ms: int = 0
 
 
+class EmbeddingStageError(Exception):
+    """Raised when the embedding stage of the pipeline fails."""
+
+    pass
+
+
+@dataclass
+class _EmbeddingBatch:
+    """A batch of chunks moving through the embed -> store stages."""
+
+    start_index: int
+    chunks: list[str]
+    reused: dict[int, list[float]]  # position in batch -> stored embedding
+    task: asyncio.Task[EmbeddingResult] | None  # embeds the non-reused chunks
+    progress: int
+
+
+@dataclass
+class _PipelineStats:
+    """Outcome of one pipeline run."""
+
+    chunk_count: int = 0
+    reused_count: int = 0
+    embedding_version: str | None = None
+    embedding_dimension: int | None = None
+
+
 class DocumentProcessor:
     """Service for processing documents through the RAG pipeline.
 
-    Pipeline:
+    Pipeline (streaming):
     1. Load document from database
     2. Update status to 'processing'
-    3. Chunk document using DocumentChunker
-    4. Generate embeddings for all chunks
-    5. Store chunks with embeddings in database
-    6. Update document status to 'ready'
+    3. Extract pages and chunk lazily using DocumentChunker
+    4. Embed batches of EMBED_BATCH_SIZE chunks, EMBED_CONCURRENCY at a time
+    5. Bulk-insert each batch in order, committing per batch
+    6. Delete the previous chunks and update document status to 'ready'
+
+    Incremental re-processing:
+    - Chunks are matched to the previous version by content hash
+    - Unchanged chunks reuse their stored embedding when the document was
+      embedded with the same provider/model; only changed chunks are embedded
 
     Error Handling:
     - Chunking failure → status='error', store error_message
     - Embedding failure → status='error', store error_message
-    - Database failure → rollback transaction
+    - Newly written chunks are removed on failure
 
     Performance Target: <30s for 1MB document
     """
@@ -61,11 +107,15 @@ class DocumentProcessor:
     # Upload directory (must match knowledge_base API)
     UPLOAD_DIR = "uploads/knowledge-base"
 
+    EMBED_BATCH_SIZE = 64
+    EMBED_CONCURRENCY = 4
+
     def __init__(
         self,
         db: AsyncSession,
         embedding_service: EmbeddingService,
         chunker: DocumentChunker | None = None,
+        extraction_executor: ExtractionExecutor | None = None,
     ):
         """Initialize document processor.
 
@@ -73,10 +123,13 @@ class DocumentProcessor:
             db: Database session
             embedding_service: Service for generating embeddings
             chunker: Document chunker (optional, creates default if not provided)
+            extraction_executor: Process pool for text extraction (optional,
+                extracts in a worker thread if not provided)
         """
         self.db = db
         self.embedding_service = embedding_service
         self.chunker = chunker or DocumentChunker()
+        self.extraction_executor = extraction_executor
 
     async def process_document(self, document_id: int) -> ProcessingResult:
         """Process a document through the RAG pipeline.
@@ -107,70 +160,69 @@ class DocumentProcessor:
 
             # Step 2: Update status to 'processing'
             await self._update_status(document_id, DocumentStatus.PROCESSING.value)
+            await self._update_progress(document_id, 0)
 
-            # Step 3: Chunk document
+            # Steps 3-5: Stream extract -> chunk -> embed -> store
+            previous_chunk_id = await self._max_chunk_id(document_id)
             try:
                 file_path = self._get_file_path(document)
-                chunks = self.chunker.chunk_document(file_path, document.file_type)
-            except Exception as e:
+                stats = await self._run_pipeline(document, file_path)
+            except EmbeddingStageError as e:
+                await self._discard_partial_chunks(document_id, previous_chunk_id)
                 return await self._handle_error(
                     document_id=document_id,
-                    error_message=f"Chunking failed: {str(e)}",
+                    error_message=f"Embedding generation failed: {str(e)}",
                     start_time=start_time,
                 )
-
-            if not chunks:
+            except Exception as e:
+                await self._discard_partial_chunks(document_id, previous_chunk_id)
                 return await self._handle_error(
                     document_id=document_id,
-                    error_message="No valid chunks extracted from document",
+                    error_message=f"Chunking failed: {str(e)}",
                     start_time=start_time,
                 )
 
-            # Step 4: Generate embeddings for all chunks
-            try:
-                embedding_result = await self.embedding_service.embed_texts(chunks)
-                embeddings = embedding_result.embeddings
-            except APIError as e:
-                return await self._handle_error(
-                    document_id=document_id,
-                    error_message=f"Embedding generation failed: {e.message}",
-                    start_time=start_time,
-                )
-            except Exception as e:
+            if stats.chunk_count == 0 or stats.embedding_version is None:
                 return await self._handle_error(
                     document_id=document_id,
-                    error_message=f"Embedding generation failed: {str(e)}",
+                    error_message="No valid chunks extracted from document",
                     start_time=start_time,
                 )
 
-            # Step 5: Delete existing chunks (for reprocessing)
-            await self._delete_existing_chunks(document_id)
-
-            # Step 6: Store chunks with embeddings
-            embedding_dimension = embedding_result.dimension
-            await self._store_chunks(document_id, chunks, embeddings, embedding_dimension)
-
-            # Step 7: Update status to 'ready' and set embedding version
-            embedding_version = f"{embedding_result.provider}-{embedding_result.model}"
+            # Step 6: Drop the previous version, update status to 'ready'
+            if previous_chunk_id is not None:
+                await self._delete_existing_chunks(document_id, up_to_id=previous_chunk_id)
+            await self._update_progress(document_id, 100)
             await self._update_status(
-                document_id, DocumentStatus.READY.value, embedding_version=embedding_version
+                document_id, DocumentStatus.READY.value, embedding_version=stats.embedding_version
             )
+            invalidate_merchant_embeddings(document.merchant_id)
+            try:
+                await invalidate_merchant_answers(document.merchant_id)
+            except Exception as e:
+                logger.warning(
+                    "semantic_answers_invalidation_failed",
+                    merchant_id=document.merchant_id,
+                    error=str(e),
+                )
 
             # Calculate processing time
             duration_ms = int((time.time() - start_time) * 1000)
+            chunk_count = stats.chunk_count
 
             logger.info(
                 "document_processing_complete",
                 document_id=document_id,
-                chunk_count=len(chunks),
+                chunk_count=chunk_count,
+                reused_embeddings=stats.reused_count,
                 processing_time_ms=duration_ms,
-                embedding_dimension=embedding_result.dimension,
+                embedding_dimension=stats.embedding_dimension,
             )
 
             return ProcessingResult(
                 document_id=document_id,
                 status="ready",
-                chunk_count=len(chunks),
+                chunk_count=chunk_count,
                 processing_time_ms=duration_ms,
             )
 
@@ -186,6 +238,162 @@ class DocumentProcessor:
                 start_time=start_time,
             )
 
+    async def _run_pipeline(
+        self,
+        document: KnowledgeDocument,
+        file_path: str,
+    ) -> _PipelineStats:
+        """Run the streaming extract -> chunk -> embed -> store stages.
+
+        At most EMBED_CONCURRENCY batches are in flight; batches are stored in
+        order so chunk_index stays contiguous and progress is monotonic.
+        The document's previous chunks stay in place until the caller swaps
+        versions, so their embeddings can be reused.
+        """
+        pages = {"done": 0, "total": None}
+
+        def on_page(pages_done: int, total_pages: int | None) -> None:
+            pages["done"] = pages_done
+            pages["total"] = total_pages
+
+        def page_progress() -> int:
+            # Capped below 100: 'ready' is only reported once the status flips
+            if not pages["total"]:
+                return 0
+            return min(99, int(pages["done"] * 100 / pages["total"]))
+
+        semaphore = asyncio.Semaphore(self.EMBED_CONCURRENCY)
+
+        async def embed(batch: list[str]) -> EmbeddingResult:
+            async with semaphore:
+                return await self._embed_batch(batch)
+
+        chunks = self._iter_document_chunks(file_path, document.file_type, on_page)
+        in_flight: deque[_EmbeddingBatch] = deque()
+        stats = _PipelineStats()
+
+        async def store_next() -> None:
+            batch = in_flight.popleft()
+            embedded = iter([])
+            if batch.task is not None:
+                result = await batch.task
+                embedded = iter(result.embeddings)
+                stats.embedding_version = f"{result.provider}-{result.model}"
+            embeddings = [
+                batch.reused[position] if position in batch.reused else next(embedded)
+                for position in range(len(batch.chunks))
+            ]
+            await self._store_chunks(
+                document.id, batch.chunks, embeddings, start_index=batch.start_index
+            )
+            await self._update_progress(document.id, batch.progress)
+            stats.chunk_count += len(batch.chunks)
+            stats.reused_count += len(batch.reused)
+            stats.embedding_dimension = len(embeddings[0])
+
+        try:
+            next_index = 0
+            async for batch in self._iter_batches(chunks):
+                reused = await self._reused_embeddings(document, batch)
+                if reused:
+                    stats.embedding_version = self.embedding_service.embedding_version
+                missing = [chunk for i, chunk in enumerate(batch) if i not in reused]
+                task = asyncio.create_task(embed(missing)) if missing else None
+                in_flight.append(
+                    _EmbeddingBatch(
+                        start_index=next_index,
+                        chunks=batch,
+                        reused=reused,
+                        task=task,
+                        progress=page_progress(),
+                    )
+                )
+                next_index += len(batch)
+                if len(in_flight) >= self.EMBED_CONCURRENCY:
+                    await store_next()
+
+            while in_flight:
+                await store_next()
+        finally:
+            for pending in in_flight:
+                if pending.task is not None:
+                    pending.task.cancel()
+
+        return stats
+
+    async def _reused_embeddings(
+        self,
+        document: KnowledgeDocument,
+        batch: list[str],
+    ) -> dict[int, list[float]]:
+        """Load stored embeddings for chunks whose content was embedded before.
+
+        Any chunk of the merchant's documents with the same content hash is
+        reusable, as long as its document was embedded by the current
+        provider/model. Re-processing a document and re-uploading it as a new
+        document both only embed the chunks whose text changed.
+        """
+        hashes = [content_hash(chunk) for chunk in batch]
+        result = await self.db.execute(
+            select(DocumentChunk.content_hash, DocumentChunk.embedding)
+            .join(KnowledgeDocument, KnowledgeDocument.id == DocumentChunk.document_id)
+            .where(
+                KnowledgeDocument.merchant_id == document.merchant_id,
+                KnowledgeDocument.embedding_version == self.embedding_service.embedding_version,
+                DocumentChunk.content_hash.in_(set(hashes)),
+                DocumentChunk.embedding.is_not(None),
+            )
+            .distinct(DocumentChunk.content_hash)
+        )
+        embeddings = {row.content_hash: row.embedding for row in result.all()}
+        return {
+            position: embeddings[digest]
+            for position, digest in enumerate(hashes)
+            if embeddings.get(digest)
+        }
+
+    async def _iter_document_chunks(
+        self,
+        file_path: str,
+        file_type: str,
+        on_page: PageCallback,
+    ) -> AsyncIterator[str]:
+        """Yield chunks, extracting in the process pool when one is configured."""
+        async for chunk in iter_document_chunks_off_loop(
+            self.chunker,
+            file_path,
+            file_type,
+            executor=self.extraction_executor,
+            on_page=on_page,
+        ):
+            yield chunk
+
+    async def _iter_batches(self, chunks: AsyncIterator[str]) -> AsyncIterator[list[str]]:
+        """Group a chunk stream into embedding batches."""
+        batch: list[str] = []
+        async for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= self.EMBED_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _embed_batch(self, chunks: list[str]) -> EmbeddingResult:
+        """Embed one batch, normalizing failures to EmbeddingStageError."""
+        try:
+            result = await self.embedding_service.embed_texts(chunks)
+        except APIError as e:
+            raise EmbeddingStageError(e.message) from e
+        except Exception as e:
+            raise EmbeddingStageError(str(e)) from e
+
+        if len(result.embeddings) != len(chunks):
+            raise EmbeddingStageError(
+                f"Expected {len(chunks)} embeddings, got {len(result.embeddings)}"
+            )
+        return result
+
     async def _load_document(self, document_id: int) -> KnowledgeDocument | None:
         """Load document from database."""
         result = await self.db.execute(
@@ -206,41 +414,81 @@ class DocumentProcessor:
         )
         await self.db.commit()
 
-    async def _delete_existing_chunks(self, document_id: int) -> None:
-        """Delete existing chunks for a document (for reprocessing)."""
-        await self.db.execute(delete(DocumentChunk).where(DocumentChunk.document_id == document_id))
+    async def _max_chunk_id(self, document_id: int) -> int | None:
+        """Highest chunk id of the document's current chunks (None if none)."""
+        result = await self.db.execute(
+            select(func.max(DocumentChunk.id)).where(DocumentChunk.document_id == document_id)
+        )
+        max_id = result.scalar_one_or_none()
+        return max_id if isinstance(max_id, int) else None
+
+    async def _delete_existing_chunks(self, document_id: int, up_to_id: int | None = None) -> None:
+        """Delete existing chunks for a document (for reprocessing).
+
+        With up_to_id, only chunks with id <= up_to_id (the previous version)
+        are deleted.
+        """
+        query = delete(DocumentChunk).where(DocumentChunk.document_id == document_id)
+        if up_to_id is not None:
+            query = query.where(DocumentChunk.id <= up_to_id)
+        await self.db.execute(query)
         await self.db.commit()
 
-    async def _store_chunks(
-        self,
-        document_id: int,
-        chunks: list[str],
-        embeddings: list[list[float]],
-        embedding_dimension: int,
+    async def _discard_partial_chunks(
+        self, document_id: int, previous_chunk_id: int | None
     ) -> None:
-        """Store chunks with embeddings in database."""
-        for index, (content, embedding) in enumerate(zip(chunks, embeddings)):
-            # Format embedding for pgvector storage
-            embedding_str = self._format_embedding_for_storage(embedding)
-
-            chunk = DocumentChunk(
+        """Remove chunks written before a pipeline failure, keeping the previous version."""
+        try:
+            await self.db.rollback()
+            query = delete(DocumentChunk).where(DocumentChunk.document_id == document_id)
+            if previous_chunk_id is not None:
+                query = query.where(DocumentChunk.id > previous_chunk_id)
+            await self.db.execute(query)
+            await self.db.commit()
+        except Exception as e:
+            logger.error(
+                "failed_to_discard_partial_chunks",
                 document_id=document_id,
-                chunk_index=index,
-                content=content,
-                embedding=embedding_str,
-                embedding_dimension=embedding_dimension,
+                error=str(e),
             )
-            self.db.add(chunk)
 
+    async def _update_progress(self, document_id: int, progress: int) -> None:
+        """Record pipeline progress (0-100) on the document."""
+        await self.db.execute(
+            update(KnowledgeDocument)
+            .where(KnowledgeDocument.id == document_id)
+            .values(re_embedding_progress=progress)
+        )
         await self.db.commit()
 
-    def _format_embedding_for_storage(self, embedding: list[float]) -> str:
-        """Format embedding for pgvector storage.
+    async def _store_chunks(
+        self,
+        document_id: int,
+        chunks: list[str],
+        embeddings: list[list[float]],
+        start_index: int = 0,
+    ) -> None:
+        """Bulk-insert chunks with embeddings in one short transaction.
 
-        Converts Python list to PostgreSQL array literal format.
-        Example: [0.1, -0.2, 0.5] -> "[0.1,-0.2,0.5]"
+        Embeddings are written as a JSONB array plus the native pgvector column
+        for their dimension, so retrieval can search them with an index.
+        Rows are sent as a single multi-row INSERT ... VALUES.
         """
-        return f"[{','.join(map(str, embedding))}]"
+        rows = [
+            {
+                "document_id": document_id,
+                "chunk_index": start_index + offset,
+                "content": content,
+                "content_hash": content_hash(content),
+                **DocumentChunk.embedding_values(embedding),
+            }
+            for offset, (content, embedding) in enumerate(zip(chunks, embeddings))
+        ]
+        if not rows:
+            return
+
+        await self.db.execute(insert(DocumentChunk), rows)
+        await self.db.commit()
 
     def _get_file_path(self, document: KnowledgeDocument) -> str:
         """Get file path for document.
@@ -0,0 +1,245 @@
+"""In-process embedding matrix cache for RAG retrieval.
+
+Fallback search engine for deployments without pgvector indexes (or for
+embedding dimensions without a native vector column). Each merchant's ready
+chunk embeddings are held as one contiguous, L2-normalized float32 matrix with
+chunk metadata in parallel arrays, so a query is a single matrix-vector
+product plus ``argpartition`` instead of a row fetch and per-row JSON parse.
+
+Entries are keyed by (merchant_id, embedding_version, dimension), evicted
+LRU-first when the memory budget is exceeded, and invalidated when a
+merchant's chunks change (DocumentProcessor, re-embedding worker, document
+deletion).
+
+Architecture Note (Multi-Worker Limitation):
+    Invalidation is in-process only. Entries also expire after a TTL so other
+    workers pick up changes within ``ttl_seconds``.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 300
+
+CacheKey = tuple[int, str | None, int]
+
+
+@dataclass
+class EmbeddingMatrix:
+    """Normalized embeddings for one merchant with parallel chunk metadata."""
+
+    matrix: np.ndarray  # (n, dimension) float32, rows L2-normalized, C-contiguous
+    chunk_ids: np.ndarray
+    chunk_indexes: np.ndarray
+    document_ids: np.ndarray
+    document_names: list[str]
+    contents: list[str]
+    created_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def size(self) -> int:
+        """Number of chunks in the matrix."""
+        return len(self.contents)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory footprint in bytes."""
+        array_bytes = (
+            self.matrix.nbytes
+            + self.chunk_ids.nbytes
+            + self.chunk_indexes.nbytes
+            + self.document_ids.nbytes
+        )
+        text_bytes = sum(len(c) for c in self.contents) + sum(len(n) for n in self.document_names)
+        return array_bytes + text_bytes
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any], dimension: int) -> EmbeddingMatrix:
+        """Build a matrix from retrieval rows.
+
+        Rows need chunk_id, content, chunk_index, document_name, document_id and
+        embedding_json (JSON array text). Rows that fail to parse or have a
+        different dimension are skipped.
+        """
+        vectors: list[list[float]] = []
+        chunk_ids: list[int] = []
+        chunk_indexes: list[int] = []
+        document_ids: list[int] = []
+        document_names: list[str] = []
+        contents: list[str] = []
+
+        for row in rows:
+            try:
+                embedding = json.loads(row.embedding_json)
+            except (json.JSONDecodeError, TypeError, ValueError) as e:
+                logger.warning("embedding_parse_error", chunk_id=row.chunk_id, error=str(e))
+                continue
+            if not isinstance(embedding, list) or len(embedding) != dimension:
+                continue
+
+            vectors.append(embedding)
+            chunk_ids.append(row.chunk_id)
+            chunk_indexes.append(row.chunk_index)
+            document_ids.append(row.document_id)
+            document_names.append(row.document_name)
+            contents.append(row.content)
+
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), dimension)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix = np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+        return cls(
+            matrix=matrix,
+            chunk_ids=np.asarray(chunk_ids, dtype=np.int64),
+            chunk_indexes=np.asarray(chunk_indexes, dtype=np.int64),
+            document_ids=np.asarray(document_ids, dtype=np.int64),
+            document_names=document_names,
+            contents=contents,
+        )
+
+    def top_k(self, query: list[float], top_k: int, threshold: float) -> list[tuple[int, float]]:
+        """Return (row, cosine similarity) pairs above threshold, best first."""
+        if self.size == 0 or top_k <= 0:
+            return []
+
+        query_vec = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query_vec)
+        if norm == 0:
+            return []
+
+        scores = self.matrix @ (query_vec / norm)
+
+        k = min(top_k, self.size)
+        if k < self.size:
+            candidates = np.argpartition(scores, -k)[-k:]
+        else:
+            candidates = np.arange(self.size)
+        candidates = candidates[np.argsort(scores[candidates])[::-1]]
+
+        return [(int(i), float(scores[i])) for i in candidates if scores[i] >= threshold]
+
+
+class EmbeddingMatrixCache:
+    """LRU cache of per-merchant embedding matrices bounded by a memory budget."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[CacheKey, EmbeddingMatrix] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def total_bytes(self) -> int:
+        """Memory currently held by cached matrices."""
+        return self._bytes
+
+    def get(
+        self, merchant_id: int, embedding_version: str | None, dimension: int
+    ) -> EmbeddingMatrix | None:
+        """Return the cached matrix, or None if missing or expired."""
+        key = (merchant_id, embedding_version, dimension)
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry.created_at > self.ttl_seconds:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(
+        self,
+        merchant_id: int,
+        embedding_version: str | None,
+        dimension: int,
+        entry: EmbeddingMatrix,
+    ) -> None:
+        """Cache a matrix, evicting least recently used entries to stay in budget."""
+        key = (merchant_id, embedding_version, dimension)
+        if key in self._entries:
+            self._remove(key)
+
+        size = entry.nbytes
+        if size > self.max_bytes:
+            logger.info(
+                "embedding_matrix_too_large_to_cache",
+                merchant_id=merchant_id,
+                bytes=size,
+                max_bytes=self.max_bytes,
+            )
+            return
+
+        while self._entries and self._bytes + size > self.max_bytes:
+            evicted_key, _ = next(iter(self._entries.items()))
+            self._remove(evicted_key)
+            logger.debug("embedding_matrix_evicted", merchant_id=evicted_key[0])
+
+        self._entries[key] = entry
+        self._bytes += size
+
+    def invalidate_merchant(self, merchant_id: int) -> None:
+        """Drop every cached matrix for a merchant."""
+        for key in [k for k in self._entries if k[0] == merchant_id]:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all cached matrices."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return cache size and hit/miss counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+
+_matrix_cache: EmbeddingMatrixCache | None = None
+
+
+def get_embedding_matrix_cache() -> EmbeddingMatrixCache:
+    """Get the process-wide embedding matrix cache."""
+    global _matrix_cache
+    if _matrix_cache is None:
+        _matrix_cache = EmbeddingMatrixCache(
+            max_bytes=settings()["RAG_MATRIX_CACHE_MAX_MB"] * 1024 * 1024,
+        )
+    return _matrix_cache
+
+
+def invalidate_merchant_embeddings(merchant_id: int) -> None:
+    """Invalidate cached embedding matrices after a merchant's chunks change."""
+    get_embedding_matrix_cache().invalidate_merchant(merchant_id)
+    logger.debug("embedding_matrix_invalidated", merchant_id=merchant_id)
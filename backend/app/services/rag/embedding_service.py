@@ -10,6 +10,7 @@ Story 8-4: Backend - RAG Service (Document Processing)
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass
 
 import httpx
@@ -17,6 +18,17 @@ import structlog
 
 from app.core.config import is_testing, settings
 from app.core.errors import APIError, ErrorCode
+from app.core.tracing import span
+from app.services.llm.base_llm_service import HTTP2_AVAILABLE, HTTP_POOL_LIMITS
+from app.services.rag.query_embedding_batcher import (
+    QueryEmbeddingBatcher,
+    get_query_embedding_batcher,
+    make_batch_key,
+)
+from app.services.rag.query_embedding_cache import (
+    QueryEmbeddingCache,
+    get_query_embedding_cache,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -39,6 +51,18 @@ EMBEDDING_RATE_LIMIT_RPM = 3000  # OpenAI limit
 EMBEDDING_RETRY_MAX_ATTEMPTS = 3
 EMBEDDING_RETRY_BACKOFF_FACTOR = 2.0  # Exponential: 1s → 2s → 4s
 
+# Ollama batch embedding (/api/embed, Ollama >= 0.3.4). Batch size adapts per
+# service instance: doubles while batches finish well under the target time,
+# halves when they are slow or the server rejects/times out on the batch.
+OLLAMA_BATCH_SIZE_INITIAL = 32
+OLLAMA_BATCH_SIZE_MIN = 1
+OLLAMA_BATCH_SIZE_MAX = 256
+OLLAMA_BATCH_TARGET_SECONDS = 2.0
+OLLAMA_LEGACY_CONCURRENCY = 10  # Per-text /api/embeddings fallback
+
+# Ollama servers (by base URL) without /api/embed; they use the per-text path
+_ollama_legacy_servers: set[str] = set()
+
 
 class EmbeddingError(Exception):
     """Base exception for embedding errors."""
@@ -58,6 +82,12 @@ class InvalidProviderError(EmbeddingError):
     pass
 
 
+class OllamaBatchUnsupportedError(EmbeddingError):
+    """Raised when an Ollama server has no /api/embed endpoint."""
+
+    pass
+
+
 @dataclass
 class EmbeddingResult:
     """Result of embedding generation."""
@@ -80,8 +110,11 @@ class EmbeddingService:
 
     Features:
     - Batch processing (OpenAI: max 100 texts per batch)
-    - Concurrent requests for Ollama with rate limiting
+    - Ollama: adaptive batches via /api/embed, falling back to concurrent
+      per-text /api/embeddings requests on older servers
     - Exponential backoff retry on rate limits
+    - Two-tier query embedding cache (in-process LRU + optional Redis)
+    - Concurrent embed_query calls coalesced into batched provider calls
     - IS_TESTING mode support for mock responses
     """
 
@@ -91,6 +124,8 @@ class EmbeddingService:
         api_key: str | None = None,
         model: str | None = None,
         ollama_url: str | None = None,
+        query_cache: QueryEmbeddingCache | None = None,
+        query_batcher: QueryEmbeddingBatcher | None = None,
     ) -> None:
         """Initialize embedding service.
 
@@ -99,6 +134,10 @@ class EmbeddingService:
             api_key: API key for cloud providers
             model: Model override (optional)
             ollama_url: Ollama server URL (optional, defaults to config)
+            query_cache: Query embedding cache (optional, defaults to the
+                process-wide cache; bypassed in IS_TESTING mode unless injected)
+            query_batcher: Query micro-batcher (optional, defaults to the
+                process-wide batcher; bypassed in IS_TESTING mode unless injected)
 
         Raises:
             InvalidProviderError: If provider doesn't support embeddings
@@ -111,6 +150,10 @@ class EmbeddingService:
         )
         self.gemini_api_key = api_key if self.provider == "gemini" else None
         self._async_client: httpx.AsyncClient | None = None
+        self._query_cache = query_cache
+        self._query_batcher = query_batcher
+        self.ollama_batch_size = OLLAMA_BATCH_SIZE_INITIAL
+        self.ollama_batch_limit = OLLAMA_BATCH_SIZE_MAX  # Lowered when a batch is rejected
 
         # Validate provider - Anthropic is explicitly not supported
         if self.provider == "anthropic":
@@ -142,6 +185,8 @@ class EmbeddingService:
                 self._async_client = httpx.AsyncClient(
                     base_url="https://api.openai.com/v1",
                     timeout=60.0,
+                    http2=HTTP2_AVAILABLE,
+                    limits=HTTP_POOL_LIMITS,
                     headers={
                         "Authorization": f"Bearer {self.api_key}",
                         "Content-Type": "application/json",
@@ -151,11 +196,14 @@ class EmbeddingService:
                 self._async_client = httpx.AsyncClient(
                     base_url="https://generativelanguage.googleapis.com/v1beta",
                     timeout=60.0,
+                    http2=HTTP2_AVAILABLE,
+                    limits=HTTP_POOL_LIMITS,
                 )
             else:  # ollama
                 self._async_client = httpx.AsyncClient(
                     base_url=self.ollama_url,
                     timeout=60.0,
+                    limits=HTTP_POOL_LIMITS,
                 )
         return self._async_client
 
@@ -275,9 +323,51 @@ class EmbeddingService:
         Raises:
             EmbeddingError: If embedding generation fails
         """
+        cache = self.query_cache
+        if cache is None:
+            with span("embedding.provider"):
+                return await self._embed_query_uncached(query)
+
+        key = cache.make_key(self.provider, self.model, self.dimension, query)
+        with span("embedding.cache_lookup"):
+            cached = await cache.get(key)
+        if cached is not None:
+            return cached
+
+        with span("embedding.provider"):
+            embedding = await self._embed_query_uncached(query)
+        await cache.set(key, embedding)
+        return embedding
+
+    async def _embed_query_uncached(self, query: str) -> list[float]:
+        """Embed a query, through the micro-batcher when one is active."""
+        batcher = self.query_batcher
+        if batcher is not None:
+            key = make_batch_key(self.provider, self.model, self.ollama_url, self.api_key)
+            return await batcher.embed(key, query, self.embed_texts)
+
         result = await self.embed_texts([query])
         return result.embeddings[0] if result.embeddings else []
 
+    @property
+    def embedding_version(self) -> str:
+        """Version tag stored on documents embedded by this provider/model."""
+        return f"{self.provider}-{self.model}"
+
+    @property
+    def query_cache(self) -> QueryEmbeddingCache | None:
+        """Query embedding cache, or None when caching is bypassed."""
+        if self._query_cache is None and not is_testing():
+            self._query_cache = get_query_embedding_cache()
+        return self._query_cache
+
+    @property
+    def query_batcher(self) -> QueryEmbeddingBatcher | None:
+        """Query micro-batcher, or None when batching is disabled or bypassed."""
+        if self._query_batcher is None and not is_testing():
+            self._query_batcher = get_query_embedding_batcher()
+        return self._query_batcher
+
     async def _embed_texts_openai(self, texts: list[str]) -> EmbeddingResult:
         """Generate embeddings using OpenAI text-embedding-3-small.
 
@@ -326,9 +416,107 @@ class EmbeddingService:
     async def _embed_texts_ollama(self, texts: list[str]) -> EmbeddingResult:
         """Generate embeddings using Ollama nomic-embed-text.
 
+        Uses the batch /api/embed endpoint; servers without it (older than
+        0.3.4) are remembered and served by the per-text /api/embeddings path.
+        """
+        embeddings: list[list[float]] | None = None
+        if self.ollama_url not in _ollama_legacy_servers:
+            try:
+                embeddings = await self._embed_texts_ollama_batched(texts)
+            except OllamaBatchUnsupportedError:
+                _ollama_legacy_servers.add(self.ollama_url)
+                logger.info("ollama_batch_embed_unsupported", ollama_url=self.ollama_url)
+
+        if embeddings is None:
+            embeddings = await self._embed_texts_ollama_legacy(texts)
+
+        # Estimate token count (rough approximation)
+        total_chars = sum(len(t) for t in texts)
+        token_count = total_chars // 4
+
+        return EmbeddingResult(
+            embeddings=embeddings,
+            model=self.model or "nomic-embed-text",
+            provider="ollama",
+            dimension=self.dimension,
+            token_count=token_count,
+        )
+
+    async def _embed_texts_ollama_batched(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts in adaptive batches via POST /api/embed.
+
+        Raises:
+            OllamaBatchUnsupportedError: If the server has no /api/embed endpoint
+        """
+        embeddings: list[list[float]] = []
+        start = 0
+
+        while start < len(texts):
+            batch = texts[start : start + self.ollama_batch_size]
+            started = time.perf_counter()
+            try:
+                response = await self.async_client.post(
+                    "/api/embed",
+                    json={"model": self.model, "input": batch},
+                )
+            except httpx.TimeoutException:
+                if self._shrink_ollama_batch():
+                    continue
+                raise
+
+            if response.status_code == 404 and not self._is_ollama_error_body(response):
+                # Plain "404 page not found": endpoint missing, not an unknown model
+                raise OllamaBatchUnsupportedError(self.ollama_url)
+            if response.status_code in (413, 500, 503) and self._shrink_ollama_batch():
+                continue
+            response.raise_for_status()
+
+            batch_embeddings = response.json()["embeddings"]
+            if len(batch_embeddings) != len(batch):
+                raise APIError(
+                    ErrorCode.EMBEDDING_GENERATION_FAILED,
+                    f"Ollama returned {len(batch_embeddings)} embeddings for {len(batch)} texts",
+                )
+            embeddings.extend(batch_embeddings)
+            start += len(batch)
+            self._adapt_ollama_batch_size(len(batch), time.perf_counter() - started)
+
+        return embeddings
+
+    def _shrink_ollama_batch(self) -> bool:
+        """Halve the Ollama batch size and cap growth; False if already at the minimum."""
+        if self.ollama_batch_size <= OLLAMA_BATCH_SIZE_MIN:
+            return False
+        self.ollama_batch_size = max(OLLAMA_BATCH_SIZE_MIN, self.ollama_batch_size // 2)
+        self.ollama_batch_limit = self.ollama_batch_size
+        logger.warning("ollama_batch_size_reduced", batch_size=self.ollama_batch_size)
+        return True
+
+    def _adapt_ollama_batch_size(self, batch_len: int, elapsed: float) -> None:
+        """Grow full, fast batches and shrink slow ones toward the target latency."""
+        if elapsed > OLLAMA_BATCH_TARGET_SECONDS:
+            self.ollama_batch_size = max(OLLAMA_BATCH_SIZE_MIN, self.ollama_batch_size // 2)
+        elif (
+            elapsed < OLLAMA_BATCH_TARGET_SECONDS / 2
+            and batch_len >= self.ollama_batch_size
+            and self.ollama_batch_size < self.ollama_batch_limit
+        ):
+            self.ollama_batch_size = min(self.ollama_batch_limit, self.ollama_batch_size * 2)
+
+    @staticmethod
+    def _is_ollama_error_body(response: httpx.Response) -> bool:
+        """True if the response carries Ollama's JSON {"error": ...} payload."""
+        try:
+            return "error" in response.json()
+        except ValueError:
+            return False
+
+    async def _embed_texts_ollama_legacy(self, texts: list[str]) -> list[list[float]]:
+        """Embed one text per POST /api/embeddings request (pre-0.3.4 servers).
+
         Uses asyncio.gather() for concurrent requests with rate limiting.
         """
-        semaphore = asyncio.Semaphore(10)  # Max 10 concurrent requests
+        semaphore = asyncio.Semaphore(OLLAMA_LEGACY_CONCURRENCY)
 
         async def embed_single(text: str) -> list[float]:
             async with semaphore:
@@ -358,17 +546,7 @@ class EmbeddingService:
             # At this point, result is guaranteed to be List[float]
             results.append(result)  # type: ignore[arg-type]
 
-        # Estimate token count (rough approximation)
-        total_chars = sum(len(t) for t in texts)
-        token_count = total_chars // 4
-
-        return EmbeddingResult(
-            embeddings=results,
-            model=self.model or "nomic-embed-text",
-            provider="ollama",
-            dimension=self.dimension,
-            token_count=token_count,
-        )
+        return results
 
     async def _embed_texts_gemini(self, texts: list[str]) -> EmbeddingResult:
         """Generate embeddings using Gemini text-embedding-004.
@@ -19,6 +19,7 @@ from app.core.errors import APIError, ErrorCode
 from app.models.llm_configuration import LLMConfiguration
 from app.models.merchant import Merchant
 from app.services.knowledge.chunker import DocumentChunker
+from app.services.knowledge.extraction_executor import get_extraction_executor
 from app.services.rag.document_processor import DocumentProcessor, ProcessingResult
 from app.services.rag.embedding_service import EMBEDDING_MODELS, EmbeddingService
 
@@ -163,11 +164,13 @@ async def process_document_background(document_id: int, merchant_id: int) -> Pro
                 ollama_url=merchant_config.ollama_url,
             )
 
-            # Initialize processor
+            # Initialize processor; PDF/DOCX parsing runs in the extraction
+            # process pool so it does not block the event loop
             processor = DocumentProcessor(
                 db=db,
                 embedding_service=embedding_service,
                 chunker=DocumentChunker(),
+                extraction_executor=get_extraction_executor(),
             )
 
             # Process document with performance tracking
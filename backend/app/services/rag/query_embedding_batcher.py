@@ -0,0 +1,186 @@
+"""Cross-request micro-batching for query embeddings.
+
+Every widget message embeds its query with a single-text provider call. Under
+load those calls are coalesced: the first query for a provider/model opens a
+batch, queries arriving within ``max_wait_ms`` (or until ``max_batch_size``
+texts) join it, and one ``embed_texts`` call serves all of them. Identical
+texts in a batch are embedded once.
+
+The batch is sent with the EmbeddingService that opened it; services are
+grouped by provider, model, Ollama URL and API key, so any member can serve
+the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from app.services.rag.embedding_service import EmbeddingResult
+
+logger = structlog.get_logger(__name__)
+
+BatchKey = tuple[str, str, str, str]
+EmbedBatch = Callable[[list[str]], Awaitable["EmbeddingResult"]]
+
+
+def make_batch_key(
+    provider: str, model: str | None, ollama_url: str | None, api_key: str | None
+) -> BatchKey:
+    """Group key for services that can share a provider call."""
+    key_digest = hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+    return (provider, model or "", ollama_url or "", key_digest)
+
+
+@dataclass
+class _PendingBatch:
+    """Queries waiting for one provider call."""
+
+    embed_batch: EmbedBatch
+    waiters: dict[str, list[asyncio.Future[list[float]]]] = field(default_factory=dict)
+    size: int = 0
+    timer: asyncio.TimerHandle | None = None
+
+
+class QueryEmbeddingBatcher:
+    """Coalesces concurrent single-query embeddings into batched provider calls.
+
+    Features:
+    - Per provider/model/credentials batching window
+    - Flushes early once max_batch_size queries are waiting
+    - Provider errors are delivered to every waiting caller
+    - Counters via stats()
+    """
+
+    DEFAULT_MAX_BATCH_SIZE = 32
+    DEFAULT_MAX_WAIT_MS = 5.0
+
+    def __init__(
+        self,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+    ) -> None:
+        """Initialize batcher.
+
+        Args:
+            max_batch_size: Queries per provider call before flushing early
+            max_wait_ms: How long the first query waits for others to join
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: dict[BatchKey, _PendingBatch] = {}
+        self._flushes: set[asyncio.Task[None]] = set()
+        self.batches = 0
+        self.queries = 0
+        self.provider_texts = 0
+        self.largest_batch = 0
+
+    async def embed(self, key: BatchKey, text: str, embed_batch: EmbedBatch) -> list[float]:
+        """Embed one query text, sharing a provider call with concurrent queries.
+
+        Args:
+            key: Batch group (see make_batch_key)
+            text: Query text
+            embed_batch: embed_texts of the calling service, used if this
+                query opens the batch
+
+        Returns:
+            Embedding vector (empty list if the provider returned none)
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(embed_batch=embed_batch)
+            batch.timer = loop.call_later(self.max_wait_ms / 1000, self._flush, key)
+            self._pending[key] = batch
+
+        future: asyncio.Future[list[float]] = loop.create_future()
+        batch.waiters.setdefault(text, []).append(future)
+        batch.size += 1
+        self.queries += 1
+
+        if batch.size >= self.max_batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: BatchKey) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run(self, batch: _PendingBatch) -> None:
+        texts = list(batch.waiters)
+        self.batches += 1
+        self.provider_texts += len(texts)
+        self.largest_batch = max(self.largest_batch, batch.size)
+
+        try:
+            result = await batch.embed_batch(texts)
+            embeddings = result.embeddings
+            if embeddings and len(embeddings) != len(texts):
+                raise ValueError(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+        except Exception as e:
+            logger.warning("query_embedding_batch_failed", texts=len(texts), error=str(e))
+            for futures in batch.waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for index, text in enumerate(texts):
+            embedding = embeddings[index] if embeddings else []
+            for future in batch.waiters[text]:
+                if not future.done():
+                    future.set_result(embedding)
+
+    def stats(self) -> dict[str, Any]:
+        """Return batching counters."""
+        return {
+            "batches": self.batches,
+            "queries": self.queries,
+            "provider_texts": self.provider_texts,
+            "largest_batch": self.largest_batch,
+            "avg_batch_size": round(self.queries / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+        }
+
+
+_query_embedding_batcher: QueryEmbeddingBatcher | None = None
+
+
+def get_query_embedding_batcher() -> QueryEmbeddingBatcher | None:
+    """Get the process-wide query embedding batcher.
+
+    Returns None when EMBEDDING_QUERY_BATCH_WINDOW_MS is 0 (batching disabled).
+    """
+    global _query_embedding_batcher
+    config = settings()
+    window_ms = config.get(
+        "EMBEDDING_QUERY_BATCH_WINDOW_MS", QueryEmbeddingBatcher.DEFAULT_MAX_WAIT_MS
+    )
+    if window_ms <= 0:
+        return None
+    if _query_embedding_batcher is None:
+        _query_embedding_batcher = QueryEmbeddingBatcher(
+            max_batch_size=config.get(
+                "EMBEDDING_QUERY_BATCH_MAX", QueryEmbeddingBatcher.DEFAULT_MAX_BATCH_SIZE
+            ),
+            max_wait_ms=window_ms,
+        )
+    return _query_embedding_batcher
@@ -0,0 +1,196 @@
+"""Two-tier cache for query embeddings.
+
+Widget traffic repeats the same questions ("what are your shipping fees"), and
+each one costs an embedding round trip to OpenAI, Gemini or Ollama. This cache
+stores query embeddings as compact float32 bytes:
+
+- L1: in-process LRU (bounded by entry count)
+- L2: optional Redis tier shared across workers (TTL-bounded)
+
+Keys combine provider, model, dimension and a hash of the normalized query
+text, so switching embedding model never serves stale vectors.
+
+Redis Keys:
+- rag:qemb:{provider}:{model}:{dimension}:{sha256(normalized query)}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+from array import array
+from collections import OrderedDict
+from typing import Any
+
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = "?!.,;: "
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text for cache keying.
+
+    Applies NFKC, lowercases, collapses whitespace and strips trailing
+    punctuation so "What are your shipping fees?" and "what are your
+    shipping fees" share one entry.
+    """
+    normalized = unicodedata.normalize("NFKC", query).lower()
+    normalized = _WHITESPACE_RE.sub(" ", normalized).strip()
+    return normalized.rstrip(_TRAILING_PUNCTUATION)
+
+
+def encode_embedding(embedding: list[float]) -> bytes:
+    """Pack an embedding as float32 bytes (4 bytes per dimension)."""
+    return array("f", embedding).tobytes()
+
+
+def decode_embedding(data: bytes) -> list[float]:
+    """Unpack float32 bytes produced by encode_embedding."""
+    values = array("f")
+    values.frombytes(data)
+    return values.tolist()
+
+
+class QueryEmbeddingCache:
+    """In-process LRU with an optional Redis tier for query embeddings.
+
+    Features:
+    - float32 byte storage in both tiers
+    - Redis hits are promoted into the in-process LRU
+    - Graceful degradation: Redis errors are logged and treated as misses
+    - Hit/miss counters via stats()
+    """
+
+    KEY_PREFIX = "rag:qemb"
+    DEFAULT_MAX_ENTRIES = 2048
+    DEFAULT_TTL_SECONDS = 7 * 24 * 3600  # Embeddings are deterministic per model
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        redis_client: redis.Redis | None = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        """Initialize query embedding cache.
+
+        Args:
+            max_entries: Maximum entries kept in the in-process LRU
+            redis_client: Optional Redis client for the shared tier
+            ttl_seconds: TTL for Redis entries
+        """
+        self.max_entries = max_entries
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    def make_key(self, provider: str, model: str | None, dimension: int, query: str) -> str:
+        """Build the cache key for a query under a provider/model/dimension."""
+        digest = hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{provider}:{model or ''}:{dimension}:{digest}"
+
+    async def get(self, key: str) -> list[float] | None:
+        """Return the cached embedding for key, checking L1 then Redis."""
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            self.local_hits += 1
+            return decode_embedding(data)
+
+        if self.redis is not None:
+            try:
+                data = await self.redis.get(key)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning("query_embedding_cache_redis_get_failed", error=str(e))
+                data = None
+            if data is not None:
+                self._store_local(key, data)
+                self.redis_hits += 1
+                return decode_embedding(data)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, embedding: list[float]) -> None:
+        """Store an embedding in both tiers."""
+        if not embedding:
+            return
+
+        data = encode_embedding(embedding)
+        self._store_local(key, data)
+
+        if self.redis is not None:
+            try:
+                await self.redis.set(key, data, ex=self.ttl_seconds)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning("query_embedding_cache_redis_set_failed", error=str(e))
+
+    def clear(self) -> None:
+        """Clear the in-process tier and reset counters."""
+        self._entries.clear()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and L1 size."""
+        lookups = self.local_hits + self.redis_hits + self.misses
+        hits = self.local_hits + self.redis_hits
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "redis_errors": self.redis_errors,
+            "redis_enabled": self.redis is not None,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _store_local(self, key: str, data: bytes) -> None:
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_query_embedding_cache: QueryEmbeddingCache | None = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Get the process-wide query embedding cache.
+
+    The Redis tier is enabled when REDIS_URL is set and
+    EMBEDDING_QUERY_CACHE_REDIS is true.
+    """
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        config = settings()
+        redis_client = None
+        redis_url = config.get("REDIS_URL")
+        if redis_url and config.get("EMBEDDING_QUERY_CACHE_REDIS", True):
+            try:
+                redis_client = redis.from_url(redis_url)
+            except Exception as e:
+                logger.warning("query_embedding_cache_redis_unavailable", error=str(e))
+
+        _query_embedding_cache = QueryEmbeddingCache(
+            max_entries=config.get(
+                "EMBEDDING_QUERY_CACHE_SIZE", QueryEmbeddingCache.DEFAULT_MAX_ENTRIES
+            ),
+            redis_client=redis_client,
+        )
+    return _query_embedding_cache
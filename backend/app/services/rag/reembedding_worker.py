@@ -1,7 +1,19 @@
 """Re-embedding background worker.
 
 Handles background re-embedding of documents when embedding provider changes.
-Processes documents marked with re_embedding_status='queued'.
+Processes documents marked with re_embedding_status='queued' as a resumable
+ReembeddingJob:
+
+- Documents are re-embedded in parallel (REEMBEDDING_CONCURRENCY), each in
+  chunk id order, in batches of REEMBEDDING_BATCH_SIZE
+- Every batch is committed to staged_chunk_embeddings together with job
+  progress; the highest staged chunk id of a document is its resume cursor
+- Provider calls of a job share a requests-per-minute rate limiter
+- Current embeddings keep serving queries until every chunk is staged, then
+  vectors, document versions and merchant embedding settings switch in one
+  transaction
+- A running job whose heartbeat goes stale (process died) is resumed by
+  resume_stalled_reembedding_jobs
 
 Story 8-11: LLM Embedding Provider Integration & Re-embedding
 """
@@ -9,18 +21,39 @@ Story 8-11: LLM Embedding Provider Integration & Re-embedding
 from __future__ import annotations
 
 import asyncio
+import time
+from collections.abc import Coroutine
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import and_, delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import async_session
-from app.models.knowledge_base import DocumentChunk, KnowledgeDocument
+from app.core.errors import APIError, ErrorCode
+from app.models.knowledge_base import (
+    VECTOR_COLUMNS,
+    DocumentChunk,
+    KnowledgeDocument,
+    ReembeddingJob,
+    ReembeddingJobStatus,
+    StagedChunkEmbedding,
+)
 from app.models.merchant import Merchant
-from app.core.config import settings
 from app.services.rag.dimension_handler import DimensionHandler
-from app.services.rag.embedding_service import EMBEDDING_MODELS, EmbeddingService
-from app.services.rag.gemini_embedding_provider import GeminiEmbeddingProvider
+from app.services.rag.embedding_matrix_cache import invalidate_merchant_embeddings
+from app.services.rag.embedding_service import (
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_MODELS,
+    EmbeddingError,
+    EmbeddingService,
+    RateLimitError,
+)
+from app.services.rag.semantic_answer_cache import invalidate_merchant_answers
 
 logger = structlog.get_logger(__name__)
 
@@ -30,24 +63,125 @@ RETRY_CONFIG = {
     "retryable_errors": [429, 503, 504],
 }
 
-# Rate limiting configuration per provider (requests per second)
-RATE_LIMITS = {
-    "openai": {"rpm": 3000, "delay_ms": 33},  # ~33ms between requests
-    "gemini": {"rpm": 1500, "delay_ms": 67},  # ~67ms between requests
-    "ollama": {"rpm": 100, "delay_ms": 10},  # Local, fast
+# Provider request budget (requests per minute, one request per batch).
+# Ollama is local: only REEMBEDDING_CONCURRENCY bounds it.
+RATE_LIMITS: dict[str, int | None] = {
+    "openai": 3000,
+    "gemini": 1500,
+    "ollama": None,
 }
 
+DEFAULT_CONCURRENCY = 4
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_STALE_SECONDS = 300
+
+# Chunks can change under a running job (document re-uploaded); staging is
+# retried this many times before the job gives up on cutting over.
+MAX_STAGING_PASSES = 3
+
+# Document statuses that belong to the current job
+JOB_DOCUMENT_STATUSES = ("queued", "in_progress")
+
+# Held while a merchant's job runs in this process
+_merchant_locks: dict[int, asyncio.Lock] = {}
+_background_tasks: set[asyncio.Task[None]] = set()
+
+
+class JobSupersededError(Exception):
+    """Raised when a running job was replaced by a job for another target."""
+
+    pass
+
+
+@dataclass(frozen=True)
+class EmbeddingTarget:
+    """Provider/model a job re-embeds into, with the credentials to call it."""
+
+    provider: str
+    model: str
+    api_key: str | None = None
+    ollama_url: str | None = None
+
+    @property
+    def version(self) -> str:
+        return f"{self.provider}-{self.model}"
+
+
+class ProviderRateLimiter:
+    """Spaces provider requests to stay within a requests-per-minute budget.
 
-async def reembed_all_documents(merchant_id: int) -> None:
+    Shared by all document tasks of a job. A rate-limited response pushes the
+    next slot out, so every task backs off together instead of retrying into
+    the same limit.
+    """
+
+    def __init__(self, requests_per_minute: int | None) -> None:
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        """Wait for the next request slot."""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def penalize(self, seconds: float) -> None:
+        """Hold back all requests for at least `seconds`."""
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+class _JobProgress:
+    """Staging throughput of the current run (resumed chunks excluded)."""
+
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.staged = 0
+
+    def record(self, count: int) -> float:
+        """Add staged chunks and return chunks per second."""
+        self.staged += count
+        elapsed = time.monotonic() - self.started
+        return self.staged / elapsed if elapsed > 0 else 0.0
+
+
+async def reembed_all_documents(
+    merchant_id: int,
+    provider: str | None = None,
+    model: str | None = None,
+    resumed: bool = False,
+) -> None:
     """Background task to re-embed all documents for a merchant.
 
     This function is triggered when:
     1. Merchant changes embedding provider (dimension change detected)
     2. Manual re-embed is triggered via API
+    3. A running job stalled and is resumed
 
     Args:
         merchant_id: Merchant ID whose documents to re-embed
+        provider: Target embedding provider (defaults to the running job's
+            target, else derived from the merchant's LLM configuration)
+        model: Target embedding model (defaults to the provider's model)
+        resumed: Job was claimed by resume_stalled_reembedding_jobs
     """
+    lock = _merchant_locks.setdefault(merchant_id, asyncio.Lock())
+    if lock.locked():
+        if provider is None:
+            logger.info("reembedding_already_running", merchant_id=merchant_id)
+            return
+        # A new target replaces the running job, which stops at its next batch
+        async with async_session()() as db:
+            await _supersede_other_jobs(db, merchant_id, _target_version(provider, model))
+
+    async with lock:
+        await _run_reembedding(merchant_id, provider, model, resumed)
+
+
+async def _run_reembedding(
+    merchant_id: int, provider: str | None, model: str | None, resumed: bool
+) -> None:
     async with async_session()() as db:
         try:
             merchant = await _get_merchant_with_config(db, merchant_id)
@@ -58,45 +192,6 @@ async def reembed_all_documents(merchant_id: int) -> None:
                 )
                 return
 
-            # Determine embedding provider from LLM config (Story 8-11)
-            # Default to LLM provider if embedding provider not explicitly configured
-            llm_config = merchant.llm_configuration
-            if llm_config:
-                llm_provider = llm_config.provider if llm_config else "openai"
-            else:
-                llm_provider = "ollama"  # Decrypt API key if present
-            api_key = None
-            if llm_config and llm_config.api_key_encrypted:
-                from app.core.security import decrypt_access_token
-
-                api_key = decrypt_access_token(llm_config.api_key_encrypted)
-
-            # Map LLM provider to embedding provider (same logic as processing_task.py)
-            if llm_provider == "gemini":
-                provider = "gemini"
-                model = EMBEDDING_MODELS["gemini"]
-            elif llm_provider == "openai":
-                provider = "openai"
-                model = EMBEDDING_MODELS["openai"]
-            elif llm_provider == "ollama":
-                provider = "ollama"
-                model = EMBEDDING_MODELS["ollama"]
-                api_key = None  # Ollama doesn't need API key
-            elif llm_provider == "anthropic":
-                # Anthropic doesn't support embeddings - fallback to OpenAI with env key
-                provider = "openai"
-                model = EMBEDDING_MODELS["openai"]
-                api_key = settings().get("OPENAI_API_KEY")
-                logger.info(
-                    "reembedding_anthropic_fallback",
-                    merchant_id=merchant_id,
-                    fallback_provider="openai",
-                )
-            else:
-                # Unknown provider - use database values as-is
-                provider = merchant.embedding_provider or "openai"
-                model = merchant.embedding_model or EMBEDDING_MODELS["openai"]
-
             documents = await _get_queued_documents(db, merchant_id)
             if not documents:
                 logger.info(
@@ -105,81 +200,41 @@ async def reembed_all_documents(merchant_id: int) -> None:
                 )
                 return
 
+            job = await _get_unfinished_job(db, merchant_id)
+            if provider is None and job is not None:
+                provider, model = job.target_provider, job.target_model
+            target = _resolve_target(merchant, provider, model)
+            if (
+                not resumed
+                and job is not None
+                and job.target_version == target.version
+                and _is_running_elsewhere(job)
+            ):
+                logger.info("reembedding_already_running", merchant_id=merchant_id, job_id=job.id)
+                return
+            job = await _start_job(db, merchant_id, target, job)
+
             logger.info(
                 "reembedding_started",
                 merchant_id=merchant_id,
+                job_id=job.id,
                 document_count=len(documents),
-                provider=provider,
-                model=model,
-            )
-
-            embedding_service = _create_embedding_service(
-                provider=provider,
-                model=model,
-                api_key=api_key,
+                total_chunks=job.total_chunks,
+                resumed_chunks=job.processed_chunks,
+                provider=target.provider,
+                model=target.model,
             )
 
-            for i, doc in enumerate(documents):
-                try:
-                    progress = int(((i + 1) / len(documents)) * 100)
-                    doc.re_embedding_status = "in_progress"
-                    doc.re_embedding_progress = progress
-                    await db.commit()
-
-                    # Retry logic with exponential backoff (MEDIUM-4)
-                    last_error = None
-                    for attempt in range(RETRY_CONFIG["max_attempts"]):
-                        try:
-                            await _reembed_document(db, doc, embedding_service, provider, model)
-                            break  # Success, exit retry loop
-                        except Exception as e:
-                            last_error = e
-                            if attempt < RETRY_CONFIG["max_attempts"] - 1:
-                                wait_time = RETRY_CONFIG["backoff_factor"] ** attempt
-                                logger.warning(
-                                    "reembedding_document_retry",
-                                    document_id=doc.id,
-                                    attempt=attempt + 1,
-                                    wait_seconds=wait_time,
-                                    error=str(e),
-                                )
-                                await asyncio.sleep(wait_time)
-                            else:
-                                raise  # Re-raise after all attempts exhausted
-
-                    doc.re_embedding_status = "completed"
-                    doc.re_embedding_progress = 100
-                    doc.embedding_version = f"{provider}-{model}"
-                    doc.status = "ready"
-                    await db.commit()
-
-                    logger.info(
-                        "reembedding_document_complete",
-                        document_id=doc.id,
-                        progress=progress,
-                    )
-
-                    # Rate limiting delay between documents (MEDIUM-5)
-                    delay_ms = RATE_LIMITS.get(provider, RATE_LIMITS["openai"])["delay_ms"]
-                    if i < len(documents) - 1:  # Don't delay after last document
-                        await asyncio.sleep(delay_ms / 1000.0)
-
-                except Exception as e:
-                    doc.re_embedding_status = "failed"
-                    doc.error_message = str(e)
-                    await db.commit()
-
-                    logger.error(
-                        "reembedding_document_failed",
-                        document_id=doc.id,
-                        error=str(e),
-                    )
-
-            logger.info(
-                "reembedding_complete",
-                merchant_id=merchant_id,
-                total_documents=len(documents),
+            embedding_service = EmbeddingService(
+                provider=target.provider,
+                api_key=target.api_key,
+                model=target.model,
+                ollama_url=target.ollama_url,
             )
+            try:
+                await _stage_and_cut_over(db, merchant_id, job.id, target, embedding_service)
+            finally:
+                await embedding_service.close()
 
         except Exception as e:
             logger.error(
@@ -189,129 +244,570 @@ async def reembed_all_documents(merchant_id: int) -> None:
             )
 
 
-async def _get_merchant_with_config(db: AsyncSession, merchant_id: int) -> Merchant | None:
-    """Get merchant with LLM configuration."""
-    from sqlalchemy.orm import selectinload
+async def _stage_and_cut_over(
+    db: AsyncSession,
+    merchant_id: int,
+    job_id: int,
+    target: EmbeddingTarget,
+    embedding_service: EmbeddingService,
+) -> None:
+    """Stage embeddings for all job documents, then cut over."""
+    config = settings()
+    concurrency = max(1, config.get("REEMBEDDING_CONCURRENCY", DEFAULT_CONCURRENCY))
+    batch_size = max(1, config.get("REEMBEDDING_BATCH_SIZE", DEFAULT_BATCH_SIZE))
+    limiter = ProviderRateLimiter(RATE_LIMITS.get(target.provider, RATE_LIMITS["openai"]))
+    progress = _JobProgress()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(document_id: int) -> bool | None:
+        async with semaphore:
+            return await _stage_document(
+                job_id, document_id, embedding_service, limiter, progress, batch_size
+            )
 
-    result = await db.execute(
-        select(Merchant)
-        .options(selectinload(Merchant.llm_configuration))
-        .where(Merchant.id == merchant_id)
-    )
-    return result.scalars().first()
+    for _ in range(MAX_STAGING_PASSES):
+        document_ids = [doc.id for doc in await _get_queued_documents(db, merchant_id)]
+        results = await asyncio.gather(*(run(document_id) for document_id in document_ids))
 
+        try:
+            if None in results:
+                raise JobSupersededError(job_id)
 
-async def _get_queued_documents(db: AsyncSession, merchant_id: int) -> list[KnowledgeDocument]:
-    """Get all documents queued for re-embedding."""
-    result = await db.execute(
-        select(KnowledgeDocument)
-        .where(
-            KnowledgeDocument.merchant_id == merchant_id,
-            KnowledgeDocument.re_embedding_status == "queued",
-        )
-        .order_by(KnowledgeDocument.created_at)
-    )
-    return list(result.scalars().all())
+            failed = results.count(False)
+            if failed:
+                await _fail_job(db, job_id, f"{failed} document(s) failed to re-embed")
+                logger.error(
+                    "reembedding_job_failed",
+                    merchant_id=merchant_id,
+                    job_id=job_id,
+                    failed_documents=failed,
+                )
+                return
+
+            cut_over = await _cut_over(db, merchant_id, job_id, target)
+        except JobSupersededError:
+            await db.rollback()
+            await db.execute(
+                delete(StagedChunkEmbedding).where(StagedChunkEmbedding.job_id == job_id)
+            )
+            await db.commit()
+            logger.info("reembedding_job_superseded", merchant_id=merchant_id, job_id=job_id)
+            return
+
+        if cut_over:
+            invalidate_merchant_embeddings(merchant_id)
+            try:
+                await invalidate_merchant_answers(merchant_id)
+            except Exception as e:
+                logger.warning(
+                    "semantic_answers_invalidation_failed",
+                    merchant_id=merchant_id,
+                    error=str(e),
+                )
+            logger.info(
+                "reembedding_complete",
+                merchant_id=merchant_id,
+                job_id=job_id,
+                total_documents=len(document_ids),
+                chunks_staged=progress.staged,
+                embedding_version=target.version,
+            )
+            return
+
+        logger.warning("reembedding_chunks_changed", merchant_id=merchant_id, job_id=job_id)
+
+    await _fail_job(db, job_id, "Chunks kept changing during re-embedding")
+
+
+async def _stage_document(
+    job_id: int,
+    document_id: int,
+    embedding_service: EmbeddingService,
+    limiter: ProviderRateLimiter,
+    progress: _JobProgress,
+    batch_size: int,
+) -> bool | None:
+    """Stage one document in its own session.
+
+    Returns:
+        True if staged, False if it failed, None if the job was superseded
+    """
+    async with async_session()() as db:
+        try:
+            await _reembed_document(
+                db, job_id, document_id, embedding_service, limiter, progress, batch_size
+            )
+            return True
+        except JobSupersededError:
+            await db.rollback()
+            return None
+        except Exception as e:
+            await db.rollback()
+            await db.execute(
+                update(KnowledgeDocument)
+                .where(KnowledgeDocument.id == document_id)
+                .values(re_embedding_status="failed", error_message=str(e))
+            )
+            await db.commit()
+
+            logger.error(
+                "reembedding_document_failed",
+                document_id=document_id,
+                job_id=job_id,
+                error=str(e),
+            )
+            return False
 
 
 async def _reembed_document(
     db: AsyncSession,
-    document: KnowledgeDocument,
+    job_id: int,
+    document_id: int,
     embedding_service: EmbeddingService,
-    provider: str,
-    model: str,
+    limiter: ProviderRateLimiter,
+    progress: _JobProgress,
+    batch_size: int,
 ) -> None:
-    """Re-embed a single document's chunks.
+    """Stage embeddings for a document's chunks, resuming after its cursor.
 
     Args:
-        db: Database session
-        document: Document to re-embed
-        embedding_service: Embedding service instance
-        provider: Provider name
-        model: Model name
+        db: Database session (owned by this document task)
+        job_id: Re-embedding job ID
+        document_id: Document to re-embed
+        embedding_service: Embedding service for the job's target
+        limiter: Job-wide provider rate limiter
+        progress: Job-wide throughput tracker
+        batch_size: Chunks per provider request and checkpoint
     """
-    result = await db.execute(
-        select(DocumentChunk)
-        .where(DocumentChunk.document_id == document.id)
-        .order_by(DocumentChunk.chunk_index)
+    cursor = await db.scalar(
+        select(func.max(StagedChunkEmbedding.chunk_id)).where(
+            StagedChunkEmbedding.job_id == job_id,
+            StagedChunkEmbedding.document_id == document_id,
+        )
+    )
+    cursor = cursor or 0
+    total = await db.scalar(select(func.count()).where(DocumentChunk.document_id == document_id))
+    done = await db.scalar(
+        select(func.count()).where(
+            DocumentChunk.document_id == document_id, DocumentChunk.id <= cursor
+        )
     )
-    chunks = list(result.scalars().all())
 
-    if not chunks:
-        logger.warning(
-            "reembedding_no_chunks",
-            document_id=document.id,
+    await db.execute(
+        update(KnowledgeDocument)
+        .where(KnowledgeDocument.id == document_id)
+        .values(re_embedding_status="in_progress", re_embedding_progress=_percent(done, total))
+    )
+    await db.commit()
+
+    while True:
+        result = await db.execute(
+            select(DocumentChunk.id, DocumentChunk.content)
+            .where(DocumentChunk.document_id == document_id, DocumentChunk.id > cursor)
+            .order_by(DocumentChunk.id)
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if not rows:
+            break
+
+        embeddings = await _embed_batch(embedding_service, limiter, [row.content for row in rows])
+
+        await db.execute(
+            insert(StagedChunkEmbedding)
+            .values(
+                [
+                    {
+                        "job_id": job_id,
+                        "chunk_id": row.id,
+                        "document_id": document_id,
+                        "embedding": embedding,
+                    }
+                    for row, embedding in zip(rows, embeddings)
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+        done += len(rows)
+        await db.execute(
+            update(KnowledgeDocument)
+            .where(KnowledgeDocument.id == document_id)
+            .values(re_embedding_progress=_percent(done, total))
         )
-        return
+        # Also the job heartbeat (updated_at)
+        result = await db.execute(
+            update(ReembeddingJob)
+            .where(
+                ReembeddingJob.id == job_id,
+                ReembeddingJob.status == ReembeddingJobStatus.RUNNING.value,
+            )
+            .values(
+                processed_chunks=ReembeddingJob.processed_chunks + len(rows),
+                chunks_per_second=round(progress.record(len(rows)), 2),
+                updated_at=datetime.now(UTC),
+            )
+        )
+        if result.rowcount == 0:
+            raise JobSupersededError(job_id)
+        await db.commit()
+        cursor = rows[-1].id
+
+    logger.info(
+        "reembedding_document_staged",
+        document_id=document_id,
+        job_id=job_id,
+        chunks=total,
+    )
+
+
+async def _embed_batch(
+    embedding_service: EmbeddingService,
+    limiter: ProviderRateLimiter,
+    texts: list[str],
+) -> list[list[float]]:
+    """Embed one batch with rate limiting and retry/backoff (MEDIUM-4, MEDIUM-5)."""
+    attempt = 0
+    while True:
+        await limiter.acquire()
+        try:
+            result = await embedding_service.embed_texts(texts)
+            if len(result.embeddings) != len(texts):
+                raise EmbeddingError(
+                    f"Expected {len(texts)} embeddings, got {len(result.embeddings)}"
+                )
+            return result.embeddings
+        except Exception as e:
+            attempt += 1
+            if attempt >= RETRY_CONFIG["max_attempts"]:
+                raise
+            wait_time = RETRY_CONFIG["backoff_factor"] ** (attempt - 1)
+            if _is_rate_limited(e):
+                limiter.penalize(wait_time)
+            logger.warning(
+                "reembedding_batch_retry",
+                attempt=attempt,
+                wait_seconds=wait_time,
+                error=str(e),
+            )
+            await asyncio.sleep(wait_time)
 
-    texts = [chunk.content for chunk in chunks]
-    embedding_result = await embedding_service.embed_texts(texts)
 
-    # Get embedding dimension from the first embedding
-    embedding_dimension = len(embedding_result.embeddings[0]) if embedding_result.embeddings else 0
+def _is_rate_limited(error: Exception) -> bool:
+    if isinstance(error, RateLimitError):
+        return True
+    return isinstance(error, APIError) and error.code == ErrorCode.EMBEDDING_RATE_LIMITED
 
-    for chunk, embedding in zip(chunks, embedding_result.embeddings):
-        # Store as JSONB for flexible dimension support (Story 8-11)
-        chunk.embedding = embedding
-        chunk.embedding_dimension = embedding_dimension
 
+def _percent(done: int, total: int) -> int:
+    return min(100, done * 100 // total) if total else 100
+
+
+async def _cut_over(
+    db: AsyncSession,
+    merchant_id: int,
+    job_id: int,
+    target: EmbeddingTarget,
+) -> bool:
+    """Swap staged embeddings into serving in a single transaction.
+
+    Returns False (nothing changed) if some job chunk has no staged embedding,
+    e.g. because its document was re-processed while the job ran.
+
+    Raises:
+        JobSupersededError: If the job is no longer running
+    """
+    status = await db.scalar(
+        select(ReembeddingJob.status).where(ReembeddingJob.id == job_id).with_for_update()
+    )
+    if status != ReembeddingJobStatus.RUNNING.value:
+        raise JobSupersededError(job_id)
+
+    missing = await db.scalar(
+        select(func.count())
+        .select_from(DocumentChunk)
+        .join(KnowledgeDocument, KnowledgeDocument.id == DocumentChunk.document_id)
+        .outerjoin(
+            StagedChunkEmbedding,
+            and_(
+                StagedChunkEmbedding.job_id == job_id,
+                StagedChunkEmbedding.chunk_id == DocumentChunk.id,
+            ),
+        )
+        .where(
+            KnowledgeDocument.merchant_id == merchant_id,
+            KnowledgeDocument.re_embedding_status.in_(JOB_DOCUMENT_STATUSES),
+            StagedChunkEmbedding.chunk_id.is_(None),
+        )
+    )
+    if missing:
+        await db.rollback()
+        return False
+
+    dimension = await db.scalar(
+        select(func.jsonb_array_length(StagedChunkEmbedding.embedding))
+        .where(StagedChunkEmbedding.job_id == job_id)
+        .limit(1)
+    )
+    dimension = dimension or EMBEDDING_DIMENSIONS.get(target.provider, 1536)
+
+    # Same JSONB -> pgvector cast as migration 036; only the column matching
+    # the new dimension is populated
+    vector_assignments = ",\n".join(
+        f"{column} = (s.embedding::text)::{vector_type}({column_dimension})"
+        if column_dimension == dimension
+        else f"{column} = NULL"
+        for column_dimension, (column, vector_type) in VECTOR_COLUMNS.items()
+    )
+    await db.execute(
+        text(
+            f"""
+            UPDATE document_chunks AS c
+            SET embedding = s.embedding,
+                embedding_dimension = :dimension,
+                {vector_assignments}
+            FROM staged_chunk_embeddings AS s
+            WHERE s.job_id = :job_id
+              AND c.id = s.chunk_id
+            """
+        ),
+        {"job_id": job_id, "dimension": dimension},
+    )
+    await db.execute(
+        update(KnowledgeDocument)
+        .where(
+            KnowledgeDocument.merchant_id == merchant_id,
+            KnowledgeDocument.re_embedding_status.in_(JOB_DOCUMENT_STATUSES),
+        )
+        .values(
+            embedding_version=target.version,
+            re_embedding_status="completed",
+            re_embedding_progress=100,
+        )
+    )
+    await db.execute(
+        update(Merchant)
+        .where(Merchant.id == merchant_id)
+        .values(
+            embedding_provider=target.provider,
+            embedding_model=target.model,
+            embedding_dimension=dimension,
+        )
+    )
+    await db.execute(delete(StagedChunkEmbedding).where(StagedChunkEmbedding.job_id == job_id))
+    await db.execute(
+        update(ReembeddingJob)
+        .where(ReembeddingJob.id == job_id)
+        .values(
+            status=ReembeddingJobStatus.COMPLETED.value,
+            processed_chunks=ReembeddingJob.total_chunks,
+            completed_at=datetime.now(UTC),
+        )
+    )
     await db.commit()
+    return True
 
-    logger.info(
-        "reembedding_chunks_complete",
-        document_id=document.id,
-        chunks_embedded=len(chunks),
-        embedding_dimension=embedding_dimension,
+
+async def _fail_job(db: AsyncSession, job_id: int, error_message: str) -> None:
+    """Mark a job failed; staged embeddings are kept so a re-trigger resumes."""
+    await db.execute(
+        update(ReembeddingJob)
+        .where(ReembeddingJob.id == job_id)
+        .values(status=ReembeddingJobStatus.FAILED.value, error_message=error_message)
     )
+    await db.commit()
 
 
-def _create_embedding_service(
-    provider: str,
-    model: str,
-    api_key: str | None,
-) -> EmbeddingService:
-    """Create embedding service for the provider.
+def _target_version(provider: str, model: str | None) -> str:
+    return f"{provider}-{model or EMBEDDING_MODELS.get(provider, EMBEDDING_MODELS['openai'])}"
 
-    Args:
-        provider: Embedding provider
-        model: Embedding model
-        api_key: API key
 
-    Returns:
-        EmbeddingService instance
-    """
-    if provider == "gemini":
-        gemini_provider = GeminiEmbeddingProvider(
-            api_key=api_key or "",
-            model=model,
+def _is_running_elsewhere(job: ReembeddingJob) -> bool:
+    """Whether a running job still has a fresh heartbeat (owned by another worker)."""
+    if job.status != ReembeddingJobStatus.RUNNING.value or job.updated_at is None:
+        return False
+    stale_seconds = settings().get("REEMBEDDING_STALE_SECONDS", DEFAULT_STALE_SECONDS)
+    return datetime.now(UTC) - job.updated_at < timedelta(seconds=stale_seconds)
+
+
+async def _supersede_other_jobs(db: AsyncSession, merchant_id: int, target_version: str) -> None:
+    """Mark the merchant's running job superseded unless it already has this target."""
+    await db.execute(
+        update(ReembeddingJob)
+        .where(
+            ReembeddingJob.merchant_id == merchant_id,
+            ReembeddingJob.status == ReembeddingJobStatus.RUNNING.value,
+            ReembeddingJob.target_version != target_version,
         )
+        .values(status=ReembeddingJobStatus.SUPERSEDED.value)
+    )
+    await db.commit()
 
-        class GeminiServiceAdapter:
-            """Adapter to make GeminiProvider work like EmbeddingService."""
 
-            def __init__(self, provider: GeminiEmbeddingProvider):
-                self._provider = provider
-                self.dimension = provider.DIMENSION
+async def _get_unfinished_job(db: AsyncSession, merchant_id: int) -> ReembeddingJob | None:
+    """Get the merchant's latest running or failed job."""
+    result = await db.execute(
+        select(ReembeddingJob)
+        .where(
+            ReembeddingJob.merchant_id == merchant_id,
+            ReembeddingJob.status.in_(
+                [ReembeddingJobStatus.RUNNING.value, ReembeddingJobStatus.FAILED.value]
+            ),
+        )
+        .order_by(ReembeddingJob.id.desc())
+        .limit(1)
+    )
+    return result.scalars().first()
 
-            async def embed_texts(self, texts: list[str]):
-                return await self._provider.embed_texts(texts)
 
-            async def embed_query(self, query: str) -> list[float]:
-                return await self._provider.embed_query(query)
+async def _start_job(
+    db: AsyncSession,
+    merchant_id: int,
+    target: EmbeddingTarget,
+    job: ReembeddingJob | None,
+) -> ReembeddingJob:
+    """Resume `job` if it has the same target, otherwise start a new job.
 
-            def get_dimension(self) -> int:
-                return self._provider.get_dimension()
+    A job for a different target is superseded and its staged embeddings are
+    dropped.
+    """
+    if job is not None and job.target_version != target.version:
+        await db.execute(delete(StagedChunkEmbedding).where(StagedChunkEmbedding.job_id == job.id))
+        job.status = ReembeddingJobStatus.SUPERSEDED.value
+        job = None
+
+    if job is None:
+        job = ReembeddingJob(
+            merchant_id=merchant_id,
+            target_provider=target.provider,
+            target_model=target.model,
+            target_version=target.version,
+        )
+        db.add(job)
+        await db.flush()
+
+    document_ids = select(KnowledgeDocument.id).where(
+        KnowledgeDocument.merchant_id == merchant_id,
+        KnowledgeDocument.re_embedding_status.in_(JOB_DOCUMENT_STATUSES),
+    )
+    job.status = ReembeddingJobStatus.RUNNING.value
+    job.error_message = None
+    job.chunks_per_second = None
+    job.total_chunks = await db.scalar(
+        select(func.count()).where(DocumentChunk.document_id.in_(document_ids))
+    )
+    job.processed_chunks = await db.scalar(
+        select(func.count()).where(StagedChunkEmbedding.job_id == job.id)
+    )
+    await db.commit()
+    return job
 
-            async def close(self):
-                pass
 
-        return GeminiServiceAdapter(gemini_provider)
+def _resolve_target(
+    merchant: Merchant,
+    provider: str | None = None,
+    model: str | None = None,
+) -> EmbeddingTarget:
+    """Resolve the job target and credentials.
 
-    return EmbeddingService(
+    Without an explicit provider the target follows the merchant's LLM
+    provider (same mapping as processing_task.py).
+    """
+    llm_config = merchant.llm_configuration
+    api_key = None
+    if llm_config and llm_config.api_key_encrypted:
+        from app.core.security import decrypt_access_token
+
+        api_key = decrypt_access_token(llm_config.api_key_encrypted)
+    ollama_url = llm_config.ollama_url if llm_config else None
+
+    if provider is None:
+        # Default to LLM provider if embedding provider not explicitly configured
+        provider = llm_config.provider if llm_config else "ollama"
+        if provider == "anthropic":
+            # Anthropic doesn't support embeddings - fallback to OpenAI with env key
+            logger.info(
+                "reembedding_anthropic_fallback",
+                merchant_id=merchant.id,
+                fallback_provider="openai",
+            )
+            provider = "openai"
+            api_key = settings().get("OPENAI_API_KEY")
+        elif provider not in EMBEDDING_MODELS:
+            # Unknown provider - use database values as-is
+            provider = merchant.embedding_provider or "openai"
+            model = merchant.embedding_model
+
+    if provider == "ollama":
+        api_key = None  # Ollama doesn't need API key
+    return EmbeddingTarget(
         provider=provider,
+        model=model or EMBEDDING_MODELS.get(provider, EMBEDDING_MODELS["openai"]),
         api_key=api_key,
-        model=model,
+        ollama_url=ollama_url,
+    )
+
+
+async def _get_merchant_with_config(db: AsyncSession, merchant_id: int) -> Merchant | None:
+    """Get merchant with LLM configuration."""
+    from sqlalchemy.orm import selectinload
+
+    result = await db.execute(
+        select(Merchant)
+        .options(selectinload(Merchant.llm_configuration))
+        .where(Merchant.id == merchant_id)
     )
+    return result.scalars().first()
+
+
+async def _get_queued_documents(db: AsyncSession, merchant_id: int) -> list[KnowledgeDocument]:
+    """Get all documents queued for (or part way through) re-embedding."""
+    result = await db.execute(
+        select(KnowledgeDocument)
+        .where(
+            KnowledgeDocument.merchant_id == merchant_id,
+            KnowledgeDocument.re_embedding_status.in_(JOB_DOCUMENT_STATUSES),
+        )
+        .order_by(KnowledgeDocument.created_at)
+    )
+    return list(result.scalars().all())
+
+
+def _spawn(coro: Coroutine[Any, Any, None]) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def resume_stalled_reembedding_jobs() -> int:
+    """Resume running jobs whose heartbeat is older than REEMBEDDING_STALE_SECONDS.
+
+    Jobs are claimed by refreshing their heartbeat in the same UPDATE, so only
+    one worker resumes a given job.
+
+    Returns:
+        Number of jobs resumed
+    """
+    stale_seconds = settings().get("REEMBEDDING_STALE_SECONDS", DEFAULT_STALE_SECONDS)
+    now = datetime.now(UTC)
+
+    async with async_session()() as db:
+        result = await db.execute(
+            update(ReembeddingJob)
+            .where(
+                ReembeddingJob.status == ReembeddingJobStatus.RUNNING.value,
+                ReembeddingJob.updated_at < now - timedelta(seconds=stale_seconds),
+            )
+            .values(updated_at=now)
+            .returning(ReembeddingJob.merchant_id)
+        )
+        merchant_ids = list(result.scalars().all())
+        await db.commit()
+
+    for merchant_id in merchant_ids:
+        logger.info("reembedding_job_resumed", merchant_id=merchant_id)
+        _spawn(reembed_all_documents(merchant_id, resumed=True))
+
+    return len(merchant_ids)
 
 
 async def trigger_reembedding_for_merchant(
@@ -335,6 +831,6 @@ async def trigger_reembedding_for_merchant(
     )
 
     if doc_count > 0:
-        asyncio.create_task(reembed_all_documents(merchant_id))
+        _spawn(reembed_all_documents(merchant_id))
 
     return doc_count
@@ -3,6 +3,17 @@
 Implements vector similarity search using pgvector's cosine distance operator.
 Returns top-k most relevant chunks with similarity scores.
 
+Distance, threshold and top-k run in SQL against the native vector column for
+the query's dimension (HNSW-indexed). Dimensions without a native column, or
+deployments with RAG_SEARCH_ENGINE=memory, use the in-process embedding matrix
+cache instead.
+
+Hybrid mode (RAG_RETRIEVAL_MODE=hybrid) adds a full-text candidate list from
+the GIN-indexed content_tsv column and fuses both rankings with reciprocal
+rank fusion in the same SQL statement. Exact terms (product names, SKUs,
+policy terms, locations) lift chunks the embedding ranks low, which lets the
+similarity threshold stay high; every fused result still has to clear it.
+
 Story 8-4: Backend - RAG Service (Document Processing)
 """
 
@@ -14,13 +25,19 @@ from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
-import numpy as np
 import structlog
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.errors import APIError, ErrorCode
+from app.core.tracing import span
+from app.models.knowledge_base import VECTOR_COLUMNS
 from app.models.rag_query_log import RAGQueryLog
+from app.services.rag.embedding_matrix_cache import (
+    EmbeddingMatrix,
+    get_embedding_matrix_cache,
+)
 from app.services.rag.embedding_service import EmbeddingService
 
 logger = structlog.get_logger(__name__)
@@ -49,6 +66,7 @@ class RetrievalService:
 
     Features:
     - Vector similarity search using pgvector's cosine distance
+    - Hybrid mode: full-text rank fused with vector rank (RRF)
     - Configurable similarity threshold (default 0.7)
     - Multi-tenant isolation (merchant_id filtering)
     - Timeout handling with graceful degradation
@@ -63,12 +81,21 @@ class RetrievalService:
     TOP_K_DEFAULT = 7  # Default number of chunks to retrieve (increased from 5 for better context)
     RETRIEVAL_TIMEOUT_MS = 500  # Timeout for retrieval
 
+    # Hybrid mode: full-text matches recover exact-term queries, so the vector
+    # threshold can go back up and fewer chunks are needed. Full-text matches
+    # keep the vector-mode floor, so hybrid recall never drops below it.
+    HYBRID_SIMILARITY_THRESHOLD = 0.4
+    HYBRID_TOP_K = 5
+    HYBRID_CANDIDATES_PER_TOP_K = 4  # Candidates taken from each ranking per result
+    RRF_K = 60  # Reciprocal rank fusion constant: score = sum(1 / (RRF_K + rank))
+
     def __init__(
         self,
         session_factory: SessionFactory,
         embedding_service: EmbeddingService,
         similarity_threshold: float = SIMILARITY_THRESHOLD,
         top_k: int = TOP_K_DEFAULT,
+        mode: str | None = None,
     ):
         """Initialize retrieval service.
 
@@ -77,11 +104,18 @@ class RetrievalService:
             embedding_service: Service for generating query embeddings
             similarity_threshold: Minimum similarity score (0.0-1.0)
             top_k: Number of chunks to retrieve
+            mode: "hybrid" or "vector" (defaults to RAG_RETRIEVAL_MODE)
         """
         self.session_factory = session_factory
         self.embedding_service = embedding_service
         self.similarity_threshold = similarity_threshold
         self.top_k = top_k
+        self.mode = mode or settings().get("RAG_RETRIEVAL_MODE", "hybrid")
+
+    @property
+    def is_hybrid(self) -> bool:
+        """Whether full-text rank is fused with vector similarity."""
+        return self.mode == "hybrid"
 
     async def retrieve_relevant_chunks(
         self,
@@ -118,10 +152,11 @@ class RetrievalService:
             # Generate query embedding with timeout
             # Note: Cloud providers like Gemini can take >1s for embedding
             try:
-                query_embedding = await asyncio.wait_for(
-                    self.embedding_service.embed_query(query),
-                    timeout=5.0,  # 5s for embedding (cloud providers can be slow)
-                )
+                with span("retrieval.embed_query"):
+                    query_embedding = await asyncio.wait_for(
+                        self.embedding_service.embed_query(query),
+                        timeout=5.0,  # 5s for embedding (cloud providers can be slow)
+                    )
             except TimeoutError:
                 logger.warning(
                     "retrieval_embedding_timeout",
@@ -132,6 +167,7 @@ class RetrievalService:
 
             # Format embedding for pgvector
             embedding_str = self._format_embedding(query_embedding)
+            embedding_dimension = len(query_embedding)
 
             # Create fresh database session for this retrieval
             # This prevents greenlet errors from session reuse
@@ -145,6 +181,7 @@ class RetrievalService:
                         db=db,
                         merchant_id=merchant_id,
                         embedding_str=embedding_str,
+                        embedding_dimension=embedding_dimension,
                         threshold=threshold,
                         top_k=top_k,
                         embedding_version=embedding_version,
@@ -157,6 +194,7 @@ class RetrievalService:
                     db=db,
                     merchant_id=merchant_id,
                     embedding_str=embedding_str,
+                    embedding_dimension=embedding_dimension,
                     threshold=threshold,
                     top_k=top_k,
                     embedding_version=embedding_version,
@@ -178,6 +216,7 @@ class RetrievalService:
         db: AsyncSession,
         merchant_id: int,
         embedding_str: str,
+        embedding_dimension: int,
         threshold: float,
         top_k: int,
         embedding_version: str | None,
@@ -186,17 +225,20 @@ class RetrievalService:
         """Execute similarity search and log results."""
         # Perform vector similarity search with timeout
         try:
-            results = await asyncio.wait_for(
-                self._execute_similarity_search(
-                    db=db,
-                    merchant_id=merchant_id,
-                    embedding_str=embedding_str,
-                    threshold=threshold,
-                    top_k=top_k,
-                    embedding_version=embedding_version,
-                ),
-                timeout=2.0,  # 2s for search (Python-based similarity computation)
-            )
+            with span("retrieval.search"):
+                results = await asyncio.wait_for(
+                    self._execute_similarity_search(
+                        db=db,
+                        merchant_id=merchant_id,
+                        embedding_str=embedding_str,
+                        embedding_dimension=embedding_dimension,
+                        threshold=threshold,
+                        top_k=top_k,
+                        embedding_version=embedding_version,
+                        query=query,
+                    ),
+                    timeout=2.0,  # 2s for search (covers the Python fallback path)
+                )
         except TimeoutError:
             logger.warning(
                 "retrieval_search_timeout",
@@ -217,12 +259,13 @@ class RetrievalService:
             top_k=top_k,
         )
 
-        await self._log_query(
-            db=db,
-            merchant_id=merchant_id,
-            query=query,
-            results=results,
-        )
+        with span("retrieval.log_query"):
+            await self._log_query(
+                db=db,
+                merchant_id=merchant_id,
+                query=query,
+                results=results,
+            )
 
         return results
 
@@ -234,12 +277,16 @@ class RetrievalService:
         threshold: float,
         top_k: int,
         embedding_version: str | None = None,
+        embedding_dimension: int | None = None,
+        query: str | None = None,
     ) -> list[RetrievedChunk]:
         """Execute pgvector similarity search query.
 
-        Uses raw asyncpg connection with pgvector for proper vector operations.
-
-        Handles double-encoded JSONB embeddings (stored as JSON strings).
+        Orders by the `<=>` cosine distance on the native vector column for the
+        query's dimension, so the HNSW index serves the top-k directly (with an
+        iterative scan, see _configure_hnsw_scan). In
+        hybrid mode (with the query text) this is one input of
+        _execute_hybrid_search instead.
 
         Filters by:
         - merchant_id (multi-tenant isolation)
@@ -247,127 +294,310 @@ class RetrievalService:
         - embedding_version (prevents dimension mixing - Story 8-11 AC6)
         - similarity >= threshold
         """
-        # Get candidate chunks using SQLAlchemy (no raw asyncpg needed)
-        # Since embeddings are stored as JSON strings in JSONB, we can't cast directly in SQL
-        # We'll fetch them as text and parse in Python
+        if embedding_dimension is None:
+            embedding_dimension = embedding_str.count(",") + 1
+
+        vector_column = VECTOR_COLUMNS.get(embedding_dimension)
+        if vector_column is None or settings()["RAG_SEARCH_ENGINE"] == "memory":
+            return await self._execute_matrix_similarity_search(
+                db=db,
+                merchant_id=merchant_id,
+                embedding_str=embedding_str,
+                embedding_dimension=embedding_dimension,
+                threshold=threshold,
+                top_k=top_k,
+                embedding_version=embedding_version,
+            )
+
+        if self.is_hybrid and query and query.strip():
+            return await self._execute_hybrid_search(
+                db=db,
+                merchant_id=merchant_id,
+                embedding_str=embedding_str,
+                embedding_dimension=embedding_dimension,
+                threshold=threshold,
+                top_k=top_k,
+                embedding_version=embedding_version,
+                query=query,
+            )
 
-        base_query = """
+        column_name, vector_type = vector_column
+        query_vector = f"CAST(:query_embedding AS {vector_type}({embedding_dimension}))"
+        distance = f"dc.{column_name} <=> {query_vector}"
+
+        search_query = f"""
             SELECT
                 dc.id AS chunk_id,
                 dc.content,
                 dc.chunk_index,
                 kd.filename AS document_name,
                 kd.id AS document_id,
-                dc.embedding::text AS embedding_json,
-                dc.embedding_dimension
+                1 - ({distance}) AS similarity
             FROM document_chunks dc
             JOIN knowledge_documents kd ON dc.document_id = kd.id
             WHERE kd.merchant_id = :merchant_id
               AND kd.status = 'ready'
-              AND dc.embedding IS NOT NULL
-              AND dc.embedding_dimension IS NOT NULL
+              AND dc.{column_name} IS NOT NULL
+              AND {distance} <= :max_distance
         """
 
-        params = {"merchant_id": merchant_id}
+        params: dict[str, Any] = {
+            "merchant_id": merchant_id,
+            "query_embedding": embedding_str,
+            "max_distance": 1 - threshold,
+            "top_k": top_k,
+        }
 
         if embedding_version:
-            base_query += "\n              AND kd.embedding_version = :embedding_version"
+            search_query += "\n              AND kd.embedding_version = :embedding_version"
             params["embedding_version"] = embedding_version
 
-        # Execute query using SQLAlchemy
+        search_query += f"\n            ORDER BY {distance}\n            LIMIT :top_k"
+
+        await self._configure_hnsw_scan(db, top_k)
+        result = await db.execute(text(search_query), params)
+        # A relaxed-order iterative scan can return near-ties slightly out of order
+        rows = sorted(result.fetchall(), key=lambda row: row.similarity, reverse=True)
+
         logger.debug(
-            "retrieval_executing_query", merchant_id=merchant_id, query=base_query, params=params
+            "retrieval_query_executed",
+            merchant_id=merchant_id,
+            row_count=len(rows),
+            vector_column=column_name,
         )
-        result = await db.execute(text(base_query), params)
+
+        return [
+            RetrievedChunk(
+                chunk_id=row.chunk_id,
+                content=row.content,
+                chunk_index=row.chunk_index,
+                document_name=row.document_name,
+                document_id=row.document_id,
+                similarity=float(row.similarity),
+            )
+            for row in rows
+        ]
+
+    async def _configure_hnsw_scan(self, db: AsyncSession, limit: int) -> None:
+        """Size the HNSW scan for this transaction's merchant-filtered query.
+
+        The index walks all merchants' chunks and the merchant/status/version
+        filters run on its output, so with a plain scan a small tenant in a
+        large shared index gets fewer than `limit` rows, or none. ef_search is
+        raised to at least `limit`, and the iterative scan keeps walking the
+        graph until enough rows pass the filters. set_config(..., true) scopes
+        both to the current transaction (SET LOCAL).
+        """
+        config = settings()
+        params = {
+            "ef_search": str(min(max(config.get("RAG_HNSW_EF_SEARCH", 100), limit), 1000)),
+        }
+        statement = "SELECT set_config('hnsw.ef_search', :ef_search, true)"
+        iterative_scan = config.get("RAG_HNSW_ITERATIVE_SCAN", "relaxed_order")
+        if iterative_scan != "off":
+            statement += ", set_config('hnsw.iterative_scan', :iterative_scan, true)"
+            params["iterative_scan"] = iterative_scan
+        await db.execute(text(statement), params)
+
+    async def _execute_hybrid_search(
+        self,
+        db: AsyncSession,
+        merchant_id: int,
+        embedding_str: str,
+        embedding_dimension: int,
+        threshold: float,
+        top_k: int,
+        embedding_version: str | None,
+        query: str,
+    ) -> list[RetrievedChunk]:
+        """Fuse full-text and vector rankings with reciprocal rank fusion.
+
+        One statement with two candidate lists:
+        - semantic: nearest chunks by `<=>` (HNSW) with similarity >= threshold
+        - lexical: chunks whose content_tsv matches any content word of the
+          query (GIN) and whose similarity >= min(threshold,
+          SIMILARITY_THRESHOLD), ranked by ts_rank_cd with document length
+          normalization
+
+        Each chunk scores sum(1 / (RRF_K + rank)) over the lists it appears in.
+        Both lists are bounded by a similarity floor, so a weak chunk that only
+        shares a word with the query is never returned, while an exact-term
+        match that vector mode would return is kept; `similarity` is the
+        cosine similarity of every returned chunk.
+        """
+        column_name, vector_type = VECTOR_COLUMNS[embedding_dimension]
+        query_vector = f"CAST(:query_embedding AS {vector_type}({embedding_dimension}))"
+        distance = f"dc.{column_name} <=> {query_vector}"
+
+        filters = f"""kd.merchant_id = :merchant_id
+                      AND kd.status = 'ready'
+                      AND dc.{column_name} IS NOT NULL"""
+        params: dict[str, Any] = {
+            "merchant_id": merchant_id,
+            "query_embedding": embedding_str,
+            "query_text": query[:1000],
+            "max_distance": 1 - threshold,
+            "lexical_max_distance": 1 - min(threshold, self.SIMILARITY_THRESHOLD),
+            "candidates": top_k * self.HYBRID_CANDIDATES_PER_TOP_K,
+            "rrf_k": settings().get("RAG_HYBRID_RRF_K", self.RRF_K),
+            "top_k": top_k,
+        }
+        if embedding_version:
+            filters += "\n                      AND kd.embedding_version = :embedding_version"
+            params["embedding_version"] = embedding_version
+
+        # plainto_tsquery ANDs the query words; OR them so a question matches
+        # chunks containing any of its (stemmed, stopword-free) terms
+        search_query = f"""
+            WITH tsq AS (
+                SELECT CAST(
+                    replace(CAST(plainto_tsquery('english', :query_text) AS text), ' & ', ' | ')
+                    AS tsquery
+                ) AS q
+            ),
+            semantic AS (
+                SELECT id, row_number() OVER (ORDER BY distance) AS rank
+                FROM (
+                    SELECT dc.id, {distance} AS distance
+                    FROM document_chunks dc
+                    JOIN knowledge_documents kd ON dc.document_id = kd.id
+                    WHERE {filters}
+                      AND {distance} <= :max_distance
+                    ORDER BY {distance}
+                    LIMIT :candidates
+                ) nearest
+            ),
+            lexical AS (
+                SELECT id, row_number() OVER (ORDER BY text_rank DESC) AS rank
+                FROM (
+                    SELECT dc.id, ts_rank_cd(dc.content_tsv, tsq.q, 1) AS text_rank
+                    FROM document_chunks dc
+                    JOIN knowledge_documents kd ON dc.document_id = kd.id
+                    CROSS JOIN tsq
+                    WHERE {filters}
+                      AND dc.content_tsv @@ tsq.q
+                      AND {distance} <= :lexical_max_distance
+                    ORDER BY text_rank DESC
+                    LIMIT :candidates
+                ) matches
+            ),
+            fused AS (
+                SELECT
+                    COALESCE(s.id, l.id) AS id,
+                    COALESCE(1.0 / (:rrf_k + s.rank), 0)
+                        + COALESCE(1.0 / (:rrf_k + l.rank), 0) AS rrf_score
+                FROM semantic s
+                FULL OUTER JOIN lexical l ON s.id = l.id
+            )
+            SELECT
+                dc.id AS chunk_id,
+                dc.content,
+                dc.chunk_index,
+                kd.filename AS document_name,
+                kd.id AS document_id,
+                1 - ({distance}) AS similarity,
+                fused.rrf_score
+            FROM fused
+            JOIN document_chunks dc ON dc.id = fused.id
+            JOIN knowledge_documents kd ON dc.document_id = kd.id
+            ORDER BY fused.rrf_score DESC, {distance}
+            LIMIT :top_k
+        """
+
+        await self._configure_hnsw_scan(db, params["candidates"])
+        result = await db.execute(text(search_query), params)
         rows = result.fetchall()
 
-        logger.debug("retrieval_query_executed", merchant_id=merchant_id, row_count=len(rows))
+        logger.debug(
+            "retrieval_hybrid_query_executed",
+            merchant_id=merchant_id,
+            row_count=len(rows),
+            vector_column=column_name,
+        )
+
+        return [
+            RetrievedChunk(
+                chunk_id=row.chunk_id,
+                content=row.content,
+                chunk_index=row.chunk_index,
+                document_name=row.document_name,
+                document_id=row.document_id,
+                similarity=float(row.similarity),
+            )
+            for row in rows
+        ]
+
+    async def _execute_matrix_similarity_search(
+        self,
+        db: AsyncSession,
+        merchant_id: int,
+        embedding_str: str,
+        embedding_dimension: int,
+        threshold: float,
+        top_k: int,
+        embedding_version: str | None = None,
+    ) -> list[RetrievedChunk]:
+        """Search the merchant's cached in-process embedding matrix.
+
+        Used when pgvector search is disabled (RAG_SEARCH_ENGINE=memory) or the
+        dimension has no native vector column. On a cache miss, the merchant's
+        JSONB embeddings are loaded once (legacy double-encoded rows included)
+        and kept as a normalized float32 matrix.
+        """
+        cache = get_embedding_matrix_cache()
+        matrix = cache.get(merchant_id, embedding_version, embedding_dimension)
+
+        if matrix is None:
+            base_query = """
+                SELECT
+                    dc.id AS chunk_id,
+                    dc.content,
+                    dc.chunk_index,
+                    kd.filename AS document_name,
+                    kd.id AS document_id,
+                    dc.embedding #>> '{}' AS embedding_json
+                FROM document_chunks dc
+                JOIN knowledge_documents kd ON dc.document_id = kd.id
+                WHERE kd.merchant_id = :merchant_id
+                  AND kd.status = 'ready'
+                  AND dc.embedding IS NOT NULL
+                  AND dc.embedding_dimension = :embedding_dimension
+            """
 
-        logger.debug("retrieval_query_executed", merchant_id=merchant_id, row_count=len(rows))
+            params: dict[str, Any] = {
+                "merchant_id": merchant_id,
+                "embedding_dimension": embedding_dimension,
+            }
 
-        # Parse query embedding to numpy array
-        query_embedding_np = np.array(json.loads(embedding_str), dtype=np.float32)
+            if embedding_version:
+                base_query += "\n                  AND kd.embedding_version = :embedding_version"
+                params["embedding_version"] = embedding_version
 
-        # Compute similarities in Python
-        chunks_with_similarity = []
-        logger.debug("retrieval_rows_fetched", merchant_id=merchant_id, row_count=len(rows))
+            result = await db.execute(text(base_query), params)
+            rows = result.fetchall()
 
-        for row_idx in range(len(rows)):
-            row = rows[row_idx]
-            try:
-                # Parse double-encoded embedding: JSONB contains a JSON string
-                embedding_json = row.embedding_json
-                logger.debug(
-                    "retrieval_parsing_embedding",
-                    chunk_id=row.chunk_id,
-                    embedding_json_length=len(embedding_json) if embedding_json else 0,
-                )
-                # First parse extracts the string from JSONB
-                inner_string = json.loads(embedding_json)
-                logger.debug(
-                    "retrieval_inner_string_parsed",
-                    chunk_id=row.chunk_id,
-                    inner_string_length=len(inner_string),
-                )
-                # Second parse extracts the array from the string
-                embedding_list = json.loads(inner_string)
-
-                # Convert to numpy array
-                stored_embedding = np.array(embedding_list, dtype=np.float32)
-
-                # Compute cosine similarity using pgvector's distance
-                # Cosine distance = 1 - cosine_similarity
-                # We'll compute cosine similarity directly
-                dot_product = np.dot(query_embedding_np, stored_embedding)
-                norm_query = np.linalg.norm(query_embedding_np)
-                norm_stored = np.linalg.norm(stored_embedding)
-
-                if norm_query > 0 and norm_stored > 0:
-                    cosine_similarity = dot_product / (norm_query * norm_stored)
-                else:
-                    cosine_similarity = 0.0
-
-                logger.debug(
-                    "retrieval_similarity_computed",
-                    chunk_id=row.chunk_id,
-                    similarity=cosine_similarity,
-                    threshold=threshold,
-                )
+            # `#>> '{}'` unwraps legacy JSON-string embeddings to the array text
+            matrix = EmbeddingMatrix.from_rows(rows, embedding_dimension)
+            cache.put(merchant_id, embedding_version, embedding_dimension, matrix)
 
-                if cosine_similarity >= threshold:
-                    chunks_with_similarity.append(
-                        {
-                            "chunk_id": row.chunk_id,
-                            "content": row.content,
-                            "chunk_index": row.chunk_index,
-                            "document_name": row.document_name,
-                            "document_id": row.document_id,
-                            "similarity": cosine_similarity,
-                        }
-                    )
-            except (json.JSONDecodeError, ValueError, KeyError) as e:
-                logger.warning("embedding_parse_error", chunk_id=row.chunk_id, error=str(e))
-                continue
-
-        # Sort by similarity (descending) and take top_k
-        chunks_with_similarity.sort(key=lambda x: x["similarity"], reverse=True)
-        chunks_with_similarity = chunks_with_similarity[:top_k]
-
-        # Convert to RetrievedChunk objects
-        chunks = []
-        for item in chunks_with_similarity:
-            chunks.append(
-                RetrievedChunk(
-                    chunk_id=item["chunk_id"],
-                    content=item["content"],
-                    chunk_index=item["chunk_index"],
-                    document_name=item["document_name"],
-                    document_id=item["document_id"],
-                    similarity=item["similarity"],
-                )
+            logger.debug(
+                "retrieval_matrix_built",
+                merchant_id=merchant_id,
+                row_count=len(rows),
+                chunk_count=matrix.size,
             )
 
-        return chunks
+        return [
+            RetrievedChunk(
+                chunk_id=int(matrix.chunk_ids[i]),
+                content=matrix.contents[i],
+                chunk_index=int(matrix.chunk_indexes[i]),
+                document_name=matrix.document_names[i],
+                document_id=int(matrix.document_ids[i]),
+                similarity=similarity,
+            )
+            for i, similarity in matrix.top_k(json.loads(embedding_str), top_k, threshold)
+        ]
 
     def _format_embedding(self, embedding: list[float]) -> str:
         """Format embedding list for pgvector query.
@@ -0,0 +1,282 @@
+"""Merchant-scoped semantic cache of general-mode answers.
+
+Support traffic is dominated by a few hundred paraphrased questions per
+store, and each one costs a full LLM generation. This cache keeps generated
+answers together with the RAG chunks they were grounded on, and serves them
+to later questions whose query embedding is a near neighbour (cosine
+similarity above a high threshold).
+
+Entries live in per-scope buckets keyed by (merchant_id, knowledge-base
+version, embedding version, persona), so answers are never shared across
+merchants, embedding models or personality settings. Each bucket holds one
+L2-normalized float32 matrix, so a lookup is a single matrix-vector product.
+
+The knowledge-base version is a Redis counter bumped whenever a merchant's
+documents or FAQs change, so every worker stops serving stale answers at
+once. Without Redis (or when it is unreachable) a local counter is used.
+
+Redis Keys:
+- rag:kbver:{merchant_id}
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import redis.asyncio as redis
+import structlog
+
+from app.core.config import is_testing, settings
+from app.services.rag.retrieval_service import RetrievedChunk
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_SIMILARITY_THRESHOLD = 0.95
+DEFAULT_MAX_ENTRIES_PER_SCOPE = 500
+DEFAULT_MAX_SCOPES = 1000
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+
+@dataclass(frozen=True)
+class AnswerScope:
+    """Everything besides the question that an answer depends on."""
+
+    merchant_id: int
+    kb_version: int
+    embedding_version: str | None
+    persona: str
+
+
+@dataclass
+class CachedAnswer:
+    """A generated answer and the RAG context it was grounded on."""
+
+    answer: str
+    rag_context: str | None
+    chunks: list[RetrievedChunk]
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class _ScopeBucket:
+    """Normalized question embeddings with parallel answers, oldest first."""
+
+    def __init__(self) -> None:
+        self.matrix: np.ndarray | None = None
+        self.answers: list[CachedAnswer] = []
+
+    def nearest(self, query: np.ndarray) -> tuple[int, float] | None:
+        if self.matrix is None or self.matrix.shape[1] != query.shape[0]:
+            return None
+        scores = self.matrix @ query
+        row = int(np.argmax(scores))
+        return row, float(scores[row])
+
+    def add(self, query: np.ndarray, answer: CachedAnswer, max_entries: int) -> None:
+        if self.matrix is not None and self.matrix.shape[1] != query.shape[0]:
+            self.matrix = None
+            self.answers = []
+        row = query.reshape(1, -1)
+        self.matrix = row if self.matrix is None else np.vstack((self.matrix, row))
+        self.answers.append(answer)
+        overflow = len(self.answers) - max_entries
+        if overflow > 0:
+            self.matrix = np.ascontiguousarray(self.matrix[overflow:])
+            del self.answers[:overflow]
+
+    def drop(self, row: int) -> None:
+        del self.answers[row]
+        self.matrix = np.delete(self.matrix, row, axis=0) if self.answers else None
+
+
+def _normalize(embedding: list[float]) -> np.ndarray | None:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if vector.ndim != 1 or norm == 0:
+        return None
+    return vector / norm
+
+
+class SemanticAnswerCache:
+    """Per-merchant nearest-neighbour answer cache with knowledge-base versioning.
+
+    Features:
+    - Exact scoping: merchant, knowledge-base version, embedding version, persona
+    - Bounded buckets (oldest answers evicted) and LRU over buckets
+    - Entries expire after ``ttl_seconds``
+    - Hit/miss counters via stats()
+    """
+
+    KB_VERSION_KEY_PREFIX = "rag:kbver"
+
+    def __init__(
+        self,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        max_entries_per_scope: int = DEFAULT_MAX_ENTRIES_PER_SCOPE,
+        max_scopes: int = DEFAULT_MAX_SCOPES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        redis_client: redis.Redis | None = None,
+    ) -> None:
+        """Initialize semantic answer cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a hit
+            max_entries_per_scope: Answers kept per merchant scope
+            max_scopes: Scopes kept in process (least recently used evicted)
+            ttl_seconds: Age after which an answer is no longer served
+            redis_client: Optional Redis client holding knowledge-base versions
+        """
+        self.similarity_threshold = similarity_threshold
+        self.max_entries_per_scope = max_entries_per_scope
+        self.max_scopes = max_scopes
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis_client
+        self._buckets: OrderedDict[AnswerScope, _ScopeBucket] = OrderedDict()
+        self._local_versions: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.redis_errors = 0
+
+    async def kb_version(self, merchant_id: int) -> int | None:
+        """Current knowledge-base version of a merchant.
+
+        Returns:
+            Version number, or None when Redis is unreachable (callers then
+            bypass the cache rather than risk serving stale answers)
+        """
+        if self.redis is None:
+            return self._local_versions.get(merchant_id, 0)
+        try:
+            value = await self.redis.get(f"{self.KB_VERSION_KEY_PREFIX}:{merchant_id}")
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("semantic_cache_kb_version_failed", error=str(e))
+            return None
+        return int(value) if value is not None else 0
+
+    def lookup(
+        self, scope: AnswerScope, embedding: list[float]
+    ) -> tuple[CachedAnswer, float] | None:
+        """Return the closest cached answer in scope and its similarity, if above threshold."""
+        query = _normalize(embedding)
+        bucket = self._buckets.get(scope)
+        nearest = bucket.nearest(query) if bucket is not None and query is not None else None
+        if nearest is None or nearest[1] < self.similarity_threshold:
+            self.misses += 1
+            return None
+
+        row, similarity = nearest
+        cached = bucket.answers[row]
+        if time.monotonic() - cached.created_at > self.ttl_seconds:
+            bucket.drop(row)
+            self.misses += 1
+            return None
+
+        self._buckets.move_to_end(scope)
+        self.hits += 1
+        return cached, similarity
+
+    def store(self, scope: AnswerScope, embedding: list[float], answer: CachedAnswer) -> None:
+        """Cache an answer for a question embedding within scope."""
+        query = _normalize(embedding)
+        if query is None or not answer.answer:
+            return
+
+        bucket = self._buckets.get(scope)
+        if bucket is None:
+            # Buckets of older knowledge-base versions can no longer be hit
+            for stale in [
+                s
+                for s in self._buckets
+                if s.merchant_id == scope.merchant_id and s.kb_version < scope.kb_version
+            ]:
+                del self._buckets[stale]
+            bucket = self._buckets[scope] = _ScopeBucket()
+        self._buckets.move_to_end(scope)
+        bucket.add(query, answer, self.max_entries_per_scope)
+        self.stores += 1
+
+        while len(self._buckets) > self.max_scopes:
+            self._buckets.popitem(last=False)
+
+    async def invalidate_merchant(self, merchant_id: int) -> None:
+        """Bump the merchant's knowledge-base version and drop its local answers."""
+        self._local_versions[merchant_id] = self._local_versions.get(merchant_id, 0) + 1
+        for scope in [s for s in self._buckets if s.merchant_id == merchant_id]:
+            del self._buckets[scope]
+
+        if self.redis is not None:
+            try:
+                await self.redis.incr(f"{self.KB_VERSION_KEY_PREFIX}:{merchant_id}")
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning("semantic_cache_kb_version_bump_failed", error=str(e))
+
+    def clear(self) -> None:
+        """Drop all cached answers and reset counters."""
+        self._buckets.clear()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.redis_errors = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and cache size."""
+        lookups = self.hits + self.misses
+        return {
+            "scopes": len(self._buckets),
+            "entries": sum(len(b.answers) for b in self._buckets.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "redis_errors": self.redis_errors,
+            "similarity_threshold": self.similarity_threshold,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_semantic_answer_cache: SemanticAnswerCache | None = None
+
+
+def get_semantic_answer_cache() -> SemanticAnswerCache | None:
+    """Get the process-wide semantic answer cache.
+
+    Returns None when SEMANTIC_CACHE_ENABLED is off, and in IS_TESTING mode
+    (tests inject their own cache). When Redis is disabled or its pool
+    cannot be created, knowledge-base versions are kept in process.
+    """
+    global _semantic_answer_cache
+    config = settings()
+    if is_testing() or not config.get("SEMANTIC_CACHE_ENABLED", True):
+        return None
+    if _semantic_answer_cache is None:
+        from app.core.redis_pool import get_redis
+
+        try:
+            redis_client = get_redis()
+        except Exception as e:
+            logger.warning("semantic_cache_redis_unavailable", error=str(e))
+            redis_client = None
+        _semantic_answer_cache = SemanticAnswerCache(
+            similarity_threshold=config.get(
+                "SEMANTIC_CACHE_SIMILARITY_THRESHOLD", DEFAULT_SIMILARITY_THRESHOLD
+            ),
+            max_entries_per_scope=config.get(
+                "SEMANTIC_CACHE_MAX_ENTRIES_PER_MERCHANT", DEFAULT_MAX_ENTRIES_PER_SCOPE
+            ),
+            ttl_seconds=config.get("SEMANTIC_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+            redis_client=redis_client,
+        )
+    return _semantic_answer_cache
+
+
+async def invalidate_merchant_answers(merchant_id: int) -> None:
+    """Invalidate cached answers after a merchant's documents or FAQs change."""
+    cache = get_semantic_answer_cache()
+    if cache is not None:
+        await cache.invalidate_merchant(merchant_id)
+        logger.debug("semantic_answers_invalidated", merchant_id=merchant_id)
@@ -13,7 +13,7 @@ from typing import Any
 import redis.asyncio as redis
 import structlog
 
-from app.core.config import settings
+from app.core.redis_pool import get_redis
 from app.services.consent import ConsentService
 
 
@@ -51,9 +51,7 @@ class SessionService:
             consent_service: Consent service instance
         """
         if redis_client is None:
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self.redis = redis.from_url(redis_url, decode_responses=True)
+            self.redis = get_redis()
         else:
             self.redis = redis_client
 
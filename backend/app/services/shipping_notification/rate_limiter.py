@@ -10,7 +10,6 @@ Implements:
 
 from __future__ import annotations
 
-import os
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
@@ -60,12 +59,9 @@ class ShippingRateLimiter:
             return self.redis
 
         try:
-            import redis.asyncio as redis
+            from app.core.redis_pool import get_redis
 
-            redis_url = os.getenv("REDIS_URL")
-            if not redis_url:
-                return None
-            self.redis = redis.from_url(redis_url, decode_responses=True)
+            self.redis = get_redis()
             return self.redis
         except Exception as e:
             logger.warning("shipping_rate_limiter_redis_unavailable", error=str(e))
@@ -13,7 +13,7 @@ from decimal import Decimal
 import redis.asyncio as redis
 import structlog
 
-from app.core.config import settings
+from app.core.redis_pool import get_redis
 
 logger = structlog.get_logger(__name__)
 
@@ -46,9 +46,7 @@ class COGSCache:
             redis_client: Optional Redis client instance
         """
         if redis_client is None:
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self.redis = redis.from_url(redis_url, decode_responses=True)
+            self.redis = get_redis()
         else:
             self.redis = redis_client
 
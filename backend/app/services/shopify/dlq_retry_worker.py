@@ -13,7 +13,6 @@ from __future__ import annotations
 
 import asyncio
 import json
-import os
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -34,17 +33,12 @@ class DLQRetryWorker:
 
     def __init__(self) -> None:
         self._running = False
-        self._redis_client = None
 
     def _get_redis_client(self):
-        """Get or create Redis client."""
-        if self._redis_client is None:
-            import redis
+        """Get the shared async Redis client (None if Redis isn't configured)."""
+        from app.core.redis_pool import get_redis
 
-            redis_url = os.getenv("REDIS_URL")
-            if redis_url:
-                self._redis_client = redis.from_url(redis_url, decode_responses=True)
-        return self._redis_client
+        return get_redis()
 
     async def process_dlq_batch(self) -> dict[str, Any]:
         """Process a batch of webhooks from the DLQ.
@@ -60,7 +54,7 @@ class DLQRetryWorker:
         stats = {"processed": 0, "succeeded": 0, "failed": 0, "max_retries": 0}
 
         for _ in range(BATCH_SIZE):
-            result = redis_client.lpop(DLQ_QUEUE_KEY)
+            result = await redis_client.lpop(DLQ_QUEUE_KEY)
             if not result:
                 break
 
@@ -76,7 +70,7 @@ class DLQRetryWorker:
                     continue
 
                 if retry_after > 0:
-                    self._requeue_with_delay(redis_client, retry_data, retry_after)
+                    await self._requeue_with_delay(redis_client, retry_data, retry_after)
                     continue
 
                 success = await self._process_webhook(retry_data)
@@ -85,7 +79,7 @@ class DLQRetryWorker:
                     stats["succeeded"] += 1
                 else:
                     stats["failed"] += 1
-                    self._increment_and_requeue(redis_client, retry_data)
+                    await self._increment_and_requeue(redis_client, retry_data)
 
             except json.JSONDecodeError as e:
                 logger.error("dlq_worker_invalid_json", error=str(e))
@@ -169,13 +163,13 @@ class DLQRetryWorker:
             log.warning("dlq_webhook_retry_failed", error=str(e))
             return False
 
-    def _increment_and_requeue(self, redis_client, retry_data: dict) -> None:
+    async def _increment_and_requeue(self, redis_client, retry_data: dict) -> None:
         """Increment attempt count and requeue webhook."""
         retry_data["attempts"] = retry_data.get("attempts", 0) + 1
         retry_data["last_error"] = retry_data.get("error", "Unknown error")
         retry_data["retried_at"] = datetime.utcnow().isoformat()
 
-        redis_client.rpush(DLQ_QUEUE_KEY, json.dumps(retry_data))
+        await redis_client.rpush(DLQ_QUEUE_KEY, json.dumps(retry_data))
 
         logger.info(
             "dlq_webhook_requeued",
@@ -183,13 +177,13 @@ class DLQRetryWorker:
             attempts=retry_data["attempts"],
         )
 
-    def _requeue_with_delay(self, redis_client, retry_data: dict, delay_seconds: int) -> None:
+    async def _requeue_with_delay(self, redis_client, retry_data: dict, delay_seconds: int) -> None:
         """Requeue webhook to be processed after delay."""
         retry_data["delayed_until"] = (
             datetime.utcnow() + timedelta(seconds=delay_seconds)
         ).isoformat()
 
-        redis_client.rpush(DLQ_QUEUE_KEY, json.dumps(retry_data))
+        await redis_client.rpush(DLQ_QUEUE_KEY, json.dumps(retry_data))
 
         logger.debug(
             "dlq_webhook_delayed",
@@ -207,7 +201,7 @@ class DLQRetryWorker:
             original_error=retry_data.get("error"),
         )
 
-    def get_dlq_size(self) -> int:
+    async def get_dlq_size(self) -> int:
         """Get current DLQ size.
 
         Returns:
@@ -218,17 +212,17 @@ class DLQRetryWorker:
             return -1
 
         try:
-            return redis_client.llen(DLQ_QUEUE_KEY)
+            return await redis_client.llen(DLQ_QUEUE_KEY)
         except Exception:
             return -1
 
-    def get_dlq_metrics(self) -> dict[str, Any]:
+    async def get_dlq_metrics(self) -> dict[str, Any]:
         """Get DLQ metrics for monitoring endpoint.
 
         Returns:
             Dict with dlq_size and health status
         """
-        dlq_size = self.get_dlq_size()
+        dlq_size = await self.get_dlq_size()
 
         return {
             "dlq_size": dlq_size,
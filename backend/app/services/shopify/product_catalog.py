@@ -0,0 +1,712 @@
+"""Local replica of each merchant's Shopify product catalog.
+
+Chat-time product lookups (search, mention detection, pins, recommendations)
+read from this replica instead of calling the Shopify Admin API:
+
+- Postgres (catalog_products / catalog_variants) is the source of truth. A
+  merchant's replica is bootstrapped by a paginated Admin API sync and kept
+  current by products/* and inventory_levels/update webhooks; a daily sync
+  reconciles anything a webhook missed.
+- Each process keeps an in-memory index per merchant. Writes made in this
+  process update it immediately; writes from other processes are picked up
+  by an incremental refresh (rows whose synced_at moved past the index
+  watermark) at most every PRODUCT_CACHE_TTL seconds.
+- Each in-memory index carries a ProductSearchIndex (inverted index with
+  typo tolerance) over its active products, updated with every change.
+
+Index entries use the product dict shape of ShopifyAdminClient.list_products()
+plus "tags" and "variants", so existing callers work unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+import structlog
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import is_testing, settings
+from app.core.database import async_session
+from app.core.security import decrypt_access_token
+from app.models.catalog_product import CatalogProduct, CatalogVariant
+from app.models.shopify_integration import ShopifyIntegration
+from app.services.shopify.product_search_index import ProductSearchIndex
+from app.services.shopify_admin import ShopifyAdminClient
+
+logger = structlog.get_logger(__name__)
+
+SYNC_PAGE_SIZE = 250  # Shopify REST maximum
+INVENTORY_ITEMS_PER_REQUEST = 50  # Shopify limit for inventory_levels.json filters
+# Re-read rows slightly older than the watermark so rows committed late by a
+# slow transaction are not skipped; re-applying a row is idempotent
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+
+def _parse_decimal(value: Any) -> Decimal | None:
+    if value in (None, ""):
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+def _parse_datetime(value: Any) -> datetime | None:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _parse_tags(value: Any) -> list[str]:
+    if isinstance(value, list):
+        return [str(tag).strip() for tag in value if str(tag).strip()]
+    if isinstance(value, str):
+        return [tag.strip() for tag in value.split(",") if tag.strip()]
+    return []
+
+
+def _variant_available(quantity: int | None) -> bool:
+    """Untracked inventory (or overselling allowed) or stock on hand."""
+    return quantity is None or quantity > 0
+
+
+def _variant_values(raw: dict[str, Any], options: list[dict[str, Any]]) -> dict[str, Any]:
+    """Column values for a variant from a Shopify REST variant payload."""
+    selected_options = {}
+    for position, option in enumerate(options[:3], start=1):
+        value = raw.get(f"option{position}")
+        if value is not None:
+            selected_options[option.get("name") or f"Option{position}"] = value
+
+    quantity = raw.get("inventory_quantity")
+    inventory_item_id = raw.get("inventory_item_id")
+    return {
+        "variant_id": str(raw.get("id")),
+        "inventory_item_id": str(inventory_item_id) if inventory_item_id else None,
+        "title": raw.get("title") or "",
+        "price": _parse_decimal(raw.get("price")),
+        "position": raw.get("position") or 0,
+        "selected_options": selected_options,
+        "inventory_quantity": int(quantity) if quantity is not None else None,
+        "inventory_policy": raw.get("inventory_policy"),
+    }
+
+
+def parse_product_payload(payload: dict[str, Any]) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Split a Shopify REST product (webhook body or products.json item) into column values.
+
+    Returns:
+        Tuple of (product column values, list of variant column values)
+    """
+    images = payload.get("images") or []
+    image = payload.get("image") or (images[0] if images else None)
+    options = payload.get("options") or []
+    variants = [_variant_values(v, options) for v in payload.get("variants") or []]
+    variants.sort(key=lambda v: v["position"])
+
+    product = {
+        "product_id": str(payload.get("id")),
+        "title": (payload.get("title") or "")[:255],
+        "description": payload.get("body_html") or "",
+        "product_type": payload.get("product_type") or "",
+        "vendor": payload.get("vendor") or "",
+        "tags": _parse_tags(payload.get("tags")),
+        "status": payload.get("status") or "active",
+        "image_url": image.get("src") if image else None,
+        "price": variants[0]["price"] if variants else None,
+        "shopify_updated_at": _parse_datetime(payload.get("updated_at")),
+    }
+    return product, variants
+
+
+def _format_price(value: Decimal | None) -> str | None:
+    return f"{value:.2f}" if value is not None else None
+
+
+def _to_entry(product: CatalogProduct) -> dict[str, Any]:
+    """Index entry in the list_products() dict shape."""
+    variants = [
+        {
+            "id": variant.variant_id,
+            "title": variant.title,
+            "price": _format_price(variant.price),
+            "inventory_quantity": variant.inventory_quantity,
+            "available": _variant_available(variant.inventory_quantity),
+            "selected_options": dict(variant.selected_options or {}),
+        }
+        for variant in product.variants
+    ]
+    tracked = [v["inventory_quantity"] for v in variants if v["inventory_quantity"] is not None]
+    return {
+        "id": product.product_id,
+        "title": product.title,
+        "description": product.description or "",
+        "image_url": product.image_url,
+        "price": _format_price(product.price),
+        "available": any(v["available"] for v in variants) if variants else True,
+        "inventory_quantity": sum(tracked),
+        "variant_id": variants[0]["id"] if variants else None,
+        "vendor": product.vendor,
+        "product_type": product.product_type,
+        "status": product.status,
+        "tags": list(product.tags or []),
+        "variants": variants,
+    }
+
+
+@dataclass
+class _MerchantIndex:
+    """In-memory catalog of one merchant."""
+
+    products: dict[str, dict[str, Any]] = field(default_factory=dict)
+    search: ProductSearchIndex = field(default_factory=ProductSearchIndex)
+    watermark: datetime | None = None
+    refreshed_at: float = 0.0
+
+
+class ProductCatalog:
+    """Per-merchant product catalog backed by Postgres with an in-memory index.
+
+    Features:
+    - Reads never call Shopify; None means the merchant isn't bootstrapped yet
+    - Paginated bulk sync with tombstoning of products Shopify no longer has
+    - Incremental webhook upserts that ignore out-of-order deliveries
+    - Per-location inventory tracking from inventory_levels/update
+    """
+
+    def __init__(self, refresh_seconds: float | None = None) -> None:
+        """Initialize catalog.
+
+        Args:
+            refresh_seconds: Max age of an in-memory index before it pulls
+                changes from Postgres (defaults to PRODUCT_CACHE_TTL)
+        """
+        self.refresh_seconds = (
+            refresh_seconds
+            if refresh_seconds is not None
+            else settings().get("PRODUCT_CACHE_TTL", 300)
+        )
+        self._indexes: dict[int, _MerchantIndex] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self._syncs: dict[int, asyncio.Task[Any]] = {}
+
+    # Reads
+
+    async def get_products(
+        self,
+        db: AsyncSession,
+        merchant_id: int,
+        status_filter: str | None = "active",
+    ) -> list[dict[str, Any]] | None:
+        """List a merchant's products.
+
+        Args:
+            db: Database session
+            merchant_id: Merchant ID
+            status_filter: Product status to keep; None returns all statuses
+
+        Returns:
+            Product dicts, or None if the catalog hasn't been synced yet
+        """
+        index = await self._get_index(db, merchant_id)
+        if index is None:
+            return None
+        return [
+            product
+            for product in index.products.values()
+            if status_filter is None or product["status"] == status_filter
+        ]
+
+    async def get_product(
+        self, db: AsyncSession, merchant_id: int, product_id: str
+    ) -> dict[str, Any] | None:
+        """Get one product by Shopify ID (None if unknown or not synced)."""
+        index = await self._get_index(db, merchant_id)
+        if index is None:
+            return None
+        return index.products.get(str(product_id))
+
+    async def get_search_index(
+        self, db: AsyncSession, merchant_id: int
+    ) -> ProductSearchIndex | None:
+        """Get the merchant's search index with current pinned boosts.
+
+        Pinned orders are reloaded from product pins when older than the
+        refresh interval or after invalidate_pins().
+
+        Returns:
+            Search index, or None if the catalog hasn't been synced yet
+        """
+        index = await self._get_index(db, merchant_id)
+        if index is None:
+            return None
+
+        search = index.search
+        now = time.monotonic()
+        loaded_at = search.pins_loaded_at
+        if loaded_at is None or now - loaded_at >= self.refresh_seconds:
+            from app.services.product_pin_service import get_pinned_product_orders
+
+            try:
+                search.set_pins(await get_pinned_product_orders(db, merchant_id), loaded_at=now)
+            except Exception as e:
+                logger.warning(
+                    "product_search_pins_load_failed", merchant_id=merchant_id, error=str(e)
+                )
+        return search
+
+    def invalidate_pins(self, merchant_id: int) -> None:
+        """Reload pinned boosts on the next search (called after pin changes)."""
+        index = self._indexes.get(merchant_id)
+        if index is not None:
+            index.search.pins_loaded_at = None
+
+    async def is_synced(self, db: AsyncSession, merchant_id: int) -> bool:
+        """Whether the merchant's catalog has completed a full sync."""
+        return await self._get_index(db, merchant_id) is not None
+
+    async def _get_index(self, db: AsyncSession, merchant_id: int) -> _MerchantIndex | None:
+        index = self._indexes.get(merchant_id)
+        if index is not None and time.monotonic() - index.refreshed_at < self.refresh_seconds:
+            return index
+
+        lock = self._locks.setdefault(merchant_id, asyncio.Lock())
+        async with lock:
+            index = self._indexes.get(merchant_id)
+            if index is not None and time.monotonic() - index.refreshed_at < self.refresh_seconds:
+                return index
+
+            if index is None:
+                synced_at = await db.scalar(
+                    select(ShopifyIntegration.catalog_synced_at).where(
+                        ShopifyIntegration.merchant_id == merchant_id
+                    )
+                )
+                if synced_at is None:
+                    return None
+                index = _MerchantIndex()
+
+            await self._refresh(db, merchant_id, index)
+            self._indexes[merchant_id] = index
+            return index
+
+    async def _refresh(self, db: AsyncSession, merchant_id: int, index: _MerchantIndex) -> None:
+        """Apply rows changed since the index watermark (all rows on first load)."""
+        query = (
+            select(CatalogProduct)
+            .options(selectinload(CatalogProduct.variants))
+            .where(CatalogProduct.merchant_id == merchant_id)
+        )
+        if index.watermark is None:
+            query = query.where(CatalogProduct.deleted.is_(False))
+        else:
+            query = query.where(CatalogProduct.synced_at > index.watermark - REFRESH_OVERLAP)
+
+        refreshed_at = time.monotonic()
+        products = (await db.execute(query)).scalars().all()
+        for product in products:
+            if product.deleted:
+                self._remove_entry(index, product.product_id)
+            else:
+                self._set_entry(index, _to_entry(product))
+            if index.watermark is None or product.synced_at > index.watermark:
+                index.watermark = product.synced_at
+
+        if index.watermark is None:
+            index.watermark = datetime.now(UTC)
+        index.refreshed_at = refreshed_at
+
+        logger.debug(
+            "product_catalog_refreshed",
+            merchant_id=merchant_id,
+            changed=len(products),
+            total=len(index.products),
+        )
+
+    def invalidate(self, merchant_id: int | None = None) -> None:
+        """Drop in-memory indexes (one merchant, or all); the next read reloads from Postgres."""
+        if merchant_id is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(merchant_id, None)
+
+    def _apply_to_index(
+        self, merchant_id: int, product_id: str, entry: dict[str, Any] | None
+    ) -> None:
+        """Apply a committed write to this process's index (entry None = removed)."""
+        index = self._indexes.get(merchant_id)
+        if index is None:
+            return
+        if entry is None:
+            self._remove_entry(index, product_id)
+        else:
+            self._set_entry(index, entry)
+
+    @staticmethod
+    def _set_entry(index: _MerchantIndex, entry: dict[str, Any]) -> None:
+        index.products[entry["id"]] = entry
+        index.search.upsert(entry)
+
+    @staticmethod
+    def _remove_entry(index: _MerchantIndex, product_id: str) -> None:
+        index.products.pop(product_id, None)
+        index.search.remove(product_id)
+
+    # Writes
+
+    async def upsert_products(
+        self,
+        db: AsyncSession,
+        merchant_id: int,
+        payloads: list[dict[str, Any]],
+    ) -> int:
+        """Insert or update products from Shopify REST payloads and commit.
+
+        A payload older than the stored row (by Shopify updated_at, or the
+        deletion time of a tombstone) is a late webhook delivery and is skipped.
+
+        Args:
+            db: Database session
+            merchant_id: Merchant ID
+            payloads: Raw Shopify products (webhook bodies or products.json items)
+
+        Returns:
+            Number of products written
+        """
+        parsed = [parse_product_payload(p) for p in payloads if p.get("id") is not None]
+        if not parsed:
+            return 0
+
+        product_ids = [values["product_id"] for values, _ in parsed]
+        result = await db.execute(
+            select(CatalogProduct)
+            .options(selectinload(CatalogProduct.variants))
+            .where(
+                CatalogProduct.merchant_id == merchant_id,
+                CatalogProduct.product_id.in_(product_ids),
+            )
+        )
+        existing = {product.product_id: product for product in result.scalars().all()}
+
+        now = datetime.now(UTC)
+        written: list[tuple[str, dict[str, Any]]] = []
+        for values, variant_values in parsed:
+            product = existing.get(values["product_id"])
+            incoming_at = values["shopify_updated_at"]
+            if (
+                product is not None
+                and product.shopify_updated_at
+                and incoming_at
+                and incoming_at < product.shopify_updated_at
+            ):
+                logger.debug(
+                    "product_catalog_stale_update_skipped",
+                    merchant_id=merchant_id,
+                    product_id=values["product_id"],
+                )
+                continue
+
+            if product is None:
+                product = CatalogProduct(merchant_id=merchant_id, variants=[])
+                db.add(product)
+            for key, value in values.items():
+                setattr(product, key, value)
+            product.deleted = False
+            product.synced_at = now
+            self._merge_variants(merchant_id, product, variant_values)
+            written.append((product.product_id, _to_entry(product)))
+
+        await db.commit()
+        for product_id, entry in written:
+            self._apply_to_index(merchant_id, product_id, entry)
+        return len(written)
+
+    @staticmethod
+    def _merge_variants(
+        merchant_id: int, product: CatalogProduct, variant_values: list[dict[str, Any]]
+    ) -> None:
+        """Match variants by Shopify ID, keeping known per-location inventory levels."""
+        current = {variant.variant_id: variant for variant in product.variants}
+        merged: list[CatalogVariant] = []
+        for values in variant_values:
+            values = dict(values)
+            inventory_policy = values.pop("inventory_policy", None)
+            if inventory_policy == "continue" and values["inventory_quantity"] is not None:
+                # Overselling allowed: treat as untracked so it stays available
+                values["inventory_quantity"] = None
+            variant = current.get(values["variant_id"])
+            if variant is None:
+                variant = CatalogVariant(merchant_id=merchant_id, inventory_levels={})
+            for key, value in values.items():
+                setattr(variant, key, value)
+            merged.append(variant)
+        product.variants = merged
+
+    async def delete_product(self, db: AsyncSession, merchant_id: int, product_id: str) -> bool:
+        """Tombstone a product and commit.
+
+        The deletion time is stored as the tombstone's shopify_updated_at, so
+        a products/update delivered after the delete cannot resurrect it.
+
+        Returns:
+            True if the product was in the catalog
+        """
+        result = await db.execute(
+            select(CatalogProduct)
+            .options(selectinload(CatalogProduct.variants))
+            .where(
+                CatalogProduct.merchant_id == merchant_id,
+                CatalogProduct.product_id == str(product_id),
+            )
+        )
+        product = result.scalars().first()
+        if product is None:
+            return False
+
+        now = datetime.now(UTC)
+        product.deleted = True
+        product.variants = []
+        product.shopify_updated_at = max(product.shopify_updated_at or now, now)
+        product.synced_at = now
+        await db.commit()
+        self._apply_to_index(merchant_id, str(product_id), None)
+        return True
+
+    async def apply_inventory_level(
+        self,
+        db: AsyncSession,
+        merchant_id: int,
+        inventory_item_id: str,
+        location_id: str | None,
+        available: int | None,
+    ) -> bool:
+        """Apply one location's stock level to the matching variant and commit.
+
+        The variant total moves by the change at that location. The sync
+        seeds every location's level, so a location with no known level was
+        not part of the synced total: its first report is recorded as the
+        baseline for later changes and leaves the total unchanged. The daily
+        sync restores exact totals.
+
+        Returns:
+            True if a catalog variant matched the inventory item
+        """
+        result = await db.execute(
+            select(CatalogVariant)
+            .options(selectinload(CatalogVariant.product).selectinload(CatalogProduct.variants))
+            .where(
+                CatalogVariant.merchant_id == merchant_id,
+                CatalogVariant.inventory_item_id == str(inventory_item_id),
+            )
+        )
+        variant = result.scalars().first()
+        if variant is None or available is None:
+            return False
+
+        location = str(location_id)
+        levels = dict(variant.inventory_levels or {})
+        previous = levels.get(location)
+        levels[location] = available
+
+        # Untracked variants (quantity None) only record the level
+        if variant.inventory_quantity is not None and previous is not None:
+            variant.inventory_quantity += available - previous
+        variant.inventory_levels = levels
+        product = variant.product
+        product.synced_at = datetime.now(UTC)
+        entry = _to_entry(product)
+
+        await db.commit()
+        self._apply_to_index(merchant_id, product.product_id, entry)
+        return True
+
+    # Bulk sync
+
+    async def sync_merchant(self, db: AsyncSession, merchant_id: int) -> int:
+        """Fully sync a merchant's catalog from the Admin API.
+
+        Pages through every product (all statuses), upserting page by page
+        and seeding each variant's per-location inventory levels, then
+        tombstones products that no longer exist in Shopify and marks the
+        catalog as synced.
+
+        Returns:
+            Number of products fetched
+
+        Raises:
+            APIError: If the Admin API fails
+        """
+        integration = (
+            (
+                await db.execute(
+                    select(ShopifyIntegration).where(ShopifyIntegration.merchant_id == merchant_id)
+                )
+            )
+            .scalars()
+            .first()
+        )
+        if (
+            not integration
+            or integration.status != "active"
+            or not integration.admin_token_encrypted
+        ):
+            logger.info("product_catalog_sync_skipped_no_integration", merchant_id=merchant_id)
+            return 0
+
+        client = ShopifyAdminClient(
+            shop_domain=integration.shop_domain,
+            access_token=decrypt_access_token(integration.admin_token_encrypted),
+            is_testing=is_testing(),
+        )
+
+        started_at = datetime.now(UTC)
+        fetched = 0
+        page_info: str | None = None
+        try:
+            while True:
+                payloads, page_info = await client.list_products_page(
+                    page_info=page_info, limit=SYNC_PAGE_SIZE
+                )
+                fetched += len(payloads)
+                await self.upsert_products(db, merchant_id, payloads)
+                await self._seed_inventory_levels(db, merchant_id, client, payloads)
+                if not page_info:
+                    break
+        finally:
+            await client.close()
+
+        # Anything not written during this sync is gone from Shopify
+        removed = await db.execute(
+            update(CatalogProduct)
+            .where(
+                CatalogProduct.merchant_id == merchant_id,
+                CatalogProduct.deleted.is_(False),
+                CatalogProduct.synced_at < started_at,
+            )
+            .values(deleted=True, shopify_updated_at=started_at, synced_at=datetime.now(UTC))
+        )
+        integration.catalog_synced_at = datetime.now(UTC)
+        await db.commit()
+        self.invalidate(merchant_id)
+
+        logger.info(
+            "product_catalog_synced",
+            merchant_id=merchant_id,
+            products=fetched,
+            removed=removed.rowcount,
+            duration_ms=round((datetime.now(UTC) - started_at).total_seconds() * 1000),
+        )
+        return fetched
+
+    async def _seed_inventory_levels(
+        self,
+        db: AsyncSession,
+        merchant_id: int,
+        client: ShopifyAdminClient,
+        payloads: list[dict[str, Any]],
+    ) -> None:
+        """Replace the per-location inventory levels of a page's variants and commit."""
+        item_ids = [
+            str(variant["inventory_item_id"])
+            for payload in payloads
+            for variant in payload.get("variants") or []
+            if variant.get("inventory_item_id") is not None
+        ]
+        levels: dict[str, dict[str, int]] = {item_id: {} for item_id in item_ids}
+        for start in range(0, len(item_ids), INVENTORY_ITEMS_PER_REQUEST):
+            batch = item_ids[start : start + INVENTORY_ITEMS_PER_REQUEST]
+            page_info: str | None = None
+            while True:
+                rows, page_info = await client.list_inventory_levels_page(
+                    batch, page_info=page_info
+                )
+                for row in rows:
+                    if row.get("available") is not None:
+                        levels[str(row["inventory_item_id"])][str(row["location_id"])] = int(
+                            row["available"]
+                        )
+                if not page_info:
+                    break
+        if not levels:
+            return
+
+        result = await db.execute(
+            select(CatalogVariant).where(
+                CatalogVariant.merchant_id == merchant_id,
+                CatalogVariant.inventory_item_id.in_(list(levels)),
+            )
+        )
+        for variant in result.scalars().all():
+            variant.inventory_levels = levels[variant.inventory_item_id]
+        await db.commit()
+
+    def schedule_sync(self, merchant_id: int) -> None:
+        """Start a background full sync unless one is already running for the merchant."""
+        task = self._syncs.get(merchant_id)
+        if task is not None and not task.done():
+            return
+        task = asyncio.get_running_loop().create_task(self._run_sync(merchant_id))
+        self._syncs[merchant_id] = task
+        task.add_done_callback(lambda _: self._syncs.pop(merchant_id, None))
+
+    async def _run_sync(self, merchant_id: int) -> None:
+        try:
+            async with async_session()() as db:
+                await self.sync_merchant(db, merchant_id)
+        except Exception as e:
+            logger.warning("product_catalog_sync_failed", merchant_id=merchant_id, error=str(e))
+
+
+_product_catalog: ProductCatalog | None = None
+
+
+def get_product_catalog() -> ProductCatalog:
+    """Get the process-wide product catalog."""
+    global _product_catalog
+    if _product_catalog is None:
+        _product_catalog = ProductCatalog()
+    return _product_catalog
+
+
+async def sync_all_product_catalogs() -> dict[str, int]:
+    """Reconcile every active Shopify merchant's catalog (scheduled daily).
+
+    Returns:
+        Counts of merchants synced and failed
+    """
+    async with async_session()() as db:
+        merchant_ids = (
+            (
+                await db.execute(
+                    select(ShopifyIntegration.merchant_id).where(
+                        ShopifyIntegration.status == "active"
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+    catalog = get_product_catalog()
+    results = {"synced": 0, "failed": 0}
+    for merchant_id in merchant_ids:
+        try:
+            async with async_session()() as db:
+                await catalog.sync_merchant(db, merchant_id)
+            results["synced"] += 1
+        except Exception as e:
+            results["failed"] += 1
+            logger.warning("product_catalog_sync_failed", merchant_id=merchant_id, error=str(e))
+
+    logger.info("product_catalog_reconcile_complete", **results)
+    return results
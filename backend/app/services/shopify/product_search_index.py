@@ -0,0 +1,360 @@
+"""In-memory inverted index for product search.
+
+One index per merchant, maintained by ProductCatalog alongside its in-memory
+catalog (entries in the list_products() dict shape). A query only touches the
+postings of its terms, so latency depends on the number of matches rather
+than the catalog size:
+
+- Terms come from title, product type, tags, vendor and variant option
+  values; each posting keeps the best field weight for that product.
+- Query terms missing from the vocabulary are expanded to indexed terms they
+  prefix, or to terms within a small edit distance (typos) found through a
+  trigram index.
+- Price, stock and option-value (size) facets are precomputed sets, and
+  pinned products carry a precomputed boost.
+
+Scores keep the scale of ProductSearchService's linear ranking: a base
+score, up to CATEGORY_MATCH_WEIGHT per fully matched field group, price
+proximity to the budget, then the pinned-order multiplier.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+_MAX_PREFIX_EXPANSIONS = 50
+_MAX_EXPANSION_CACHE = 4096
+
+
+def normalize_token(token: str) -> str:
+    """Casefold and strip a plural "s" so "shoes" and "shoe" share a term."""
+    token = token.casefold()
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split text into normalized terms."""
+    if not text:
+        return []
+    return [normalize_token(token) for token in _TOKEN_RE.findall(text)]
+
+
+def _trigrams(token: str) -> set[str]:
+    padded = f"  {token} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _max_edits(token: str) -> int:
+    if len(token) <= 3:
+        return 0
+    return 1 if len(token) <= 7 else 2
+
+
+def _within_edit_distance(a: str, b: str, limit: int) -> bool:
+    """Levenshtein distance <= limit, computed only inside the diagonal band."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i] + [limit + 1] * len(b)
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        for j in range(low, high + 1):
+            cost = 0 if char_a == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+        if min(current[max(0, low - 1) : high + 1]) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+@dataclass
+class SearchHit:
+    """One ranked product."""
+
+    product_id: str
+    score: float
+    entry: dict[str, Any]
+
+
+@dataclass
+class SearchHits:
+    """Top hits plus the number of products that passed the filters."""
+
+    hits: list[SearchHit]
+    total: int
+
+
+class ProductSearchIndex:
+    """Inverted index with typo tolerance over one merchant's active products.
+
+    Features:
+    - Field-weighted postings (type/tags > title/vendor > variant options)
+    - Prefix and edit-distance expansion of unknown query terms
+    - Stock, price and option-value facets
+    - Precomputed pinned boosts (3.0x for order 1 down to 1.5x for order 10)
+    """
+
+    BASE_SCORE = 20.0
+    CATEGORY_MATCH_WEIGHT = 50.0
+    PRICE_PROXIMITY_WEIGHT = 30.0
+    COLOR_MATCH_WEIGHT = 25.0
+
+    # Share of CATEGORY_MATCH_WEIGHT a term earns by the field it matched
+    FIELD_WEIGHTS = {
+        "product_type": 1.0,
+        "tags": 1.0,
+        "title": 0.5,
+        "vendor": 0.5,
+        "options": 0.25,
+    }
+    PREFIX_FACTOR = 0.8
+    FUZZY_FACTOR = 0.6
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._doc_terms: dict[str, dict[str, float]] = {}
+        self._postings: dict[str, dict[str, float]] = {}
+        self._trigram_terms: dict[str, set[str]] = {}
+        self._sorted_terms: list[str] | None = None
+        self._expansions: dict[str, list[tuple[str, float]]] = {}
+
+        self._prices: dict[str, float] = {}
+        self._by_price: list[tuple[float, str]] | None = None
+        self._in_stock: set[str] = set()
+        self._option_values: dict[str, set[str]] = {}
+        self._doc_option_values: dict[str, set[str]] = {}
+
+        self._pin_boosts: dict[str, float] = {}
+        self.pins_loaded_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Maintenance
+
+    def upsert(self, entry: dict[str, Any]) -> None:
+        """Index a catalog entry, replacing any previous version.
+
+        Non-active products are only removed.
+        """
+        product_id = str(entry["id"])
+        self.remove(product_id)
+        if entry.get("status", "active") != "active":
+            return
+
+        terms: dict[str, float] = {}
+
+        def add(text: str | None, weight: float) -> None:
+            for term in tokenize(text):
+                if weight > terms.get(term, 0.0):
+                    terms[term] = weight
+
+        add(entry.get("title"), self.FIELD_WEIGHTS["title"])
+        add(entry.get("product_type"), self.FIELD_WEIGHTS["product_type"])
+        add(" ".join(entry.get("tags") or []), self.FIELD_WEIGHTS["tags"])
+        add(entry.get("vendor"), self.FIELD_WEIGHTS["vendor"])
+
+        option_values: set[str] = set()
+        for variant in entry.get("variants") or []:
+            for value in (variant.get("selected_options") or {}).values():
+                option_values.add(str(value).casefold())
+                add(str(value), self.FIELD_WEIGHTS["options"])
+
+        for term, weight in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                for gram in _trigrams(term):
+                    self._trigram_terms.setdefault(gram, set()).add(term)
+                self._sorted_terms = None
+                self._expansions.clear()
+            postings[product_id] = weight
+
+        for value in option_values:
+            self._option_values.setdefault(value, set()).add(product_id)
+
+        self._entries[product_id] = entry
+        self._doc_terms[product_id] = terms
+        self._doc_option_values[product_id] = option_values
+        self._prices[product_id] = _price(entry.get("price"))
+        self._by_price = None
+        if entry.get("available", True):
+            self._in_stock.add(product_id)
+
+    def remove(self, product_id: str) -> None:
+        """Drop a product from the index (no-op if absent)."""
+        product_id = str(product_id)
+        if self._entries.pop(product_id, None) is None:
+            return
+        for term in self._doc_terms.pop(product_id, {}):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(product_id, None)
+        for value in self._doc_option_values.pop(product_id, set()):
+            self._option_values.get(value, set()).discard(product_id)
+        self._prices.pop(product_id, None)
+        self._by_price = None
+        self._in_stock.discard(product_id)
+
+    def set_pins(self, pinned_orders: dict[str, int], loaded_at: float) -> None:
+        """Precompute pinned boosts from {product_id: pinned_order}."""
+        self._pin_boosts = {
+            str(product_id): 3.0 - (order - 1) * 0.167  # (3.0 - 1.5) / 9 per step
+            for product_id, order in pinned_orders.items()
+        }
+        self.pins_loaded_at = loaded_at
+
+    # Query
+
+    def search(
+        self,
+        query: str | None = None,
+        max_price: float | None = None,
+        size: str | None = None,
+        color: str | None = None,
+        sort_by_price: str | None = None,
+        limit: int = 20,
+    ) -> SearchHits:
+        """Rank in-stock products for a query.
+
+        If no product matches the query terms, every product passing the
+        filters is ranked on price and pins alone, like the linear ranking.
+
+        Args:
+            query: Free text (category, product name)
+            max_price: Budget; products above it are excluded
+            size: Exact (case-insensitive) variant option value
+            color: Boosts products with this option value or term
+            sort_by_price: "asc" or "desc" to break score ties by price
+            limit: Number of hits to return
+
+        Returns:
+            Top hits and the total number of matching products
+        """
+        text_scores = self._match_terms(tokenize(query)) if query else {}
+        candidates: Any = text_scores if text_scores else self._candidates_by_price(max_price)
+
+        size_ids = self._option_values.get(size.casefold(), set()) if size else None
+        color_ids = self._color_ids(color) if color else set()
+
+        scored: list[tuple[float, float, str]] = []
+        for product_id in candidates:
+            if product_id not in self._in_stock:
+                continue
+            price = self._prices[product_id]
+            if max_price and price > max_price:
+                continue
+            if size_ids is not None and product_id not in size_ids:
+                continue
+
+            score = self.BASE_SCORE + text_scores.get(product_id, 0.0) * self.CATEGORY_MATCH_WEIGHT
+            if max_price and price:
+                score += (1.0 - price / max_price) * self.PRICE_PROXIMITY_WEIGHT
+            if product_id in color_ids:
+                score += self.COLOR_MATCH_WEIGHT
+            score *= self._pin_boosts.get(product_id, 1.0)
+
+            tie_break = price if sort_by_price == "asc" else -price if sort_by_price else 0.0
+            scored.append((score, -tie_break, product_id))
+
+        top = heapq.nlargest(limit, scored)
+        return SearchHits(
+            hits=[SearchHit(pid, score, self._entries[pid]) for score, _, pid in top],
+            total=len(scored),
+        )
+
+    def _match_terms(self, terms: list[str]) -> dict[str, float]:
+        """Average best field weight per query term, per product."""
+        terms = list(dict.fromkeys(terms))
+        if not terms:
+            return {}
+        totals: dict[str, float] = {}
+        for term in terms:
+            best: dict[str, float] = {}
+            for indexed, factor in self._expand(term):
+                for product_id, weight in self._postings.get(indexed, {}).items():
+                    value = weight * factor
+                    if value > best.get(product_id, 0.0):
+                        best[product_id] = value
+            for product_id, value in best.items():
+                totals[product_id] = totals.get(product_id, 0.0) + value
+        return {product_id: total / len(terms) for product_id, total in totals.items()}
+
+    def _expand(self, term: str) -> list[tuple[str, float]]:
+        """Indexed terms a query term matches, with their match factor."""
+        cached = self._expansions.get(term)
+        if cached is not None:
+            return cached
+
+        expansions: list[tuple[str, float]] = []
+        if self._postings.get(term):
+            expansions.append((term, 1.0))
+        if len(term) >= 3:
+            expansions.extend((t, self.PREFIX_FACTOR) for t in self._prefixed(term))
+        if not expansions:
+            expansions.extend((t, self.FUZZY_FACTOR) for t in self._fuzzy(term))
+
+        if len(self._expansions) >= _MAX_EXPANSION_CACHE:
+            self._expansions.clear()
+        self._expansions[term] = expansions
+        return expansions
+
+    def _prefixed(self, term: str) -> list[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = self._sorted_terms
+        start = bisect_left(terms, term)
+        matches: list[str] = []
+        for candidate in terms[start : start + _MAX_PREFIX_EXPANSIONS + 1]:
+            if not candidate.startswith(term):
+                break
+            if candidate != term and self._postings.get(candidate):
+                matches.append(candidate)
+        return matches
+
+    def _fuzzy(self, term: str) -> list[str]:
+        limit = _max_edits(term)
+        if limit == 0:
+            return []
+        grams = _trigrams(term)
+        shared: dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._trigram_terms.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        # q-gram lemma: each edit destroys at most 3 trigrams
+        required = len(grams) - 3 * limit
+        return [
+            candidate
+            for candidate, count in shared.items()
+            if count >= required
+            and self._postings.get(candidate)
+            and _within_edit_distance(term, candidate, limit)
+        ]
+
+    def _candidates_by_price(self, max_price: float | None) -> Any:
+        if not max_price:
+            return self._entries.keys()
+        if self._by_price is None:
+            self._by_price = sorted((price, pid) for pid, price in self._prices.items())
+        end = bisect_right(self._by_price, (max_price, "\uffff"))
+        return [pid for _, pid in self._by_price[:end]]
+
+    def _color_ids(self, color: str) -> set[str]:
+        ids = set(self._option_values.get(color.casefold(), set()))
+        for term in tokenize(color):
+            ids.update(self._postings.get(term, {}))
+        return ids
+
+
+def _price(value: Any) -> float:
+    try:
+        return float(value) if value else 0.0
+    except (TypeError, ValueError):
+        return 0.0
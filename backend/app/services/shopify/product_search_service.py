@@ -1,7 +1,7 @@
 """Product search service for Shopify integration.
 
-Orchestrates product search by mapping intent entities to Shopify queries,
-fetching from Admin API (no storefront token required), applying filters, and ranking by relevance.
+Orchestrates product search by mapping intent entities to search parameters,
+reading the merchant's local catalog replica, applying filters, and ranking by relevance.
 """
 
 from __future__ import annotations
@@ -9,16 +9,14 @@ from __future__ import annotations
 from typing import Any
 
 import structlog
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import is_testing
-from app.core.security import decrypt_access_token
-from app.models.shopify_integration import ShopifyIntegration
 from app.schemas.shopify import Product, ProductSearchResult
 from app.services.intent.classification_schema import ExtractedEntities
+from app.services.shopify.product_catalog import get_product_catalog
 from app.services.shopify.product_mapper import ProductMapper
-from app.services.shopify_admin import ShopifyAdminClient
+from app.services.shopify.product_search_index import ProductSearchIndex
+from app.services.shopify.product_service import fetch_products
 
 logger = structlog.get_logger(__name__)
 
@@ -26,8 +24,11 @@ logger = structlog.get_logger(__name__)
 class ProductSearchService:
     """Service for searching products based on classified entities.
 
-    Uses Shopify Admin API for product search (no storefront token required).
-    Maps intent classification entities to filters and ranks results by relevance.
+    Searches the merchant's local catalog replica (kept in sync by Shopify
+    webhooks) through its inverted index, so no Shopify API call is made and
+    ranking cost doesn't grow with the catalog. Until a merchant's catalog is
+    synced, products are fetched and ranked linearly. Maps intent
+    classification entities to filters and ranks results by relevance.
 
     Attributes:
         mapper: Product data mapper
@@ -56,52 +57,6 @@ class ProductSearchService:
         self.db = db
         self.logger = structlog.get_logger(__name__)
 
-    async def _get_admin_client_for_merchant(self, merchant_id: int) -> ShopifyAdminClient | None:
-        """Get Shopify Admin client for a specific merchant.
-
-        Uses the admin token from ShopifyIntegration (no storefront token needed).
-
-        Args:
-            merchant_id: Merchant ID to fetch credentials for
-
-        Returns:
-            ShopifyAdminClient or None if no integration
-        """
-        if not self.db:
-            self.logger.warning("no_db_session", merchant_id=merchant_id)
-            return None
-
-        result = await self.db.execute(
-            select(ShopifyIntegration).where(ShopifyIntegration.merchant_id == merchant_id)
-        )
-        integration = result.scalars().first()
-
-        if (
-            not integration
-            or integration.status != "active"
-            or not integration.admin_token_encrypted
-        ):
-            self.logger.info(
-                "no_shopify_admin_integration",
-                merchant_id=merchant_id,
-                has_integration=integration is not None,
-            )
-            return None
-
-        admin_token = decrypt_access_token(integration.admin_token_encrypted)
-
-        self.logger.info(
-            "using_shopify_admin_api",
-            merchant_id=merchant_id,
-            shop_domain=integration.shop_domain,
-        )
-
-        return ShopifyAdminClient(
-            shop_domain=integration.shop_domain,
-            access_token=admin_token,
-            is_testing=is_testing(),
-        )
-
     async def search_products(
         self,
         entities: ExtractedEntities,
@@ -109,7 +64,9 @@ class ProductSearchService:
     ) -> ProductSearchResult:
         """Search for products matching the extracted entities.
 
-        Uses Shopify Admin API to fetch products and filters them locally.
+        Queries the merchant's catalog search index (typo-tolerant terms,
+        price/stock/size facets, pinned boosts); falls back to filtering and
+        ranking the fetched products when the catalog isn't synced yet.
 
         Args:
             entities: Extracted entities from intent classification
@@ -135,45 +92,36 @@ class ProductSearchService:
             size=search_params.get("size"),
         )
 
-        # Fetch products from Admin API
-        admin_client: ShopifyAdminClient | None = None
-        if merchant_id:
-            admin_client = await self._get_admin_client_for_merchant(merchant_id)
-
-        if admin_client:
-            # Fetch all products from Shopify (Admin API)
-            raw_products = await admin_client.list_products(limit=self.MAX_RESULTS)
-            self.logger.info(
-                "admin_api_products_fetched",
-                merchant_id=merchant_id,
-                count=len(raw_products),
-            )
+        search_index = await self._get_search_index(merchant_id)
+        if search_index is not None:
+            ranked_products, total_count = self._search_index(search_index, entities, search_params)
         else:
-            # Fallback to mock products
-            from app.services.shopify.product_service import fetch_products
-
-            raw_products = await fetch_products(None, merchant_id, self.db) if self.db else []
+            # Catalog not synced yet: live Admin API / mock products, ranked linearly
+            raw_products = (
+                await fetch_products(None, merchant_id, self.db) if self.db and merchant_id else []
+            )
             self.logger.info(
-                "using_fallback_products",
+                "catalog_products_loaded",
                 merchant_id=merchant_id,
                 count=len(raw_products),
             )
 
-        # Map to Product objects
-        products = self._map_admin_products(raw_products)
+            # Map to Product objects
+            products = self._map_admin_products(raw_products)
 
-        # Apply filters
-        products = self._apply_filters(products, search_params)
+            # Apply filters
+            products = self._apply_filters(products, search_params)
 
-        # Apply sorting
-        products = self._apply_sorting(products, entities)
+            # Apply sorting
+            products = self._apply_sorting(products, entities)
 
-        # Fetch pinned product IDs for relevance boosting
-        pinned_ids = await self._get_pinned_product_ids(merchant_id)
-        pinned_orders = await self._get_pinned_product_orders(merchant_id)
+            # Fetch pinned product IDs for relevance boosting
+            pinned_ids = await self._get_pinned_product_ids(merchant_id)
+            pinned_orders = await self._get_pinned_product_orders(merchant_id)
 
-        # Rank by relevance (with pinned boost)
-        ranked_products = self._rank_products(products, entities, pinned_ids, pinned_orders)
+            # Rank by relevance (with pinned boost)
+            ranked_products = self._rank_products(products, entities, pinned_ids, pinned_orders)
+            total_count = len(ranked_products)
 
         has_alternatives = self._check_alternatives(ranked_products, entities)
 
@@ -182,7 +130,8 @@ class ProductSearchService:
         self.logger.info(
             "product_search_complete",
             merchant_id=merchant_id,
-            result_count=len(ranked_products),
+            result_count=total_count,
+            indexed=search_index is not None,
             search_time_ms=search_time_ms,
         )
 
@@ -190,7 +139,7 @@ class ProductSearchService:
 
         return ProductSearchResult(
             products=displayed_products,
-            total_count=len(ranked_products),
+            total_count=total_count,
             search_params={
                 "category": search_params.get("category"),
                 "maxPrice": search_params.get("max_price"),
@@ -201,14 +150,68 @@ class ProductSearchService:
             search_time_ms=search_time_ms,
         )
 
+    async def _get_search_index(self, merchant_id: int | None) -> ProductSearchIndex | None:
+        """Get the merchant's catalog search index (None until the catalog is synced)."""
+        if not self.db or not merchant_id:
+            return None
+        try:
+            return await get_product_catalog().get_search_index(self.db, merchant_id)
+        except Exception as e:
+            self.logger.warning(
+                "product_search_index_unavailable",
+                merchant_id=merchant_id,
+                error=str(e),
+            )
+            return None
+
+    def _search_index(
+        self,
+        search_index: ProductSearchIndex,
+        entities: ExtractedEntities,
+        search_params: dict[str, Any],
+    ) -> tuple[list[Product], int]:
+        """Rank products with the inverted index.
+
+        Only the top MAX_RESULTS hits are mapped to Product objects.
+
+        Args:
+            search_index: Merchant's product search index
+            entities: Extracted entities with sort constraints
+            search_params: Mapped search parameters
+
+        Returns:
+            Tuple of (ranked products, number of matching products)
+        """
+        constraints = entities.constraints or {}
+        sort_by_price = (
+            constraints.get("sort_order", "asc") if constraints.get("sort_by") == "price" else None
+        )
+        query = " ".join(
+            part for part in (search_params.get("category"), search_params.get("brand")) if part
+        )
+
+        results = search_index.search(
+            query=query or None,
+            max_price=search_params.get("max_price"),
+            size=search_params.get("size"),
+            color=search_params.get("color"),
+            sort_by_price=sort_by_price,
+            limit=self.MAX_RESULTS,
+        )
+
+        products = self._map_admin_products([hit.entry for hit in results.hits])
+        for product, hit in zip(products, results.hits, strict=True):
+            product.relevance_score = hit.score
+        return products, results.total
+
     def _map_admin_products(self, raw_products: list[dict]) -> list[Product]:
-        """Map Admin API products to Product objects.
+        """Map catalog / Admin API product dicts to Product objects.
 
-        The list_products() method already extracts price and availability,
-        so we just need to map to Product objects.
+        Catalog entries carry every variant with its selected options (so size
+        filters work); list_products() dicts only describe the first variant.
 
         Args:
-            raw_products: Raw product dicts from Admin API (already formatted)
+            raw_products: Product dicts in the list_products() shape
 
         Returns:
             List of Product objects
@@ -229,19 +232,32 @@ class ProductSearchService:
             if p.get("image_url"):
                 images.append({"url": p["image_url"], "src": p["image_url"]})
 
-            # Build variant with availability info for filter_by_availability
-            available = p.get("available", True)
-            variants = [
-                ProductVariant(
-                    id=p.get("variant_id", ""),
-                    product_id=str(p.get("id", "")),
-                    title="Default",
-                    price=price,
-                    currency_code=CurrencyCode.USD,
-                    available_for_sale=available,
-                    selected_options={},
-                )
-            ]
+            # Build variants with availability info for filter_by_availability
+            if p.get("variants"):
+                variants = [
+                    ProductVariant(
+                        id=v["id"],
+                        product_id=str(p.get("id", "")),
+                        title=v.get("title") or "Default",
+                        price=float(v["price"]) if v.get("price") else price,
+                        currency_code=CurrencyCode.USD,
+                        available_for_sale=v.get("available", True),
+                        selected_options=v.get("selected_options") or {},
+                    )
+                    for v in p["variants"]
+                ]
+            else:
+                variants = [
+                    ProductVariant(
+                        id=p.get("variant_id", ""),
+                        product_id=str(p.get("id", "")),
+                        title="Default",
+                        price=price,
+                        currency_code=CurrencyCode.USD,
+                        available_for_sale=p.get("available", True),
+                        selected_options={},
+                    )
+                ]
 
             products.append(
                 Product(
@@ -445,15 +461,9 @@ class ProductSearchService:
             return {}
 
         try:
-            from app.models.product_pin import ProductPin
+            from app.services.product_pin_service import get_pinned_product_orders
 
-            result = await self.db.execute(
-                select(ProductPin.product_id, ProductPin.pinned_order).where(
-                    ProductPin.merchant_id == merchant_id
-                )
-            )
-            pins = result.all()
-            return {str(pin.product_id): pin.pinned_order for pin in pins}
+            return await get_pinned_product_orders(self.db, merchant_id)
         except Exception as e:
             self.logger.warning(
                 "get_pinned_orders_failed",
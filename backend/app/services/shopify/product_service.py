@@ -2,14 +2,14 @@
 
 Story 1.15: Product Highlight Pins
 
-Fetches product data from Shopify Admin API with caching.
-Integrates with product pin service to provide product titles and images.
+Serves product data from the local catalog replica (see product_catalog),
+falling back to a live Admin API fetch while a merchant's catalog is still
+being bootstrapped. Integrates with product pin service to provide product
+titles and images.
 """
 
 from __future__ import annotations
 
-import os
-
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -17,12 +17,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import is_testing
 from app.core.security import decrypt_access_token
 from app.models.shopify_integration import ShopifyIntegration
+from app.services.shopify.product_catalog import get_product_catalog
 from app.services.shopify_admin import ShopifyAdminClient
 
 logger = structlog.get_logger(__name__)
 
-PRODUCT_CACHE_TTL = int(os.getenv("PRODUCT_CACHE_TTL", "300"))
-
 
 MOCK_PRODUCTS = [
     {
@@ -214,7 +213,11 @@ async def fetch_products(
     db: AsyncSession,
     status_filter: str | None = "active",
 ) -> list[dict]:
-    """Fetch products from Shopify Admin API.
+    """Fetch a merchant's products from the local catalog.
+
+    Until the merchant's catalog has completed its first sync, a sync is
+    started in the background and up to 100 products are fetched live from
+    the Admin API.
 
     Args:
         access_token: Unused (kept for compatibility)
@@ -252,6 +255,12 @@ async def fetch_products(
         )
 
         if integration and integration.status == "active" and integration.admin_token_encrypted:
+            catalog = get_product_catalog()
+            products = await catalog.get_products(db, merchant_id_int, status_filter)
+            if products is not None:
+                return products
+            catalog.schedule_sync(merchant_id_int)
+
             admin_token = decrypt_access_token(integration.admin_token_encrypted)
 
             client = ShopifyAdminClient(
@@ -304,9 +313,14 @@ async def get_product_by_id(
     Returns:
         Product dictionary or None if not found
     """
-    products = await fetch_products(
-        access_token, int(merchant_id) if isinstance(merchant_id, str) else merchant_id, db
-    )
+    merchant_id_int = int(merchant_id) if isinstance(merchant_id, str) else merchant_id
+
+    catalog = get_product_catalog()
+    if await catalog.is_synced(db, merchant_id_int):
+        product = await catalog.get_product(db, merchant_id_int, product_id)
+        return product if product and product["status"] == "active" else None
+
+    products = await fetch_products(access_token, merchant_id_int, db)
 
     for product in products:
         if product["id"] == product_id:
@@ -320,12 +334,13 @@ async def invalidate_product_cache(
 ) -> None:
     """Invalidate product cache for a merchant.
 
-    Called when pin configuration changes to force refresh
-    of Shopify product data.
+    Drops this process's in-memory catalog index so the next read reloads
+    it from Postgres. Called when pin configuration changes.
 
     Args:
         merchant_id: Merchant ID
     """
+    get_product_catalog().invalidate(int(merchant_id))
     logger.info(
         "product_cache_invalidated",
         merchant_id=merchant_id,
@@ -354,19 +369,16 @@ async def get_products_by_ids(
 
     merchant_id_int = int(merchant_id) if isinstance(merchant_id, str) else merchant_id
 
-    unique_ids = list(set(product_ids))
-
-    products = {}
-    for pid in unique_ids:
-        try:
-            product = await get_product_by_id(access_token, pid, merchant_id_int, db)
-            if product:
-                products[pid] = product
-        except Exception as e:
-            logger.warning(
-                "fetch_product_failed",
-                product_id=pid,
-                error=str(e),
-            )
+    unique_ids = set(product_ids)
+
+    try:
+        all_products = await fetch_products(access_token, merchant_id_int, db)
+    except Exception as e:
+        logger.warning(
+            "fetch_products_by_ids_failed",
+            merchant_id=merchant_id_int,
+            error=str(e),
+        )
+        return {}
 
-    return products
+    return {product["id"]: product for product in all_products if product["id"] in unique_ids}
@@ -510,12 +510,13 @@ class TestDLQRetryWorker:
         assert should_retry is True
         assert retry_after > 0
 
-    def test_get_dlq_metrics_returns_expected_structure(self) -> None:
+    @pytest.mark.asyncio
+    async def test_get_dlq_metrics_returns_expected_structure(self) -> None:
         """Test get_dlq_metrics returns expected structure."""
         worker = DLQRetryWorker()
 
-        with patch.object(worker, "get_dlq_size", return_value=5):
-            metrics = worker.get_dlq_metrics()
+        with patch.object(worker, "get_dlq_size", AsyncMock(return_value=5)):
+            metrics = await worker.get_dlq_metrics()
 
             assert "dlq_size" in metrics
             assert "dlq_healthy" in metrics
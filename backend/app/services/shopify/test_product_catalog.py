@@ -0,0 +1,271 @@
+"""Tests for the local product catalog replica.
+
+Covers payload parsing, the in-memory index (bootstrap check, load,
+incremental refresh), webhook upserts and deletes, and per-location
+inventory updates and seeding.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.catalog_product import CatalogProduct, CatalogVariant
+from app.services.shopify.product_catalog import ProductCatalog, parse_product_payload
+
+
+def _payload(**overrides: Any) -> dict[str, Any]:
+    payload = {
+        "id": 101,
+        "title": "Trail Runner",
+        "body_html": "<p>Grippy soles</p>",
+        "vendor": "Acme",
+        "product_type": "Footwear",
+        "tags": "running, trail ,",
+        "status": "active",
+        "updated_at": "2026-04-16T10:00:00-04:00",
+        "options": [{"name": "Size"}, {"name": "Color"}],
+        "images": [{"src": "https://cdn.example.com/runner.jpg"}],
+        "variants": [
+            {
+                "id": 2002,
+                "title": "10 / Blue",
+                "price": "89.50",
+                "position": 2,
+                "option1": "10",
+                "option2": "Blue",
+                "inventory_item_id": 3002,
+                "inventory_quantity": 0,
+                "inventory_policy": "deny",
+            },
+            {
+                "id": 2001,
+                "title": "9 / Blue",
+                "price": "79.00",
+                "position": 1,
+                "option1": "9",
+                "option2": "Blue",
+                "inventory_item_id": 3001,
+                "inventory_quantity": 4,
+                "inventory_policy": "deny",
+            },
+        ],
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _catalog_product(**overrides: Any) -> CatalogProduct:
+    values, variant_values = parse_product_payload(_payload(**overrides))
+    product = CatalogProduct(merchant_id=1, deleted=False, synced_at=datetime.now(UTC), **values)
+    product.variants = [
+        CatalogVariant(
+            merchant_id=1,
+            inventory_levels={},
+            **{k: v for k, v in variant.items() if k != "inventory_policy"},
+        )
+        for variant in variant_values
+    ]
+    return product
+
+
+def _result(rows: list[Any]) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    result.scalars.return_value.first.return_value = rows[0] if rows else None
+    return result
+
+
+class TestParseProductPayload:
+    """Tests for parse_product_payload."""
+
+    def test_maps_product_and_variants(self) -> None:
+        product, variants = parse_product_payload(_payload())
+
+        assert product["product_id"] == "101"
+        assert product["tags"] == ["running", "trail"]
+        assert product["image_url"] == "https://cdn.example.com/runner.jpg"
+        # Variants are ordered by position; product price is the first variant's
+        assert [v["variant_id"] for v in variants] == ["2001", "2002"]
+        assert product["price"] == Decimal("79.00")
+        assert variants[0]["selected_options"] == {"Size": "9", "Color": "Blue"}
+        assert variants[0]["inventory_item_id"] == "3001"
+        assert product["shopify_updated_at"] == datetime.fromisoformat("2026-04-16T14:00:00+00:00")
+
+
+class TestCatalogIndex:
+    """Tests for reads through the in-memory index."""
+
+    @pytest.mark.asyncio
+    async def test_returns_none_until_first_sync(self) -> None:
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value=None)
+        db.execute = AsyncMock()
+
+        catalog = ProductCatalog(refresh_seconds=60)
+
+        assert await catalog.get_products(db, merchant_id=1) is None
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_loads_once_and_serves_from_memory(self) -> None:
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value=datetime.now(UTC))
+        db.execute = AsyncMock(
+            return_value=_result([_catalog_product(), _catalog_product(id=102, status="draft")])
+        )
+
+        catalog = ProductCatalog(refresh_seconds=60)
+        active = await catalog.get_products(db, merchant_id=1)
+        every_status = await catalog.get_products(db, merchant_id=1, status_filter=None)
+
+        assert db.execute.await_count == 1
+        assert [p["id"] for p in active] == ["101"]
+        assert len(every_status) == 2
+        entry = active[0]
+        assert entry["price"] == "79.00"
+        assert entry["variant_id"] == "2001"
+        assert entry["available"] is True
+        assert entry["inventory_quantity"] == 4
+        assert entry["tags"] == ["running", "trail"]
+
+    @pytest.mark.asyncio
+    async def test_refresh_applies_changes_and_tombstones(self) -> None:
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value=datetime.now(UTC))
+        db.execute = AsyncMock(return_value=_result([_catalog_product()]))
+
+        catalog = ProductCatalog(refresh_seconds=0)
+        await catalog.get_products(db, merchant_id=1)
+
+        deleted = _catalog_product()
+        deleted.deleted = True
+        db.execute = AsyncMock(return_value=_result([deleted, _catalog_product(id=103)]))
+        products = await catalog.get_products(db, merchant_id=1)
+
+        assert [p["id"] for p in products] == ["103"]
+        # Incremental refresh reads by watermark, not the whole catalog
+        assert "synced_at" in str(db.execute.call_args[0][0])
+
+
+class TestCatalogWrites:
+    """Tests for webhook-driven writes."""
+
+    @pytest.mark.asyncio
+    async def test_upsert_skips_out_of_order_update(self) -> None:
+        stored = _catalog_product(updated_at="2026-04-16T12:00:00Z")
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result([stored]))
+        db.commit = AsyncMock()
+
+        catalog = ProductCatalog(refresh_seconds=60)
+        written = await catalog.upsert_products(
+            db, 1, [_payload(title="Old title", updated_at="2026-04-16T11:00:00Z")]
+        )
+
+        assert written == 0
+        assert stored.title == "Trail Runner"
+
+    @pytest.mark.asyncio
+    async def test_late_update_does_not_resurrect_deleted_product(self) -> None:
+        stored = _catalog_product(updated_at="2026-04-16T12:00:00Z")
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result([stored]))
+        db.commit = AsyncMock()
+
+        catalog = ProductCatalog(refresh_seconds=60)
+        assert await catalog.delete_product(db, 1, "101") is True
+        written = await catalog.upsert_products(
+            db, 1, [_payload(title="Old title", updated_at="2026-04-16T13:00:00Z")]
+        )
+
+        assert written == 0
+        assert stored.deleted is True
+        assert stored.title == "Trail Runner"
+
+    @pytest.mark.asyncio
+    async def test_upsert_updates_index_and_keeps_inventory_levels(self) -> None:
+        stored = _catalog_product()
+        stored.variants[0].inventory_levels = {"55": 4}
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result([stored]))
+        db.commit = AsyncMock()
+        db.scalar = AsyncMock(return_value=datetime.now(UTC))
+
+        catalog = ProductCatalog(refresh_seconds=60)
+        await catalog.get_products(db, merchant_id=1)
+        await catalog.upsert_products(
+            db, 1, [_payload(title="Trail Runner 2", updated_at="2026-04-17T10:00:00Z")]
+        )
+
+        db.commit.assert_awaited_once()
+        assert stored.variants[0].inventory_levels == {"55": 4}
+        products = await catalog.get_products(db, merchant_id=1)
+        assert products[0]["title"] == "Trail Runner 2"
+
+    @pytest.mark.asyncio
+    async def test_inventory_level_moves_total_by_location_change(self) -> None:
+        product = _catalog_product()
+        variant = product.variants[0]
+        variant.product = product
+        variant.inventory_quantity = 10
+        variant.inventory_levels = {"55": 6, "66": 4}
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result([variant]))
+        db.commit = AsyncMock()
+
+        catalog = ProductCatalog(refresh_seconds=60)
+        matched = await catalog.apply_inventory_level(db, 1, "3001", "66", 1)
+
+        assert matched is True
+        assert variant.inventory_quantity == 7
+        assert variant.inventory_levels == {"55": 6, "66": 1}
+
+    @pytest.mark.asyncio
+    async def test_inventory_level_first_report_keeps_synced_total(self) -> None:
+        product = _catalog_product()
+        variant = product.variants[0]
+        variant.product = product
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result([variant]))
+        db.commit = AsyncMock()
+
+        catalog = ProductCatalog(refresh_seconds=60)
+        await catalog.apply_inventory_level(db, 1, "3001", "55", 1)
+        assert variant.inventory_quantity == 4
+        assert variant.inventory_levels == {"55": 1}
+
+        # Later reports from that location move the total by the change
+        await catalog.apply_inventory_level(db, 1, "3001", "55", 0)
+        assert variant.inventory_quantity == 3
+
+    @pytest.mark.asyncio
+    async def test_sync_seeds_inventory_levels_per_location(self) -> None:
+        product = _catalog_product()
+        variant = product.variants[0]
+        variant.inventory_levels = {"99": 2}
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result([variant]))
+        db.commit = AsyncMock()
+        client = MagicMock()
+        client.list_inventory_levels_page = AsyncMock(
+            return_value=(
+                [
+                    {"inventory_item_id": 3001, "location_id": 55, "available": 3},
+                    {"inventory_item_id": 3001, "location_id": 66, "available": 1},
+                    {"inventory_item_id": 3002, "location_id": 55, "available": None},
+                ],
+                None,
+            )
+        )
+
+        catalog = ProductCatalog(refresh_seconds=60)
+        await catalog._seed_inventory_levels(db, 1, client, [_payload()])
+
+        client.list_inventory_levels_page.assert_awaited_once_with(["3002", "3001"], page_info=None)
+        assert variant.inventory_levels == {"55": 3, "66": 1}
+        db.commit.assert_awaited_once()
@@ -0,0 +1,155 @@
+"""Tests for the per-merchant inverted product search index.
+
+Covers term matching (exact, prefix, typo), field weighting, facets
+(budget, stock, size), color boosts, pinned boosts and index maintenance.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from app.services.shopify.product_search_index import (
+    ProductSearchIndex,
+    _within_edit_distance,
+    tokenize,
+)
+
+
+def _entry(product_id: str, **overrides: Any) -> dict[str, Any]:
+    entry = {
+        "id": product_id,
+        "title": "Basic Item",
+        "product_type": "",
+        "vendor": "Acme",
+        "tags": [],
+        "status": "active",
+        "price": "50.00",
+        "available": True,
+        "variants": [],
+    }
+    entry.update(overrides)
+    return entry
+
+
+def _index(*entries: dict[str, Any]) -> ProductSearchIndex:
+    index = ProductSearchIndex()
+    for entry in entries:
+        index.upsert(entry)
+    return index
+
+
+def _ids(index: ProductSearchIndex, **kwargs: Any) -> list[str]:
+    return [hit.product_id for hit in index.search(**kwargs).hits]
+
+
+class TestTokenize:
+    """Tests for term normalization."""
+
+    def test_casefolds_and_strips_plural(self) -> None:
+        assert tokenize("Running SHOES, glass") == ["running", "shoe", "glass"]
+
+    def test_edit_distance_band(self) -> None:
+        assert _within_edit_distance("snekers", "sneaker", 2)
+        assert not _within_edit_distance("boot", "coat", 1)
+
+
+class TestTermMatching:
+    """Tests for query term expansion and weighting."""
+
+    def test_typo_matches_indexed_term(self) -> None:
+        index = _index(
+            _entry("1", title="Court Sneakers", product_type="Sneakers"),
+            _entry("2", title="Wool Hat", product_type="Hats"),
+        )
+
+        result = index.search(query="snekers")
+
+        assert [hit.product_id for hit in result.hits] == ["1"]
+        assert result.total == 1
+
+    def test_prefix_matches_longer_term(self) -> None:
+        index = _index(
+            _entry("1", title="Hoodie", product_type="Sweatshirts"),
+            _entry("2", title="Wool Hat"),
+        )
+
+        assert _ids(index, query="sweat") == ["1"]
+
+    def test_type_match_outranks_title_match(self) -> None:
+        index = _index(
+            _entry("title", title="Boot Socks", product_type="Socks"),
+            _entry("type", title="Hiker", product_type="Boots"),
+        )
+
+        assert _ids(index, query="boots") == ["type", "title"]
+
+    def test_unmatched_query_ranks_all_products(self) -> None:
+        index = _index(_entry("1"), _entry("2"))
+
+        result = index.search(query="zzzzzz")
+
+        assert result.total == 2
+
+
+class TestFacets:
+    """Tests for filters and boosts."""
+
+    def test_budget_and_stock_filters(self) -> None:
+        index = _index(
+            _entry("cheap", product_type="Shoes", price="40.00"),
+            _entry("pricey", product_type="Shoes", price="140.00"),
+            _entry("sold_out", product_type="Shoes", price="30.00", available=False),
+        )
+
+        assert _ids(index, query="shoes", max_price=100.0) == ["cheap"]
+        assert _ids(index, max_price=100.0) == ["cheap"]
+
+    def test_size_filters_on_variant_options(self) -> None:
+        index = _index(
+            _entry("small", variants=[{"selected_options": {"Size": "S"}}]),
+            _entry("large", variants=[{"selected_options": {"Size": "L"}}]),
+        )
+
+        assert _ids(index, size="l") == ["large"]
+
+    def test_color_boosts_without_filtering(self) -> None:
+        index = _index(
+            _entry("plain", product_type="Shirts"),
+            _entry("red", product_type="Shirts", variants=[{"selected_options": {"Color": "Red"}}]),
+        )
+
+        assert _ids(index, query="shirt", color="red") == ["red", "plain"]
+
+    def test_sort_by_price_breaks_ties(self) -> None:
+        index = _index(
+            _entry("a", price="30.00"),
+            _entry("b", price="10.00"),
+            _entry("c", price="20.00"),
+        )
+
+        assert _ids(index, sort_by_price="asc") == ["b", "c", "a"]
+        assert _ids(index, sort_by_price="desc") == ["a", "c", "b"]
+
+
+class TestMaintenance:
+    """Tests for pins and incremental updates."""
+
+    def test_pinned_products_are_boosted(self) -> None:
+        index = _index(
+            _entry("match", product_type="Shoes"),
+            _entry("pinned", title="Shoe Laces"),
+        )
+        index.set_pins({"pinned": 1}, loaded_at=0.0)
+
+        assert _ids(index, query="shoes") == ["pinned", "match"]
+
+    def test_upsert_replaces_and_remove_drops(self) -> None:
+        index = _index(_entry("1", product_type="Shoes"), _entry("2", product_type="Shoes"))
+
+        index.upsert(_entry("1", product_type="Hats"))
+        assert _ids(index, query="shoes") == ["2"]
+        assert _ids(index, query="hats") == ["1"]
+
+        index.upsert(_entry("1", product_type="Hats", status="draft"))
+        index.remove("2")
+        assert len(index) == 0
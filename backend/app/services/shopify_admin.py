@@ -344,6 +344,163 @@ class ShopifyAdminClient(ShopifyBaseClient):
             logger.error("admin_products_error", error=str(e))
             raise APIError(ErrorCode.SHOPIFY_API_ERROR, f"Failed to fetch products: {str(e)}")
 
+    async def list_products_page(
+        self,
+        page_info: str | None = None,
+        limit: int = 250,
+        max_retries: int = 3,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Fetch one page of raw products (all statuses) via Admin REST API.
+
+        Uses cursor pagination: the next page's cursor comes from the Link
+        response header. Unlike list_products(), products are returned in
+        Shopify's REST shape (variants, images, tags), the same shape as
+        products/* webhook payloads.
+
+        Args:
+            page_info: Cursor returned for the previous page (None for the first page)
+            limit: Page size (Shopify allows up to 250)
+            max_retries: Maximum retry attempts for rate limits
+
+        Returns:
+            Tuple of (raw product dicts, cursor for the next page or None)
+
+        Raises:
+            APIError: If fetch fails
+        """
+        if self.is_testing:
+            return [], None
+
+        url = f"{SHOPIFY_ADMIN_API_URL.format(shop=self.shop_domain)}/products.json"
+        params: dict[str, Any] = {"limit": limit}
+        if page_info:
+            params["page_info"] = page_info
+
+        try:
+            for attempt in range(max_retries + 1):
+                response = await self.async_client.get(
+                    url,
+                    params=params,
+                    headers={
+                        "X-Shopify-Access-Token": self.access_token,
+                        "Accept": "application/json",
+                    },
+                    timeout=30.0,
+                )
+                if response.status_code == 429 and attempt < max_retries:
+                    logger.warning(
+                        "admin_products_page_rate_limited",
+                        shop_domain=self.shop_domain,
+                        retry_count=attempt,
+                    )
+                    await asyncio.sleep(float(response.headers.get("Retry-After", 2**attempt)))
+                    continue
+                break
+
+            response.raise_for_status()
+            products = response.json().get("products", [])
+
+            next_page_info = None
+            next_url = response.links.get("next", {}).get("url")
+            if next_url:
+                next_page_info = httpx.URL(next_url).params.get("page_info")
+
+            return products, next_page_info
+
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                "admin_products_page_http_error",
+                status=e.response.status_code,
+                detail=e.response.text,
+            )
+            raise APIError(
+                ErrorCode.SHOPIFY_API_ERROR,
+                f"Failed to fetch products (HTTP {e.response.status_code}): {e.response.text}",
+            )
+        except Exception as e:
+            logger.error("admin_products_page_error", error=str(e))
+            raise APIError(ErrorCode.SHOPIFY_API_ERROR, f"Failed to fetch products: {str(e)}")
+
+    async def list_inventory_levels_page(
+        self,
+        inventory_item_ids: list[str],
+        page_info: str | None = None,
+        limit: int = 250,
+        max_retries: int = 3,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Fetch one page of inventory levels (one per item and location) via Admin REST API.
+
+        Args:
+            inventory_item_ids: Inventory item IDs (Shopify allows up to 50 per request)
+            page_info: Cursor returned for the previous page (None for the first page)
+            limit: Page size (Shopify allows up to 250)
+            max_retries: Maximum retry attempts for rate limits
+
+        Returns:
+            Tuple of (raw inventory level dicts, cursor for the next page or None)
+
+        Raises:
+            APIError: If fetch fails
+        """
+        if self.is_testing or not inventory_item_ids:
+            return [], None
+
+        url = f"{SHOPIFY_ADMIN_API_URL.format(shop=self.shop_domain)}/inventory_levels.json"
+        params: dict[str, Any] = {"limit": limit}
+        if page_info:
+            # Cursor pages must not repeat the original filters
+            params["page_info"] = page_info
+        else:
+            params["inventory_item_ids"] = ",".join(inventory_item_ids)
+
+        try:
+            for attempt in range(max_retries + 1):
+                response = await self.async_client.get(
+                    url,
+                    params=params,
+                    headers={
+                        "X-Shopify-Access-Token": self.access_token,
+                        "Accept": "application/json",
+                    },
+                    timeout=30.0,
+                )
+                if response.status_code == 429 and attempt < max_retries:
+                    logger.warning(
+                        "admin_inventory_levels_rate_limited",
+                        shop_domain=self.shop_domain,
+                        retry_count=attempt,
+                    )
+                    await asyncio.sleep(float(response.headers.get("Retry-After", 2**attempt)))
+                    continue
+                break
+
+            response.raise_for_status()
+            levels = response.json().get("inventory_levels", [])
+
+            next_page_info = None
+            next_url = response.links.get("next", {}).get("url")
+            if next_url:
+                next_page_info = httpx.URL(next_url).params.get("page_info")
+
+            return levels, next_page_info
+
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                "admin_inventory_levels_http_error",
+                status=e.response.status_code,
+                detail=e.response.text,
+            )
+            raise APIError(
+                ErrorCode.SHOPIFY_API_ERROR,
+                f"Failed to fetch inventory levels (HTTP {e.response.status_code}): "
+                f"{e.response.text}",
+            )
+        except Exception as e:
+            logger.error("admin_inventory_levels_error", error=str(e))
+            raise APIError(
+                ErrorCode.SHOPIFY_API_ERROR, f"Failed to fetch inventory levels: {str(e)}"
+            )
+
     async def fetch_variant_costs_batch(
         self,
         variant_ids: list[str],
@@ -9,11 +9,14 @@ from __future__ import annotations
 
 import time
 from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from app.models.faq import Faq
 from app.services.faq import (
+    FaqIndex,
+    FaqIndexCache,
     FaqMatch,
     FaqMatcher,
     get_faq_matcher,
@@ -434,3 +437,138 @@ class TestConvenienceFunctions:
         assert result is not None
         assert result.faq.id == 1
         assert result.confidence >= 0.7
+
+
+def _make_faq(faq_id: int, question: str, keywords: str | None = None) -> Faq:
+    return Faq(
+        id=faq_id,
+        merchant_id=1,
+        question=question,
+        answer=f"Answer {faq_id}",
+        keywords=keywords,
+        order_index=faq_id,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+
+
+class TestFaqIndex:
+    """Tests for the precompiled per-merchant FaqIndex."""
+
+    FAQS = [
+        _make_faq(1, "What are your shipping options?", "shipping, delivery, ship"),
+        _make_faq(2, "Do you accept returns?", "returns, refund"),
+        _make_faq(3, "What are your hours?", "hours, open, close"),
+        _make_faq(4, "Do you have a relationship program?", "loyalty"),
+        _make_faq(5, "Express   Shipping Details", "express shipping,express"),
+        _make_faq(6, "Where is my order?", None),
+    ]
+
+    @pytest.mark.parametrize(
+        "message",
+        [
+            "What are your shipping options?",
+            "  WHAT ARE YOUR   shipping options?  ",
+            "shipping",
+            "ship",
+            "refund",
+            "can I get a refund for returns",
+            "hi",
+            "hours",
+            "express shipping and delivery",
+            "relationship",
+            "what are your",
+            "where is my order? please help",
+            "your hours",
+            "nothing related at all",
+        ],
+    )
+    def test_matches_like_faq_matcher(self, message):
+        """FaqIndex.match agrees with FaqMatcher.match_faq on the same FAQs."""
+        expected = FaqMatcher().match_faq(message, self.FAQS)
+        actual = FaqIndex(self.FAQS).match(message)
+
+        if expected is None:
+            assert actual is None
+        else:
+            assert actual is not None
+            assert actual.faq.id == expected.faq.id
+            assert actual.confidence == pytest.approx(expected.confidence)
+            assert actual.match_type == expected.match_type
+
+    def test_empty_index_returns_none(self):
+        assert FaqIndex([]).match("shipping") is None
+
+    def test_empty_message_raises_error(self):
+        with pytest.raises(ValueError, match="customer_message cannot be empty"):
+            FaqIndex(self.FAQS).match("   ")
+
+
+class TestFaqIndexCache:
+    """Tests for per-merchant FaqIndex caching and invalidation."""
+
+    @staticmethod
+    def _db(faqs: list[Faq]) -> AsyncMock:
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = faqs
+        db = AsyncMock()
+        db.execute.return_value = result
+        return db
+
+    async def test_reuses_index_without_db_hit(self):
+        cache = FaqIndexCache()
+        db = self._db([_make_faq(1, "What are your hours?", "hours")])
+
+        first = await cache.get(db, merchant_id=1)
+        second = await cache.get(db, merchant_id=1)
+
+        assert first is second
+        assert db.execute.await_count == 1
+        assert second.match("hours").faq.id == 1
+
+    async def test_invalidate_rebuilds_index(self):
+        cache = FaqIndexCache()
+        db = self._db([_make_faq(1, "What are your hours?", "hours")])
+        await cache.get(db, merchant_id=1)
+
+        db.execute.return_value.scalars.return_value.all.return_value = [
+            _make_faq(2, "Do you accept returns?", "returns")
+        ]
+        cache.invalidate(1)
+        index = await cache.get(db, merchant_id=1)
+
+        assert db.execute.await_count == 2
+        assert index.match("hours") is None
+        assert index.match("returns").faq.id == 2
+
+    async def test_merchants_are_isolated(self):
+        cache = FaqIndexCache()
+        db = self._db([_make_faq(1, "What are your hours?", "hours")])
+        await cache.get(db, merchant_id=1)
+        await cache.get(db, merchant_id=1)
+        await cache.get(db, merchant_id=2)
+
+        assert db.execute.await_count == 2
+
+    async def test_build_racing_invalidation_is_not_cached(self):
+        cache = FaqIndexCache()
+        db = self._db([_make_faq(1, "What are your hours?", "hours")])
+
+        async def execute_with_concurrent_edit(*args, **kwargs):
+            cache.invalidate(1)
+            return db.execute.return_value
+
+        db.execute.side_effect = execute_with_concurrent_edit
+        await cache.get(db, merchant_id=1)
+        await cache.get(db, merchant_id=1)
+
+        assert db.execute.await_count == 2
+
+    async def test_ttl_expiry_rebuilds_index(self):
+        cache = FaqIndexCache(ttl_seconds=0)
+        db = self._db([_make_faq(1, "What are your hours?", "hours")])
+
+        await cache.get(db, merchant_id=1)
+        await cache.get(db, merchant_id=1)
+
+        assert db.execute.await_count == 2
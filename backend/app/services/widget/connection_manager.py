@@ -21,11 +21,11 @@ import redis.asyncio as redis
 import structlog
 from fastapi import WebSocket
 
-from app.core.config import settings
 from app.core.connection_limits import (
     MAX_CONNECTIONS_PER_WIDGET_SESSION,
     MAX_TOTAL_WIDGET_CONNECTIONS,
 )
+from app.core.redis_pool import get_pubsub_redis, get_redis
 
 logger = structlog.get_logger(__name__)
 
@@ -51,7 +51,7 @@ class WidgetConnectionManager:
         """Initialize the connection manager.
 
         Args:
-            redis_client: Optional Redis client (creates default if not provided)
+            redis_client: Optional Redis client (shared application pool if not provided)
         """
         self._connections: dict[str, set[WebSocket]] = {}
         self._redis: redis.Redis | None = redis_client
@@ -61,12 +61,16 @@ class WidgetConnectionManager:
         self._logger = structlog.get_logger(__name__)
         self._total_connections = 0
 
-    def _get_redis(self) -> redis.Redis:
-        """Get or create Redis client."""
+    def _get_redis(self) -> redis.Redis | None:
+        """Get the injected Redis client, or the shared one (None if Redis is disabled)."""
         if self._redis is None:
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self._redis = redis.from_url(redis_url, decode_responses=True)
+            return get_redis()
+        return self._redis
+
+    def _get_pubsub_redis(self) -> redis.Redis | None:
+        """Get the Redis client used for long-lived channel subscriptions."""
+        if self._redis is None:
+            return get_pubsub_redis()
         return self._redis
 
     async def connect(self, session_id: str, websocket: WebSocket) -> None:
@@ -202,6 +206,8 @@ class WidgetConnectionManager:
         # Publish to Redis for delivery (works for both local and cross-instance)
         redis_client = self._get_redis()
         channel = f"widget:{session_id}"
+        if redis_client is None:
+            return await self._deliver_locally(session_id, message)
 
         try:
             await redis_client.publish(channel, json.dumps(message))
@@ -334,7 +340,10 @@ class WidgetConnectionManager:
         if session_id in self._listener_tasks:
             return
 
-        redis_client = self._get_redis()
+        redis_client = self._get_pubsub_redis()
+        if redis_client is None:
+            # Without Redis, broadcasts are delivered locally
+            return
         pubsub = redis_client.pubsub()
 
         try:
@@ -15,8 +15,8 @@ import structlog
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.core.database import async_session
+from app.core.redis_pool import get_redis
 from app.models.conversation import Conversation
 
 logger = structlog.get_logger(__name__)
@@ -51,9 +51,7 @@ class WidgetConversationCleanupService:
             redis_client: Optional Redis client instance
         """
         if redis_client is None:
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self.redis = redis.from_url(redis_url, decode_responses=True)
+            self.redis = get_redis()
         else:
             self.redis = redis_client
 
@@ -22,6 +22,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.errors import APIError, ErrorCode
 from app.models.merchant import Merchant
 from app.schemas.widget import WidgetSessionData
+from app.services.analytics.sentiment_analyzer import message_sentiment
 from app.services.conversation.schemas import (
     Channel,
     ClarificationState,
@@ -33,6 +34,11 @@ from app.services.conversation.schemas import (
 from app.services.conversation.unified_conversation_service import UnifiedConversationService
 from app.services.llm.base_llm_service import LLMMessage
 from app.services.llm.llm_factory import LLMProviderFactory
+from app.services.llm.provider_registry import (
+    EMBEDDING_CLIENT,
+    config_fingerprint,
+    get_provider_registry,
+)
 from app.services.widget.widget_session_service import WidgetSessionService
 
 logger = structlog.get_logger(__name__)
@@ -376,33 +382,10 @@ class WidgetMessageService:
             current_message=message,
         )
 
-        provider_name = "ollama"
-        llm_config = {}
-
-        try:
-            if merchant_llm_config:
-                llm_config_obj = merchant_llm_config
-                provider_name = llm_config_obj.provider or "ollama"
-
-                llm_config = {
-                    "model": llm_config_obj.ollama_model or llm_config_obj.cloud_model,
-                }
-
-                if provider_name == "ollama":
-                    llm_config["ollama_url"] = llm_config_obj.ollama_url
-                else:
-                    if llm_config_obj.api_key_encrypted:
-                        from app.core.security import decrypt_access_token
-
-                        llm_config["api_key"] = decrypt_access_token(
-                            llm_config_obj.api_key_encrypted
-                        )
-        except Exception:
-            pass
-
-        llm_service = LLMProviderFactory.create_provider(
-            provider_name=provider_name,
-            config=llm_config,
+        llm_service = self._get_llm_service_from_config(
+            merchant_id=merchant_id,
+            merchant_llm_config=merchant_llm_config,
+            merchant_bot_name=merchant.bot_name,
         )
 
         try:
@@ -602,33 +585,44 @@ class WidgetMessageService:
 
             provider = merchant_embedding_provider
             model = merchant_embedding_model
-            api_key = None
+            api_key_encrypted = None
             ollama_url = None
 
             if merchant_llm_config:
                 ollama_url = merchant_llm_config.ollama_url
-                if merchant_llm_config.api_key_encrypted:
-                    from app.core.security import decrypt_access_token
-
-                    api_key = decrypt_access_token(merchant_llm_config.api_key_encrypted)
+                api_key_encrypted = merchant_llm_config.api_key_encrypted
 
             if not provider:
                 provider = "ollama"
                 model = "nomic-embed-text"
 
             if provider == "anthropic":
-                from app.core.config import settings
-
                 provider = "openai"
                 model = "text-embedding-3-small"
-                if not api_key:
+
+            def create_embedding_service() -> EmbeddingService:
+                api_key = None
+                if api_key_encrypted:
+                    from app.core.security import decrypt_access_token
+
+                    api_key = decrypt_access_token(api_key_encrypted)
+                if merchant_embedding_provider == "anthropic" and not api_key:
+                    from app.core.config import settings
+
                     api_key = settings().get("OPENAI_API_KEY")
+                return EmbeddingService(
+                    provider=provider,
+                    api_key=api_key,
+                    model=model,
+                    ollama_url=ollama_url,
+                )
 
-            embedding_service = EmbeddingService(
-                provider=provider,
-                api_key=api_key,
-                model=model,
-                ollama_url=ollama_url,
+            # Reuse the merchant's EmbeddingService (and its connection pool)
+            embedding_service = get_provider_registry().get_or_create(
+                merchant_id,
+                EMBEDDING_CLIENT,
+                config_fingerprint(provider, model, ollama_url, api_key_encrypted),
+                create_embedding_service,
             )
 
             # Create session factory for request-scoped database sessions
@@ -678,6 +672,9 @@ class WidgetMessageService:
     ):
         """Get LLM service for a merchant.
 
+        Served from the process-wide provider registry, so the provider's
+        pooled HTTP client and decrypted key are reused across messages.
+
         Args:
             merchant_id: Merchant ID
             merchant_llm_config: LLM configuration object
@@ -686,34 +683,19 @@ class WidgetMessageService:
         Returns:
             LLM service instance
         """
-        provider_name = "ollama"
-        llm_config = {}
-
         try:
-            if merchant_llm_config:
-                llm_config_obj = merchant_llm_config
-                provider_name = llm_config_obj.provider or "ollama"
-
-                llm_config = {
-                    "model": llm_config_obj.ollama_model or llm_config_obj.cloud_model,
-                }
-
-                if provider_name == "ollama":
-                    llm_config["ollama_url"] = llm_config_obj.ollama_url
-                else:
-                    if llm_config_obj.api_key_encrypted:
-                        from app.core.security import decrypt_access_token
-
-                        llm_config["api_key"] = decrypt_access_token(
-                            llm_config_obj.api_key_encrypted
-                        )
-        except Exception:
-            pass
-
-        return LLMProviderFactory.create_provider(
-            provider_name=provider_name,
-            config=llm_config,
-        )
+            return get_provider_registry().get_llm_provider(
+                merchant_id,
+                merchant_llm_config,
+                provider_factory=LLMProviderFactory,
+            )
+        except Exception as e:
+            self.logger.warning(
+                "widget_llm_config_failed",
+                merchant_id=merchant_id,
+                error=str(e),
+            )
+            return LLMProviderFactory.create_provider(provider_name="ollama", config={})
 
     async def process_message_streaming(
         self,
@@ -726,6 +708,10 @@ class WidgetMessageService:
         Story 11-2: WebSocket Streaming for Multi-Turn Responses
         Streams LLM-generated tokens to the frontend in real-time through
         the existing WebSocket connection, eliminating perceived latency.
+        Tokens are forwarded as the provider emits them; the stream end
+        carries the final post-processed content (which the widget renders
+        in place of the streamed text) plus products, quick replies and
+        sources.
 
         Falls back to non-streaming process_message() if WebSocket is unavailable.
 
@@ -851,36 +837,28 @@ class WidgetMessageService:
 
             assert self.db is not None
 
+            streamed = False
+
+            async def send_token(token: str) -> None:
+                nonlocal streamed
+                streamed = True
+                await connection_manager.broadcast_streaming_token(
+                    session.session_id, bot_msg_id, token
+                )
+
             response = await unified_service.process_message(
                 db=self.db,
                 context=context,
                 message=sanitized_message,
+                on_token=send_token,
             )
 
             full_content = response.message
 
-            import time
-
-            CHUNK_SIZE = 3
-            send_interval = 0.03
-
-            chunk_buffer = ""
-            last_send_time = time.monotonic()
-
-            for char in full_content:
-                chunk_buffer += char
-
-                now = time.monotonic()
-                if len(chunk_buffer) >= CHUNK_SIZE or now - last_send_time >= send_interval:
-                    await connection_manager.broadcast_streaming_token(
-                        session.session_id, bot_msg_id, chunk_buffer
-                    )
-                    chunk_buffer = ""
-                    last_send_time = now
-
-            if chunk_buffer:
+            # Non-LLM replies (search, cart, FAQ...) are complete on arrival
+            if not streamed and full_content:
                 await connection_manager.broadcast_streaming_token(
-                    session.session_id, bot_msg_id, chunk_buffer
+                    session.session_id, bot_msg_id, full_content
                 )
 
             extra_fields: dict[str, Any] = {}
@@ -1065,6 +1043,8 @@ class WidgetMessageService:
                     },
                 )
                 message.set_encrypted_content(content, sender)
+                if sender == "customer":
+                    message.sentiment, message.sentiment_score = message_sentiment(content)
                 self.db.add(message)
 
             await self.db.commit()
@@ -17,8 +17,8 @@ from uuid import uuid4
 import redis.asyncio as redis
 import structlog
 
-from app.core.config import settings
 from app.core.errors import APIError, ErrorCode
+from app.core.redis_pool import get_redis
 from app.schemas.widget import WidgetSessionData
 
 logger = structlog.get_logger(__name__)
@@ -59,9 +59,7 @@ class WidgetSessionService:
             redis_client: Optional Redis client instance
         """
         if redis_client is None:
-            config = settings()
-            redis_url = config.get("REDIS_URL", "redis://localhost:6379/0")
-            self.redis = redis.from_url(redis_url, decode_responses=True)
+            self.redis = get_redis()
         else:
             self.redis = redis_client
 
@@ -292,8 +290,9 @@ class WidgetSessionService:
 
             # Close the associated conversation
             try:
-                from app.core.database import get_db
                 from sqlalchemy import select
+
+                from app.core.database import get_db
                 from app.models.conversation import Conversation
 
                 async for db in get_db():
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""Benchmark event-loop lag while extracting a large PDF upload.
+
+Generates a text-heavy PDF (200 pages by default) and chunks it twice while a
+heartbeat coroutine measures how late the event loop wakes it up:
+
+1. inline:       DocumentChunker.iter_document_chunks on the event loop
+2. process pool: ExtractionExecutor.iter_document_chunks
+
+Lag is what every concurrent WebSocket/chat request on the worker would see.
+
+Usage:
+    python scripts/benchmark_extraction_event_loop.py --pages 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.knowledge.chunker import DocumentChunker
+from app.services.knowledge.extraction_executor import ExtractionExecutor
+
+HEARTBEAT_INTERVAL = 0.005
+LINES_PER_PAGE = 45
+
+
+def write_text_pdf(path: str, pages: int) -> None:
+    """Write a minimal multi-page PDF with Helvetica text on every page."""
+    objects: list[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")  # Filled in once the page ids are known
+    page_ids = []
+
+    for page in range(pages):
+        lines = [b"BT /F1 9 Tf 40 800 Td 11 TL"]
+        for line in range(LINES_PER_PAGE):
+            text = (
+                f"Page {page + 1} line {line + 1}: orders ship within two business "
+                f"days and returns are accepted for thirty days."
+            )
+            lines.append(f"({text}) Tj T*".encode())
+        lines.append(b"ET")
+        stream = b"\n".join(lines)
+        content_id = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(
+            add(
+                b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+                b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+                % (pages_id, font_id, content_id)
+            )
+        )
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        catalog_id,
+        xref_offset,
+    )
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late each wake-up is relative to HEARTBEAT_INTERVAL."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def measure(name: str, run) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT_INTERVAL * 2)
+
+    started = time.perf_counter()
+    chunk_count = await run()
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{name:<13} chunks={chunk_count:<5} wall={elapsed:6.2f}s "
+        f"lag max={lags_ms[-1]:8.1f}ms p99={p99:7.1f}ms "
+        f"mean={statistics.fmean(lags_ms):6.2f}ms ticks={len(lags)}"
+    )
+
+
+async def main(pages: int, workers: int) -> None:
+    chunker = DocumentChunker()
+    executor = ExtractionExecutor(max_workers=workers)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "large.pdf")
+        write_text_pdf(pdf_path, pages)
+        print(f"Generated {pages}-page PDF ({os.path.getsize(pdf_path) / 1024:.0f} KB)")
+
+        # Warm up the pool so process start-up is not attributed to extraction
+        async for _ in executor.iter_pages(pdf_path, "pdf"):
+            break
+
+        async def inline() -> int:
+            return sum(1 for _ in chunker.iter_document_chunks(pdf_path, "pdf"))
+
+        async def pooled() -> int:
+            count = 0
+            async for _ in executor.iter_document_chunks(chunker, pdf_path, "pdf"):
+                count += 1
+            return count
+
+        try:
+            await measure("inline", inline)
+            await measure("process pool", pooled)
+        finally:
+            executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=200, help="Pages in the generated PDF")
+    parser.add_argument("--workers", type=int, default=2, help="Extraction worker processes")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.pages, args.workers))
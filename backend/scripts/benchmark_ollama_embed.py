@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""Micro-benchmark Ollama embedding throughput: /api/embed vs /api/embeddings.
+
+Starts a local stand-in for an Ollama server and embeds the same texts twice
+with EmbeddingService:
+
+1. per-text: one POST /api/embeddings per text (servers older than 0.3.4)
+2. batched:  adaptive POST /api/embed batches
+
+The stand-in runs the "model" serially, like a single Ollama runner: every
+request pays a fixed overhead (HTTP, JSON, scheduling) plus a per-text compute
+cost, so the difference between the two runs is request overhead.
+
+Usage:
+    python scripts/benchmark_ollama_embed.py --texts 2000
+"""
+
+import argparse
+import asyncio
+import socket
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.services.rag.embedding_service import EmbeddingService
+
+DIMENSION = 768
+
+
+def build_stand_in(overhead_s: float, per_text_s: float, stats: dict[str, int]) -> Starlette:
+    """Ollama stand-in with a serial model runner."""
+    runner = asyncio.Lock()
+
+    async def run_model(count: int) -> list[list[float]]:
+        async with runner:
+            await asyncio.sleep(overhead_s + per_text_s * count)
+        return [[0.01] * DIMENSION for _ in range(count)]
+
+    async def embed(request: Request) -> JSONResponse:
+        body = await request.json()
+        stats["requests"] += 1
+        return JSONResponse({"embeddings": await run_model(len(body["input"]))})
+
+    async def embeddings(request: Request) -> JSONResponse:
+        await request.json()
+        stats["requests"] += 1
+        return JSONResponse({"embedding": (await run_model(1))[0]})
+
+    return Starlette(
+        routes=[
+            Route("/api/embed", embed, methods=["POST"]),
+            Route("/api/embeddings", embeddings, methods=["POST"]),
+        ]
+    )
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run(name: str, url: str, texts: list[str], stats: dict[str, int], batched: bool) -> None:
+    service = EmbeddingService(provider="ollama", ollama_url=url)
+    stats["requests"] = 0
+    started = time.perf_counter()
+    try:
+        if batched:
+            embeddings = await service._embed_texts_ollama_batched(texts)
+        else:
+            embeddings = await service._embed_texts_ollama_legacy(texts)
+    finally:
+        await service.close()
+    elapsed = time.perf_counter() - started
+
+    assert len(embeddings) == len(texts)
+    print(
+        f"{name:<9} texts={len(texts)} requests={stats['requests']:<5} "
+        f"time={elapsed:6.2f}s throughput={len(texts) / elapsed:8.1f} texts/s"
+        + (f" final_batch_size={service.ollama_batch_size}" if batched else "")
+    )
+
+
+async def main(count: int, overhead_ms: float, per_text_ms: float) -> None:
+    stats = {"requests": 0}
+    port = free_port()
+    app = build_stand_in(overhead_ms / 1000, per_text_ms / 1000, stats)
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    url = f"http://127.0.0.1:{port}"
+    texts = [f"Chunk {i}: orders ship within two business days." for i in range(count)]
+    print(f"Stand-in: {overhead_ms}ms per request + {per_text_ms}ms per text (serial runner)")
+    try:
+        await run("per-text", url, texts, stats, batched=False)
+        await run("batched", url, texts, stats, batched=True)
+    finally:
+        server.should_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000, help="Number of texts to embed")
+    parser.add_argument("--overhead-ms", type=float, default=3.0, help="Fixed cost per request")
+    parser.add_argument("--per-text-ms", type=float, default=0.5, help="Model cost per text")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.texts, args.overhead_ms, args.per_text_ms))
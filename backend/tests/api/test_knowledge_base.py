@@ -662,3 +662,52 @@ class TestDocumentChunker:
                 assert len(chunk) >= chunker.MIN_CHUNK_CHARS
         except ImportError:
             pytest.skip("python-docx not installed")
+
+    def test_iter_document_chunks_matches_chunk_document(self, tmp_path: str) -> None:
+        """Streaming chunking yields the same chunks and reports page progress."""
+        chunker = DocumentChunker()
+
+        test_file = os.path.join(tmp_path, "stream.txt")
+        with open(test_file, "w") as f:
+            f.write("Streaming sentence number one. " * 300)
+
+        pages = []
+        streamed = list(
+            chunker.iter_document_chunks(
+                test_file, "txt", on_page=lambda done, total: pages.append((done, total))
+            )
+        )
+
+        assert streamed == chunker.chunk_document(test_file, "txt")
+        assert pages == [(1, 1)]
+
+    def test_structured_chunks_follow_headings_without_overlap(self) -> None:
+        """Sections start new chunks and no text is repeated across chunks."""
+        chunker = DocumentChunker()
+        shipping = "Orders ship within two business days. " * 20
+        returns = "Returns are accepted within thirty days of delivery. " * 20
+        text = f"# Shipping\n\n{shipping}\n\n# Returns\n\n{returns}"
+
+        chunks = list(chunker.iter_chunks([text]))
+
+        assert chunks[0].startswith("# Shipping")
+        assert chunks[1].startswith("# Returns")
+        assert sum(len(c) for c in chunks) <= len(text)
+        for chunk in chunks:
+            assert len(chunk) <= chunker.CHUNK_SIZE_MAX
+
+    def test_structured_chunks_are_stable_across_page_boundaries(self) -> None:
+        """Streaming pages yields the same chunks as chunking the joined text."""
+        chunker = DocumentChunker()
+        pages = [f"Section {i}\n\n" + "A complete sentence about policy. " * 30 for i in range(5)]
+
+        assert list(chunker.iter_chunks(pages)) == list(chunker.iter_chunks(["\n".join(pages)]))
+
+    def test_fixed_strategy_keeps_overlapping_windows(self) -> None:
+        """The legacy strategy still produces overlapping windows."""
+        chunker = DocumentChunker(strategy="fixed")
+        text = "x" * 1500 + "y" * 1500
+
+        chunks = list(chunker.iter_chunks([text]))
+
+        assert chunks[1].startswith("x" * chunker.OVERLAP_SIZE)
@@ -0,0 +1,237 @@
+"""Tests for the dashboard analytics result cache.
+
+Covers:
+- L1 hits, Redis promotion and Redis failure degradation
+- Keying by merchant, endpoint and parameters; TTL expiry
+- Single-flight de-duplication of concurrent identical requests
+- Per-merchant invalidation through the generation counter
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.analytics.analytics_result_cache import (
+    AnalyticsResultCache,
+    cached_analytics_result,
+)
+
+
+class FakeRedis:
+    """Minimal async Redis double with get/set/incr."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.data[key] = value
+
+    async def incr(self, key: str) -> int:
+        self.data[key] = str(int(self.data.get(key, "0")) + 1)
+        return int(self.data[key])
+
+
+def _compute(value=None):
+    return AsyncMock(return_value=value if value is not None else {"total": 1})
+
+
+class TestAnalyticsResultCache:
+    """Tests for the two cache tiers."""
+
+    @pytest.mark.asyncio
+    async def test_second_call_is_served_from_l1(self):
+        cache = AnalyticsResultCache()
+        compute = _compute()
+
+        first = await cache.get_or_compute(1, "peak-hours", {"days": 7}, compute)
+        second = await cache.get_or_compute(1, "peak-hours", {"days": 7}, compute)
+
+        assert first == second == {"total": 1}
+        compute.assert_awaited_once()
+        assert cache.stats()["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_key_includes_merchant_endpoint_and_params(self):
+        cache = AnalyticsResultCache()
+        compute = _compute()
+
+        await cache.get_or_compute(1, "peak-hours", {"days": 7}, compute)
+        await cache.get_or_compute(1, "peak-hours", {"days": 30}, compute)
+        await cache.get_or_compute(1, "bot-quality", {"days": 7}, compute)
+        await cache.get_or_compute(2, "peak-hours", {"days": 7}, compute)
+
+        assert compute.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_results_are_json_encoded(self):
+        cache = AnalyticsResultCache()
+        at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+
+        result = await cache.get_or_compute(1, "summary", {}, _compute({"at": at}))
+
+        assert result == {"at": at.isoformat()}
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_recomputed(self):
+        cache = AnalyticsResultCache(ttl_seconds=0)
+        compute = _compute()
+
+        await cache.get_or_compute(1, "summary", {}, compute)
+        await cache.get_or_compute(1, "summary", {}, compute)
+
+        assert compute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_is_shared_across_workers(self):
+        redis = FakeRedis()
+        worker_a = AnalyticsResultCache(redis_client=redis)
+        worker_b = AnalyticsResultCache(redis_client=redis)
+        compute = _compute()
+
+        await worker_a.get_or_compute(1, "summary", {}, compute)
+        result = await worker_b.get_or_compute(1, "summary", {}, compute)
+
+        assert result == {"total": 1}
+        compute.assert_awaited_once()
+        assert worker_b.stats()["redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_degrade_to_local_cache(self):
+        redis = FakeRedis()
+        redis.get = AsyncMock(side_effect=ConnectionError("down"))
+        redis.set = AsyncMock(side_effect=ConnectionError("down"))
+        cache = AnalyticsResultCache(redis_client=redis)
+        compute = _compute()
+
+        await cache.get_or_compute(1, "summary", {}, compute)
+        result = await cache.get_or_compute(1, "summary", {}, compute)
+
+        assert result == {"total": 1}
+        compute.assert_awaited_once()
+        assert cache.stats()["redis_errors"] > 0
+
+
+class TestSingleFlight:
+    """Concurrent identical requests share one computation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_compute_once(self):
+        cache = AnalyticsResultCache()
+        release = asyncio.Event()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"total": 3}
+
+        tasks = [
+            asyncio.create_task(cache.get_or_compute(1, "summary", {}, compute))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert calls == 1
+        assert results == [{"total": 3}] * 5
+        assert cache.stats()["shared_computations"] == 4
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_to_waiters_and_are_not_cached(self):
+        cache = AnalyticsResultCache()
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise RuntimeError("query failed")
+
+        tasks = [
+            asyncio.create_task(cache.get_or_compute(1, "summary", {}, failing))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert await cache.get_or_compute(1, "summary", {}, _compute()) == {"total": 1}
+
+    @pytest.mark.asyncio
+    async def test_waiter_recomputes_when_leader_is_cancelled(self):
+        cache = AnalyticsResultCache()
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        leader = asyncio.create_task(cache.get_or_compute(1, "summary", {}, slow))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_compute(1, "summary", {}, _compute()))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == {"total": 1}
+
+
+class TestInvalidation:
+    """Per-merchant invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_invalidate_merchant_drops_only_that_merchant(self):
+        cache = AnalyticsResultCache()
+        compute = _compute()
+        await cache.get_or_compute(1, "summary", {}, compute)
+        await cache.get_or_compute(2, "summary", {}, compute)
+
+        await cache.invalidate_merchant(1)
+        await cache.get_or_compute(1, "summary", {}, compute)
+        await cache.get_or_compute(2, "summary", {}, compute)
+
+        assert compute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_workers_through_redis(self):
+        redis = FakeRedis()
+        worker_a = AnalyticsResultCache(redis_client=redis)
+        worker_b = AnalyticsResultCache(redis_client=redis)
+        compute = _compute()
+        await worker_a.get_or_compute(1, "summary", {}, compute)
+        await worker_b.get_or_compute(1, "summary", {}, compute)
+
+        await worker_a.invalidate_merchant(1)
+        await worker_b.get_or_compute(1, "summary", {}, compute)
+
+        assert compute.await_count == 2
+
+
+class TestCachedAnalyticsResult:
+    """Tests for the route helper."""
+
+    @pytest.mark.asyncio
+    async def test_bypassed_without_cache_in_testing_mode(self):
+        compute = _compute()
+
+        await cached_analytics_result(1, "summary", {}, compute)
+        await cached_analytics_result(1, "summary", {}, compute)
+
+        assert compute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_uses_injected_cache(self):
+        cache = AnalyticsResultCache()
+        compute = _compute()
+
+        await cached_analytics_result(1, "summary", {}, compute, cache=cache)
+        await cached_analytics_result(1, "summary", {}, compute, cache=cache)
+
+        compute.assert_awaited_once()
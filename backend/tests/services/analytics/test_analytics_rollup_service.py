@@ -0,0 +1,198 @@
+"""Tests for incremental analytics rollups.
+
+Covers:
+- Compaction of conversations, messages and LLM timings into daily/hourly rows
+- Incremental windows (backfill, then yesterday..today only)
+- Widgets read from rollups agree with the raw-query fallback
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analytics_rollup import AnalyticsDailyRollup
+from app.models.conversation import Conversation
+from app.models.llm_conversation_cost import LLMConversationCost
+from app.models.message import Message
+from app.services.analytics.aggregated_analytics_service import AggregatedAnalyticsService
+from app.services.analytics.analytics_rollup_service import (
+    AnalyticsRollupService,
+    customer_sentiment_by_day,
+)
+
+
+def _cost(conversation_id: int, merchant_id: int, ms: float, response_type: str, at: datetime):
+    return LLMConversationCost(
+        conversation_id=str(conversation_id),
+        merchant_id=merchant_id,
+        provider="openai",
+        model="gpt-4o-mini",
+        prompt_tokens=100,
+        completion_tokens=50,
+        total_tokens=150,
+        input_cost_usd=0.001,
+        output_cost_usd=0.002,
+        total_cost_usd=0.003,
+        processing_time_ms=ms,
+        response_type=response_type,
+        request_timestamp=at,
+        created_at=at,
+    )
+
+
+async def _seed(db: AsyncSession, merchant_id: int) -> None:
+    now = datetime.now(UTC).replace(tzinfo=None)
+    conversation = Conversation(
+        merchant_id=merchant_id, platform="widget", platform_sender_id="s1", created_at=now
+    )
+    older = Conversation(
+        merchant_id=merchant_id,
+        platform="widget",
+        platform_sender_id="s2",
+        created_at=now - timedelta(days=3),
+    )
+    db.add_all([conversation, older])
+    await db.flush()
+    db.add_all(
+        [
+            Message(
+                conversation_id=conversation.id, sender="customer", content="hi", created_at=now
+            ),
+            Message(
+                conversation_id=conversation.id, sender="bot", content="hello", created_at=now
+            ),
+            _cost(conversation.id, merchant_id, 800, "rag", now),
+            _cost(conversation.id, merchant_id, 2400, "general", now),
+            _cost(older.id, merchant_id, 6000, "general", now - timedelta(days=3)),
+        ]
+    )
+    await db.commit()
+
+
+class TestRefresh:
+    """Tests for compaction."""
+
+    async def test_backfill_writes_a_row_per_day(self, async_session, test_merchant):
+        await _seed(async_session, test_merchant)
+        today = datetime.now(UTC).date()
+
+        written = await AnalyticsRollupService(async_session).refresh_incremental(
+            test_merchant, today=today, backfill_days=5
+        )
+
+        assert written == 6
+        rows = (
+            (
+                await async_session.execute(
+                    select(AnalyticsDailyRollup)
+                    .where(AnalyticsDailyRollup.merchant_id == test_merchant)
+                    .order_by(AnalyticsDailyRollup.day)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        assert [r.day for r in rows][-1] == today
+        latest = rows[-1]
+        assert latest.conversations_started == 1
+        assert latest.customer_messages == 1
+        assert latest.bot_messages == 1
+        assert latest.llm_requests == 2
+        assert latest.response_time_count == 2
+        assert set(latest.response_time_histogram) == {"rag", "general"}
+        assert sum(r.conversations_started for r in rows) == 2
+
+    async def test_second_run_only_recomputes_recent_days(self, async_session, test_merchant):
+        await _seed(async_session, test_merchant)
+        service = AnalyticsRollupService(async_session)
+        today = datetime.now(UTC).date()
+        await service.refresh_incremental(test_merchant, today=today, backfill_days=5)
+
+        written = await service.refresh_incremental(test_merchant, today=today, backfill_days=5)
+
+        assert written == 2
+        assert await service.covers(test_merchant, today - timedelta(days=5), today)
+        assert not await service.covers(test_merchant, today - timedelta(days=6), today)
+
+
+class TestRollupBackedWidgets:
+    """Rollup reads agree with the raw queries."""
+
+    async def test_peak_hours_match_raw(self, async_session, test_merchant):
+        await _seed(async_session, test_merchant)
+        await AnalyticsRollupService(async_session).refresh_incremental(
+            test_merchant, backfill_days=40
+        )
+
+        from_rollups = await AggregatedAnalyticsService(
+            async_session, use_rollups=True
+        ).get_peak_hours(test_merchant, days=7)
+        from_raw = await AggregatedAnalyticsService(
+            async_session, use_rollups=False
+        ).get_peak_hours(test_merchant, days=7)
+
+        def by_slot(breakdown):
+            return sorted(breakdown, key=lambda h: (h["dayOfWeek"], h["hour"]))
+
+        assert by_slot(from_rollups["hourlyBreakdown"]) == by_slot(from_raw["hourlyBreakdown"])
+        assert from_rollups["totalConversations"] == 2
+
+    async def test_response_time_histogram_matches_raw(self, async_session, test_merchant):
+        await _seed(async_session, test_merchant)
+        await AnalyticsRollupService(async_session).refresh_incremental(
+            test_merchant, backfill_days=40
+        )
+
+        from_rollups = await AggregatedAnalyticsService(
+            async_session, use_rollups=True
+        ).get_response_time_distribution(test_merchant, days=7)
+        from_raw = await AggregatedAnalyticsService(
+            async_session, use_rollups=False
+        ).get_response_time_distribution(test_merchant, days=7)
+
+        assert from_rollups["count"] == from_raw["count"] == 3
+        assert from_rollups["histogram"] == from_raw["histogram"]
+        assert from_rollups["responseTypeBreakdown"]["rag"]["count"] == 1
+
+    async def test_uncovered_window_falls_back_to_raw(self, async_session, test_merchant):
+        await _seed(async_session, test_merchant)
+
+        result = await AggregatedAnalyticsService(
+            async_session, use_rollups=True
+        ).get_peak_hours(test_merchant, days=7)
+
+        assert result["totalConversations"] == 2
+
+
+class TestCustomerSentimentByDay:
+    """Stored sentiment labels are grouped; unlabelled messages are analyzed."""
+
+    async def test_counts_stored_and_unlabelled_messages(
+        self, async_session, test_merchant, test_conversation
+    ):
+        now = datetime.now(UTC).replace(tzinfo=None)
+        labelled = Message(
+            conversation_id=test_conversation.id,
+            sender="customer",
+            content="ciphertext",
+            sentiment="negative",
+            sentiment_score=-1.0,
+            created_at=now,
+        )
+        unlabelled = Message(
+            conversation_id=test_conversation.id,
+            sender="customer",
+            content="This is great, thank you!",
+            created_at=now,
+        )
+        async_session.add_all([labelled, unlabelled])
+        await async_session.commit()
+
+        counts = await customer_sentiment_by_day(
+            async_session, test_merchant, now - timedelta(days=1)
+        )
+
+        assert counts[now.date()] == {"positive": 1, "negative": 1, "neutral": 0}
@@ -0,0 +1,193 @@
+"""Tests for the batched dashboard snapshot.
+
+Covers:
+- Planning: RAGQueryLog widgets share one scan per (clamped) period
+- The shared scan produces the same widget data as the individual routes
+- Per-widget error events and route-identical response bodies
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import delete
+
+from app.models.rag_query_log import RAGQueryLog
+from app.services.analytics import dashboard_snapshot_service
+from app.services.analytics.aggregated_analytics_service import AggregatedAnalyticsService
+from app.services.analytics.analytics_result_cache import AnalyticsResultCache
+from app.services.analytics.dashboard_snapshot_service import (
+    RAG_QUERY_LOG_SCAN,
+    DashboardSnapshotService,
+    SnapshotWidget,
+)
+
+RAG_WIDGETS = ["knowledge-effectiveness", "top-topics", "failed-queries", "question-categories"]
+
+
+def _session_factory(session):
+    @asynccontextmanager
+    async def factory():
+        yield session
+
+    return factory
+
+
+async def _collect(service: DashboardSnapshotService, merchant_id: int, widgets, days: int):
+    return {
+        event["widget"]: event async for event in service.stream(merchant_id, widgets, days)
+    }
+
+
+class TestPlan:
+    """Tests for grouping widgets into tasks."""
+
+    def test_rag_widgets_share_a_scan_per_period(self):
+        tasks = DashboardSnapshotService.plan(
+            ["top-topics", "peak-hours", "failed-queries", "knowledge-effectiveness"], days=60
+        )
+
+        scans = [(t.scan, t.scan_days, [w[0] for w in t.widgets]) for t in tasks]
+        assert (RAG_QUERY_LOG_SCAN, 60, ["top-topics", "failed-queries"]) in scans
+        # knowledge-effectiveness is capped at 30 days like its route
+        assert (RAG_QUERY_LOG_SCAN, 30, ["knowledge-effectiveness"]) in scans
+        assert (None, None, ["peak-hours"]) in scans
+
+    def test_duplicates_are_computed_once(self):
+        tasks = DashboardSnapshotService.plan(["peak-hours", "peak-hours"], days=7)
+
+        assert len(tasks) == 1
+
+    def test_unknown_widget_is_rejected(self):
+        with pytest.raises(ValueError, match="no-such-widget"):
+            DashboardSnapshotService.plan(["peak-hours", "no-such-widget"], days=7)
+
+
+class TestStream:
+    """Tests for streaming widget events."""
+
+    @pytest.mark.asyncio
+    async def test_failing_widget_yields_error_event(self, monkeypatch):
+        widgets = dict(dashboard_snapshot_service.SNAPSHOT_WIDGETS)
+        widgets["ok"] = SnapshotWidget(
+            service=lambda db: None,
+            params=lambda days: {"days": days},
+            compute=AsyncMock(return_value=[1, 2]),
+            body=lambda result, m, p: {"items": result, "merchantId": m},
+        )
+        widgets["broken"] = SnapshotWidget(
+            service=lambda db: None,
+            params=lambda days: {"days": days},
+            compute=AsyncMock(side_effect=RuntimeError("query failed")),
+        )
+        monkeypatch.setattr(dashboard_snapshot_service, "SNAPSHOT_WIDGETS", widgets)
+        service = DashboardSnapshotService(
+            session_factory=_session_factory(AsyncMock()), concurrency=2
+        )
+
+        events = await _collect(service, 7, ["ok", "broken"], days=7)
+
+        assert events["ok"] == {
+            "widget": "ok",
+            "status": "ok",
+            "data": {"items": [1, 2], "merchantId": 7},
+        }
+        assert events["broken"]["status"] == "error"
+        assert "query failed" in events["broken"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_results_go_through_the_route_cache_keys(self):
+        cache = AnalyticsResultCache()
+        cached = AsyncMock(return_value={"hours": []})
+        await cache.get_or_compute(7, "peak-hours", {"days": 30}, cached)
+        service = DashboardSnapshotService(
+            session_factory=_session_factory(AsyncMock()), cache=cache
+        )
+
+        events = await _collect(service, 7, ["peak-hours"], days=30)
+
+        assert events["peak-hours"]["data"] == {"hours": []}
+        assert cache.stats()["local_hits"] == 1
+
+
+class TestRagQueryLogScan:
+    """The shared RAGQueryLog scan matches the per-widget queries."""
+
+    @pytest.fixture(autouse=True)
+    async def _clean_query_logs(self, async_session, test_merchant):
+        # rag_query_logs is not truncated between tests and merchant IDs are reused
+        await async_session.execute(
+            delete(RAGQueryLog).where(RAGQueryLog.merchant_id == test_merchant)
+        )
+        await async_session.commit()
+        yield
+        await async_session.rollback()
+        await async_session.execute(
+            delete(RAGQueryLog).where(RAGQueryLog.merchant_id == test_merchant)
+        )
+        await async_session.commit()
+
+    async def _seed(self, session, merchant_id: int) -> None:
+        now = datetime.now(UTC)
+        logs = [
+            ("How do I return an item?", False, 0.1, timedelta(hours=1)),
+            ("How do I return an item?", False, 0.2, timedelta(days=1)),
+            ("How do I return an item?", False, 0.15, timedelta(days=2)),
+            ("shipping cost", True, 0.9, timedelta(hours=2)),
+            ("shipping cost", True, 0.8, timedelta(days=3)),
+            ("product size", False, 0.3, timedelta(days=1)),
+            ("shipping cost", True, 0.7, timedelta(days=10)),
+            ("store hours", True, 0.6, timedelta(days=12)),
+        ]
+        for query, matched, confidence, age in logs:
+            session.add(
+                RAGQueryLog(
+                    merchant_id=merchant_id,
+                    query=query,
+                    matched=matched,
+                    confidence=confidence,
+                    created_at=now - age,
+                )
+            )
+        await session.commit()
+
+    @pytest.mark.asyncio
+    async def test_matches_individual_widgets(self, async_session, test_merchant):
+        await self._seed(async_session, test_merchant)
+        service = AggregatedAnalyticsService(async_session)
+        snapshot = DashboardSnapshotService(
+            session_factory=_session_factory(async_session), concurrency=1
+        )
+
+        events = await _collect(snapshot, test_merchant, RAG_WIDGETS, days=7)
+
+        assert all(event["status"] == "ok" for event in events.values())
+
+        effectiveness = events["knowledge-effectiveness"]["data"]["data"]
+        expected = await service.get_knowledge_effectiveness(test_merchant, 7)
+        effectiveness.pop("lastUpdated")
+        expected.pop("lastUpdated")
+        assert effectiveness == expected
+        assert effectiveness["totalQueries"] == 6
+
+        topics = events["top-topics"]["data"]["data"]
+        expected = await service.get_top_topics(test_merchant, 7)
+        assert topics["topics"] == expected["topics"]
+        assert [t["trend"] for t in topics["topics"]] == ["new", "up", "new"]
+
+        failed = events["failed-queries"]["data"]
+        expected = await service.get_failed_queries(test_merchant, 7)
+        assert failed == expected
+        assert [f["frequency"] for f in failed] == [3, 1]
+
+        categories = events["question-categories"]["data"]
+        expected = await service.get_question_categories(test_merchant, 7)
+        assert [c["category"] for c in categories] == [c["category"] for c in expected]
+        for actual, wanted in zip(categories, expected, strict=True):
+            assert actual["volume"] == wanted["volume"]
+            assert actual["matchRate"] == pytest.approx(wanted["matchRate"])
+            assert actual["avgConfidence"] == pytest.approx(wanted["avgConfidence"])
+            assert actual["topQuestions"] == wanted["topQuestions"]
@@ -0,0 +1,58 @@
+"""Tests for the mergeable latency histogram."""
+
+from __future__ import annotations
+
+import random
+
+from app.services.analytics.latency_histogram import LATENCY_BUCKET_EDGES_MS, LatencyHistogram
+
+
+def _exact_percentile(values: list[float], p: float) -> float:
+    data = sorted(values)
+    k = (len(data) - 1) * p / 100
+    f = int(k)
+    c = min(f + 1, len(data) - 1)
+    return data[f] * (c - k) + data[c] * (k - f) if f != c else data[f]
+
+
+class TestLatencyHistogram:
+    """Tests for bucketing, merging and percentiles."""
+
+    def test_empty_histogram_has_no_percentiles(self):
+        assert LatencyHistogram().percentiles() == {"p50": None, "p95": None, "p99": None}
+
+    def test_percentiles_within_one_bucket_of_exact(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(7, 0.6) for _ in range(5000)]
+        histogram = LatencyHistogram.from_values(values)
+
+        for p in (50, 95, 99):
+            exact = _exact_percentile(values, p)
+            approx = histogram.percentile(p)
+            width = 50 if exact < 1000 else 100 if exact < 5000 else 250
+            assert abs(approx - exact) <= width
+
+    def test_sparse_round_trip_and_merge(self):
+        day_1 = LatencyHistogram.from_values([120, 480, 2200])
+        day_2 = LatencyHistogram.from_values([130, 7000])
+
+        merged = LatencyHistogram.from_sparse(day_1.to_sparse()).merge(
+            LatencyHistogram.from_sparse(day_2.to_sparse())
+        )
+
+        assert merged.count == 5
+        assert merged.counts == LatencyHistogram.from_values([120, 480, 2200, 130, 7000]).counts
+
+    def test_count_between_matches_dashboard_buckets(self):
+        histogram = LatencyHistogram.from_values([0, 999, 1000, 2999, 4999, 5000, 120000])
+
+        assert histogram.count_between(0, 1000) == 2
+        assert histogram.count_between(1000, 3000) == 2
+        assert histogram.count_between(3000, 5000) == 1
+        assert histogram.count_between(5000, None) == 2
+
+    def test_values_beyond_last_edge_land_in_overflow_bucket(self):
+        histogram = LatencyHistogram.from_values([10**7])
+
+        assert histogram.counts[-1] == 1
+        assert histogram.percentile(50) == LATENCY_BUCKET_EDGES_MS[-1]
@@ -0,0 +1,115 @@
+"""Tests for database-side percentile and bucket aggregates."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import column, select
+from sqlalchemy.dialects import postgresql
+
+from app.models.llm_conversation_cost import LLMConversationCost
+from app.services.analytics.aggregated_analytics_service import (
+    AggregatedAnalyticsService,
+    ResponseTimeStats,
+)
+from app.services.analytics.sql_distribution import (
+    bucket_count_columns,
+    bucket_counts_from_row,
+    percentile_columns,
+    percentiles_from_row,
+)
+
+BUCKETS = [
+    {"label": "0-1s", "min": 0, "max": 1000, "color": "green"},
+    {"label": "1s+", "min": 1000, "max": None, "color": "red"},
+]
+
+
+def _compile(*columns) -> str:
+    return str(select(*columns).compile(dialect=postgresql.dialect()))
+
+
+class TestSqlDistribution:
+    """Tests for the SQL builders and row readers."""
+
+    def test_percentile_columns_use_percentile_cont(self):
+        sql = _compile(*percentile_columns(column("ms"), prefix="rag_"))
+
+        assert sql.count("WITHIN GROUP") == 3
+        assert "rag_p50" in sql and "rag_p99" in sql
+
+    def test_bucket_columns_filter_half_open_ranges(self):
+        sql = _compile(*bucket_count_columns(column("ms"), BUCKETS))
+
+        assert "count(*) FILTER (WHERE ms >=" in sql
+        assert "bucket_1" in sql
+
+    def test_row_readers(self):
+        row = SimpleNamespace(p50=512.7, p95=None, p99=900.0, bucket_0=3, bucket_1=None)
+
+        assert percentiles_from_row(row) == {"p50": 512, "p95": None, "p99": 900}
+        assert percentiles_from_row(None) == {"p50": None, "p95": None, "p99": None}
+        assert [b["count"] for b in bucket_counts_from_row(row, BUCKETS)] == [3, 0]
+
+
+class TestRawResponseTimes:
+    """The raw response-time path matches linear-interpolation percentiles."""
+
+    async def test_percentiles_and_buckets(self, async_session, test_merchant):
+        now = datetime.now(UTC).replace(tzinfo=None)
+        samples = [
+            (200, "rag", now),
+            (800, "rag", now),
+            (1500, "general", now),
+            (4000, None, now),
+            (9000, "general", now),
+            (300, "rag", now - timedelta(days=10)),
+        ]
+        for ms, response_type, at in samples:
+            async_session.add(
+                LLMConversationCost(
+                    conversation_id="c1",
+                    merchant_id=test_merchant,
+                    provider="openai",
+                    model="gpt-4o-mini",
+                    prompt_tokens=1,
+                    completion_tokens=1,
+                    total_tokens=2,
+                    input_cost_usd=0.0,
+                    output_cost_usd=0.0,
+                    total_cost_usd=0.0,
+                    processing_time_ms=ms,
+                    response_type=response_type,
+                    request_timestamp=at,
+                    created_at=at,
+                )
+            )
+        await async_session.commit()
+
+        result = await AggregatedAnalyticsService(
+            async_session, use_rollups=False
+        ).get_response_time_distribution(test_merchant, days=7)
+
+        percentiles = result["percentiles"]
+        assert result["count"] == 5
+        assert percentiles["p50"] == 1500
+        assert abs(percentiles["p95"] - 8000) <= 1
+        assert abs(percentiles["p99"] - 8800) <= 1
+        assert [b["count"] for b in result["histogram"]] == [2, 1, 0, 1, 1]
+        assert result["previousPeriod"]["percentiles"]["p50"] == 300
+        assert result["responseTypeBreakdown"]["rag"]["count"] == 2
+        assert result["responseTypeBreakdown"]["rag"]["percentiles"]["p50"] == 500
+        assert result["responseTypeBreakdown"]["general"]["count"] == 3
+
+    async def test_raw_path_returns_named_stats(self, async_session, test_merchant):
+        cutoff = datetime.now(UTC).replace(tzinfo=None) - timedelta(days=7)
+
+        stats = await AggregatedAnalyticsService(
+            async_session, use_rollups=False
+        )._raw_response_times(test_merchant, 7, cutoff, BUCKETS)
+
+        assert isinstance(stats, ResponseTimeStats)
+        assert stats.count == stats.rag_count == stats.general_count == 0
+        assert stats.histogram == []
+        assert stats.previous_percentiles == {"p50": None, "p95": None, "p99": None}
@@ -0,0 +1,164 @@
+"""Tests for process-pool document text extraction.
+
+Covers:
+- Chunks from worker processes match in-process chunking
+- Page progress callbacks per extraction window
+- Per-document deadline
+- Worker-thread fallback when no executor is configured
+- DocumentProcessor dispatching to the executor
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.knowledge_base import DocumentStatus, KnowledgeDocument
+from app.services.knowledge.chunker import ChunkingError, DocumentChunker
+from app.services.knowledge.extraction_executor import (
+    ExtractionExecutor,
+    ExtractionTimeoutError,
+    iter_document_chunks_off_loop,
+)
+from app.services.rag.document_processor import DocumentProcessor
+from app.services.rag.embedding_service import EmbeddingResult, EmbeddingService
+
+
+@pytest.fixture
+def executor():
+    executor = ExtractionExecutor(max_workers=1, timeout_seconds=60)
+    yield executor
+    executor.shutdown()
+
+
+class TestExtractionExecutor:
+    """Tests for ExtractionExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_pool_chunks_match_inline_chunking(self, executor, tmp_path):
+        chunker = DocumentChunker()
+        test_file = os.path.join(tmp_path, "faq.txt")
+        with open(test_file, "w") as f:
+            f.write("Orders ship within two business days. " * 200)
+
+        pages = []
+        chunks = [
+            chunk
+            async for chunk in executor.iter_document_chunks(
+                chunker, test_file, "txt", on_page=lambda done, total: pages.append((done, total))
+            )
+        ]
+
+        assert chunks == chunker.chunk_document(test_file, "txt")
+        assert pages == [(1, 1)]
+
+    @pytest.mark.asyncio
+    async def test_worker_errors_propagate_as_chunking_error(self, executor, tmp_path):
+        with pytest.raises(ChunkingError, match="Failed to extract text from PDF"):
+            async for _ in executor.iter_pages(os.path.join(tmp_path, "missing.pdf"), "pdf"):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_deadline_exceeded_raises_timeout(self, tmp_path):
+        executor = ExtractionExecutor(timeout_seconds=0)
+
+        with pytest.raises(ExtractionTimeoutError):
+            async for _ in executor.iter_pages(os.path.join(tmp_path, "any.pdf"), "pdf"):
+                pass
+
+
+class TestIterDocumentChunksOffLoop:
+    """Tests for the executor-or-thread chunk iterator."""
+
+    @pytest.mark.asyncio
+    async def test_thread_fallback_matches_inline_chunking(self, tmp_path):
+        chunker = DocumentChunker()
+        test_file = os.path.join(tmp_path, "faq.txt")
+        with open(test_file, "w") as f:
+            f.write("Orders ship within two business days. " * 200)
+
+        chunks = [c async for c in iter_document_chunks_off_loop(chunker, test_file, "txt")]
+
+        assert chunks == chunker.chunk_document(test_file, "txt")
+
+    @pytest.mark.asyncio
+    async def test_thread_fallback_parses_off_the_event_loop(self, tmp_path):
+        chunker = DocumentChunker()
+        test_file = os.path.join(tmp_path, "faq.txt")
+        with open(test_file, "w") as f:
+            f.write("Returns are accepted within thirty days of delivery. " * 50)
+        parse_threads = []
+        iter_pages = chunker.iter_pages
+
+        def tracking_iter_pages(*args, **kwargs):
+            parse_threads.append(threading.get_ident())
+            yield from iter_pages(*args, **kwargs)
+
+        chunker.iter_pages = tracking_iter_pages
+
+        chunks = [c async for c in iter_document_chunks_off_loop(chunker, test_file, "txt")]
+
+        assert chunks
+        assert parse_threads and threading.get_ident() not in parse_threads
+
+    @pytest.mark.asyncio
+    async def test_thread_fallback_raises_chunking_error(self, tmp_path):
+        with pytest.raises(ChunkingError):
+            async for _ in iter_document_chunks_off_loop(
+                DocumentChunker(), os.path.join(tmp_path, "missing.pdf"), "pdf"
+            ):
+                pass
+
+
+class TestDocumentProcessorDispatch:
+    """DocumentProcessor uses the executor instead of in-process extraction."""
+
+    @pytest.mark.asyncio
+    async def test_process_document_uses_extraction_executor(self):
+        mock_db = MagicMock(spec=AsyncSession)
+        mock_chunker = MagicMock(spec=DocumentChunker)
+        mock_embedding = MagicMock(spec=EmbeddingService)
+        mock_document = KnowledgeDocument(
+            id=1,
+            merchant_id=1,
+            filename="big.pdf",
+            file_type="pdf",
+            file_size=1000,
+            status=DocumentStatus.PENDING.value,
+        )
+
+        async def mock_execute(query, params=None):
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = mock_document
+            return result
+
+        async def pooled_chunks(chunker, file_path, file_type, on_page=None):
+            on_page(1, 1)
+            yield "Pooled chunk"
+
+        mock_db.execute = mock_execute
+        mock_db.commit = AsyncMock()
+        mock_embedding.embed_texts = AsyncMock(
+            return_value=EmbeddingResult(
+                embeddings=[[0.1] * 768],
+                model="nomic-embed-text",
+                provider="ollama",
+                dimension=768,
+            )
+        )
+        executor = MagicMock(spec=ExtractionExecutor)
+        executor.iter_document_chunks = pooled_chunks
+
+        with patch.object(DocumentProcessor, "_get_file_path", return_value="/path/big.pdf"):
+            processor = DocumentProcessor(
+                mock_db, mock_embedding, mock_chunker, extraction_executor=executor
+            )
+            result = await processor.process_document(1)
+
+        assert result.status == "ready"
+        assert result.chunk_count == 1
+        mock_chunker.iter_document_chunks.assert_not_called()
@@ -7,18 +7,21 @@ Test Coverage:
 - AC4: Error handling (chunking failure, embedding failure)
 - Performance tracking
 - Document status updates
+- Embedding reuse by content hash across the merchant's documents
 """
 
 from __future__ import annotations
 
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.errors import APIError, ErrorCode
-from app.models.knowledge_base import DocumentStatus, KnowledgeDocument
-from app.services.knowledge.chunker import ChunkingError, DocumentChunker
+from app.models.knowledge_base import DocumentChunk, DocumentStatus, KnowledgeDocument
+from app.services.knowledge.chunker import ChunkingError, DocumentChunker, content_hash
 from app.services.rag.document_processor import DocumentProcessor, ProcessingResult
 from app.services.rag.embedding_service import EmbeddingResult, EmbeddingService
 
@@ -69,7 +72,7 @@ class TestProcessDocument:
             status=DocumentStatus.PENDING.value,
         )
 
-        async def mock_execute(query):
+        async def mock_execute(query, params=None):
             result = MagicMock()
             result.scalar_one_or_none.return_value = mock_document
             return result
@@ -80,11 +83,9 @@ class TestProcessDocument:
         mock_db.refresh = AsyncMock()
 
         # Mock chunker
-        mock_chunker.chunk_document.return_value = [
-            "Chunk 1 content",
-            "Chunk 2 content",
-            "Chunk 3 content",
-        ]
+        mock_chunker.iter_document_chunks.return_value = iter(
+            ["Chunk 1 content", "Chunk 2 content", "Chunk 3 content"]
+        )
 
         # Mock embedding service
         mock_embedding.embed_texts = AsyncMock(
@@ -111,6 +112,55 @@ class TestProcessDocument:
         assert result.error_message is None
         assert result.processing_time_ms > 0
 
+    @pytest.mark.asyncio
+    async def test_answer_cache_invalidation_failure_keeps_document_ready(self):
+        """A failed post-commit cache invalidation does not fail processing."""
+        mock_db = MagicMock(spec=AsyncSession)
+        mock_embedding = MagicMock(spec=EmbeddingService)
+        mock_chunker = MagicMock(spec=DocumentChunker)
+        mock_document = KnowledgeDocument(
+            id=1,
+            merchant_id=1,
+            filename="test.pdf",
+            file_type="pdf",
+            file_size=1000,
+            status=DocumentStatus.PENDING.value,
+        )
+
+        async def mock_execute(query, params=None):
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = mock_document
+            return result
+
+        mock_db.execute = mock_execute
+        mock_db.commit = AsyncMock()
+        mock_db.add = MagicMock()
+        mock_db.refresh = AsyncMock()
+        mock_chunker.iter_document_chunks.return_value = iter(["Chunk 1 content"])
+        mock_embedding.embed_texts = AsyncMock(
+            return_value=EmbeddingResult(
+                embeddings=[[0.1] * 1536],
+                model="text-embedding-3-small",
+                provider="openai",
+                dimension=1536,
+                token_count=10,
+            )
+        )
+
+        with (
+            patch.object(DocumentProcessor, "_get_file_path", return_value="/path/to/test.pdf"),
+            patch(
+                "app.services.rag.document_processor.invalidate_merchant_answers",
+                AsyncMock(side_effect=ConnectionError("redis down")),
+            ) as invalidate,
+        ):
+            processor = DocumentProcessor(mock_db, mock_embedding, mock_chunker)
+            result = await processor.process_document(1)
+
+        invalidate.assert_awaited_once_with(1)
+        assert result.status == "ready"
+        assert result.error_message is None
+
     @pytest.mark.asyncio
     async def test_process_document_chunking_failure(self):
         """AC4: Test chunking failure updates status to error."""
@@ -128,7 +178,7 @@ class TestProcessDocument:
             status=DocumentStatus.PENDING.value,
         )
 
-        async def mock_execute(query):
+        async def mock_execute(query, params=None):
             result = MagicMock()
             result.scalar_one_or_none.return_value = mock_document
             return result
@@ -137,7 +187,9 @@ class TestProcessDocument:
         mock_db.commit = AsyncMock()
 
         # Mock chunker to raise error
-        mock_chunker.chunk_document.side_effect = ChunkingError("Failed to extract text from PDF")
+        mock_chunker.iter_document_chunks.side_effect = ChunkingError(
+            "Failed to extract text from PDF"
+        )
 
         with patch.object(
             DocumentProcessor,
@@ -168,7 +220,7 @@ class TestProcessDocument:
             status=DocumentStatus.PENDING.value,
         )
 
-        async def mock_execute(query):
+        async def mock_execute(query, params=None):
             result = MagicMock()
             result.scalar_one_or_none.return_value = mock_document
             return result
@@ -177,7 +229,7 @@ class TestProcessDocument:
         mock_db.commit = AsyncMock()
 
         # Mock chunker
-        mock_chunker.chunk_document.return_value = ["Chunk 1", "Chunk 2"]
+        mock_chunker.iter_document_chunks.return_value = iter(["Chunk 1", "Chunk 2"])
 
         # Mock embedding failure
         mock_embedding.embed_texts = AsyncMock(
@@ -205,7 +257,7 @@ class TestProcessDocument:
         mock_db = MagicMock(spec=AsyncSession)
         mock_embedding = MagicMock(spec=EmbeddingService)
 
-        async def mock_execute(query):
+        async def mock_execute(query, params=None):
             result = MagicMock()
             result.scalar_one_or_none.return_value = None
             return result
@@ -236,7 +288,7 @@ class TestProcessDocument:
             status=DocumentStatus.PENDING.value,
         )
 
-        async def mock_execute(query):
+        async def mock_execute(query, params=None):
             result = MagicMock()
             result.scalar_one_or_none.return_value = mock_document
             return result
@@ -245,7 +297,7 @@ class TestProcessDocument:
         mock_db.commit = AsyncMock()
 
         # Mock chunker returns empty list
-        mock_chunker.chunk_document.return_value = []
+        mock_chunker.iter_document_chunks.return_value = iter([])
 
         with patch.object(
             DocumentProcessor,
@@ -278,7 +330,7 @@ class TestProcessDocument:
 
         execute_calls = []
 
-        async def mock_execute(query):
+        async def mock_execute(query, params=None):
             execute_calls.append(query)
             result = MagicMock()
             result.scalar_one_or_none.return_value = mock_document
@@ -289,7 +341,7 @@ class TestProcessDocument:
         mock_db.add = MagicMock()
 
         # Mock chunker
-        mock_chunker.chunk_document.return_value = ["New chunk"]
+        mock_chunker.iter_document_chunks.return_value = iter(["New chunk"])
 
         # Mock embedding
         mock_embedding.embed_texts = AsyncMock(
@@ -315,33 +367,318 @@ class TestProcessDocument:
         # Verify chunks were deleted before adding new ones
 
 
-class TestFormatEmbedding:
-    """Tests for _format_embedding_for_storage method."""
+class TestStoreChunks:
+    """Tests for _store_chunks method."""
 
-    def test_format_embedding(self):
-        """Test embedding formatting for pgvector storage."""
+    @pytest.mark.asyncio
+    async def test_store_chunks_populates_native_vector_column(self):
+        """Embeddings are stored as a JSONB array plus the matching vector column."""
         mock_db = MagicMock(spec=AsyncSession)
+        mock_db.execute = AsyncMock()
+        mock_db.commit = AsyncMock()
         mock_embedding = MagicMock(spec=EmbeddingService)
 
         processor = DocumentProcessor(mock_db, mock_embedding)
+        await processor._store_chunks(1, ["a", "b"], [[0.1, -0.2] * 384] * 2, start_index=64)
+
+        rows = mock_db.execute.call_args[0][1]
+        assert [row["chunk_index"] for row in rows] == [64, 65]
+        assert rows[0]["embedding"] == [0.1, -0.2] * 384
+        assert rows[0]["embedding_dimension"] == 768
+        assert rows[0]["embedding_768"] == [0.1, -0.2] * 384
+        assert rows[0]["embedding_1536"] is None
+        assert rows[0]["embedding_3072"] is None
+        mock_db.commit.assert_awaited_once()
+
+
+class TestStreamingPipeline:
+    """Tests for the bounded extract -> embed -> store pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_large_document_is_embedded_in_ordered_batches(self):
+        """Chunks are embedded in batches and stored with contiguous indexes."""
+        mock_db = MagicMock(spec=AsyncSession)
+        mock_embedding = MagicMock(spec=EmbeddingService)
+        mock_chunker = MagicMock(spec=DocumentChunker)
+
+        mock_document = KnowledgeDocument(
+            id=1,
+            merchant_id=1,
+            filename="big.pdf",
+            file_type="pdf",
+            file_size=10_000_000,
+            status=DocumentStatus.PENDING.value,
+        )
+        stored_rows = []
+
+        async def mock_execute(query, params=None):
+            if params is not None:
+                stored_rows.extend(params)
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = mock_document
+            return result
+
+        mock_db.execute = mock_execute
+        mock_db.commit = AsyncMock()
+        mock_chunker.iter_document_chunks.return_value = iter(f"chunk {i}" for i in range(10))
+
+        async def embed_texts(texts):
+            return EmbeddingResult(
+                embeddings=[[float(len(t))] * 768 for t in texts],
+                model="nomic-embed-text",
+                provider="ollama",
+                dimension=768,
+            )
+
+        mock_embedding.embed_texts = AsyncMock(side_effect=embed_texts)
+
+        with patch.object(DocumentProcessor, "_get_file_path", return_value="/path/big.pdf"):
+            processor = DocumentProcessor(mock_db, mock_embedding, mock_chunker)
+            processor.EMBED_BATCH_SIZE = 3
+            processor.EMBED_CONCURRENCY = 2
+            result = await processor.process_document(1)
+
+        assert result.status == "ready"
+        assert result.chunk_count == 10
+        assert [len(call.args[0]) for call in mock_embedding.embed_texts.call_args_list] == [
+            3,
+            3,
+            3,
+            1,
+        ]
+        assert [row["chunk_index"] for row in stored_rows] == list(range(10))
+        assert [row["content"] for row in stored_rows] == [f"chunk {i}" for i in range(10)]
+
+    @pytest.mark.asyncio
+    async def test_embedding_failure_mid_document_discards_partial_chunks(self):
+        """A failing batch marks the document as errored and removes written chunks."""
+        mock_db = MagicMock(spec=AsyncSession)
+        mock_embedding = MagicMock(spec=EmbeddingService)
+        mock_chunker = MagicMock(spec=DocumentChunker)
+
+        mock_document = KnowledgeDocument(
+            id=1,
+            merchant_id=1,
+            filename="big.pdf",
+            file_type="pdf",
+            file_size=1000,
+            status=DocumentStatus.PENDING.value,
+        )
 
-        embedding = [0.1, -0.2, 0.5]
-        result = processor._format_embedding_for_storage(embedding)
+        async def mock_execute(query, params=None):
+            result = MagicMock()
+            result.scalar_one_or_none.return_value = mock_document
+            return result
 
-        assert result == "[0.1,-0.2,0.5]"
+        mock_db.execute = mock_execute
+        mock_db.commit = AsyncMock()
+        mock_db.rollback = AsyncMock()
+        mock_chunker.iter_document_chunks.return_value = iter(["a", "b", "c", "d"])
+        mock_embedding.embed_texts = AsyncMock(
+            side_effect=[
+                EmbeddingResult(
+                    embeddings=[[0.1] * 768] * 2,
+                    model="nomic-embed-text",
+                    provider="ollama",
+                    dimension=768,
+                ),
+                Exception("Ollama unavailable"),
+            ]
+        )
 
-    def test_format_embedding_large(self):
-        """Test formatting large embedding vector."""
+        with patch.object(DocumentProcessor, "_get_file_path", return_value="/path/big.pdf"):
+            processor = DocumentProcessor(mock_db, mock_embedding, mock_chunker)
+            processor.EMBED_BATCH_SIZE = 2
+            processor.EMBED_CONCURRENCY = 1
+            result = await processor.process_document(1)
+
+        assert result.status == "error"
+        assert result.error_message == "Embedding generation failed: Ollama unavailable"
+        mock_db.rollback.assert_awaited()
+
+
+class TestIncrementalReprocessing:
+    """Tests for content-hash based embedding reuse."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_chunks_reuse_stored_embeddings(self):
+        """Only chunks whose content hash changed are sent to the provider."""
         mock_db = MagicMock(spec=AsyncSession)
         mock_embedding = MagicMock(spec=EmbeddingService)
+        mock_embedding.provider = "openai"
+        mock_embedding.model = "text-embedding-3-small"
+        mock_chunker = MagicMock(spec=DocumentChunker)
+
+        mock_document = KnowledgeDocument(
+            id=1,
+            merchant_id=1,
+            filename="faq.pdf",
+            file_type="pdf",
+            file_size=1000,
+            status=DocumentStatus.READY.value,
+            embedding_version="openai-text-embedding-3-small",
+        )
+        stored_rows = []
+        statements = []
+
+        async def mock_execute(query, params=None):
+            sql = str(query)
+            statements.append(sql)
+            result = MagicMock()
+            if params is not None:
+                stored_rows.extend(params)
+            elif "max(document_chunks.id)" in sql:
+                result.scalar_one_or_none.return_value = 7
+            elif "document_chunks.content_hash, document_chunks.embedding" in sql:
+                result.all.return_value = [
+                    SimpleNamespace(
+                        content_hash=content_hash("Unchanged answer"), embedding=[0.9] * 1536
+                    )
+                ]
+            else:
+                result.scalar_one_or_none.return_value = mock_document
+            return result
+
+        mock_db.execute = mock_execute
+        mock_db.commit = AsyncMock()
+        mock_chunker.iter_document_chunks.return_value = iter(["Unchanged answer", "Edited answer"])
+        mock_embedding.embed_texts = AsyncMock(
+            return_value=EmbeddingResult(
+                embeddings=[[0.1] * 1536],
+                model="text-embedding-3-small",
+                provider="openai",
+                dimension=1536,
+            )
+        )
+
+        with patch.object(DocumentProcessor, "_get_file_path", return_value="/path/faq.pdf"):
+            processor = DocumentProcessor(mock_db, mock_embedding, mock_chunker)
+            result = await processor.process_document(1)
+
+        assert result.status == "ready"
+        mock_embedding.embed_texts.assert_awaited_once_with(["Edited answer"])
+        assert [row["embedding"][0] for row in stored_rows] == [0.9, 0.1]
+        assert stored_rows[1]["content_hash"] == content_hash("Edited answer")
+        # Previous version is removed only after the new chunks are written
+        assert any(
+            sql.startswith("DELETE FROM document_chunks") and "document_chunks.id <=" in sql
+            for sql in statements
+        )
+
+    @pytest.mark.asyncio
+    async def test_reuse_lookup_is_scoped_to_merchant_and_model(self):
+        """Stored vectors from another merchant or model are never reused."""
+        mock_db = MagicMock(spec=AsyncSession)
+        mock_embedding = MagicMock(spec=EmbeddingService)
+        mock_embedding.embedding_version = "ollama-nomic-embed-text"
+        mock_db.execute = AsyncMock(return_value=MagicMock(all=MagicMock(return_value=[])))
 
         processor = DocumentProcessor(mock_db, mock_embedding)
+        document = KnowledgeDocument(id=1, merchant_id=5)
+
+        assert await processor._reused_embeddings(document, ["Some answer"]) == {}
+        query = mock_db.execute.await_args.args[0]
+        params = query.compile().params
+        assert 5 in params.values()
+        assert "ollama-nomic-embed-text" in params.values()
 
-        embedding = [0.1] * 1536
-        result = processor._format_embedding_for_storage(embedding)
+    @pytest.mark.asyncio
+    async def test_new_document_reuses_another_documents_vectors(
+        self, async_session: AsyncSession, test_merchant: int
+    ):
+        """A re-upload (new document) reuses vectors of the merchant's earlier upload."""
+        first = KnowledgeDocument(
+            merchant_id=test_merchant,
+            filename="faq.txt",
+            file_type="txt",
+            file_size=100,
+            status=DocumentStatus.READY.value,
+            embedding_version="openai-text-embedding-3-small",
+        )
+        second = KnowledgeDocument(
+            merchant_id=test_merchant,
+            filename="faq-v2.txt",
+            file_type="txt",
+            file_size=100,
+            status=DocumentStatus.PENDING.value,
+        )
+        async_session.add_all([first, second])
+        await async_session.flush()
+        stored = DocumentChunk(
+            document_id=first.id,
+            chunk_index=0,
+            content="Orders ship within two business days.",
+            content_hash=content_hash("Orders ship within two business days."),
+        )
+        stored.set_embedding([0.9] * 1536)
+        async_session.add(stored)
+        await async_session.commit()
+
+        mock_embedding = MagicMock(spec=EmbeddingService)
+        mock_embedding.embedding_version = "openai-text-embedding-3-small"
+        mock_embedding.embed_texts = AsyncMock(
+            return_value=EmbeddingResult(
+                embeddings=[[0.1] * 1536],
+                model="text-embedding-3-small",
+                provider="openai",
+                dimension=1536,
+            )
+        )
+        mock_chunker = MagicMock(spec=DocumentChunker)
+        mock_chunker.iter_document_chunks.return_value = iter(
+            ["Orders ship within two business days.", "Returns are free for 30 days."]
+        )
+
+        with patch.object(DocumentProcessor, "_get_file_path", return_value="/path/faq-v2.txt"):
+            processor = DocumentProcessor(async_session, mock_embedding, mock_chunker)
+            result = await processor.process_document(second.id)
+
+        assert result.status == "ready"
+        mock_embedding.embed_texts.assert_awaited_once_with(["Returns are free for 30 days."])
+        rows = (
+            await async_session.execute(
+                select(DocumentChunk.chunk_index, DocumentChunk.embedding)
+                .where(DocumentChunk.document_id == second.id)
+                .order_by(DocumentChunk.chunk_index)
+            )
+        ).all()
+        assert [row.embedding[0] for row in rows] == [pytest.approx(0.9), pytest.approx(0.1)]
+
+    @pytest.mark.asyncio
+    async def test_other_merchants_vectors_are_not_reused(
+        self, async_session: AsyncSession, test_merchant: int
+    ):
+        """Identical content from another merchant is embedded again."""
+        other = KnowledgeDocument(
+            merchant_id=test_merchant,
+            filename="faq.txt",
+            file_type="txt",
+            file_size=100,
+            status=DocumentStatus.READY.value,
+            embedding_version="openai-text-embedding-3-small",
+        )
+        async_session.add(other)
+        await async_session.flush()
+        stored = DocumentChunk(
+            document_id=other.id,
+            chunk_index=0,
+            content="Orders ship within two business days.",
+            content_hash=content_hash("Orders ship within two business days."),
+        )
+        stored.set_embedding([0.9] * 1536)
+        async_session.add(stored)
+        await async_session.commit()
+
+        mock_embedding = MagicMock(spec=EmbeddingService)
+        mock_embedding.embedding_version = "openai-text-embedding-3-small"
+        processor = DocumentProcessor(async_session, mock_embedding)
+        document = KnowledgeDocument(id=other.id + 1, merchant_id=test_merchant + 1000)
+
+        reused = await processor._reused_embeddings(
+            document, ["Orders ship within two business days."]
+        )
 
-        assert result.startswith("[0.1")
-        assert result.endswith("0.1]")
+        assert reused == {}
 
 
 class TestProcessingResult:
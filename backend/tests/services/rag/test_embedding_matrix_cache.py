@@ -0,0 +1,119 @@
+"""Tests for the in-process embedding matrix cache.
+
+Covers:
+- Matrix construction from JSONB rows (normalization, dimension filtering)
+- Vectorized top-k with threshold
+- LRU eviction under a memory budget, TTL expiry and merchant invalidation
+"""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services.rag.embedding_matrix_cache import EmbeddingMatrix, EmbeddingMatrixCache
+
+
+def _row(chunk_id: int, embedding: list[float] | str) -> SimpleNamespace:
+    return SimpleNamespace(
+        chunk_id=chunk_id,
+        content=f"chunk {chunk_id}",
+        chunk_index=chunk_id,
+        document_name="faq.pdf",
+        document_id=10,
+        embedding_json=embedding if isinstance(embedding, str) else json.dumps(embedding),
+    )
+
+
+def _matrix(n: int = 3, dimension: int = 4) -> EmbeddingMatrix:
+    rows = [_row(i, [float(i == j) for j in range(dimension)]) for i in range(n)]
+    return EmbeddingMatrix.from_rows(rows, dimension)
+
+
+class TestEmbeddingMatrix:
+    """Tests for EmbeddingMatrix construction and search."""
+
+    def test_from_rows_normalizes_and_skips_bad_rows(self):
+        rows = [
+            _row(1, [3.0, 4.0]),
+            _row(2, [1.0, 0.0, 0.0]),  # wrong dimension
+            _row(3, "not json"),
+        ]
+
+        matrix = EmbeddingMatrix.from_rows(rows, dimension=2)
+
+        assert matrix.size == 1
+        assert matrix.matrix.dtype == np.float32
+        assert matrix.matrix.flags["C_CONTIGUOUS"]
+        assert np.allclose(matrix.matrix[0], [0.6, 0.8])
+        assert matrix.chunk_ids.tolist() == [1]
+
+    def test_top_k_orders_by_similarity_and_applies_threshold(self):
+        rows = [
+            _row(1, [1.0, 0.0]),
+            _row(2, [0.8, 0.6]),
+            _row(3, [0.0, 1.0]),
+        ]
+        matrix = EmbeddingMatrix.from_rows(rows, dimension=2)
+
+        results = matrix.top_k([2.0, 0.0], top_k=2, threshold=0.5)
+
+        assert [matrix.chunk_ids[i] for i, _ in results] == [1, 2]
+        assert results[0][1] == pytest.approx(1.0)
+        assert results[1][1] == pytest.approx(0.8)
+
+    def test_top_k_empty_matrix(self):
+        matrix = EmbeddingMatrix.from_rows([], dimension=4)
+
+        assert matrix.top_k([1.0, 0.0, 0.0, 0.0], top_k=5, threshold=0.0) == []
+
+
+class TestEmbeddingMatrixCache:
+    """Tests for EmbeddingMatrixCache behaviour."""
+
+    def test_get_put_roundtrip_counts_hits_and_misses(self):
+        cache = EmbeddingMatrixCache()
+        matrix = _matrix()
+
+        assert cache.get(1, "openai-text-embedding-3-small", 4) is None
+        cache.put(1, "openai-text-embedding-3-small", 4, matrix)
+
+        assert cache.get(1, "openai-text-embedding-3-small", 4) is matrix
+        assert cache.get(1, "ollama-nomic-embed-text", 4) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_evicts_least_recently_used_over_budget(self):
+        matrix_size = _matrix().nbytes
+        cache = EmbeddingMatrixCache(max_bytes=matrix_size * 2)
+
+        cache.put(1, None, 4, _matrix())
+        cache.put(2, None, 4, _matrix())
+        cache.get(1, None, 4)  # merchant 1 becomes most recently used
+        cache.put(3, None, 4, _matrix())
+
+        assert cache.get(2, None, 4) is None
+        assert cache.get(1, None, 4) is not None
+        assert cache.get(3, None, 4) is not None
+        assert cache.total_bytes <= cache.max_bytes
+
+    def test_ttl_expiry(self):
+        cache = EmbeddingMatrixCache(ttl_seconds=0)
+        cache.put(1, None, 4, _matrix())
+
+        assert cache.get(1, None, 4) is None
+        assert cache.total_bytes == 0
+
+    def test_invalidate_merchant_drops_all_versions(self):
+        cache = EmbeddingMatrixCache()
+        cache.put(1, "a", 4, _matrix())
+        cache.put(1, "b", 4, _matrix())
+        cache.put(2, "a", 4, _matrix())
+
+        cache.invalidate_merchant(1)
+
+        assert cache.get(1, "a", 4) is None
+        assert cache.get(1, "b", 4) is None
+        assert cache.get(2, "a", 4) is not None
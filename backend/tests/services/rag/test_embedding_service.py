@@ -16,12 +16,14 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import httpx
 import pytest
 
+from app.core.errors import APIError
 from app.services.rag.embedding_service import (
     EMBEDDING_DIMENSIONS,
     EMBEDDING_MODELS,
     EmbeddingResult,
     EmbeddingService,
     InvalidProviderError,
+    _ollama_legacy_servers,
 )
 
 
@@ -224,40 +226,82 @@ class TestEmbeddingServiceOpenAI:
 class TestEmbeddingServiceOllama:
     """Tests for Ollama embedding generation."""
 
+    @pytest.fixture(autouse=True)
+    def reset_legacy_servers(self):
+        _ollama_legacy_servers.clear()
+        yield
+        _ollama_legacy_servers.clear()
+
+    @staticmethod
+    def _batch_response(texts: list[str]) -> MagicMock:
+        mock_response = MagicMock(status_code=200)
+        mock_response.json.return_value = {"embeddings": [[0.1] * 768 for _ in texts]}
+        mock_response.raise_for_status = MagicMock()
+        return mock_response
+
     @pytest.mark.asyncio
     async def test_embed_texts_ollama_success(self):
-        """Test successful Ollama embedding generation."""
+        """Test successful Ollama embedding generation via /api/embed."""
         service = EmbeddingService(provider="ollama")
+        calls = []
 
-        async def mock_post(*args, **kwargs):
-            mock_response = MagicMock()
-            mock_response.json.return_value = {"embedding": [0.1] * 768}
-            mock_response.raise_for_status = MagicMock()
-            return mock_response
+        async def mock_post(url, json):
+            calls.append((url, json))
+            return self._batch_response(json["input"])
 
         mock_client = AsyncMock()
         mock_client.post = mock_post
         service._async_client = mock_client
 
         with patch("app.services.rag.embedding_service.is_testing", return_value=False):
-            result = await service.embed_texts(["Test text"])
+            result = await service.embed_texts(["Test text", "Second text"])
 
-        assert len(result.embeddings) == 1
+        assert len(result.embeddings) == 2
         assert len(result.embeddings[0]) == 768
         assert result.provider == "ollama"
+        assert calls == [
+            ("/api/embed", {"model": "nomic-embed-text", "input": ["Test text", "Second text"]})
+        ]
+
+    @pytest.mark.asyncio
+    async def test_embed_texts_ollama_batch_size_adapts(self):
+        """Fast full batches grow; batches the server rejects are halved and retried."""
+        service = EmbeddingService(provider="ollama")
+        service.ollama_batch_size = 4
+        batch_sizes = []
+
+        async def mock_post(url, json):
+            batch_sizes.append(len(json["input"]))
+            if len(json["input"]) > 8:
+                return MagicMock(status_code=413)
+            return self._batch_response(json["input"])
+
+        mock_client = AsyncMock()
+        mock_client.post = mock_post
+        service._async_client = mock_client
+
+        with patch("app.services.rag.embedding_service.is_testing", return_value=False):
+            result = await service.embed_texts([f"Text {i}" for i in range(30)])
+
+        assert len(result.embeddings) == 30
+        assert batch_sizes == [4, 8, 16, 8, 8, 2]
 
     @pytest.mark.asyncio
-    async def test_embed_texts_ollama_concurrent_requests(self):
-        """Test Ollama concurrent requests with rate limiting."""
+    async def test_embed_texts_ollama_falls_back_to_per_text_endpoint(self):
+        """Servers without /api/embed use concurrent /api/embeddings requests."""
         service = EmbeddingService(provider="ollama")
 
         texts = ["Text 1", "Text 2", "Text 3"]
-        call_count = 0
+        urls = []
 
-        async def mock_post(*args, **kwargs):
-            nonlocal call_count
-            call_count += 1
+        async def mock_post(url, json):
+            urls.append(url)
             mock_response = MagicMock()
+            if url == "/api/embed":
+                mock_response.status_code = 404
+                mock_response.json.side_effect = ValueError("404 page not found")
+                return mock_response
+            mock_response.status_code = 200
             mock_response.json.return_value = {"embedding": [0.1] * 768}
             mock_response.raise_for_status = MagicMock()
             return mock_response
@@ -268,9 +312,35 @@ class TestEmbeddingServiceOllama:
 
         with patch("app.services.rag.embedding_service.is_testing", return_value=False):
             result = await service.embed_texts(texts)
+            await service.embed_texts(["Text 4"])
 
         assert len(result.embeddings) == 3
-        assert call_count == 3
+        # /api/embed is probed once per server, then skipped
+        assert urls.count("/api/embed") == 1
+        assert urls.count("/api/embeddings") == 4
+
+    @pytest.mark.asyncio
+    async def test_embed_texts_ollama_unknown_model_is_not_a_fallback(self):
+        """A JSON 404 (model not pulled) is an error, not a missing endpoint."""
+        service = EmbeddingService(provider="ollama")
+
+        async def mock_post(url, json):
+            mock_response = MagicMock(status_code=404)
+            mock_response.json.return_value = {"error": 'model "nomic-embed-text" not found'}
+            mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
+                "Not found", request=MagicMock(), response=MagicMock(status_code=404, text="")
+            )
+            return mock_response
+
+        mock_client = AsyncMock()
+        mock_client.post = mock_post
+        service._async_client = mock_client
+
+        with patch("app.services.rag.embedding_service.is_testing", return_value=False):
+            with pytest.raises(APIError):
+                await service.embed_texts(["Test"])
+
+        assert service.ollama_url not in _ollama_legacy_servers
 
 
 class TestEmbeddingServiceEmbedQuery:
@@ -0,0 +1,125 @@
+"""Tests for cross-request query embedding micro-batching.
+
+Covers:
+- Concurrent queries coalesced into one provider call
+- Early flush at max batch size and de-duplication of identical texts
+- Error fan-out and isolation between provider groups
+- EmbeddingService.embed_query integration
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.rag.embedding_service import EmbeddingResult, EmbeddingService
+from app.services.rag.query_embedding_batcher import QueryEmbeddingBatcher, make_batch_key
+
+KEY = make_batch_key("openai", "text-embedding-3-small", None, "test-key")
+
+
+def _embed_batch_mock() -> AsyncMock:
+    async def embed(texts: list[str]) -> EmbeddingResult:
+        return EmbeddingResult(
+            embeddings=[[float(len(text))] for text in texts],
+            model="text-embedding-3-small",
+            provider="openai",
+            dimension=1,
+        )
+
+    return AsyncMock(side_effect=embed)
+
+
+class TestQueryEmbeddingBatcher:
+    """Tests for QueryEmbeddingBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_share_one_call(self):
+        batcher = QueryEmbeddingBatcher(max_wait_ms=20)
+        embed_batch = _embed_batch_mock()
+
+        results = await asyncio.gather(
+            *(batcher.embed(KEY, "q" * n, embed_batch) for n in range(1, 6))
+        )
+
+        assert results == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        embed_batch.assert_awaited_once_with(["q", "qq", "qqq", "qqqq", "qqqqq"])
+        assert batcher.stats()["avg_batch_size"] == 5
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_without_waiting(self):
+        batcher = QueryEmbeddingBatcher(max_batch_size=2, max_wait_ms=10_000)
+        embed_batch = _embed_batch_mock()
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                batcher.embed(KEY, "a", embed_batch), batcher.embed(KEY, "b", embed_batch)
+            ),
+            timeout=1,
+        )
+
+        assert results == [[1.0], [1.0]]
+
+    @pytest.mark.asyncio
+    async def test_identical_queries_are_embedded_once(self):
+        batcher = QueryEmbeddingBatcher(max_wait_ms=20)
+        embed_batch = _embed_batch_mock()
+
+        results = await asyncio.gather(
+            batcher.embed(KEY, "shipping", embed_batch),
+            batcher.embed(KEY, "shipping", embed_batch),
+        )
+
+        assert results == [[8.0], [8.0]]
+        embed_batch.assert_awaited_once_with(["shipping"])
+
+    @pytest.mark.asyncio
+    async def test_provider_error_reaches_every_caller(self):
+        batcher = QueryEmbeddingBatcher(max_wait_ms=5)
+        embed_batch = AsyncMock(side_effect=RuntimeError("provider down"))
+
+        results = await asyncio.gather(
+            batcher.embed(KEY, "a", embed_batch),
+            batcher.embed(KEY, "b", embed_batch),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_different_provider_groups_are_not_mixed(self):
+        batcher = QueryEmbeddingBatcher(max_wait_ms=5)
+        openai_batch = _embed_batch_mock()
+        ollama_batch = _embed_batch_mock()
+        ollama_key = make_batch_key("ollama", "nomic-embed-text", "http://ollama:11434", None)
+
+        await asyncio.gather(
+            batcher.embed(KEY, "a", openai_batch),
+            batcher.embed(ollama_key, "b", ollama_batch),
+        )
+
+        openai_batch.assert_awaited_once_with(["a"])
+        ollama_batch.assert_awaited_once_with(["b"])
+
+
+class TestEmbedQueryBatching:
+    """Tests for EmbeddingService.embed_query with an injected batcher."""
+
+    @pytest.mark.asyncio
+    async def test_services_with_same_credentials_share_a_batch(self):
+        batcher = QueryEmbeddingBatcher(max_wait_ms=20)
+        first = EmbeddingService(provider="openai", api_key="test-key", query_batcher=batcher)
+        second = EmbeddingService(provider="openai", api_key="test-key", query_batcher=batcher)
+        embed_batch = _embed_batch_mock()
+
+        with (
+            patch.object(first, "embed_texts", embed_batch),
+            patch.object(second, "embed_texts", new_callable=AsyncMock) as second_embed,
+        ):
+            results = await asyncio.gather(first.embed_query("ab"), second.embed_query("abc"))
+
+        assert results == [[2.0], [3.0]]
+        embed_batch.assert_awaited_once_with(["ab", "abc"])
+        second_embed.assert_not_awaited()
@@ -0,0 +1,123 @@
+"""Tests for the two-tier query embedding cache.
+
+Covers:
+- Query normalization and key composition
+- float32 byte encoding
+- In-process LRU, Redis promotion and Redis failure degradation
+- EmbeddingService.embed_query cache integration
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.rag.embedding_service import EmbeddingResult, EmbeddingService
+from app.services.rag.query_embedding_cache import (
+    QueryEmbeddingCache,
+    decode_embedding,
+    encode_embedding,
+    normalize_query,
+)
+
+
+class TestKeying:
+    """Tests for normalization and cache keys."""
+
+    def test_normalize_query_collapses_case_whitespace_and_punctuation(self):
+        assert normalize_query("  What are your   SHIPPING fees?? ") == (
+            "what are your shipping fees"
+        )
+
+    def test_key_depends_on_provider_model_and_dimension(self):
+        cache = QueryEmbeddingCache()
+
+        base = cache.make_key("openai", "text-embedding-3-small", 1536, "Shipping fees?")
+
+        assert base == cache.make_key("openai", "text-embedding-3-small", 1536, "shipping fees")
+        assert base != cache.make_key("ollama", "nomic-embed-text", 768, "shipping fees")
+        assert base.startswith("rag:qemb:openai:text-embedding-3-small:1536:")
+
+    def test_encode_decode_roundtrip_is_float32(self):
+        data = encode_embedding([0.5, -0.25, 1.0])
+
+        assert len(data) == 12
+        assert decode_embedding(data) == [0.5, -0.25, 1.0]
+
+
+class TestQueryEmbeddingCache:
+    """Tests for cache tiers."""
+
+    @pytest.mark.asyncio
+    async def test_local_lru_evicts_oldest(self):
+        cache = QueryEmbeddingCache(max_entries=2)
+
+        await cache.set("a", [1.0])
+        await cache.set("b", [2.0])
+        await cache.get("a")
+        await cache.set("c", [3.0])
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") == [1.0]
+        assert await cache.get("c") == [3.0]
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_is_promoted_to_local_tier(self):
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(return_value=encode_embedding([0.5, 0.5]))
+        cache = QueryEmbeddingCache(redis_client=redis_client)
+
+        assert await cache.get("k") == [0.5, 0.5]
+        assert await cache.get("k") == [0.5, 0.5]
+
+        redis_client.get.assert_awaited_once_with("k")
+        assert cache.stats()["redis_hits"] == 1
+        assert cache.stats()["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_set_writes_bytes_to_redis_with_ttl(self):
+        redis_client = MagicMock()
+        redis_client.set = AsyncMock()
+        cache = QueryEmbeddingCache(redis_client=redis_client, ttl_seconds=60)
+
+        await cache.set("k", [0.25])
+
+        redis_client.set.assert_awaited_once_with("k", encode_embedding([0.25]), ex=60)
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_degrade_to_miss(self):
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(side_effect=ConnectionError("down"))
+        cache = QueryEmbeddingCache(redis_client=redis_client)
+
+        assert await cache.get("k") is None
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["redis_errors"] == 1
+
+
+class TestEmbedQueryCaching:
+    """Tests for EmbeddingService.embed_query with an injected cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_skips_provider_call(self):
+        cache = QueryEmbeddingCache()
+        service = EmbeddingService(provider="openai", api_key="test-key", query_cache=cache)
+
+        with patch.object(
+            service,
+            "embed_texts",
+            new_callable=AsyncMock,
+            return_value=EmbeddingResult(
+                embeddings=[[0.5] * 1536],
+                model="text-embedding-3-small",
+                provider="openai",
+                dimension=1536,
+            ),
+        ) as mock_embed:
+            first = await service.embed_query("What are your shipping fees?")
+            second = await service.embed_query("what are your shipping fees")
+
+        assert first == second == [0.5] * 1536
+        mock_embed.assert_awaited_once()
+        assert cache.stats()["local_hits"] == 1
@@ -3,13 +3,27 @@
 Story 8-11: LLM Embedding Provider Integration & Re-embedding
 """
 
+from datetime import UTC, datetime
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy import Select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.errors import APIError, ErrorCode
+from app.models.knowledge_base import ReembeddingJob, ReembeddingJobStatus
+from app.services.rag import reembedding_worker
 from app.services.rag.dimension_handler import DimensionHandler
+from app.services.rag.embedding_service import EmbeddingResult
 from app.services.rag.reembedding_worker import (
+    EmbeddingTarget,
+    ProviderRateLimiter,
+    _embed_batch,
+    _JobProgress,
+    _reembed_document,
+    _resolve_target,
+    _stage_and_cut_over,
     reembed_all_documents,
     trigger_reembedding_for_merchant,
 )
@@ -199,3 +213,345 @@ class TestDimensionChangeIntegration:
         expected_version = f"{provider}-{model}"
 
         assert expected_version == "gemini-text-embedding-004"
+
+
+def _embedding_result(texts: list[str]) -> EmbeddingResult:
+    return EmbeddingResult(
+        embeddings=[[0.1] * 768 for _ in texts],
+        model="gemini-embedding-001",
+        provider="gemini",
+        dimension=768,
+    )
+
+
+class TestProviderRateLimiter:
+    """Tests for the job-wide provider rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_requests_are_spaced_by_rpm(self):
+        limiter = ProviderRateLimiter(requests_per_minute=600)  # one per 100ms
+        sleeps: list[float] = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        with (
+            patch.object(reembedding_worker.time, "monotonic", return_value=50.0),
+            patch.object(reembedding_worker.asyncio, "sleep", new=fake_sleep),
+        ):
+            for _ in range(3):
+                await limiter.acquire()
+
+        assert sleeps == pytest.approx([0.1, 0.2])
+
+    @pytest.mark.asyncio
+    async def test_unlimited_provider_never_waits(self):
+        limiter = ProviderRateLimiter(requests_per_minute=None)
+
+        with patch.object(reembedding_worker.asyncio, "sleep", new=AsyncMock()) as mock_sleep:
+            for _ in range(5):
+                await limiter.acquire()
+
+        mock_sleep.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_penalize_holds_back_next_request(self):
+        limiter = ProviderRateLimiter(requests_per_minute=None)
+        sleeps: list[float] = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        with (
+            patch.object(reembedding_worker.time, "monotonic", return_value=10.0),
+            patch.object(reembedding_worker.asyncio, "sleep", new=fake_sleep),
+        ):
+            limiter.penalize(2.0)
+            await limiter.acquire()
+
+        assert sleeps == [2.0]
+
+
+class TestEmbedBatch:
+    """Tests for batch embedding with retry."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_batch_penalizes_limiter_and_retries(self):
+        service = MagicMock()
+        service.embed_texts = AsyncMock(
+            side_effect=[
+                APIError(ErrorCode.EMBEDDING_RATE_LIMITED, "rate limited"),
+                _embedding_result(["a", "b"]),
+            ]
+        )
+        limiter = MagicMock()
+        limiter.acquire = AsyncMock()
+
+        with patch.object(reembedding_worker.asyncio, "sleep", new=AsyncMock()):
+            embeddings = await _embed_batch(service, limiter, ["a", "b"])
+
+        assert len(embeddings) == 2
+        assert limiter.acquire.await_count == 2
+        limiter.penalize.assert_called_once_with(1.0)
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        service = MagicMock()
+        service.embed_texts = AsyncMock(side_effect=RuntimeError("provider down"))
+        limiter = ProviderRateLimiter(requests_per_minute=None)
+
+        with (
+            patch.object(reembedding_worker.asyncio, "sleep", new=AsyncMock()),
+            pytest.raises(RuntimeError),
+        ):
+            await _embed_batch(service, limiter, ["a"])
+
+        assert service.embed_texts.await_count == reembedding_worker.RETRY_CONFIG["max_attempts"]
+
+
+class TestReembedDocument:
+    """Tests for staging a document's chunks."""
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_cursor_and_checkpoints_each_batch(self):
+        db = MagicMock(spec=AsyncSession)
+        # cursor (last staged chunk id), chunk count, chunks at or below cursor
+        db.scalar = AsyncMock(side_effect=[102, 5, 2])
+        db.commit = AsyncMock()
+        batches = [
+            [SimpleNamespace(id=103, content="c"), SimpleNamespace(id=104, content="d")],
+            [SimpleNamespace(id=105, content="e")],
+            [],
+        ]
+        selects: list[dict] = []
+
+        async def mock_execute(statement, params=None):
+            result = MagicMock()
+            result.rowcount = 1
+            if isinstance(statement, Select):
+                selects.append(statement.compile().params)
+                result.all.return_value = batches[len(selects) - 1]
+            return result
+
+        db.execute = mock_execute
+        service = MagicMock()
+        service.embed_texts = AsyncMock(side_effect=_embedding_result)
+
+        await _reembed_document(
+            db,
+            job_id=7,
+            document_id=3,
+            embedding_service=service,
+            limiter=ProviderRateLimiter(None),
+            progress=_JobProgress(),
+            batch_size=2,
+        )
+
+        assert [call.args[0] for call in service.embed_texts.await_args_list] == [
+            ["c", "d"],
+            ["e"],
+        ]
+        # Each batch starts after the last checkpointed chunk id
+        assert [params["id_1"] for params in selects] == [102, 104, 105]
+        # Status update + one checkpoint commit per batch
+        assert db.commit.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_superseded_job_stops_staging(self):
+        db = MagicMock(spec=AsyncSession)
+        db.scalar = AsyncMock(side_effect=[None, 1, 0])
+        db.commit = AsyncMock()
+
+        async def mock_execute(statement, params=None):
+            result = MagicMock()
+            result.rowcount = 0  # job no longer running
+            result.all.return_value = [SimpleNamespace(id=1, content="a")]
+            return result
+
+        db.execute = mock_execute
+        service = MagicMock()
+        service.embed_texts = AsyncMock(side_effect=_embedding_result)
+
+        with pytest.raises(reembedding_worker.JobSupersededError):
+            await _reembed_document(
+                db, 7, 3, service, ProviderRateLimiter(None), _JobProgress(), batch_size=2
+            )
+
+
+class TestStageAndCutOver:
+    """Tests for job orchestration and atomic cutover."""
+
+    TARGET = EmbeddingTarget(provider="gemini", model="gemini-embedding-001")
+
+    @staticmethod
+    def _db():
+        db = MagicMock(spec=AsyncSession)
+        db.execute = AsyncMock()
+        db.commit = AsyncMock()
+        db.rollback = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_documents_staged_in_parallel_then_cut_over(self):
+        db = self._db()
+        in_flight = 0
+        peak = 0
+
+        async def stage(job_id, document_id, *args):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await reembedding_worker.asyncio.sleep(0)
+            in_flight -= 1
+            return True
+
+        documents = [SimpleNamespace(id=i) for i in range(6)]
+        with (
+            patch.object(
+                reembedding_worker, "_get_queued_documents", new=AsyncMock(return_value=documents)
+            ),
+            patch.object(reembedding_worker, "_stage_document", new=stage),
+            patch.object(
+                reembedding_worker, "_cut_over", new=AsyncMock(return_value=True)
+            ) as cut_over,
+            patch.object(reembedding_worker, "_fail_job", new=AsyncMock()) as fail_job,
+            patch.object(reembedding_worker, "invalidate_merchant_embeddings") as invalidate,
+            patch.object(
+                reembedding_worker,
+                "settings",
+                return_value={"REEMBEDDING_CONCURRENCY": 3, "REEMBEDDING_BATCH_SIZE": 8},
+            ),
+        ):
+            await _stage_and_cut_over(db, 1, 7, self.TARGET, MagicMock())
+
+        assert peak == 3
+        cut_over.assert_awaited_once_with(db, 1, 7, self.TARGET)
+        fail_job.assert_not_awaited()
+        invalidate.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_failed_document_keeps_old_embeddings_serving(self):
+        db = self._db()
+        documents = [SimpleNamespace(id=1), SimpleNamespace(id=2)]
+
+        with (
+            patch.object(
+                reembedding_worker, "_get_queued_documents", new=AsyncMock(return_value=documents)
+            ),
+            patch.object(
+                reembedding_worker, "_stage_document", new=AsyncMock(side_effect=[True, False])
+            ),
+            patch.object(reembedding_worker, "_cut_over", new=AsyncMock()) as cut_over,
+            patch.object(reembedding_worker, "_fail_job", new=AsyncMock()) as fail_job,
+        ):
+            await _stage_and_cut_over(db, 1, 7, self.TARGET, MagicMock())
+
+        cut_over.assert_not_awaited()
+        fail_job.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_chunks_changed_during_job_are_staged_in_another_pass(self):
+        db = self._db()
+
+        with (
+            patch.object(
+                reembedding_worker,
+                "_get_queued_documents",
+                new=AsyncMock(return_value=[SimpleNamespace(id=1)]),
+            ),
+            patch.object(
+                reembedding_worker, "_stage_document", new=AsyncMock(return_value=True)
+            ) as stage,
+            patch.object(
+                reembedding_worker, "_cut_over", new=AsyncMock(side_effect=[False, True])
+            ) as cut_over,
+            patch.object(reembedding_worker, "_fail_job", new=AsyncMock()) as fail_job,
+            patch.object(reembedding_worker, "invalidate_merchant_embeddings"),
+        ):
+            await _stage_and_cut_over(db, 1, 7, self.TARGET, MagicMock())
+
+        assert stage.await_count == 2
+        assert cut_over.await_count == 2
+        fail_job.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_superseded_job_drops_staged_embeddings(self):
+        db = self._db()
+
+        with (
+            patch.object(
+                reembedding_worker,
+                "_get_queued_documents",
+                new=AsyncMock(return_value=[SimpleNamespace(id=1)]),
+            ),
+            patch.object(reembedding_worker, "_stage_document", new=AsyncMock(return_value=None)),
+            patch.object(reembedding_worker, "_cut_over", new=AsyncMock()) as cut_over,
+        ):
+            await _stage_and_cut_over(db, 1, 7, self.TARGET, MagicMock())
+
+        cut_over.assert_not_awaited()
+        db.execute.assert_awaited_once()  # DELETE staged_chunk_embeddings
+        db.commit.assert_awaited_once()
+
+
+class TestResolveTarget:
+    """Tests for job target resolution."""
+
+    def test_defaults_to_llm_provider(self):
+        merchant = MagicMock()
+        merchant.llm_configuration = SimpleNamespace(
+            provider="ollama", api_key_encrypted=None, ollama_url="http://ollama:11434"
+        )
+
+        target = _resolve_target(merchant)
+
+        assert target.provider == "ollama"
+        assert target.version == "ollama-nomic-embed-text"
+        assert target.ollama_url == "http://ollama:11434"
+        assert target.api_key is None
+
+    def test_explicit_target_overrides_llm_provider(self):
+        merchant = MagicMock()
+        merchant.llm_configuration = None
+
+        target = _resolve_target(merchant, "openai", "text-embedding-3-large")
+
+        assert target.version == "openai-text-embedding-3-large"
+
+
+class TestJobStatus:
+    """Tests for re-embedding job progress reporting."""
+
+    def test_running_job_reports_eta(self):
+        job = ReembeddingJob(
+            id=7,
+            merchant_id=1,
+            target_provider="gemini",
+            target_model="gemini-embedding-001",
+            target_version="gemini-gemini-embedding-001",
+            status=ReembeddingJobStatus.RUNNING.value,
+            total_chunks=1000,
+            processed_chunks=250,
+            chunks_per_second=25.0,
+            started_at=datetime(2026, 4, 12, tzinfo=UTC),
+        )
+
+        status = DimensionHandler.get_job_status(job)
+
+        assert status["progress_percent"] == 25.0
+        assert status["eta_seconds"] == 30
+        assert status["target_version"] == "gemini-gemini-embedding-001"
+
+    def test_completed_job_has_no_eta(self):
+        job = ReembeddingJob(
+            id=7,
+            status=ReembeddingJobStatus.COMPLETED.value,
+            total_chunks=10,
+            processed_chunks=10,
+            chunks_per_second=5.0,
+        )
+
+        status = DimensionHandler.get_job_status(job)
+
+        assert status["progress_percent"] == 100.0
+        assert status["eta_seconds"] is None
@@ -14,9 +14,15 @@ from __future__ import annotations
 import asyncio
 from contextlib import asynccontextmanager
 from unittest.mock import AsyncMock, MagicMock, patch
+import numpy as np
 import pytest
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.errors import APIError, ErrorCode
+from app.models.knowledge_base import DocumentChunk, DocumentStatus, KnowledgeDocument
+from app.models.merchant import Merchant
+from app.services.rag.context_builder import RAGContextBuilder
+from app.services.rag.embedding_matrix_cache import EmbeddingMatrixCache
 from app.services.rag.embedding_service import EmbeddingService
 from app.services.rag.retrieval_service import RetrievalService, RetrievedChunk
 from app.models.rag_query_log import RAGQueryLog
@@ -127,6 +133,329 @@ class TestRetrieveRelevantChunks:
         assert chunks[2].similarity == 0.75
 
 
+class TestSimilaritySearch:
+    """Tests for SQL-side and fallback similarity search."""
+
+    @pytest.mark.asyncio
+    async def test_native_dimension_pushes_distance_into_sql(self):
+        """Supported dimensions order by pgvector distance with threshold and LIMIT in SQL."""
+        mock_db = MagicMock(spec=AsyncSession)
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = []
+        mock_db.execute = AsyncMock(return_value=mock_result)
+
+        service = RetrievalService(MagicMock(), MagicMock(spec=EmbeddingService))
+        await service._execute_similarity_search(
+            db=mock_db,
+            merchant_id=1,
+            embedding_str=service._format_embedding([0.1] * 3072),
+            embedding_dimension=3072,
+            threshold=0.4,
+            top_k=3,
+            embedding_version="gemini-gemini-embedding-001",
+        )
+
+        sql = str(mock_db.execute.call_args[0][0])
+        params = mock_db.execute.call_args[0][1]
+        assert "dc.embedding_3072 <=> CAST(:query_embedding AS halfvec(3072))" in sql
+        assert "ORDER BY" in sql and "LIMIT :top_k" in sql
+        assert params["max_distance"] == pytest.approx(0.6)
+        assert params["top_k"] == 3
+        assert params["embedding_version"] == "gemini-gemini-embedding-001"
+
+    @pytest.mark.asyncio
+    async def test_hybrid_mode_fuses_full_text_and_vector_rank(self):
+        """Hybrid mode ranks content_tsv matches and vector neighbours with RRF in one query."""
+        mock_db = MagicMock(spec=AsyncSession)
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = [
+            MagicMock(
+                chunk_id=7,
+                content="SKU AB-1234 ships from Lisbon",
+                chunk_index=0,
+                document_name="catalog.pdf",
+                document_id=2,
+                similarity=0.45,
+                rrf_score=0.032,
+            ),
+        ]
+        mock_db.execute = AsyncMock(return_value=mock_result)
+
+        service = RetrievalService(MagicMock(), MagicMock(spec=EmbeddingService), mode="hybrid")
+        chunks = await service._execute_similarity_search(
+            db=mock_db,
+            merchant_id=1,
+            embedding_str=service._format_embedding([0.1] * 1536),
+            embedding_dimension=1536,
+            threshold=0.4,
+            top_k=5,
+            embedding_version="openai-text-embedding-3-small",
+            query="Where does SKU AB-1234 ship from?",
+        )
+
+        # HNSW scan settings, then the fused query
+        assert mock_db.execute.await_count == 2
+        sql = str(mock_db.execute.call_args[0][0])
+        params = mock_db.execute.call_args[0][1]
+        assert "dc.embedding_1536 <=> CAST(:query_embedding AS vector(1536))" in sql
+        assert "dc.content_tsv @@ tsq.q" in sql
+        assert "ts_rank_cd" in sql and "FULL OUTER JOIN" in sql
+        assert "LIMIT :top_k" in sql
+        assert params["query_text"] == "Where does SKU AB-1234 ship from?"
+        assert params["rrf_k"] == RetrievalService.RRF_K
+        assert params["candidates"] == 5 * RetrievalService.HYBRID_CANDIDATES_PER_TOP_K
+        assert params["max_distance"] == pytest.approx(0.6)
+        # Full-text matches keep the vector-mode floor
+        assert params["lexical_max_distance"] == pytest.approx(0.7)
+        assert sql.count("<= :max_distance") == 1
+        assert sql.count("<= :lexical_max_distance") == 1
+        assert params["embedding_version"] == "openai-text-embedding-3-small"
+        assert chunks[0].chunk_id == 7
+        assert chunks[0].similarity == pytest.approx(0.45)
+
+    @pytest.mark.asyncio
+    async def test_vector_mode_skips_full_text(self):
+        """Vector mode keeps the cosine-only query even when the query text is passed."""
+        mock_db = MagicMock(spec=AsyncSession)
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = []
+        mock_db.execute = AsyncMock(return_value=mock_result)
+
+        service = RetrievalService(MagicMock(), MagicMock(spec=EmbeddingService), mode="vector")
+        await service._execute_similarity_search(
+            db=mock_db,
+            merchant_id=1,
+            embedding_str=service._format_embedding([0.1] * 768),
+            embedding_dimension=768,
+            threshold=0.2,
+            top_k=7,
+            query="return policy",
+        )
+
+        sql = str(mock_db.execute.call_args[0][0])
+        assert "content_tsv" not in sql
+        assert "query_text" not in mock_db.execute.call_args[0][1]
+
+    @pytest.mark.asyncio
+    async def test_unsupported_dimension_falls_back_to_python_scoring(self):
+        """Dimensions without a vector column use the in-process embedding matrix."""
+        mock_db = MagicMock(spec=AsyncSession)
+        mock_result = MagicMock()
+        mock_result.fetchall.return_value = [
+            MagicMock(
+                chunk_id=1,
+                content="match",
+                chunk_index=0,
+                document_name="doc.pdf",
+                document_id=1,
+                embedding_json="[1.0, 0.0, 0.0, 0.0]",
+            ),
+            MagicMock(
+                chunk_id=2,
+                content="orthogonal",
+                chunk_index=1,
+                document_name="doc.pdf",
+                document_id=1,
+                embedding_json="[0.0, 1.0, 0.0, 0.0]",
+            ),
+        ]
+        mock_db.execute = AsyncMock(return_value=mock_result)
+
+        service = RetrievalService(MagicMock(), MagicMock(spec=EmbeddingService))
+        with patch(
+            "app.services.rag.retrieval_service.get_embedding_matrix_cache",
+            return_value=EmbeddingMatrixCache(),
+        ):
+            chunks = await service._execute_similarity_search(
+                db=mock_db,
+                merchant_id=1,
+                embedding_str="[1.0,0.0,0.0,0.0]",
+                embedding_dimension=4,
+                threshold=0.5,
+                top_k=5,
+            )
+            # Second query is served from the cached matrix without a DB round trip
+            await service._execute_similarity_search(
+                db=mock_db,
+                merchant_id=1,
+                embedding_str="[0.0,1.0,0.0,0.0]",
+                embedding_dimension=4,
+                threshold=0.5,
+                top_k=5,
+            )
+
+        assert [c.chunk_id for c in chunks] == [1]
+        assert chunks[0].similarity == pytest.approx(1.0)
+        assert mock_db.execute.await_count == 1
+
+
+async def _seed_document(session: AsyncSession, merchant_id: int, chunks) -> None:
+    """Add a ready document with (content, embedding) chunks."""
+    document = KnowledgeDocument(
+        merchant_id=merchant_id,
+        filename="kb.txt",
+        file_type="txt",
+        file_size=100,
+        status=DocumentStatus.READY.value,
+        embedding_version="ollama-nomic-embed-text",
+    )
+    session.add(document)
+    await session.flush()
+    for index, (content, vector) in enumerate(chunks):
+        chunk = DocumentChunk(document_id=document.id, chunk_index=index, content=content)
+        chunk.set_embedding(vector)
+        session.add(chunk)
+
+
+class TestHybridThreshold:
+    """Full-text matches are bounded by the vector-mode similarity floor."""
+
+    @pytest.mark.asyncio
+    async def test_lexical_only_weak_match_is_excluded(
+        self, async_session: AsyncSession, test_merchant: int
+    ):
+        """A chunk sharing a query word but far from the query vector is dropped."""
+        query = [1.0] + [0.0] * 767
+        near = [0.9, 0.4] + [0.0] * 766
+        far = [0.1, 0.0, 1.0] + [0.0] * 765
+        await _seed_document(
+            async_session,
+            test_merchant,
+            [
+                ("SKU AB-1234 ships from our Lisbon warehouse.", near),
+                ("Our Lisbon store hosts a summer market.", far),
+            ],
+        )
+        await async_session.commit()
+
+        service = RetrievalService(MagicMock(), MagicMock(spec=EmbeddingService), mode="hybrid")
+        chunks = await service._execute_similarity_search(
+            db=async_session,
+            merchant_id=test_merchant,
+            embedding_str=service._format_embedding(query),
+            embedding_dimension=768,
+            threshold=0.4,
+            top_k=5,
+            query="Does the SKU ship from Lisbon?",
+        )
+
+        assert [c.content for c in chunks] == ["SKU AB-1234 ships from our Lisbon warehouse."]
+        assert chunks[0].similarity >= 0.4
+
+    @pytest.mark.asyncio
+    async def test_exact_term_match_below_hybrid_threshold_is_kept(
+        self, async_session: AsyncSession, test_merchant: int
+    ):
+        """Hybrid mode returns an exact-term chunk that vector mode would return."""
+        query = [1.0] + [0.0] * 767
+        weak = [0.35, (1 - 0.35**2) ** 0.5] + [0.0] * 766
+        await _seed_document(
+            async_session,
+            test_merchant,
+            [
+                ("AB-1234 is stocked in Porto.", weak),
+                ("Gift cards never expire.", weak),
+            ],
+        )
+        await async_session.commit()
+
+        service = RetrievalService(MagicMock(), MagicMock(spec=EmbeddingService), mode="hybrid")
+        chunks = await service._execute_similarity_search(
+            db=async_session,
+            merchant_id=test_merchant,
+            embedding_str=service._format_embedding(query),
+            embedding_dimension=768,
+            threshold=0.4,
+            top_k=5,
+            query="Where is AB-1234 stocked?",
+        )
+
+        assert [c.content for c in chunks] == ["AB-1234 is stocked in Porto."]
+        assert chunks[0].similarity == pytest.approx(0.35, abs=1e-3)
+
+
+class TestSmallTenantRecall:
+    """A small merchant in a large shared HNSW index still gets its top-k."""
+
+    @pytest.mark.asyncio
+    async def test_small_tenant_gets_rows_past_other_tenants_neighbours(
+        self, async_session: AsyncSession, test_merchant: int
+    ):
+        """The index scan keeps going past the large tenant's nearer chunks."""
+        rng = np.random.default_rng(7)
+        query = np.zeros(768)
+        query[0] = 1.0
+        # The large tenant's chunks are all nearer the query than the small tenant's
+        large_vectors = query + rng.normal(scale=0.05, size=(400, 768))
+        small_vectors = np.tile(query * 0.6, (3, 1))
+        small_vectors[:, 1:4] += rng.uniform(0.5, 0.8, size=(3, 3))
+
+        large = Merchant(merchant_key="large-tenant", platform="messenger", status="active")
+        async_session.add(large)
+        await async_session.flush()
+        await _seed_document(
+            async_session, large.id, [("large", v) for v in large_vectors.tolist()]
+        )
+        await _seed_document(
+            async_session, test_merchant, [("small", v) for v in small_vectors.tolist()]
+        )
+        await async_session.commit()
+        await async_session.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_document_chunks_embedding_768_hnsw "
+                "ON document_chunks USING hnsw (embedding_768 vector_cosine_ops) "
+                "WITH (m = 16, ef_construction = 64)"
+            )
+        )
+        await async_session.execute(text("ANALYZE document_chunks"))
+        await async_session.commit()
+
+        # Make the planner take the HNSW path a large shared table would get
+        await async_session.execute(text("SET LOCAL enable_seqscan = off"))
+        await async_session.execute(text("SET LOCAL enable_sort = off"))
+        service = RetrievalService(MagicMock(), MagicMock(spec=EmbeddingService), mode="vector")
+        chunks = await service._execute_similarity_search(
+            db=async_session,
+            merchant_id=test_merchant,
+            embedding_str=service._format_embedding(query.tolist()),
+            embedding_dimension=768,
+            threshold=0.3,
+            top_k=3,
+        )
+
+        assert len(chunks) == 3
+        assert [c.similarity for c in chunks] == sorted(
+            (c.similarity for c in chunks), reverse=True
+        )
+
+
+class TestRetrievalLimits:
+    """Tests for mode-dependent retrieval defaults in RAGContextBuilder."""
+
+    @pytest.mark.parametrize(
+        ("mode", "expected"),
+        [
+            (
+                "hybrid",
+                (RetrievalService.HYBRID_TOP_K, RetrievalService.HYBRID_SIMILARITY_THRESHOLD),
+            ),
+            (
+                "vector",
+                (
+                    RAGContextBuilder.TOP_K_DEFAULT,
+                    RAGContextBuilder.SIMILARITY_THRESHOLD_DEFAULT,
+                ),
+            ),
+        ],
+    )
+    def test_defaults_follow_retrieval_mode(self, mode, expected):
+        builder = RAGContextBuilder(MagicMock(), MagicMock(spec=EmbeddingService))
+        builder.retrieval_service.mode = mode
+
+        assert builder._resolve_limits(None, None) == expected
+        assert builder._resolve_limits(3, 0.9) == (3, 0.9)
+
+
 class TestFormatEmbedding:
     """Tests for _format_embedding method."""
 
@@ -0,0 +1,176 @@
+"""Tests for the merchant-scoped semantic answer cache.
+
+Covers:
+- Nearest-neighbour hits above the similarity threshold
+- Scope isolation (merchant, knowledge-base version, persona)
+- Knowledge-base version bumps (local and Redis) and Redis failure bypass
+- Local versions when the Redis pool is unavailable
+- Bucket bounds and TTL expiry
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core import redis_pool
+from app.services.rag import semantic_answer_cache
+from app.services.rag.retrieval_service import RetrievedChunk
+from app.services.rag.semantic_answer_cache import (
+    AnswerScope,
+    CachedAnswer,
+    SemanticAnswerCache,
+)
+
+
+def _scope(merchant_id: int = 1, kb_version: int = 0, persona: str = "friendly|Bot|Shop"):
+    return AnswerScope(merchant_id, kb_version, "openai-text-embedding-3-small", persona)
+
+
+def _answer(text: str = "We ship worldwide.") -> CachedAnswer:
+    chunk = RetrievedChunk(
+        chunk_id=1,
+        content="Shipping: worldwide",
+        chunk_index=0,
+        document_name="Policies",
+        document_id=7,
+        similarity=0.9,
+    )
+    return CachedAnswer(answer=text, rag_context='From "Policies": ...', chunks=[chunk])
+
+
+class TestLookup:
+    """Tests for nearest-neighbour lookups."""
+
+    def test_paraphrase_above_threshold_hits(self):
+        cache = SemanticAnswerCache(similarity_threshold=0.95)
+        cache.store(_scope(), [1.0, 0.0, 0.0], _answer())
+
+        hit = cache.lookup(_scope(), [0.99, 0.05, 0.0])
+
+        assert hit is not None
+        cached, similarity = hit
+        assert cached.answer == "We ship worldwide."
+        assert cached.chunks[0].document_id == 7
+        assert similarity > 0.95
+
+    def test_dissimilar_question_misses(self):
+        cache = SemanticAnswerCache(similarity_threshold=0.95)
+        cache.store(_scope(), [1.0, 0.0, 0.0], _answer())
+
+        assert cache.lookup(_scope(), [0.6, 0.8, 0.0]) is None
+        assert cache.stats()["misses"] == 1
+
+    def test_returns_closest_answer(self):
+        cache = SemanticAnswerCache(similarity_threshold=0.9)
+        cache.store(_scope(), [1.0, 0.0, 0.0], _answer("shipping"))
+        cache.store(_scope(), [0.0, 1.0, 0.0], _answer("returns"))
+
+        hit = cache.lookup(_scope(), [0.05, 1.0, 0.0])
+
+        assert hit is not None
+        assert hit[0].answer == "returns"
+
+
+class TestScoping:
+    """Answers never cross merchants, versions or personas."""
+
+    def test_other_merchant_misses(self):
+        cache = SemanticAnswerCache()
+        cache.store(_scope(merchant_id=1), [1.0, 0.0], _answer())
+
+        assert cache.lookup(_scope(merchant_id=2), [1.0, 0.0]) is None
+
+    def test_other_persona_misses(self):
+        cache = SemanticAnswerCache()
+        cache.store(_scope(persona="friendly|Bot|Shop"), [1.0, 0.0], _answer())
+
+        assert cache.lookup(_scope(persona="professional|Bot|Shop"), [1.0, 0.0]) is None
+
+    def test_newer_kb_version_prunes_older_buckets(self):
+        cache = SemanticAnswerCache()
+        cache.store(_scope(kb_version=0), [1.0, 0.0], _answer("old"))
+        cache.store(_scope(kb_version=1), [1.0, 0.0], _answer("new"))
+
+        assert cache.lookup(_scope(kb_version=0), [1.0, 0.0]) is None
+        assert cache.lookup(_scope(kb_version=1), [1.0, 0.0])[0].answer == "new"
+
+    def test_late_store_for_older_version_keeps_newer_bucket(self):
+        cache = SemanticAnswerCache()
+        cache.store(_scope(kb_version=1), [1.0, 0.0], _answer("new"))
+        cache.store(_scope(kb_version=0), [1.0, 0.0], _answer("raced"))
+
+        assert cache.lookup(_scope(kb_version=1), [1.0, 0.0])[0].answer == "new"
+
+
+class TestKnowledgeBaseVersion:
+    """Tests for knowledge-base version tracking and invalidation."""
+
+    async def test_local_invalidation_bumps_version_and_drops_answers(self):
+        cache = SemanticAnswerCache()
+        cache.store(_scope(), [1.0, 0.0], _answer())
+        assert await cache.kb_version(1) == 0
+
+        await cache.invalidate_merchant(1)
+
+        assert await cache.kb_version(1) == 1
+        assert await cache.kb_version(2) == 0
+        assert cache.lookup(_scope(), [1.0, 0.0]) is None
+
+    async def test_redis_version_is_shared(self):
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(return_value="4")
+        redis_client.incr = AsyncMock(return_value=5)
+        cache = SemanticAnswerCache(redis_client=redis_client)
+
+        assert await cache.kb_version(1) == 4
+        await cache.invalidate_merchant(1)
+
+        redis_client.incr.assert_awaited_once_with("rag:kbver:1")
+
+    async def test_redis_failure_bypasses_cache(self):
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(side_effect=ConnectionError("down"))
+        cache = SemanticAnswerCache(redis_client=redis_client)
+
+        assert await cache.kb_version(1) is None
+        assert cache.stats()["redis_errors"] == 1
+
+    async def test_process_cache_falls_back_to_local_versions(self, monkeypatch):
+        monkeypatch.setattr(semantic_answer_cache, "is_testing", lambda: False)
+        monkeypatch.setattr(semantic_answer_cache, "_semantic_answer_cache", None)
+        monkeypatch.setattr(redis_pool, "get_redis", MagicMock(side_effect=ValueError("bad url")))
+
+        cache = semantic_answer_cache.get_semantic_answer_cache()
+        await semantic_answer_cache.invalidate_merchant_answers(1)
+
+        assert cache.redis is None
+        assert await cache.kb_version(1) == 1
+
+
+class TestBounds:
+    """Tests for size bounds and expiry."""
+
+    def test_oldest_answers_evicted_per_scope(self):
+        cache = SemanticAnswerCache(max_entries_per_scope=2, similarity_threshold=0.99)
+        cache.store(_scope(), [1.0, 0.0, 0.0], _answer("a"))
+        cache.store(_scope(), [0.0, 1.0, 0.0], _answer("b"))
+        cache.store(_scope(), [0.0, 0.0, 1.0], _answer("c"))
+
+        assert cache.lookup(_scope(), [1.0, 0.0, 0.0]) is None
+        assert cache.lookup(_scope(), [0.0, 0.0, 1.0])[0].answer == "c"
+        assert cache.stats()["entries"] == 2
+
+    def test_least_recently_used_scope_evicted(self):
+        cache = SemanticAnswerCache(max_scopes=1)
+        cache.store(_scope(merchant_id=1), [1.0, 0.0], _answer())
+        cache.store(_scope(merchant_id=2), [1.0, 0.0], _answer())
+
+        assert cache.lookup(_scope(merchant_id=1), [1.0, 0.0]) is None
+        assert cache.lookup(_scope(merchant_id=2), [1.0, 0.0]) is not None
+
+    def test_expired_answer_is_dropped(self):
+        cache = SemanticAnswerCache(ttl_seconds=0)
+        cache.store(_scope(), [1.0, 0.0], _answer())
+
+        assert cache.lookup(_scope(), [1.0, 0.0]) is None
+        assert cache.stats()["entries"] == 0
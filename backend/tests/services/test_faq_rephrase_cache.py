@@ -0,0 +1,284 @@
+"""Tests for the FAQ personality rephrase cache.
+
+Covers:
+- Key composition (answer, personality, bot and business name)
+- In-process LRU, Redis promotion and Redis failure degradation
+- Per-FAQ and per-merchant invalidation
+- rephrase_faq_cached: LLM resolved only on a miss, failures not cached
+- Pre-warm tasks stay referenced until they finish
+- Pre-warm goes through the budget wrapper and skips paused merchants
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.faq import Faq
+from app.models.merchant import Merchant, PersonalityType
+from app.services import faq_rephrase_cache
+from app.services.cost_tracking.budget_alert_service import BudgetAlertService
+from app.services.cost_tracking.budget_aware_llm_wrapper import BudgetAwareLLMWrapper
+from app.services.faq_rephrase_cache import (
+    FaqRephraseCache,
+    prewarm_faq_rephrase,
+    rephrase_faq_cached,
+    schedule_faq_rephrase_prewarm,
+)
+
+
+class FakeRedis:
+    """Minimal async Redis double with get/set/scan_iter/delete."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, str] = {}
+
+    async def get(self, key: str) -> str | None:
+        return self.data.get(key)
+
+    async def set(self, key: str, value: str, ex: int | None = None) -> None:
+        self.data[key] = value
+
+    async def scan_iter(self, match: str):
+        prefix = match.rstrip("*")
+        for key in list(self.data):
+            if key.startswith(prefix):
+                yield key
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.data.pop(key, None)
+
+
+def _faq(faq_id: int = 1, answer: str = "Free shipping over $50.", merchant_id: int = 1) -> Faq:
+    return Faq(
+        id=faq_id,
+        merchant_id=merchant_id,
+        question="What are your shipping options?",
+        answer=answer,
+        keywords="shipping",
+        order_index=0,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+
+
+def _llm(content: str = "Hey! Shipping is free over $50!") -> MagicMock:
+    llm_service = MagicMock()
+    llm_service.chat = AsyncMock(return_value=MagicMock(content=content))
+    return llm_service
+
+
+class TestKeying:
+    """Tests for cache keys."""
+
+    def test_key_depends_on_answer_and_personality_settings(self):
+        cache = FaqRephraseCache()
+        base = cache.make_key(_faq(), PersonalityType.FRIENDLY, "Shop", "Bot")
+
+        assert base.startswith("faq:rephrase:1:1:")
+        assert base == cache.make_key(_faq(), PersonalityType.FRIENDLY, "Shop", "Bot")
+        edited = _faq(answer="Changed")
+        assert base != cache.make_key(edited, PersonalityType.FRIENDLY, "Shop", "Bot")
+        assert base != cache.make_key(_faq(), PersonalityType.PROFESSIONAL, "Shop", "Bot")
+        assert base != cache.make_key(_faq(), PersonalityType.FRIENDLY, "Other", "Bot")
+        assert base != cache.make_key(_faq(), PersonalityType.FRIENDLY, "Shop", "Other")
+
+
+class TestFaqRephraseCache:
+    """Tests for cache tiers and invalidation."""
+
+    async def test_redis_hit_is_promoted_to_local(self):
+        redis_client = FakeRedis()
+        redis_client.data["k"] = "rephrased"
+        cache = FaqRephraseCache(redis_client=redis_client)
+
+        assert await cache.get("k") == "rephrased"
+        del redis_client.data["k"]
+        assert await cache.get("k") == "rephrased"
+        assert cache.stats()["redis_hits"] == 1
+        assert cache.stats()["local_hits"] == 1
+
+    async def test_redis_errors_degrade_to_miss(self):
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(side_effect=ConnectionError("down"))
+        redis_client.set = AsyncMock(side_effect=ConnectionError("down"))
+        cache = FaqRephraseCache(redis_client=redis_client)
+
+        assert await cache.get("k") is None
+        await cache.set("k", "rephrased")
+        assert await cache.get("k") == "rephrased"
+        assert cache.stats()["redis_errors"] == 2
+
+    async def test_invalidate_faq_drops_only_that_faq(self):
+        redis_client = FakeRedis()
+        cache = FaqRephraseCache(redis_client=redis_client)
+        key_1 = cache.make_key(_faq(1), PersonalityType.FRIENDLY, "Shop", "Bot")
+        key_2 = cache.make_key(_faq(2), PersonalityType.FRIENDLY, "Shop", "Bot")
+        await cache.set(key_1, "one")
+        await cache.set(key_2, "two")
+
+        await cache.invalidate_faq(1, 1)
+
+        assert key_1 not in redis_client.data
+        assert await cache.get(key_1) is None
+        assert await cache.get(key_2) == "two"
+
+    async def test_invalidate_merchant_keeps_other_merchants(self):
+        redis_client = FakeRedis()
+        cache = FaqRephraseCache(redis_client=redis_client)
+        key_1 = cache.make_key(_faq(1, merchant_id=1), PersonalityType.FRIENDLY, "Shop", "Bot")
+        key_2 = cache.make_key(_faq(1, merchant_id=2), PersonalityType.FRIENDLY, "Shop", "Bot")
+        await cache.set(key_1, "one")
+        await cache.set(key_2, "two")
+
+        await cache.invalidate_merchant(1)
+
+        assert await cache.get(key_1) is None
+        assert await cache.get(key_2) == "two"
+
+
+class TestRephraseFaqCached:
+    """Tests for the cached rephrase helper."""
+
+    async def test_second_hit_skips_llm(self):
+        cache = FaqRephraseCache()
+        llm_service = _llm()
+        get_llm_service = AsyncMock(return_value=llm_service)
+
+        first = await rephrase_faq_cached(
+            get_llm_service, _faq(), PersonalityType.FRIENDLY, "Shop", "Bot", cache=cache
+        )
+        second = await rephrase_faq_cached(
+            get_llm_service, _faq(), PersonalityType.FRIENDLY, "Shop", "Bot", cache=cache
+        )
+
+        assert first == second == "Hey! Shipping is free over $50!"
+        assert get_llm_service.await_count == 1
+        assert llm_service.chat.await_count == 1
+
+    async def test_failed_rephrase_falls_back_and_is_not_cached(self):
+        cache = FaqRephraseCache()
+        llm_service = MagicMock()
+        llm_service.chat = AsyncMock(side_effect=RuntimeError("provider down"))
+
+        result = await rephrase_faq_cached(
+            AsyncMock(return_value=llm_service),
+            _faq(),
+            PersonalityType.FRIENDLY,
+            "Shop",
+            "Bot",
+            cache=cache,
+        )
+
+        assert result == "Free shipping over $50."
+        assert cache.stats()["entries"] == 0
+
+    async def test_missing_llm_returns_original_answer(self):
+        result = await rephrase_faq_cached(
+            AsyncMock(return_value=None),
+            _faq(),
+            PersonalityType.FRIENDLY,
+            "Shop",
+            cache=FaqRephraseCache(),
+        )
+
+        assert result == "Free shipping over $50."
+
+    @pytest.mark.parametrize(
+        "personality", [PersonalityType.FRIENDLY, PersonalityType.PROFESSIONAL]
+    )
+    async def test_personality_change_misses(self, personality):
+        cache = FaqRephraseCache()
+        key = cache.make_key(_faq(), PersonalityType.FRIENDLY, "Shop", "Bot")
+        await cache.set(key, "cached friendly")
+
+        result = await rephrase_faq_cached(
+            AsyncMock(return_value=_llm("fresh")),
+            _faq(),
+            personality,
+            "Shop",
+            "Bot",
+            cache=cache,
+        )
+
+        expected = "cached friendly" if personality == PersonalityType.FRIENDLY else "fresh"
+        assert result == expected
+
+
+class TestSchedulePrewarm:
+    """Tests for background pre-warm scheduling."""
+
+    async def test_task_is_referenced_until_done(self, monkeypatch):
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def prewarm(merchant_id: int, faq_id: int) -> None:
+            started.set()
+            await release.wait()
+
+        monkeypatch.setattr(faq_rephrase_cache, "is_testing", lambda: False)
+        monkeypatch.setattr(faq_rephrase_cache, "prewarm_faq_rephrase", prewarm)
+
+        schedule_faq_rephrase_prewarm(1, 2)
+        await started.wait()
+        (task,) = faq_rephrase_cache._prewarm_tasks
+
+        release.set()
+        await task
+        await asyncio.sleep(0)
+        assert not faq_rephrase_cache._prewarm_tasks
+
+
+class TestPrewarm:
+    """Tests for pre-warming a FAQ's rephrasing."""
+
+    @pytest.fixture
+    def merchant_db(self, monkeypatch):
+        merchant = Merchant(id=1, personality=PersonalityType.FRIENDLY, business_name="Shop")
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                MagicMock(scalars=lambda: MagicMock(first=lambda: merchant)),
+                MagicMock(scalars=lambda: MagicMock(first=lambda: _faq())),
+            ]
+        )
+
+        @asynccontextmanager
+        async def session():
+            yield db
+
+        monkeypatch.setattr("app.core.database.async_session", lambda: session)
+        return db
+
+    @pytest.mark.parametrize("paused", [True, False])
+    async def test_goes_through_budget_check(self, merchant_db, monkeypatch, paused):
+        provider = _llm()
+        registry = MagicMock()
+        registry.get_llm_provider.return_value = provider
+        monkeypatch.setattr(
+            "app.services.llm.provider_registry.get_provider_registry", lambda: registry
+        )
+        monkeypatch.setattr(
+            "app.services.cost_tracking.budget_alert_service.get_redis", MagicMock
+        )
+        monkeypatch.setattr(
+            BudgetAlertService,
+            "get_bot_paused_state",
+            AsyncMock(return_value=(paused, "Budget exceeded" if paused else None)),
+        )
+        monkeypatch.setattr(
+            BudgetAwareLLMWrapper, "chat", AsyncMock(return_value=MagicMock(content="Hey!"))
+        )
+        cache = FaqRephraseCache()
+        monkeypatch.setattr(faq_rephrase_cache, "_default_cache", lambda: cache)
+
+        await prewarm_faq_rephrase(1, 1)
+
+        assert BudgetAwareLLMWrapper.chat.await_count == (0 if paused else 1)
+        assert provider.chat.await_count == 0
+        assert cache.stats()["entries"] == (0 if paused else 1)
@@ -0,0 +1,118 @@
+"""Tests for per-turn latency tracing and the rolling histograms.
+
+Spans should record into the active trace (including from tasks spawned
+during the turn), do nothing outside a trace, and finished traces should
+show up per merchant in the histogram snapshot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core import tracing
+from app.core.tracing import (
+    LatencyHistograms,
+    current_trace,
+    finish_trace,
+    get_latency_histograms,
+    span,
+    start_trace,
+)
+from app.services.conversation.schemas import Channel, ConversationContext
+from app.services.conversation.unified_conversation_service import build_turn_context_snapshot
+
+
+@pytest.fixture(autouse=True)
+def _fresh_histograms():
+    get_latency_histograms().reset()
+    yield
+    get_latency_histograms().reset()
+
+
+@pytest.mark.asyncio
+async def test_spans_record_into_active_trace_and_child_tasks() -> None:
+    async def retrieve() -> None:
+        with span("rag.retrieve"):
+            await asyncio.sleep(0)
+
+    trace = start_trace(merchant_id=7)
+    try:
+        with span("faq_match"):
+            pass
+        with span("handler.LLMHandler"):
+            pass
+        with span("handler.LLMHandler"):
+            pass
+        await asyncio.create_task(retrieve())
+    finally:
+        finish_trace(trace)
+
+    assert set(trace.stages) == {"faq_match", "handler.LLMHandler", "rag.retrieve"}
+    assert current_trace() is None
+
+    stages = get_latency_histograms().snapshot(7)["stages"]
+    assert stages["total"]["count"] == 1
+    assert stages["handler.LLMHandler"]["count"] == 1
+    assert get_latency_histograms().snapshot(8)["stages"] == {}
+
+
+def test_span_outside_trace_is_noop() -> None:
+    with span("persist") as active:
+        pass
+
+    assert active is tracing._NOOP_SPAN
+
+
+def test_disabled_tracing_starts_no_trace() -> None:
+    with patch.object(tracing, "settings", return_value={"LATENCY_TRACING_ENABLED": False}):
+        trace = start_trace(merchant_id=7)
+
+    assert trace is None
+    assert span("faq_match") is tracing._NOOP_SPAN
+    finish_trace(trace)
+
+
+def test_snapshot_percentiles_buckets_and_window() -> None:
+    histograms = LatencyHistograms(window_seconds=60)
+    for elapsed_ms in range(1, 101):
+        histograms.record(1, {"total": float(elapsed_ms)})
+
+    total = histograms.snapshot(1)["stages"]["total"]
+    assert total["count"] == 100
+    assert total["p50"] == 50.0
+    assert total["p95"] == 95.0
+    assert total["max"] == 100.0
+    # 1-10ms, 11-25ms, 26-50ms, 51-100ms
+    assert total["buckets"][:4] == [10, 15, 25, 50]
+
+    with patch.object(tracing.time, "monotonic", return_value=tracing.time.monotonic() + 61):
+        assert histograms.snapshot(1)["stages"] == {}
+
+
+def test_histograms_evict_least_recent_merchant() -> None:
+    histograms = LatencyHistograms(max_merchants=2)
+    histograms.record(1, {"total": 1.0})
+    histograms.record(2, {"total": 1.0})
+    histograms.record(1, {"total": 1.0})
+    histograms.record(3, {"total": 1.0})
+
+    assert histograms.snapshot(2)["stages"] == {}
+    assert histograms.snapshot(1)["stages"]["total"]["count"] == 2
+
+
+def test_turn_snapshot_includes_stage_breakdown() -> None:
+    context = ConversationContext(
+        session_id="s", merchant_id=1, channel=Channel.WIDGET, conversation_history=[]
+    )
+
+    snapshot = build_turn_context_snapshot(
+        confidence=0.9,
+        processing_time_ms=120.0,
+        context=context,
+        stage_timings={"faq_match": 3.1, "handler.LLMHandler": 95.4},
+    )
+
+    assert snapshot["stage_timings_ms"] == {"faq_match": 3.1, "handler.LLMHandler": 95.4}
@@ -0,0 +1,120 @@
+"""Tests for LLMHandler token streaming (Story 11-2).
+
+Tokens should reach the callback as the provider emits them, leaked
+classification payloads should never be streamed, and the final response
+should still carry the full text.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.merchant import PersonalityType
+from app.services.conversation.handlers.llm_handler import LLMHandler
+from app.services.conversation.schemas import Channel, ConsentState, ConversationContext
+from app.services.llm.base_llm_service import StreamEvent
+
+
+def _merchant() -> MagicMock:
+    merchant = MagicMock()
+    merchant.id = 1
+    merchant.personality = PersonalityType.FRIENDLY
+    merchant.business_name = "Test Store"
+    merchant.bot_name = "TestBot"
+    merchant.onboarding_mode = "general"
+    return merchant
+
+
+def _context() -> ConversationContext:
+    return ConversationContext(
+        session_id="stream-session",
+        merchant_id=1,
+        channel=Channel.WIDGET,
+        consent_state=ConsentState(),
+        metadata={},
+    )
+
+
+def _streaming_llm(*events: StreamEvent) -> MagicMock:
+    async def stream_chat(**kwargs):
+        for event in events:
+            yield event
+
+    llm_service = MagicMock()
+    llm_service.stream_chat = stream_chat
+    llm_service.chat = AsyncMock()
+    return llm_service
+
+
+async def _handle(llm_service: MagicMock) -> tuple[str, list[str]]:
+    handler = LLMHandler()
+    tokens: list[str] = []
+
+    async def on_token(token: str) -> None:
+        tokens.append(token)
+
+    with (
+        patch.object(handler, "_build_system_prompt", AsyncMock(return_value="system")),
+        patch.object(handler, "_detect_product_mentions", AsyncMock(return_value=None)),
+    ):
+        response = await handler.handle(
+            AsyncMock(), _merchant(), llm_service, "tell me a story", _context(), on_token=on_token
+        )
+    return response.message, tokens
+
+
+@pytest.mark.asyncio
+async def test_tokens_forwarded_as_generated() -> None:
+    llm_service = _streaming_llm(
+        StreamEvent(type="token", content="Once"),
+        StreamEvent(type="token", content=" upon"),
+        StreamEvent(type="token", content=" a time"),
+        StreamEvent(type="done", metadata={"tokens_used": 3}),
+    )
+
+    message, tokens = await _handle(llm_service)
+
+    assert tokens == ["Once", " upon", " a time"]
+    assert message == "Once upon a time"
+    llm_service.chat.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_leading_brace_held_until_not_a_leak() -> None:
+    llm_service = _streaming_llm(
+        StreamEvent(type="token", content="{"),
+        StreamEvent(type="token", content="a} is a set"),
+        StreamEvent(type="token", content="."),
+    )
+
+    message, tokens = await _handle(llm_service)
+
+    assert tokens == ["{a} is a set", "."]
+    assert message == "{a} is a set."
+
+
+@pytest.mark.asyncio
+async def test_classification_leak_is_not_streamed() -> None:
+    llm_service = _streaming_llm(
+        StreamEvent(type="token", content='{"int'),
+        StreamEvent(type="token", content='ent": "product_search"}'),
+    )
+
+    message, tokens = await _handle(llm_service)
+
+    assert tokens == []
+    assert not message.startswith('{"intent"')
+
+
+@pytest.mark.asyncio
+async def test_done_only_stream_returns_its_content() -> None:
+    llm_service = _streaming_llm(
+        StreamEvent(type="done", content="Bot is paused.", metadata={"budget_paused": True}),
+    )
+
+    message, tokens = await _handle(llm_service)
+
+    assert message == "Bot is paused."
+    assert tokens == []
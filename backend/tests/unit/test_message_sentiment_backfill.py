@@ -0,0 +1,51 @@
+"""Tests for scheduling the message sentiment backfill.
+
+The job keeps running while rows are labelled and is unscheduled by the
+first run that finds nothing left.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.background_jobs import data_retention, message_sentiment_backfill
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("labelled", "done"), [(0, True), (500, False)])
+async def test_scheduled_run_reports_done_when_nothing_labelled(labelled, done) -> None:
+    with patch.object(
+        message_sentiment_backfill,
+        "backfill_message_sentiment",
+        AsyncMock(return_value=labelled),
+    ):
+        assert await message_sentiment_backfill.run_scheduled_sentiment_backfill() is done
+
+
+@pytest.mark.asyncio
+async def test_failed_run_keeps_the_job() -> None:
+    with patch.object(
+        message_sentiment_backfill,
+        "backfill_message_sentiment",
+        AsyncMock(side_effect=RuntimeError("db down")),
+    ):
+        assert await message_sentiment_backfill.run_scheduled_sentiment_backfill() is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("done", [True, False])
+async def test_job_is_removed_once_done(monkeypatch, done) -> None:
+    scheduler = MagicMock()
+    monkeypatch.setattr(data_retention, "scheduler", scheduler)
+    monkeypatch.setattr(
+        data_retention, "run_scheduled_sentiment_backfill", AsyncMock(return_value=done)
+    )
+
+    await data_retention._run_sentiment_backfill()
+
+    if done:
+        scheduler.remove_job.assert_called_once_with(data_retention.SENTIMENT_BACKFILL_JOB_ID)
+    else:
+        scheduler.remove_job.assert_not_called()
@@ -0,0 +1,132 @@
+"""Tests for the per-merchant LLM/embedding client registry.
+
+Clients should be reused while the configuration fingerprint is unchanged,
+rebuilt (and the old one retired) when it changes, and closed on shutdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.llm.provider_registry import (
+    FALLBACK_LLM_MODEL,
+    LLM_CLIENT,
+    ProviderRegistry,
+    config_fingerprint,
+)
+
+
+@pytest.fixture(autouse=True)
+def _not_testing():
+    with patch("app.services.llm.provider_registry.is_testing", return_value=False):
+        yield
+
+
+def _client() -> MagicMock:
+    client = MagicMock()
+    client.close = AsyncMock()
+    return client
+
+
+def _llm_config(api_key_encrypted: str = "enc-key", model: str = "gpt-4o-mini") -> MagicMock:
+    config = MagicMock()
+    config.provider = "openai"
+    config.ollama_model = None
+    config.cloud_model = model
+    config.ollama_url = None
+    config.api_key_encrypted = api_key_encrypted
+    return config
+
+
+@pytest.mark.asyncio
+async def test_same_fingerprint_reuses_client() -> None:
+    registry = ProviderRegistry()
+    factory = MagicMock(side_effect=[_client(), _client()])
+
+    first = registry.get_or_create(1, LLM_CLIENT, config_fingerprint("openai", "m"), factory)
+    second = registry.get_or_create(1, LLM_CLIENT, config_fingerprint("openai", "m"), factory)
+
+    assert first is second
+    assert factory.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_fingerprint_retires_old_client() -> None:
+    registry = ProviderRegistry(retire_grace_seconds=0)
+    old, new = _client(), _client()
+
+    registry.get_or_create(1, LLM_CLIENT, "a", lambda: old)
+    assert registry.get_or_create(1, LLM_CLIENT, "b", lambda: new) is new
+
+    await asyncio.sleep(0.01)
+    old.close.assert_awaited_once()
+    new.close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_invalidate_and_close() -> None:
+    registry = ProviderRegistry(retire_grace_seconds=60)
+    merchant_client, other_client = _client(), _client()
+    registry.get_or_create(1, LLM_CLIENT, "a", lambda: merchant_client)
+    registry.get_or_create(2, LLM_CLIENT, "a", lambda: other_client)
+
+    registry.invalidate(1)
+    merchant_client.close.assert_not_awaited()
+
+    await registry.close()
+
+    merchant_client.close.assert_awaited_once()
+    other_client.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_llm_provider_decrypts_only_on_miss() -> None:
+    registry = ProviderRegistry()
+    factory = MagicMock()
+    factory.create_provider.side_effect = lambda **kwargs: _client()
+
+    with patch("app.core.security.decrypt_access_token", return_value="sk-test") as decrypt:
+        first = registry.get_llm_provider(1, _llm_config(), provider_factory=factory)
+        second = registry.get_llm_provider(1, _llm_config(), provider_factory=factory)
+        rotated = registry.get_llm_provider(
+            1, _llm_config(api_key_encrypted="enc-key-2"), provider_factory=factory
+        )
+
+    assert first is second
+    assert rotated is not first
+    assert decrypt.call_count == 2
+    factory.create_provider.assert_called_with(
+        provider_name="openai", config={"model": "gpt-4o-mini", "api_key": "sk-test"}
+    )
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_fallback_provider_is_shared_across_callers() -> None:
+    """Widget and conversation lookups without a config share one fallback client."""
+    from app.services.widget.widget_message_service import WidgetMessageService
+
+    registry = ProviderRegistry()
+    factory = MagicMock()
+    factory.create_provider.side_effect = lambda **kwargs: _client()
+
+    with (
+        patch(
+            "app.services.widget.widget_message_service.get_provider_registry",
+            return_value=registry,
+        ),
+        patch("app.services.widget.widget_message_service.LLMProviderFactory", factory),
+    ):
+        widget_llm = WidgetMessageService._get_llm_service_from_config(
+            MagicMock(), merchant_id=1, merchant_llm_config=None, merchant_bot_name=None
+        )
+    conversation_llm = registry.get_llm_provider(1, None, provider_factory=factory)
+
+    assert widget_llm is conversation_llm
+    factory.create_provider.assert_called_once_with(
+        provider_name="ollama", config={"model": FALLBACK_LLM_MODEL}
+    )
+    await registry.close()
@@ -0,0 +1,97 @@
+"""Tests for the shared async Redis connection pool.
+
+Services should all get the same client, subscriptions should use their own
+pool, and health/stats should report without needing a live Redis. An empty
+REDIS_URL (as set by the test conftest) disables Redis.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core import redis_pool
+from app.core.config import settings
+from app.core.redis_pool import (
+    close_redis,
+    get_pubsub_redis,
+    get_redis,
+    init_redis,
+    redis_health,
+    redis_pool_stats,
+)
+
+
+def _with_redis_url(monkeypatch, url: str) -> None:
+    config = {**settings(), "REDIS_URL": url}
+    monkeypatch.setattr(redis_pool, "settings", lambda: config)
+
+
+@pytest.fixture(autouse=True)
+async def _fresh_pool(monkeypatch):
+    _with_redis_url(monkeypatch, "redis://localhost:6379/0")
+    await close_redis()
+    yield
+    await close_redis()
+
+
+@pytest.mark.asyncio
+async def test_get_redis_returns_shared_client() -> None:
+    assert get_redis() is get_redis()
+    assert get_pubsub_redis() is not get_redis()
+    assert get_pubsub_redis().connection_pool is not get_redis().connection_pool
+
+
+@pytest.mark.asyncio
+async def test_stats_report_pool_limits() -> None:
+    assert redis_pool_stats()["initialized"] is False
+
+    get_redis()
+    stats = redis_pool_stats()
+
+    assert stats["initialized"] is True
+    assert stats["max_connections"] == redis_pool._pool.max_connections
+    assert stats["in_use"] == 0
+
+
+@pytest.mark.asyncio
+async def test_close_resets_clients() -> None:
+    client = get_redis()
+
+    await close_redis()
+
+    assert redis_pool._client is None
+    assert get_redis() is not client
+
+
+@pytest.mark.asyncio
+async def test_health_reports_unavailable_redis() -> None:
+    with patch.object(get_redis(), "ping", AsyncMock(side_effect=ConnectionError("refused"))):
+        health = await redis_health()
+
+    assert health["status"] == "unavailable"
+    assert "refused" in health["error"]
+    assert health["pool"]["initialized"] is True
+
+
+@pytest.mark.asyncio
+async def test_health_reports_latency() -> None:
+    with patch.object(get_redis(), "ping", AsyncMock(return_value=True)):
+        health = await redis_health()
+
+    assert health["status"] == "connected"
+    assert health["latency_ms"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_empty_url_disables_redis(monkeypatch) -> None:
+    _with_redis_url(monkeypatch, "")
+
+    assert get_redis() is None
+    assert get_pubsub_redis() is None
+    await init_redis()
+    health = await redis_health()
+
+    assert health["status"] == "disabled"
+    assert health["pool"]["initialized"] is False
@@ -4,6 +4,7 @@ import pytest
 from app.services.analytics.sentiment_analyzer import (
     analyze_sentiment,
     get_sentiment_score,
+    message_sentiment,
     Sentiment,
     SentimentScore,
 )
@@ -84,3 +85,21 @@ class TestSentimentAnalyzer:
 
         # Questions should have reduced weight
         assert result.confidence <= result_greeting.confidence
+
+
+class TestMessageSentiment:
+    """Tests for the label and polarity stored on customer messages."""
+
+    def test_label_matches_analyze_sentiment(self):
+        for text in ("This is great, thank you!", "Terrible 👎", "Where is my order?"):
+            label, _ = message_sentiment(text)
+            assert label == analyze_sentiment(text)
+
+    def test_polarity_sign_follows_sentiment(self):
+        assert message_sentiment("Love it! Works perfectly.")[1] > 0
+        assert message_sentiment("This is terrible, I hate it.")[1] < 0
+        assert message_sentiment("")[1] == 0.0
+
+    def test_polarity_is_bounded(self):
+        _, polarity = message_sentiment("Amazing amazing amazing, love it! 👍👍")
+        assert -1.0 <= polarity <= 1.0
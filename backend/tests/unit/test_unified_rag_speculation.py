@@ -0,0 +1,170 @@
+"""Tests for speculative RAG retrieval in UnifiedConversationService.
+
+Retrieval starts before the session-bound pre-checks and is joined before
+routing; a turn answered earlier (FAQ hit, summarize) must not wait for it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.conversation.schemas import (
+    Channel,
+    ConversationContext,
+    ConversationResponse,
+)
+from app.services.conversation.unified_conversation_service import UnifiedConversationService
+
+
+@pytest.fixture
+def context() -> ConversationContext:
+    return ConversationContext(
+        session_id="rag-speculation-session",
+        merchant_id=1,
+        channel=Channel.WIDGET,
+        conversation_history=[],
+    )
+
+
+@pytest.fixture
+def merchant() -> MagicMock:
+    merchant = MagicMock()
+    merchant.id = 1
+    merchant.embedding_provider = "openai"
+    merchant.embedding_model = "text-embedding-3-small"
+    merchant.onboarding_mode = "general"
+    return merchant
+
+
+def _service(rag_builder: MagicMock, merchant: MagicMock) -> tuple:
+    service = UnifiedConversationService(rag_context_builder=rag_builder)
+    patches = [
+        patch.object(service, "_load_merchant", AsyncMock(return_value=merchant)),
+        patch.object(service, "_check_budget_pause", AsyncMock(return_value=None)),
+        patch.object(service, "_check_hybrid_mode", AsyncMock(return_value=None)),
+        patch.object(service, "_check_returning_shopper", AsyncMock(return_value=None)),
+        patch.object(service, "_check_and_prompt_consent", AsyncMock(return_value=None)),
+        patch.object(service, "_check_multi_turn_state", AsyncMock(return_value=None)),
+        patch.object(service, "_check_proactive_gathering", AsyncMock(return_value=None)),
+        patch.object(service, "_persist_conversation_message", AsyncMock(return_value=None)),
+        patch.object(service, "_track_conversation_turn", AsyncMock()),
+        patch.object(service, "_detect_and_record_knowledge_gap", AsyncMock()),
+    ]
+    return service, patches
+
+
+@pytest.mark.asyncio
+async def test_faq_hit_cancels_pending_retrieval(context, merchant) -> None:
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow_build(**kwargs):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    rag_builder = MagicMock()
+    rag_builder.build_rag_context_with_chunks = slow_build
+    service, patches = _service(rag_builder, merchant)
+    faq_response = ConversationResponse(message="We ship worldwide.", intent="faq", confidence=1.0)
+
+    async def faq_match(*args, **kwargs):
+        await started.wait()
+        return faq_response
+
+    for p in patches:
+        p.start()
+    try:
+        with patch.object(service, "_check_faq_match", faq_match):
+            response = await asyncio.wait_for(
+                service.process_message(
+                    db=AsyncMock(spec=AsyncSession),
+                    context=context,
+                    message="Do you ship internationally?",
+                ),
+                timeout=2,
+            )
+        knowledge_gap = service._detect_and_record_knowledge_gap
+    finally:
+        patch.stopall()
+
+    assert response.intent == "faq"
+    assert cancelled.is_set()
+    assert "faq_match" in response.metadata["stage_timings_ms"]
+    assert knowledge_gap.await_args.kwargs["rag_checked"] is False
+
+
+@pytest.mark.asyncio
+async def test_retrieval_result_reaches_handler(context, merchant) -> None:
+    rag_builder = MagicMock()
+    rag_builder.build_rag_context_with_chunks = AsyncMock(
+        return_value=('From "Shipping Policy": We ship worldwide.', [])
+    )
+    service, patches = _service(rag_builder, merchant)
+    llm_handler = MagicMock()
+    llm_handler.handle = AsyncMock(
+        return_value=ConversationResponse(message="Yes, we do.", intent="general")
+    )
+    service._handlers["llm"] = llm_handler
+    classification = MagicMock()
+    classification.intent = None
+    classification.confidence = 0.9
+    classification.entities = None
+
+    for p in patches:
+        p.start()
+    try:
+        with (
+            patch.object(service, "_check_faq_match", AsyncMock(return_value=None)),
+            patch.object(service, "_get_merchant_llm", AsyncMock(return_value=MagicMock())),
+            patch.object(service, "_classify_intent", AsyncMock(return_value=classification)),
+            patch.object(service, "_check_handoff", AsyncMock(return_value=None)),
+        ):
+            response = await service.process_message(
+                db=AsyncMock(spec=AsyncSession),
+                context=context,
+                message="Do you ship internationally?",
+            )
+    finally:
+        patch.stopall()
+
+    rag_builder.build_rag_context_with_chunks.assert_awaited_once()
+    assert rag_builder.build_rag_context_with_chunks.await_args.kwargs["embedding_version"] == (
+        "openai-text-embedding-3-small"
+    )
+    assert context.metadata["rag_context"].startswith('From "Shipping Policy"')
+    assert "rag_retrieval" in response.metadata["stage_timings_ms"]
+
+
+@pytest.mark.asyncio
+async def test_summarize_skips_retrieval(context, merchant) -> None:
+    rag_builder = MagicMock()
+    rag_builder.build_rag_context_with_chunks = AsyncMock(return_value=("", []))
+    service, patches = _service(rag_builder, merchant)
+    summarize_handler = MagicMock()
+    summarize_handler.handle = AsyncMock(
+        return_value=ConversationResponse(message="Summary", intent="summarize")
+    )
+    service._handlers["summarize"] = summarize_handler
+
+    for p in patches:
+        p.start()
+    try:
+        with patch.object(service, "_get_merchant_llm", AsyncMock(return_value=MagicMock())):
+            await service.process_message(
+                db=AsyncMock(spec=AsyncSession),
+                context=context,
+                message="Summarize our conversation",
+            )
+    finally:
+        patch.stopall()
+
+    summarize_handler.handle.assert_awaited_once()
+    rag_builder.build_rag_context_with_chunks.assert_not_awaited()
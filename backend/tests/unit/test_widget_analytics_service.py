@@ -6,6 +6,7 @@ Tests for GDPR cleanup, metrics calculation, and CSV export.
 """
 
 from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -100,6 +101,20 @@ class TestIngestEvents:
         assert accepted == 1
 
 
+def _period_row(period: str, sessions: int = 1, **values):
+    """Build an aggregate row as returned by _get_period_aggregates."""
+    row = {event_type: 0 for event_type in EVENT_TYPES}
+    row.update(
+        period=period,
+        sessions=sessions,
+        avg_load_time_ms=None,
+        load_time_p95=None,
+        avg_bundle_size_kb=None,
+    )
+    row.update(values)
+    return SimpleNamespace(**row)
+
+
 class TestGetMetrics:
     """Tests for metrics retrieval."""
 
@@ -107,7 +122,7 @@ class TestGetMetrics:
     async def test_get_metrics_empty(self, service, mock_db):
         """Test get metrics with no events."""
         mock_result = MagicMock()
-        mock_result.scalars().all.return_value = []
+        mock_result.all.return_value = []
         mock_db.execute = AsyncMock(return_value=mock_result)
 
         result = await service.get_metrics(merchant_id=1, days=30)
@@ -129,28 +144,17 @@ class TestGetMetrics:
     @pytest.mark.asyncio
     async def test_get_metrics_with_events(self, service, mock_db):
         """Test get metrics with events."""
-        from app.models.widget_analytics_event import WidgetAnalyticsEvent
-
-        now = datetime.now(UTC)
-        events = [
-            WidgetAnalyticsEvent(
-                merchant_id=1,
-                session_id="session-1",
-                event_type="widget_open",
-                timestamp=now,
-                event_metadata={},
-            ),
-            WidgetAnalyticsEvent(
-                merchant_id=1,
-                session_id="session-1",
-                event_type="message_send",
-                timestamp=now,
-                event_metadata={},
-            ),
-        ]
-
         mock_result = MagicMock()
-        mock_result.scalars().all.return_value = events
+        mock_result.all.return_value = [
+            _period_row(
+                "current",
+                widget_open=1,
+                message_send=1,
+                avg_load_time_ms=150.0,
+                load_time_p95=195.456,
+                avg_bundle_size_kb=42.0,
+            )
+        ]
         mock_db.execute = AsyncMock(return_value=mock_result)
 
         result = await service.get_metrics(merchant_id=1, days=30)
@@ -158,6 +162,25 @@ class TestGetMetrics:
         assert result["merchant_id"] == 1
         assert result["metrics"]["open_rate"] == 100.0
         assert result["metrics"]["message_rate"] == 100.0
+        assert result["performance"]["avg_load_time_ms"] == 150.0
+        assert result["performance"]["p95_load_time_ms"] == 195.46
+        assert result["performance"]["bundle_size_kb"] == 42.0
+        mock_db.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_metrics_trends_use_previous_period(self, service, mock_db):
+        """Test trends compare against the previous period row."""
+        mock_result = MagicMock()
+        mock_result.all.return_value = [
+            _period_row("current", sessions=2, widget_open=1),
+            _period_row("previous", sessions=4, widget_open=1),
+        ]
+        mock_db.execute = AsyncMock(return_value=mock_result)
+
+        result = await service.get_metrics(merchant_id=1, days=30)
+
+        assert result["metrics"]["open_rate"] == 50.0
+        assert result["trends"]["open_rate_change"] == 100.0
 
 
 class TestCalculateMetrics:
@@ -165,41 +188,16 @@ class TestCalculateMetrics:
 
     def test_calculate_metrics_empty(self, service):
         """Test metrics calculation with no events."""
-        result = service._calculate_metrics([])
+        result = service._calculate_metrics({}, 0)
 
         assert result["open_rate"] == 0.0
         assert result["message_rate"] == 0.0
 
     def test_calculate_metrics_with_events(self, service):
         """Test metrics calculation with events."""
-        from app.models.widget_analytics_event import WidgetAnalyticsEvent
+        counts = {"widget_open": 1, "message_send": 1, "quick_reply_click": 1}
 
-        now = datetime.now(UTC)
-        events = [
-            WidgetAnalyticsEvent(
-                merchant_id=1,
-                session_id="session-1",
-                event_type="widget_open",
-                timestamp=now,
-                event_metadata={},
-            ),
-            WidgetAnalyticsEvent(
-                merchant_id=1,
-                session_id="session-1",
-                event_type="message_send",
-                timestamp=now,
-                event_metadata={},
-            ),
-            WidgetAnalyticsEvent(
-                merchant_id=1,
-                session_id="session-1",
-                event_type="quick_reply_click",
-                timestamp=now,
-                event_metadata={},
-            ),
-        ]
-
-        result = service._calculate_metrics(events)
+        result = service._calculate_metrics(counts, 1)
 
         assert result["open_rate"] == 100.0
         assert result["message_rate"] == 100.0
@@ -323,61 +321,30 @@ class TestExportCsv:
 
 
 class TestPerformanceMetrics:
-    """Tests for performance metric calculations."""
+    """Tests for performance metric aggregation."""
 
-    def test_calc_avg_load_time_empty(self, service):
-        """Test average load time with no events."""
-        result = service._calc_avg_load_time([])
-        assert result == 0.0
+    def test_load_time_aggregates_are_computed_in_sql(self):
+        """Test load time avg/p95 come from database aggregates."""
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
 
-    def test_calc_avg_load_time_with_data(self, service):
-        """Test average load time calculation."""
         from app.models.widget_analytics_event import WidgetAnalyticsEvent
+        from app.services.analytics.sql_distribution import json_number, percentile_columns
 
-        now = datetime.now(UTC)
-        events = [
-            WidgetAnalyticsEvent(
-                merchant_id=1,
-                session_id="session-1",
-                event_type="widget_open",
-                timestamp=now,
-                event_metadata={"load_time_ms": 100},
-            ),
-            WidgetAnalyticsEvent(
-                merchant_id=1,
-                session_id="session-1",
-                event_type="widget_open",
-                timestamp=now,
-                event_metadata={"load_time_ms": 200},
-            ),
-        ]
-
-        result = service._calc_avg_load_time(events)
-        assert result == 150.0
-
-    def test_calc_p95_load_time_empty(self, service):
-        """Test p95 load time with no events."""
-        result = service._calc_p95_load_time([])
-        assert result == 0.0
-
-    def test_calc_p95_load_time_with_data(self, service):
-        """Test p95 load time calculation."""
-        from app.models.widget_analytics_event import WidgetAnalyticsEvent
-
-        now = datetime.now(UTC)
-        events = [
-            WidgetAnalyticsEvent(
-                merchant_id=1,
-                session_id="session-1",
-                event_type="widget_open",
-                timestamp=now,
-                event_metadata={"load_time_ms": i * 10},
+        load_time = json_number(WidgetAnalyticsEvent.event_metadata, "load_time_ms")
+        sql = str(
+            select(*percentile_columns(load_time, (95,), prefix="load_time_")).compile(
+                dialect=postgresql.dialect()
             )
-            for i in range(20)
-        ]
+        )
+
+        assert "percentile_cont" in sql
+        assert "WITHIN GROUP (ORDER BY" in sql
+        assert "jsonb_typeof" in sql
 
-        result = service._calc_p95_load_time(events)
-        assert result > 0
+    def test_rounded_missing_row(self, service):
+        """Test performance values default to 0.0 without events."""
+        assert service._rounded(None, "avg_load_time_ms") == 0.0
 
 
 class TestEventTypes: